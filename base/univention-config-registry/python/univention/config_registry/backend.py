@@ -36,12 +36,17 @@
 
 import errno
 import fcntl
+import mmap
 import os
 import re
+import struct
 import sys
+import tempfile
 import time
-from collections.abc import ItemsView, Iterator, Mapping, MutableMapping
+import zlib
+from collections.abc import Callable, ItemsView, Iterable, Iterator, Mapping, MutableMapping
 from enum import IntEnum
+from io import StringIO
 from stat import S_ISREG
 from types import TracebackType
 from typing import IO, Literal, NoReturn, Self, TypeVar, overload
@@ -79,6 +84,7 @@ class Load(IntEnum):
     MANUAL = 0
     ONCE = 1
     ALWAYS = 2
+    NOTIFY = 3
 
 
 if MYPY:  # pragma: no cover
@@ -164,6 +170,33 @@ class ViewConfigRegistry(_M, BooleanConfigRegistry):
         return self.ucr.__len__()
 
 
+class _DependencyRecorder(_M):
+    """
+    Proxy recording the variables looked up while evaluating a default value.
+
+    :param ucr: The registry to look up variables in.
+    :param names: Set to record the variable names in.
+    """
+
+    def __init__(self, ucr: Mapping[str, str], names: set[str]) -> None:
+        self.ucr = ucr
+        self.names = names
+
+    def __contains__(self, key: object) -> bool:
+        self.names.add(key)  # type: ignore[arg-type]
+        return key in self.ucr
+
+    def __getitem__(self, key: str) -> str:
+        self.names.add(key)
+        return self.ucr[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return self.ucr.__iter__()
+
+    def __len__(self) -> int:
+        return self.ucr.__len__()
+
+
 class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
     """
     Merged persistent read-only value store.
@@ -183,17 +216,26 @@ class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
         DEFAULTS: 'base-defaults.conf',
     }
 
+    SNAPSHOT = True
+    NOTIFY_INTERVAL = 10.0
+
     def __init__(self, filename: str = "") -> None:
         super().__init__()
         custom = os.getenv('UNIVENTION_BASECONF') or filename
         self.autoload = Load.MANUAL
 
+        layer = _SnapshotConfigRegistry if self.SNAPSHOT else _ConfigRegistry
         self._registry: dict[int, _ConfigRegistry] = {}
         for reg in self.LAYER_PRIORITIES:
             if reg == self.CUSTOM:
-                self._registry[reg] = _ConfigRegistry(custom if custom else os.devnull)
+                self._registry[reg] = layer(custom if custom else os.devnull)
             else:
-                self._registry[reg] = _ConfigRegistry(os.devnull if custom else os.path.join(self.PREFIX, self.BASES[reg]))
+                self._registry[reg] = layer(os.devnull if custom else os.path.join(self.PREFIX, self.BASES[reg]))
+
+        self._defaults: dict[str, tuple[str, str, frozenset[str]]] = {}
+        self._defaults_mtime: tuple[float, ...] = ()
+        self._listeners: list[tuple[Callable[[set[str]], None], frozenset[str] | None]] = []
+        self._notify_check = 0.0
 
     def _walk(self) -> Iterator[tuple[int, Self]]:
         """
@@ -201,7 +243,9 @@ class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
 
         :returns: Iterator of 2-tuple (layers-mumber, layer)
         """
-        if self.autoload:
+        if self.autoload == Load.NOTIFY:
+            self._reload_changed()
+        elif self.autoload:
             self.load(Load.MANUAL if self.autoload == Load.ONCE else self.autoload)
 
         for reg in self.LAYER_PRIORITIES:
@@ -214,6 +258,11 @@ class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
 
         :param autoload: Automatically reload changed files.
         """
+        if autoload == Load.NOTIFY:
+            for reg in self._registry.values():
+                reg.watch()
+            self._notify_check = time.monotonic() + self.NOTIFY_INTERVAL
+
         for reg in self._registry.values():
             reg.load()
 
@@ -226,6 +275,56 @@ class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
 
         return self
 
+    def _reload_changed(self) -> None:
+        """
+        Re-load the changed layers and notify the listeners about changed variables.
+
+        Changes are detected by the change counters of the layers, which need no system calls.
+        Layers without change counter and changes not made through UCR are detected by checking the file modification times every `NOTIFY_INTERVAL` seconds.
+        """
+        now = time.monotonic()
+        check = now >= self._notify_check
+        if check:
+            self._notify_check = now + self.NOTIFY_INTERVAL
+
+        changed: set[str] = set()
+        for registry in self._registry.values():
+            if not registry.changed(check):
+                continue
+
+            old = dict(registry.items())
+            registry.mtime = 0.0
+            registry.load()
+            new = dict(registry.items())
+            changed.update(key for key in old.keys() | new.keys() if old.get(key) != new.get(key))
+
+        if not changed:
+            return
+
+        self._invalidate_defaults(changed)
+        for callback, keys in list(self._listeners):
+            selected = changed if keys is None else changed & keys
+            if selected:
+                callback(selected)
+
+    def add_change_listener(self, callback: Callable[[set[str]], None], keys: Iterable[str] | None = None) -> None:
+        """
+        Register callback for variables changed by other processes.
+        Only used with `Load.NOTIFY`, where it is invoked by the next access after the change.
+
+        :param callback: Function called with the set of changed UCR variable names.
+        :param keys: Only notify about these UCR variable names. `None` for all variables.
+        """
+        self._listeners.append((callback, None if keys is None else frozenset(keys)))
+
+    def remove_change_listener(self, callback: Callable[[set[str]], None]) -> None:
+        """
+        Unregister callback for changed variables.
+
+        :param callback: Function previously registered with :py:meth:`add_change_listener`.
+        """
+        self._listeners = [(func, keys) for func, keys in self._listeners if func != callback]
+
     def __enter__(self) -> ViewConfigRegistry:
         """
         Return immutable view despite `autoload`.
@@ -303,7 +402,7 @@ class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
             except KeyError:
                 continue
             if reg == self.DEFAULTS:
-                value = self._eval_default(value)
+                value = self._eval_default(value, key)
             return (reg, value) if getscope else value
         return default
 
@@ -348,24 +447,70 @@ class ReadOnlyConfigRegistry(_M, BooleanConfigRegistry):
             for key, value in registry.items():
                 if key not in merge:
                     if reg == self.DEFAULTS:
-                        value = self._eval_default(value)
+                        value = self._eval_default(value, key)
                     merge[key] = (reg, value) if getscope else value
 
         return merge  # type: ignore
 
-    def _eval_default(self, default: str) -> str:
+    def _eval_default(self, default: str, key: str | None = None) -> str:
         """
         Recursively evaluate default value.
 
+        The result is memoized together with the names of the referenced variables.
+        All results are dropped when any layer gets re-loaded, single results when the variable itself or any referenced variable is changed.
+
         :param default: Default value.
+        :param key: UCR variable name to memoize the result for.
         :returns: Substituted value.
         """
+        if '@%@' not in default:
+            return default
+
+        if key is not None:
+            mtime = tuple(registry.mtime for registry in self._registry.values())
+            if mtime != self._defaults_mtime:
+                self._defaults.clear()
+                self._defaults_mtime = mtime
+
+            try:
+                template, result, _names = self._defaults[key]
+            except KeyError:
+                pass
+            else:
+                if template == default:
+                    return result
+
+        names: set[str] = set()
         try:
-            value = run_filter(default, self, opts={'disallow-execution': True})
+            value = run_filter(default, _DependencyRecorder(self, names), opts={'disallow-execution': True})
         except RuntimeError:  # maximum recursion depth exceeded
             value = b''
 
-        return value.decode("UTF-8")
+        result = value.decode("UTF-8")
+        if key is not None:
+            self._defaults[key] = (default, result, frozenset(names))
+
+        return result
+
+    def _invalidate_defaults(self, keys: Iterable[str]) -> None:
+        """
+        Drop memoized default values depending on changed variables.
+
+        :param keys: Names of the changed UCR variables.
+        """
+        stale = set(keys)
+        while True:
+            depending = {
+                key
+                for key, (_template, _result, names) in self._defaults.items()
+                if key not in stale and not names.isdisjoint(stale)
+            }
+            if not depending:
+                break
+            stale |= depending
+
+        for key in stale:
+            self._defaults.pop(key, None)
 
     @overload
     def items(self) -> ItemsView[str, str]:  # pragma: no cover
@@ -400,6 +545,8 @@ class ConfigRegistry(ReadOnlyConfigRegistry, _MM):
     :param write_registry: The UCR level used for writing.
     """
 
+    SNAPSHOT = False
+
     def __init__(self, filename: str = "", write_registry: int = ReadOnlyConfigRegistry.NORMAL) -> None:
         super().__init__(filename)
         custom = os.getenv('UNIVENTION_BASECONF') or filename
@@ -447,6 +594,7 @@ class ConfigRegistry(ReadOnlyConfigRegistry, _MM):
     def clear(self) -> None:
         """Clear all registry keys."""
         self._layer.clear()
+        self._defaults.clear()
 
     def __delitem__(self, key: str) -> None:
         """
@@ -455,6 +603,7 @@ class ConfigRegistry(ReadOnlyConfigRegistry, _MM):
         :param key: UCR variable name.
         """
         del self._layer[key]
+        self._invalidate_defaults((key,))
 
     def __setitem__(self, key: str, value: str) -> None:
         """
@@ -464,6 +613,7 @@ class ConfigRegistry(ReadOnlyConfigRegistry, _MM):
         :param value: UCR variable value.
         """
         self._layer[key] = value
+        self._invalidate_defaults((key,))
 
     def update(self, changes: dict[str, str | None]) -> dict[str, tuple[str | None, str | None]]:  # type: ignore
         """
@@ -485,6 +635,8 @@ class ConfigRegistry(ReadOnlyConfigRegistry, _MM):
                 registry[key] = value
             new_value = registry.get(key, value)
             changed[key] = (old_value, new_value)
+
+        self._invalidate_defaults(changed)
         return changed
 
     def setdefault(self, key: str, default: str) -> str:  # type: ignore
@@ -512,12 +664,16 @@ class _ConfigRegistry(dict):
     """
 
     RE_COMMENT = re.compile(r'^[^:]*#.*$')
+    GENERATION = struct.Struct('<Q')
 
     def __init__(self, filename: str) -> None:
         dict.__init__(self)
         self.file = filename
         self.backup_file = self.file + '.bak'
         self.lock_filename = self.file + '.lock'
+        self.generation_file = self.file + '.generation'
+        self.counter: mmap.mmap | None = None
+        self.generation = 0
         # will be set by <ConfigRegistry> for each <_ConfigRegistry> - <True>
         # means the backend files are valid UTF-8 and should stay that way -->
         # only accept valid UTF-8
@@ -539,15 +695,7 @@ class _ConfigRegistry(dict):
                         continue
 
                     reg_file.seek(0)
-                    for line in reg_file:
-                        line = self.RE_COMMENT.sub("", line)
-                        if line == '':
-                            continue
-                        if line.find(': ') == -1:
-                            continue
-
-                        key, value = line.split(': ', 1)
-                        new[key] = value.strip()
+                    new = self._parse(reg_file)
 
                 break
             except OSError:
@@ -563,17 +711,40 @@ class _ConfigRegistry(dict):
         if fn != self.file:
             self._save_file(self.file)
 
+    @classmethod
+    def _parse(cls, lines: Iterable[str]) -> dict[str, str]:
+        """
+        Parse text database.
+
+        :param lines: Lines of the text database.
+        :returns: A mapping from variable name to value.
+        """
+        new = {}
+        for line in lines:
+            line = cls.RE_COMMENT.sub("", line)
+            if line == '':
+                continue
+            if line.find(': ') == -1:
+                continue
+
+            key, value = line.split(': ', 1)
+            new[key] = value.strip()
+
+        return new
+
     def _create_base_conf(self) -> None:
         """Create sub registry file."""
         try:
             reg_file = os.open(self.file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
             os.close(reg_file)
         except OSError as ex:
-            if ex.errno == errno.EEXIST and not os.path.isdir(self.file):
-                return
-            msg = "E: could not create file '%s': %s" % (self.file, ex)
-            print(msg, file=sys.stderr)
-            exception_occured()
+            if ex.errno != errno.EEXIST or os.path.isdir(self.file):
+                msg = "E: could not create file '%s': %s" % (self.file, ex)
+                print(msg, file=sys.stderr)
+                exception_occured()
+
+        if not os.path.exists(self.generation_file):
+            self._increment_generation()
 
     def _save_file(self, filename: str) -> None:
         """
@@ -632,6 +803,86 @@ class _ConfigRegistry(dict):
         for filename in (self.backup_file, self.file):
             self._save_file(filename)
 
+        self._save_snapshot()
+        self._increment_generation()
+
+    def _increment_generation(self) -> None:
+        """Increment the change counter of the sub registry to notify watching readers."""
+        try:
+            file_stat = os.stat(self.file)
+            if not S_ISREG(file_stat.st_mode):
+                return
+
+            fd = os.open(self.generation_file, os.O_RDWR | os.O_CREAT, file_stat.st_mode & 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                data = os.pread(fd, self.GENERATION.size, 0)
+                generation, = self.GENERATION.unpack(data) if len(data) == self.GENERATION.size else (0,)
+                os.pwrite(fd, self.GENERATION.pack(generation + 1), 0)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def watch(self) -> None:
+        """Map the change counter of the sub registry, which allows detecting changes without system calls."""
+        if self.counter is not None or self.file == os.devnull:
+            return
+
+        try:
+            with open(self.generation_file, 'rb') as fd:
+                self.counter = mmap.mmap(fd.fileno(), self.GENERATION.size, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+
+        self.generation, = self.GENERATION.unpack_from(self.counter)
+
+    def changed(self, check: bool = False) -> bool:
+        """
+        Check if the sub registry has been changed since it was loaded.
+
+        :param check: Also compare the modification time of the file, which needs a system call.
+        :returns: `True` if the sub registry needs to be re-loaded, `False` otherwise.
+        """
+        if self.file == os.devnull:
+            return False
+
+        if self.counter is not None:
+            generation, = self.GENERATION.unpack_from(self.counter)
+            if generation != self.generation:
+                self.generation = generation
+                return True
+        elif check:
+            self.watch()
+
+        if check:
+            try:
+                return os.stat(self.file).st_mtime > self.mtime
+            except OSError:
+                pass
+
+        return False
+
+    @property
+    def snapshot_file(self) -> str:
+        """Return file name of the binary snapshot."""
+        return self.file + '.snapshot'
+
+    def _save_snapshot(self) -> None:
+        """
+        Compile the just saved sub registry into a binary snapshot.
+
+        The snapshot is only an optimization for readers, so failing to write it is not fatal.
+        """
+        try:
+            file_stat = os.stat(self.file)
+            if not S_ISREG(file_stat.st_mode):
+                return
+
+            _Snapshot.dump(self.snapshot_file, self._parse(StringIO(self.__unicode__(), newline=None)), file_stat)
+        except OSError:
+            pass
+
     def lock(self) -> None:
         """Lock sub registry file."""
         self.lock_file = lock = open(self.lock_filename, "a+", encoding='utf-8')
@@ -685,3 +936,249 @@ class _ConfigRegistry(dict):
         if isinstance(data, bytes):
             data = data.decode('UTF-8')
         return data
+
+
+class _SnapshotConfigRegistry(_ConfigRegistry):
+    """
+    Persistent read-only value store.
+    This is a single value store using the binary snapshot of the text file while it is current and the text file otherwise.
+
+    :param filename: File name for text database file.
+    """
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename)
+        self.snapshot: _Snapshot | None = None
+
+    def load(self) -> None:
+        """Load sub registry from snapshot or file."""
+        try:
+            file_stat = os.stat(self.file)
+        except OSError:
+            pass
+        else:
+            if self.snapshot is not None:
+                if self.snapshot.matches(file_stat):
+                    return
+            elif file_stat.st_mtime <= self.mtime:
+                return
+
+            snapshot = _Snapshot.open(self.snapshot_file, file_stat) if S_ISREG(file_stat.st_mode) else None
+            if snapshot is not None:
+                self._close_snapshot()
+                self.snapshot = snapshot
+                dict.clear(self)
+                self.mtime = file_stat.st_mtime
+                return
+
+        if self.snapshot is not None:
+            self._close_snapshot()
+            self.mtime = 0.0
+
+        super().load()
+
+    def _close_snapshot(self) -> None:
+        """Release the currently used snapshot."""
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+
+    def __getitem__(self, key: str) -> str:
+        if self.snapshot is None:
+            return dict.__getitem__(self, key)
+        return self.snapshot[key]
+
+    def __contains__(self, key: object) -> bool:
+        if self.snapshot is None:
+            return dict.__contains__(self, key)
+        return key in self.snapshot
+
+    def get(self, key: str, default: _VT | None = None) -> str | _VT | None:  # type: ignore[override]
+        if self.snapshot is None:
+            return dict.get(self, key, default)
+        return self.snapshot.get(key, default)
+
+    def __iter__(self) -> Iterator[str]:
+        if self.snapshot is None:
+            return dict.__iter__(self)
+        return iter(self.snapshot)
+
+    def __len__(self) -> int:
+        if self.snapshot is None:
+            return dict.__len__(self)
+        return len(self.snapshot)
+
+    def keys(self):  # type: ignore[override]
+        if self.snapshot is None:
+            return dict.keys(self)
+        return self.snapshot.keys()
+
+    def items(self):  # type: ignore[override]
+        if self.snapshot is None:
+            return dict.items(self)
+        return self.snapshot.items()
+
+
+class _Snapshot(_M):
+    """
+    Memory mapped binary snapshot of a sub registry.
+
+    The file consists of a header, an open addressing hash table and the entries:
+
+    * header: magic, version, inode, size, mtime and ctime of the compiled text file, number of entries, number of slots
+    * hash table: one offset per slot pointing to an entry, `0` for an unused slot
+    * entries: length of name, length of value, UTF-8 encoded name, UTF-8 encoded value
+
+    :param mapped: The memory mapped file.
+    """
+
+    MAGIC = b'UCRSNAP\0'
+    VERSION = 1
+    HEADER = struct.Struct('<8sIQQQQII')
+    SLOT = struct.Struct('<I')
+    ENTRY = struct.Struct('<II')
+
+    def __init__(self, mapped: mmap.mmap) -> None:
+        self._map = mapped
+        _magic, _version, *self._source, self._count, self._slots = self.HEADER.unpack_from(mapped)
+        self._table = self.HEADER.size
+        self._entries = self._table + self._slots * self.SLOT.size
+
+    @staticmethod
+    def _source_of(file_stat: os.stat_result) -> list[int]:
+        """
+        Identify the version of a text file.
+
+        :param file_stat: `stat` result of the text file.
+        :returns: List of inode, size, mtime and ctime.
+        """
+        return [file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ctime_ns]
+
+    @classmethod
+    def open(cls, filename: str, file_stat: os.stat_result) -> '_Snapshot | None':
+        """
+        Map snapshot, if it has been compiled from the current text file.
+
+        :param filename: File name of the snapshot.
+        :param file_stat: `stat` result of the text file.
+        :returns: The snapshot or `None` if it is missing, invalid or outdated.
+        """
+        try:
+            with open(filename, 'rb') as fd:
+                mapped = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, version, *source, _count, slots = cls.HEADER.unpack_from(mapped)
+        except struct.error:
+            magic = None
+
+        if magic != cls.MAGIC or version != cls.VERSION or source != cls._source_of(file_stat) or slots & (slots - 1):
+            mapped.close()
+            return None
+
+        return cls(mapped)
+
+    def matches(self, file_stat: os.stat_result) -> bool:
+        """
+        Check if the snapshot has been compiled from the given version of the text file.
+
+        :param file_stat: `stat` result of the text file.
+        :returns: `True` if the snapshot is current, `False` otherwise.
+        """
+        return self._source == self._source_of(file_stat)
+
+    def close(self) -> None:
+        """Unmap snapshot."""
+        self._map.close()
+
+    def _entry(self, offset: int) -> tuple[int, bytes, int, int]:
+        """
+        Decode entry.
+
+        :param offset: Position of the entry.
+        :returns: 4-tuple (end position, name, value position, value length).
+        """
+        klen, vlen = self.ENTRY.unpack_from(self._map, offset)
+        start = offset + self.ENTRY.size
+        return (start + klen + vlen, self._map[start:start + klen], start + klen, vlen)
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            name = key.encode('utf-8')
+        except (AttributeError, UnicodeError):
+            raise KeyError(key)
+
+        mask = self._slots - 1
+        slot = zlib.crc32(name) & mask
+        while True:
+            offset, = self.SLOT.unpack_from(self._map, self._table + slot * self.SLOT.size)
+            if not offset:
+                raise KeyError(key)
+            _end, found, start, vlen = self._entry(offset)
+            if found == name:
+                return self._map[start:start + vlen].decode('utf-8')
+            slot = (slot + 1) & mask
+
+    def __iter__(self) -> Iterator[str]:
+        for key, _value in self._iter_entries():
+            yield key
+
+    def __len__(self) -> int:
+        return self._count
+
+    def items(self) -> list[tuple[str, str]]:  # type: ignore[override]
+        return list(self._iter_entries())
+
+    def _iter_entries(self) -> Iterator[tuple[str, str]]:
+        offset = self._entries
+        for _ in range(self._count):
+            offset, name, start, vlen = self._entry(offset)
+            yield (name.decode('utf-8'), self._map[start:start + vlen].decode('utf-8'))
+
+    @classmethod
+    def dump(cls, filename: str, data: Mapping[str, str], file_stat: os.stat_result) -> None:
+        """
+        Atomically replace snapshot.
+
+        :param filename: File name of the snapshot.
+        :param data: The parsed content of the text file.
+        :param file_stat: `stat` result of the text file.
+        """
+        slots = 8
+        while slots < 2 * len(data):
+            slots <<= 1
+
+        mask = slots - 1
+        table = [0] * slots
+        entries = []
+        offset = cls.HEADER.size + slots * cls.SLOT.size
+        for key, value in data.items():
+            name, text = key.encode('utf-8'), value.encode('utf-8')
+            slot = zlib.crc32(name) & mask
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = offset
+            entry = cls.ENTRY.pack(len(name), len(text)) + name + text
+            entries.append(entry)
+            offset += len(entry)
+
+        fd, temp_filename = tempfile.mkstemp(prefix=os.path.basename(filename) + '.', dir=os.path.dirname(filename))
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, *cls._source_of(file_stat), len(data), slots))
+                stream.write(struct.pack('<%dI' % slots, *table))
+                stream.writelines(entries)
+                stream.flush()
+                os.fsync(stream.fileno())
+
+            os.chmod(temp_filename, file_stat.st_mode & 0o7777)
+            try:
+                os.chown(temp_filename, file_stat.st_uid, file_stat.st_gid)
+            except OSError:
+                pass
+            os.rename(temp_filename, filename)
+        except BaseException:
+            os.unlink(temp_filename)
+            raise
@@ -313,12 +313,18 @@ def handler_commit(args: list[str], opts: dict[str, Any] = {}) -> None:
     :param args: Command line arguments.
     :param opts: Command line options.
     """
+    try:
+        jobs = int(opts.get('jobs') or 1)
+    except ValueError:
+        print('E: invalid number of jobs: %s' % (opts['jobs'],), file=sys.stderr)
+        sys.exit(1)
+
     ucr = ConfigRegistry()
     ucr.load()
 
     handlers = ConfigHandlers()
     handlers.load()
-    handlers.commit(ucr, args)
+    handlers.commit(ucr, args, jobs)
 
 
 def handler_register(args: list[str], opts: dict[str, Any] = {}) -> None:
@@ -616,9 +622,10 @@ Actions:
     `version/version: 1.0` => `version_version="1.0"`
     (deprecated: use --shell dump instead)
 
-  commit [file1 ...]:
+  commit [--jobs <n>] [file1 ...]:
     rebuild configuration file from univention template; if
     no file is specified ALL configuration files are rebuilt
+    --jobs: generate up to <n> independent files in parallel
 
   filter [file]:
     evaluate a template file, expects Python inline code in UTF-8 or US-ASCII
@@ -716,6 +723,9 @@ OPT_COMMANDS: dict[str, dict[str, Any]] = {
         'non-empty': [BOOL, False],
         'verbose': [BOOL, False],
     },
+    'commit': {
+        'jobs': [STRING, None],
+    },
     'filter': {
         'encode-utf8': [BOOL, False],
         'disallow-execution': [BOOL, False],
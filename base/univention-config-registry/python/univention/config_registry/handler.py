@@ -45,7 +45,8 @@ import random
 import re
 import subprocess
 import sys
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from grp import getgrnam
 from pwd import getpwnam
 from typing import IO, Any
@@ -239,6 +240,10 @@ class ConfigHandler:
     def __call__(self, args: _ARG) -> None:
         raise NotImplementedError()
 
+    def need_serial(self) -> bool:
+        """Check if the handler must not run in parallel to other handlers."""
+        return True
+
 
 class ConfigHandlerDiverting(ConfigHandler):
     """
@@ -319,6 +324,17 @@ class ConfigHandlerDiverting(ConfigHandler):
         """Check if diversion is needed."""
         return False
 
+    def need_serial(self) -> bool:
+        """
+        Files only depend on their templates and can be generated in parallel,
+        unless Python modules or scripts are run before or after generating them.
+        """
+        return bool(getattr(self, 'preinst', None) or getattr(self, 'postinst', None) or os.path.isfile(self._script_file()))
+
+    def _script_file(self) -> str:
+        """Return the path of the script run after generating the file."""
+        return ''
+
     def install_divert(self) -> None:
         """Prepare file for diversion."""
         deb = '%s.debian' % self.to_file
@@ -402,7 +418,7 @@ class ConfigHandlerMultifile(ConfigHandlerDiverting):
 
         to_dir = os.path.dirname(self.to_file)
         if not os.path.isdir(to_dir):
-            os.makedirs(to_dir, 0o755)
+            os.makedirs(to_dir, 0o755, exist_ok=True)
 
         if os.path.isfile(self.dummy_from_file):
             stat: os.stat_result | None = os.stat(self.dummy_from_file)
@@ -440,10 +456,13 @@ class ConfigHandlerMultifile(ConfigHandlerDiverting):
         if hasattr(self, 'postinst') and self.postinst:
             run_module(self.postinst, 'postinst', ucr, changed)
 
-        script_file = os.path.join(SCRIPT_DIR, self.to_file.strip("/"))
+        script_file = self._script_file()
         if os.path.isfile(script_file):
             run_script(script_file, 'postinst', changed)
 
+    def _script_file(self) -> str:
+        return os.path.join(SCRIPT_DIR, self.to_file.strip("/"))
+
     def need_divert(self) -> bool:
         """
         Diversion is needed when at least one multifile and one subfile
@@ -490,7 +509,7 @@ class ConfigHandlerFile(ConfigHandlerDiverting):
 
         to_dir = os.path.dirname(self.to_file)
         if not os.path.isdir(to_dir):
-            os.makedirs(to_dir, 0o755)
+            os.makedirs(to_dir, 0o755, exist_ok=True)
 
         try:
             stat = os.stat(self.from_file)
@@ -522,10 +541,13 @@ class ConfigHandlerFile(ConfigHandlerDiverting):
         if hasattr(self, 'postinst') and self.postinst:
             run_module(self.postinst, 'postinst', ucr, changed)
 
-        script_file = self.from_file.replace(FILE_DIR, SCRIPT_DIR)
+        script_file = self._script_file()
         if os.path.isfile(script_file):
             run_script(script_file, 'postinst', changed)
 
+    def _script_file(self) -> str:
+        return self.from_file.replace(FILE_DIR, SCRIPT_DIR)
+
     def need_divert(self) -> bool:
         """For simple files the diversion is always needed."""
         return True
@@ -609,6 +631,60 @@ def grep_variables(text: str) -> set[str]:
     return set(VARIABLE_PATTERN.findall(text))
 
 
+class VariableIndex:
+    """
+    Dispatch index mapping changed variable names to their handlers.
+
+    Registered variable names are regular expressions, which are matched against the start of changed variable names.
+    Most of them are plain names without any special character, which are looked up by prefix in a dictionary.
+    The remaining patterns are combined into one alternation, which quickly rejects non-matching variables.
+    """
+
+    LITERAL = re.compile(r'[^.^$*+?{}\[\]\\|()]*\Z')
+
+    def __init__(self, handlers: Mapping[str, set[ConfigHandler]]) -> None:
+        """:param handlers: Mapping of registered variable patterns to handlers."""
+        self._literals: dict[str, set[ConfigHandler]] = {}
+        self._patterns: list[tuple[re.Pattern[str], set[ConfigHandler]]] = []
+        for reg_var, v2h in handlers.items():
+            if self.LITERAL.match(reg_var):
+                self._literals[reg_var] = v2h
+                continue
+            try:
+                _re = re.compile(reg_var)
+            except re.error as ex:
+                print('Failed to compile regular expression %s: %s' % (reg_var, ex), file=sys.stderr)
+                continue
+            self._patterns.append((_re, v2h))
+        self._lengths = sorted({len(reg_var) for reg_var in self._literals})
+        try:
+            self._combined: re.Pattern[str] | None = re.compile('|'.join('(?:%s)' % (_re.pattern,) for _re, _v2h in self._patterns)) if self._patterns else None
+        except re.error:
+            self._combined = None
+
+    def __call__(self, variable: str) -> set[ConfigHandler]:
+        """
+        Return the handlers registered for a variable.
+
+        :param variable: Changed UCR variable name.
+        :returns: Set of handlers.
+        """
+        pending_handlers: set[ConfigHandler] = set()
+        for length in self._lengths:
+            if length > len(variable):
+                break
+            v2h = self._literals.get(variable[:length])
+            if v2h:
+                pending_handlers |= v2h
+
+        if self._patterns and (self._combined is None or self._combined.match(variable)):
+            for _re, v2h in self._patterns:
+                if _re.match(variable):
+                    pending_handlers |= v2h
+
+        return pending_handlers
+
+
 class ConfigHandlers:
     """Manage handlers for configuration variables."""
 
@@ -617,9 +693,10 @@ class ConfigHandlers:
     # 1: with version header
     # 2: switch to handlers mapping to set, drop file, add multifile.def_count
     # 3: split config_registry into sub modules
-    VERSION = 3
-    VERSION_MIN = 3
-    VERSION_MAX = 3
+    # 4: add variable index, fix reading the version from the cache
+    VERSION = 4
+    VERSION_MIN = 4
+    VERSION_MAX = 4
     VERSION_TEXT = 'univention-config cache, version'
     VERSION_NOTICE = '%s %s\n' % (VERSION_TEXT, VERSION)
     VERSION_RE = re.compile('^%s (?P<version>[0-9]+)$' % VERSION_TEXT)
@@ -627,6 +704,7 @@ class ConfigHandlers:
     _handlers: dict[str, set[ConfigHandler]] = {}  # variable -> set(handlers)
     _multifiles: dict[str, ConfigHandlerMultifile] = {}  # multifile -> handler
     _subfiles: dict[str, list[tuple[str, set[str]]]] = {}  # multifile -> [(subfile, variables)] // pending
+    _index: VariableIndex | None = None
 
     def __init__(self) -> None:
         pass
@@ -640,6 +718,8 @@ class ConfigHandlers:
         :returns: Version.
         """
         line = cache_file.readline()    # IOError is propagated
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', 'replace')
         match = ConfigHandlers.VERSION_RE.match(line)
         if match:
             version = int(match.group('version'))
@@ -668,6 +748,8 @@ class ConfigHandlers:
                 chv = ConfigHandlers
                 if not chv.VERSION_MIN <= version <= chv.VERSION_MAX:
                     raise TypeError("Invalid cache file version.")
+                if not self._is_current(cache_file):
+                    raise TypeError("Outdated cache file.")
                 pickler = pickle.Unpickler(cache_file)
                 self._handlers = pickler.load()
                 if version <= 1:
@@ -678,9 +760,23 @@ class ConfigHandlers:
                     pickler.load()
                 self._subfiles = pickler.load()
                 self._multifiles = pickler.load()
+                self._index = pickler.load()
         except (Exception, pickle.UnpicklingError):
             self.update()
 
+    @staticmethod
+    def _is_current(cache_file: IO) -> bool:
+        """
+        Check if the cache is newer than the `.info` files.
+
+        :param cache_file: Opened cache file.
+        :returns: `False` if `.info` files were added, removed or replaced after the cache was written.
+        """
+        try:
+            return os.fstat(cache_file.fileno()).st_mtime_ns >= os.stat(INFO_DIR).st_mtime_ns
+        except OSError:
+            return True
+
     def get_handler(self, entry: _INFO) -> ConfigHandler | None:
         """
         Parse entry and return Handler instance.
@@ -882,6 +978,7 @@ class ConfigHandlers:
                 v2h = self._handlers.setdefault(variable, set())
                 v2h.add(handler)
 
+        self._index = VariableIndex(self._handlers)
         self._save_cache()
         return handlers
 
@@ -930,6 +1027,7 @@ class ConfigHandlers:
                 pickler.dump(self._handlers)
                 pickler.dump(self._subfiles)
                 pickler.dump(self._multifiles)
+                pickler.dump(self._index)
         except OSError as ex:
             if ex.errno != errno.EACCES:
                 raise
@@ -967,6 +1065,7 @@ class ConfigHandlers:
 
             handler((ucr, values))
 
+        self._index = VariableIndex(self._handlers)
         self._save_cache()
         return handlers
 
@@ -1021,37 +1120,32 @@ class ConfigHandlers:
             pass
         return obsolete_handlers
 
-    def __call__(self, variables: Iterable[str], arg: _ARG) -> None:
+    def __call__(self, variables: Iterable[str], arg: _ARG, jobs: int = 1) -> None:
         """
         Call handlers registered for changes in variables.
 
         :param variables: Changed UCR variable names.
         :param arg: 2-tuple(UCR-instance, changed) where changed is a dictionary mapping ucs-variable-names to values.
+        :param jobs: Number of files to generate in parallel.
         """
         if not variables:
             return
-        pending_handlers: set[ConfigHandler] = set()
+        if self._index is None:
+            self._index = VariableIndex(self._handlers)
 
-        for reg_var, handlers in self._handlers.items():
-            try:
-                _re = re.compile(reg_var)
-            except re.error as ex:
-                print('Failed to compile regular expression %s: %s' % (reg_var, ex), file=sys.stderr)
-                continue
-
-            for variable in variables:
-                if _re.match(variable):
-                    pending_handlers |= handlers
+        pending_handlers: set[ConfigHandler] = set()
+        for variable in variables:
+            pending_handlers |= self._index(variable)
 
-        for handler in pending_handlers:
-            handler(arg)
+        self._run_handlers(pending_handlers, lambda handler: handler(arg), jobs)
 
-    def commit(self, ucr: _UCR, filelist: Iterable[str] = []) -> None:
+    def commit(self, ucr: _UCR, filelist: Iterable[str] = [], jobs: int = 1) -> None:
         """
         Call handlers to (re-)generate files.
 
         :param ucr: UCR instance.
         :param filelist: List of files to re-generate. By default *all* files will be re-generated and all modules and scripts will we re-invoked!
+        :param jobs: Number of files to generate in parallel.
         """
         _filelist = []
         for fname in filelist:
@@ -1090,8 +1184,46 @@ class ConfigHandlers:
             print('Warning: The file %r is not registered as an UCR template.' % (fname,), file=sys.stderr)
 
         # call handlers
-        for handler in pending_handlers:
-            self.call_handler(ucr, handler)
+        self._run_handlers(pending_handlers, lambda handler: self.call_handler(ucr, handler), jobs)
+
+    @staticmethod
+    def _run_handlers(handlers: Iterable[ConfigHandler], call: Callable[[ConfigHandler], None], jobs: int = 1) -> None:
+        """
+        Call handlers, optionally generating independent files in parallel.
+
+        Handlers which need to run serially are called after all others.
+        Errors while generating files in parallel are reported per file and the first one is raised after all handlers have been called.
+
+        :param handlers: The handlers to call.
+        :param call: Function to call a single handler.
+        :param jobs: Number of files to generate in parallel.
+        """
+        if jobs <= 1:
+            for handler in handlers:
+                call(handler)
+            return
+
+        serial: list[ConfigHandler] = []
+        errors: list[Exception] = []
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {}
+            for handler in handlers:
+                if handler.need_serial():
+                    serial.append(handler)
+                else:
+                    futures[pool.submit(call, handler)] = handler
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as ex:
+                    print('Failed to generate %s: %s' % (getattr(futures[future], 'to_file', futures[future]), ex), file=sys.stderr)
+                    errors.append(ex)
+
+        for handler in serial:
+            call(handler)
+
+        if errors:
+            raise errors[0]
 
     def call_handler(self, ucr: _UCR, handler: ConfigHandler) -> None:
         """
@@ -438,6 +438,158 @@ class TestInternal:
         assert not os.path.isfile(os.path.devnull)
 
 
+class TestSnapshot:
+    """Unit test for py:class:`univention.config_registry.backend._Snapshot`"""
+
+    @pytest.fixture()
+    def ucrs(self, ucr0):
+        ucr0["foo"] = "bar"
+        ucr0["key"] = " value \u00e4 "
+        ucr0["multi"] = "line1\nline2"
+        ucr0.save()
+        return ucr0
+
+    def test_snapshot(self, ucrs):
+        ucr = backend.ReadOnlyConfigRegistry().load()
+        layer = ucr._registry[ucr.NORMAL]
+        assert layer.snapshot is not None
+        assert ucr["foo"] == "bar"
+        assert "foo" in ucr
+        assert "missing" not in ucr
+        assert ucr.get("missing", "default") == "default"
+
+    def test_identical(self, ucrs):
+        text = backend._ConfigRegistry(ucrs._layer.file)
+        text.load()
+        layer = backend._SnapshotConfigRegistry(ucrs._layer.file)
+        layer.load()
+        assert layer.snapshot is not None
+        assert dict(layer.items()) == dict(text.items())
+        assert sorted(layer) == sorted(text)
+        assert len(layer) == len(text)
+        assert str(layer) == str(text)
+
+    def test_many(self, ucr0):
+        data = {"key/%d" % i: "value%d" % i for i in range(1000)}
+        ucr0.update(data)
+        ucr0.save()
+        ucr = backend.ReadOnlyConfigRegistry().load()
+        assert ucr._registry[ucr.NORMAL].snapshot is not None
+        assert dict(ucr.items()) == data
+
+    def test_outdated(self, ucrs):
+        with open(ucrs._layer.file, "a") as fd:
+            fd.write("\nnew: value\n")
+
+        ucr = backend.ReadOnlyConfigRegistry().load()
+        assert ucr._registry[ucr.NORMAL].snapshot is None
+        assert ucr["new"] == "value"
+        assert ucr["foo"] == "bar"
+
+    @pytest.mark.parametrize("data", [b"", b"garbage", b"UCRSNAP\0" + bytes(40)])
+    def test_invalid(self, data, ucrs):
+        with open(ucrs._layer.snapshot_file, "wb") as fd:
+            fd.write(data)
+
+        ucr = backend.ReadOnlyConfigRegistry().load()
+        assert ucr._registry[ucr.NORMAL].snapshot is None
+        assert ucr["foo"] == "bar"
+
+    def test_missing(self, ucrs):
+        os.unlink(ucrs._layer.snapshot_file)
+        ucr = backend.ReadOnlyConfigRegistry().load()
+        assert ucr._registry[ucr.NORMAL].snapshot is None
+        assert ucr["foo"] == "bar"
+
+    def test_autoload(self, ucrs):
+        ucr = backend.ReadOnlyConfigRegistry().load(autoload=backend.Load.ALWAYS)
+        assert ucr["foo"] == "bar"
+        ucrs["foo"] = "baz"
+        ucrs.save()
+        assert ucr["foo"] == "baz"
+        assert ucr._registry[ucr.NORMAL].snapshot is not None
+
+    def test_writable(self, ucrs):
+        ucr = ConfigRegistry().load()
+        assert not isinstance(ucr._registry[ucr.NORMAL], backend._SnapshotConfigRegistry)
+        assert ucr["foo"] == "bar"
+
+
+class TestNotify:
+    """Unit test for change detection with py:attr:`univention.config_registry.backend.Load.NOTIFY`"""
+
+    @pytest.fixture()
+    def ucrn(self, ucr0):
+        ucr0["foo"] = "bar"
+        ucr0["baz"] = "bam"
+        ucr0.save()
+        return backend.ReadOnlyConfigRegistry().load(autoload=backend.Load.NOTIFY)
+
+    def test_generation(self, ucr0):
+        layer = ucr0._layer
+        layer.watch()
+        assert layer.generation == 1
+        ucr0.save()
+        assert layer.changed()
+        assert not layer.changed()
+
+    def test_changed(self, ucrn, ucr0):
+        assert ucrn["foo"] == "bar"
+        ucr0["foo"] = "new"
+        ucr0.save()
+        assert ucrn["foo"] == "new"
+
+    def test_unchanged(self, ucrn, mocker):
+        stat = mocker.patch("os.stat")
+        assert ucrn["foo"] == "bar"
+        assert "baz" in ucrn
+        stat.assert_not_called()
+
+    def test_changed_layer(self, ucrn, mocker):
+        loads = {reg: mocker.spy(registry, "load") for reg, registry in ucrn._registry.items()}
+        ucr = ConfigRegistry(write_registry=ConfigRegistry.LDAP)
+        ucr["foo"] = "LDAP"
+        ucr.save()
+        assert ucrn["foo"] == "LDAP"
+        assert loads.pop(ucrn.LDAP).call_count == 1
+        assert all(load.call_count == 0 for load in loads.values())
+
+    def test_listener(self, ucrn, ucr0, mocker):
+        everything = mocker.Mock()
+        ucrn.add_change_listener(everything)
+        selected = mocker.Mock()
+        ucrn.add_change_listener(selected, ["baz"])
+
+        ucr0["foo"] = "new"
+        ucr0["new"] = "value"
+        ucr0.save()
+        assert ucrn["foo"] == "new"
+        everything.assert_called_once_with({"foo", "new"})
+        selected.assert_not_called()
+
+        del ucr0["baz"]
+        ucr0.save()
+        ucrn.remove_change_listener(everything)
+        assert "baz" not in ucrn
+        everything.assert_called_once()
+        selected.assert_called_once_with({"baz"})
+
+    def test_fallback(self, ucr0, mocker):
+        ucr0["foo"] = "bar"
+        ucr0.save()
+        os.unlink(ucr0._layer.generation_file)
+        ucr = backend.ReadOnlyConfigRegistry().load(autoload=backend.Load.NOTIFY)
+        assert ucr._registry[ucr.NORMAL].counter is None
+
+        time.sleep(.1)
+        with open(ucr0._layer.file, "a") as fd:
+            fd.write("\nfoo: new\n")
+
+        assert ucr["foo"] == "bar"
+        ucr._notify_check = 0.0
+        assert ucr["foo"] == "new"
+
+
 class TestDefault:
     def test_default(self, ucr0, tmpdir):
         ucr0._registry[ucr0.DEFAULTS]["key"] = "val"
@@ -453,3 +605,60 @@ class TestDefault:
     def test_recusrion(self, ucr0, tmpdir):
         ucr0._registry[ucr0.DEFAULTS]["key"] = "@%@key@%@"
         assert ucr0["key"] == ""
+
+    def test_plain(self, ucr0, mocker):
+        run_filter = mocker.patch("univention.config_registry.backend.run_filter")
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "val"
+        assert ucr0["key"] == "val"
+        run_filter.assert_not_called()
+
+    def test_memoized(self, ucr0, mocker):
+        run_filter = mocker.spy(backend, "run_filter")
+        ucr0["ref"] = "val"
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "@%@ref@%@"
+        assert ucr0["key"] == "val"
+        assert ucr0["key"] == "val"
+        assert ucr0.items() == {"ref": "val", "key": "val"}.items()
+        assert run_filter.call_count == 1
+
+    def test_changed_default(self, ucr0):
+        ucr0["ref"] = "val"
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "@%@ref@%@"
+        assert ucr0["key"] == "val"
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "@%@ref@%@2"
+        assert ucr0["key"] == "val2"
+
+    @pytest.mark.parametrize("change", [
+        pytest.param(lambda ucr: ucr.__setitem__("ref", "new"), id="set"),
+        pytest.param(lambda ucr: ucr.update({"ref": "new"}), id="update"),
+        pytest.param(lambda ucr: ucr.__delitem__("ref"), id="unset"),
+        pytest.param(lambda ucr: ucr.clear(), id="clear"),
+    ])
+    def test_changed_reference(self, change, ucr0):
+        ucr0["ref"] = "val"
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "<@%@ref@%@>"
+        assert ucr0["key"] == "<val>"
+        change(ucr0)
+        assert ucr0["key"] == "<%s>" % (ucr0.get("ref", ""),)
+
+    def test_changed_nested(self, ucr0):
+        ucr0["ref"] = "val"
+        ucr0._registry[ucr0.DEFAULTS]["mid"] = "@%@ref@%@"
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "<@%@mid@%@>"
+        assert ucr0["key"] == "<val>"
+        ucr0["ref"] = "new"
+        assert ucr0["key"] == "<new>"
+
+    def test_changed_file(self, ucr0):
+        ucr0["ref"] = "val"
+        ucr0.save()
+        ucr0._registry[ucr0.DEFAULTS]["key"] = "@%@ref@%@"
+        assert ucr0["key"] == "val"
+
+        time.sleep(.1)
+        ucr = ConfigRegistry()
+        ucr["ref"] = "new"
+        ucr.save()
+
+        ucr0.load()
+        assert ucr0["key"] == "new"
@@ -10,6 +10,8 @@ from io import StringIO
 import pytest
 
 import univention.config_registry.frontend as ucrfe
+from univention.config_registry import backend
+from univention.config_registry.handler import run_filter
 
 
 @pytest.fixture()
@@ -602,3 +604,48 @@ class TestMain:
         handlers["get"][0].side_effect = TypeError()
         with pytest.raises(TypeError):
             ucrfe.main(["--debug", "get", "KEY"])
+
+
+def _eval_default_uncached(self, default, key=None):
+    """Evaluate default value without memoization."""
+    try:
+        value = run_filter(default, self, opts={'disallow-execution': True})
+    except RuntimeError:
+        value = b''
+
+    return value.decode("UTF-8")
+
+
+@pytest.fixture()
+def ucrd(ucr0):
+    """Return UCR instance with many templated default values."""
+    ucr = ucrfe.ConfigRegistry()
+    ucr["hostname"] = "host"
+    ucr["domainname"] = "example.com"
+    ucr.save()
+    ucr = ucrfe.ConfigRegistry(write_registry=ucrfe.ConfigRegistry.DEFAULTS)
+    for i in range(200):
+        ucr["bench/%d/plain" % i] = "value"
+        ucr["bench/%d/fqdn" % i] = "@%@hostname@%@.@%@domainname@%@"
+        ucr["bench/%d/url" % i] = f"https://@%@bench/{i}/fqdn@%@/"
+    ucr.save()
+    ucr0.load()
+    return ucr0
+
+
+@pytest.mark.slow()
+@pytest.mark.parametrize("memoize", [
+    pytest.param(False, id="before"),
+    pytest.param(True, id="after"),
+])
+@pytest.mark.parametrize("func", [
+    pytest.param(lambda ucr: list(ucrfe.handler_dump([])), id="dump"),
+    pytest.param(lambda ucr: list(ucrfe.handler_search(["^bench/1/"], {"brief": True})), id="search"),
+    pytest.param(lambda ucr: list(ucr.items()), id="items"),
+])
+def test_benchmark_defaults(func, memoize, ucrd, rinfo, benchmark, mocker):
+    if not memoize:
+        mocker.patch.object(backend.ReadOnlyConfigRegistry, "_eval_default", _eval_default_uncached)
+
+    output = benchmark(func, ucrd)
+    assert len(output) >= 2
@@ -7,6 +7,7 @@
 
 import sys
 from argparse import Namespace
+from io import BytesIO
 from os import stat_result
 from os.path import dirname
 
@@ -221,6 +222,9 @@ def test_ConfigHandlerMultifile(mocker):
 def test_ConfigHandlerFile(mocker):
     h = ucrh.ConfigHandlerFile("file.from", "file.to")
     assert h.need_divert()
+    assert not h.need_serial()
+    h.postinst = "module"
+    assert h.need_serial()
 
     return  # TODO
 
@@ -287,6 +291,39 @@ def handlers(tmpcache):
     return handlers
 
 
+class TestVariableIndex:
+    @pytest.fixture()
+    def index(self):
+        return ucrh.VariableIndex({
+            "foo": {"h_foo"},
+            "foo/bar": {"h_foo_bar"},
+            "foo-bar": {"h_foo-bar"},
+            "a/b.": {"h_regex"},
+            "interfaces/[^/]+/address": {"h_iface"},
+            "invalid[": {"h_invalid"},
+        })
+
+    @pytest.mark.parametrize("variable,handlers", [
+        ("foo", {"h_foo"}),
+        ("foo/bar", {"h_foo", "h_foo_bar"}),
+        ("foo/bar/baz", {"h_foo", "h_foo_bar"}),
+        ("foo-bar", {"h_foo", "h_foo-bar"}),
+        ("fo", set()),
+        ("bar", set()),
+        ("a/bc", {"h_regex"}),
+        ("a/b", set()),
+        ("interfaces/eth0/address", {"h_iface"}),
+        ("interfaces/eth0/netmask", set()),
+        ("invalid[", set()),
+    ])
+    def test_match(self, index, variable, handlers):
+        assert index(variable) == handlers
+
+    def test_combined_invalid(self):
+        index = ucrh.VariableIndex({"(?i)a": {"h_a"}, "b(?i)": {"h_b"}})
+        assert index("A") == {"h_a"}
+
+
 class TestConfigHandlers:
     COMMON = {
         "Preinst": ["preinst"],
@@ -394,23 +431,27 @@ class TestConfigHandlers:
         ("univention-config cache, version 1\n", 1),
         ("univention-config cache, version 2\n", 2),
         ("univention-config cache, version 3\n", 3),
+        ("univention-config cache, version 4\n", 4),
     ])
     def test_get_cache_version(self, data, version):
         cache = StringIO(data)
         assert version == ucrh.ConfigHandlers._get_cache_version(cache)
+        cache = BytesIO(data.encode("utf-8"))
+        assert version == ucrh.ConfigHandlers._get_cache_version(cache)
 
     def test_cache(self, handlers):
         handlers._handlers = {"var": set()}
         handlers._subfiles = {"mfile": []}
         handlers._multifiles = {"mfile": None}
+        handlers._index = ucrh.VariableIndex(handlers._handlers)
         handlers._save_cache()
 
         h2 = ucrh.ConfigHandlers()
         h2.load()
-        pytest.xfail("BUG")
         assert h2._handlers == handlers._handlers
         assert h2._subfiles == handlers._subfiles
         assert h2._multifiles == handlers._multifiles
+        assert h2._index("var") == set()
 
     @pytest.mark.skip()
     def test_update(self, handlers):
@@ -428,14 +469,42 @@ class TestConfigHandlers:
     def test_unregister(self, handlers):
         pass
 
-    @pytest.mark.skip()
-    def test_call(self, handlers):
-        pass
+    def test_call(self, handlers, mocker):
+        literal, regex, other = (mocker.MagicMock() for _ in range(3))
+        handlers._handlers = {"foo/bar": {literal}, "foo/.*/baz": {regex}, "other": {other}}
+        handlers(["foo/bar", "foo/x/baz"], ({}, {}))
+        literal.assert_called_once_with(({}, {}))
+        regex.assert_called_once_with(({}, {}))
+        other.assert_not_called()
 
     @pytest.mark.skip()
     def test_commit(self, handlers):
         pass
 
+    @pytest.mark.parametrize("jobs", [1, 4])
+    def test_run_handlers(self, handlers, jobs):
+        files = [ucrh.ConfigHandlerFile("file%d.from" % i, "file%d.to" % i) for i in range(8)]
+        script = ucrh.ConfigHandlerScript("script")
+        called = []
+        handlers._run_handlers([script, *files], called.append, jobs)
+        assert sorted(called, key=repr) == sorted([script, *files], key=repr)
+        if jobs > 1:
+            assert called[-1] is script
+
+    def test_run_handlers_error(self, handlers, capsys):
+        files = [ucrh.ConfigHandlerFile("file%d.from" % i, "file%d.to" % i) for i in range(4)]
+        called = []
+
+        def call(handler):
+            called.append(handler)
+            if handler.to_file == "/file1.to":
+                raise ValueError("broken")
+
+        with pytest.raises(ValueError, match="broken"):
+            handlers._run_handlers(files, call, 2)
+        assert len(called) == 4
+        assert "Failed to generate /file1.to: broken" in capsys.readouterr().err
+
     @pytest.mark.skip()
     def test_call_handler(self, handlers):
         pass
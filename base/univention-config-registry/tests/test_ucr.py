@@ -33,6 +33,7 @@ def test_ro(ucrf):
     pytest.param(lambda: UCR.ucr, "BEFORE", "BEFORE", id="Once"),
     pytest.param(lambda: UCR.ucr_live, "BEFORE", "AFTER", id="Always"),
     pytest.param(lambda: UCR.ucr_live.__enter__(), "BEFORE", "BEFORE", id="View"),  # noqa: PLW0108
+    pytest.param(lambda: UCR.ConfigRegistry().load(autoload=UCR.Load.NOTIFY), "BEFORE", "AFTER", id="Notify"),
 ])
 def test_autoload(autoload, before, after, ucr0):
     reload(UCR)
@@ -56,6 +57,7 @@ def test_autoload(autoload, before, after, ucr0):
     pytest.param(lambda ucr: ucr.load(), id="Default"),
     pytest.param(lambda ucr: ucr.load(autoload=UCR.Load.ALWAYS), id="Always"),
     pytest.param(lambda ucr: ucr.load(autoload=UCR.Load.ALWAYS).__enter__(), id="View"),
+    pytest.param(lambda ucr: ucr.load(autoload=UCR.Load.NOTIFY), id="Notify"),
 ])
 def test_benchmark_autoload(autoload, benchmark, ucr0):
     ucr0["foo"] = "value"
@@ -30,13 +30,16 @@
 # /usr/share/common-licenses/AGPL-3; if not, see
 # <https://www.gnu.org/licenses/>.
 
+import os
 from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
 from typing import Any
 
 from univention.ldap_cache.log import debug
 
 
 DB_DIRECTORY = '/usr/share/univention-group-membership-cache/caches'
+COMMIT_INTERVAL = 10000
 
 
 class Caches:
@@ -71,6 +74,28 @@ class Caches:
     def _add_sub_cache(self, name: str, single_value: bool, reverse: bool) -> Any:
         raise NotImplementedError()
 
+    def _initialized_file(self, name: str) -> str:
+        return os.path.join(self._directory, '%s.initialized' % (name,))
+
+    def is_initialized(self, name: str) -> bool:
+        """Whether the sub cache has been filled completely once, even if it is empty."""
+        return os.path.exists(self._initialized_file(name))
+
+    def set_initialized(self, name: str) -> None:
+        """Remember that the sub cache has been filled completely."""
+        debug('%s - Marking as initialized', name)
+        with open(self._initialized_file(name), 'w'):
+            pass
+
+    @contextmanager
+    def bulk_loading(self, commit_interval: int = COMMIT_INTERVAL) -> Iterator[None]:
+        """
+        Group all writes to the sub caches into large transactions, which
+        are committed every `commit_interval` writes and when leaving the
+        context. Meant for (re)building the cache with many objects.
+        """
+        raise NotImplementedError()
+
 
 class Shard:
     ldap_filter: str | None = None
@@ -80,11 +105,14 @@ class Shard:
     value: str | None = None
     attributes: list[str] = []
     reverse = False
+    transitive = False
 
     def __init__(self, cache: Any) -> None:
         self._cache = cache
 
     def rm_object(self, obj: tuple[str, Mapping[str, Sequence[bytes]]]) -> None:
+        if self.transitive:
+            return
         try:
             key = self.get_key(obj)
         except ValueError:
@@ -94,6 +122,8 @@ class Shard:
         self._cache.delete(key, values)
 
     def add_object(self, obj: tuple[str, Mapping[str, Sequence[bytes]]]) -> None:
+        if self.transitive:
+            return
         try:
             key = self.get_key(obj)
         except ValueError:
@@ -105,6 +135,36 @@ class Shard:
         else:
             self._cache.delete(key, [])
 
+    def modify_object(self, old_obj: tuple[str, Mapping[str, Sequence[bytes]]], new_obj: tuple[str, Mapping[str, Sequence[bytes]]]) -> None:
+        """
+        Update the cache for a modified object.
+        Reverse caches only touch the values which actually changed, as
+        every value is a key of its own in the database.
+        Transitive caches are not fed directly but derived from the other
+        caches, see :func:`univention.ldap_cache.frontend.update_nested_users`.
+        """
+        if self.transitive:
+            return
+        if self.reverse:
+            try:
+                key = self.get_key(old_obj)
+                renamed = key != self.get_key(new_obj)
+            except ValueError:
+                renamed = True
+            if not renamed:
+                old_values = {value.lower() for value in self.get_values(old_obj)}
+                new_values = {value.lower() for value in self.get_values(new_obj)}
+                debug('Modifying %s', key)
+                removed = sorted(old_values - new_values)
+                if removed:
+                    self._cache.delete(key, removed)
+                added = sorted(new_values - old_values)
+                if added:
+                    self._cache.save(key, added)
+                return
+        self.rm_object(old_obj)
+        self.add_object(new_obj)
+
     def _get_from_object(self, obj: tuple[str, Mapping[str, Sequence[bytes]]], attr: str) -> Sequence[Any]:
         if attr == 'dn':
             return [obj[0]]
@@ -37,7 +37,7 @@ from contextlib import contextmanager
 from dbm import gnu as gdbm
 from pwd import getpwnam
 
-from univention.ldap_cache.cache.backend import Caches, LdapCache, Shard, _s
+from univention.ldap_cache.cache.backend import COMMIT_INTERVAL, Caches, LdapCache, Shard, _s
 from univention.ldap_cache.log import debug, log
 
 
@@ -54,14 +54,55 @@ class GdbmCaches(Caches):
         self._caches[name] = cache
         return cache
 
+    @contextmanager
+    def bulk_loading(self, commit_interval=COMMIT_INTERVAL):
+        # type: (int) -> Iterator[None]
+        caches = [cache for _name, cache in self]
+        try:
+            for cache in caches:
+                cache.begin_bulk(commit_interval)
+            yield
+        finally:
+            for cache in caches:
+                cache.end_bulk()
+
 
 class GdbmCache(LdapCache):
     def __init__(self, *args, **kwargs):
         # type: (*Any, **Any) -> None
         self.fail_count = 0
+        self.bulk = None  # type: Optional[Any]
+        self.bulk_count = 0
+        self.commit_interval = COMMIT_INTERVAL
         super().__init__(*args, **kwargs)
         log('%s - Recreating!', self.name)
 
+    def begin_bulk(self, commit_interval):
+        # type: (int) -> None
+        """
+        Keep the database open without synchronizing every write.
+        Readers do not lock the database, so it is synchronized and closed
+        every `commit_interval` writes to leave a consistent file behind.
+        """
+        if self.bulk is not None:
+            return
+        if not os.path.exists(self.db_file):
+            self.clear()
+        self.bulk = gdbm.open(self.db_file, 'cu')
+        self.bulk_count = 0
+        self.commit_interval = commit_interval
+
+    def end_bulk(self):
+        # type: () -> None
+        if self.bulk is None:
+            return
+        bulk, self.bulk = self.bulk, None
+        debug('%s - Synchronizing %d writes', self.name, self.bulk_count)
+        try:
+            bulk.sync()
+        finally:
+            bulk.close()
+
     def _fix_permissions(self):
         # type: () -> None
         listener_uid = getpwnam('listener').pw_uid
@@ -73,6 +114,14 @@ class GdbmCache(LdapCache):
         # type: (Optional[Any]) -> Iterator[Any]
         if writer is not None:
             yield writer
+        elif self.bulk is not None:
+            self.bulk_count += 1
+            if self.bulk_count % self.commit_interval == 0:
+                debug('%s - Synchronizing %d writes', self.name, self.bulk_count)
+                self.bulk.sync()
+                self.bulk.close()
+                self.bulk = gdbm.open(self.db_file, 'cu')
+            yield self.bulk
         else:
             if not os.path.exists(self.db_file):
                 self.clear()
@@ -82,13 +131,24 @@ class GdbmCache(LdapCache):
             finally:
                 writer.close()
 
-    reading = writing
+    @contextmanager
+    def reading(self, reader=None):
+        # type: (Optional[Any]) -> Iterator[Any]
+        if reader is not None:
+            yield reader
+        elif self.bulk is not None:
+            # reads do not count towards the commit interval
+            yield self.bulk
+        else:
+            with self.writing() as reader:
+                yield reader
 
     def save(self, key, values):
         # type: (str, List[str]) -> None
         with self.writing() as writer:
             if self.reverse:
                 for value in values:
+                    value = value.lower()
                     current = self.get(value, writer) or []
                     if key in current:
                         continue
@@ -108,8 +168,12 @@ class GdbmCache(LdapCache):
     def clear(self):
         # type: () -> None
         log('%s - Clearing whole DB!', self.name)
+        bulk = self.bulk is not None
+        self.end_bulk()
         gdbm.open(self.db_file, 'nu').close()
         self._fix_permissions()
+        if bulk:
+            self.begin_bulk(self.commit_interval)
 
     def cleanup(self):
         # type: () -> None
@@ -132,12 +196,16 @@ class GdbmCache(LdapCache):
         with self.writing(writer) as writer:
             if self.reverse:
                 for value in values:
+                    value = value.lower()
                     current = self.get(value, writer) or []
                     try:
                         current.remove(key)
                     except ValueError:
                         continue
-                    writer[value] = json.dumps(current)
+                    if current:
+                        writer[value] = json.dumps(current)
+                    else:
+                        del writer[value]
             else:
                 try:
                     del writer[key]
@@ -37,7 +37,8 @@ from pwd import getpwnam
 
 import lmdb
 
-from univention.ldap_cache.cache.backend import Caches, LdapCache, Shard
+from univention.ldap_cache.cache.backend import COMMIT_INTERVAL, Caches, LdapCache, Shard, _s
+from univention.ldap_cache.log import debug
 
 
 class LmdbCaches(Caches):
@@ -57,20 +58,72 @@ class LmdbCaches(Caches):
 
     def _add_sub_cache(self, name, single_value, reverse):
         # type: (str, bool, bool) -> LmdbCache
-        sub_db = self.env.open_db(name, dupsort=not single_value)
+        sub_db = self.env.open_db(name.encode('utf-8'), dupsort=not single_value)
         cache = LmdbCache(name, single_value, reverse)
         cache.env = self.env
         cache.sub_db = sub_db
         self._caches[name] = cache
         return cache
 
+    @contextmanager
+    def bulk_loading(self, commit_interval=COMMIT_INTERVAL):
+        # type: (int) -> Iterator[None]
+        bulk = LmdbBulkWriter(self.env, commit_interval)
+        caches = [cache for _name, cache in self]
+        for cache in caches:
+            cache.bulk = bulk
+        try:
+            yield
+        except BaseException:
+            bulk.abort()
+            raise
+        else:
+            bulk.commit()
+        finally:
+            for cache in caches:
+                cache.bulk = None
+
+
+class LmdbBulkWriter:
+    """One write transaction for all sub caches, committed every `commit_interval` writes."""
+
+    def __init__(self, env, commit_interval):
+        # type: (Any, int) -> None
+        self.env = env
+        self.commit_interval = commit_interval
+        self.count = 0
+        self.txn = env.begin(write=True)
+
+    def writer(self):
+        # type: () -> Any
+        self.count += 1
+        if self.count > self.commit_interval:
+            debug('Committing %d writes', self.count - 1)
+            self.txn.commit()
+            self.txn = self.env.begin(write=True)
+            self.count = 1
+        return self.txn
+
+    def commit(self):
+        # type: () -> None
+        debug('Committing %d writes', self.count)
+        self.txn.commit()
+
+    def abort(self):
+        # type: () -> None
+        self.txn.abort()
+
 
 class LmdbCache(LdapCache):
+    bulk = None  # type: Optional[LmdbBulkWriter]
+
     @contextmanager
     def writing(self, writer=None):
         # type: (Optional[Any]) -> Iterator[Any]
         if writer is not None:
             yield writer
+        elif self.bulk is not None:
+            yield self.bulk.writer()
         else:
             with self.env.begin(self.sub_db, write=True) as writer:
                 yield writer
@@ -78,61 +131,68 @@ class LmdbCache(LdapCache):
     def save(self, key, values):
         # type: (str, List[str]) -> None
         with self.writing() as writer:
-            self.delete(key, writer)
-            for value in values:
-                writer.put(key, value)
+            if self.reverse:
+                for value in values:
+                    writer.put(value.lower().encode('utf-8'), key.encode('utf-8'), db=self.sub_db)
+            else:
+                self.delete(key, values, writer)
+                for value in values:
+                    writer.put(key.encode('utf-8'), value.encode('utf-8'), db=self.sub_db)
 
     def clear(self):
         # type: () -> None
-        with self.env.begin(write=True) as writer:
+        with self.writing() as writer:
             writer.drop(self.sub_db, delete=False)
 
     def cleanup(self):
         # type: () -> None
         pass
 
-    def delete(self, key, writer=None):
-        # type: (str, Any) -> None
+    def delete(self, key, values, writer=None):
+        # type: (str, List[str], Any) -> None
         with self.writing(writer) as writer:
-            writer.delete(key)
+            if self.reverse:
+                for value in values:
+                    writer.delete(value.lower().encode('utf-8'), key.encode('utf-8'), db=self.sub_db)
+            else:
+                writer.delete(key.encode('utf-8'), db=self.sub_db)
 
     @contextmanager
-    def reading(self):
-        # type: () -> Iterator[Any]
-        with self.env.begin(self.sub_db) as txn, txn.cursor() as cursor:
-            yield cursor
+    def reading(self, reader=None):
+        # type: (Optional[Any]) -> Iterator[Any]
+        if reader is not None:
+            yield reader
+        elif self.bulk is not None:
+            yield self.bulk.txn
+        else:
+            with self.env.begin(self.sub_db) as reader:
+                yield reader
+
+    def keys(self):
+        # type: () -> Iterator[str]
+        with self.reading() as reader, reader.cursor(self.sub_db) as cursor:
+            for key in cursor.iternext_nodup():
+                yield _s(key)
 
     def __iter__(self):
         # type: () -> Iterator[Tuple[str, Any]]
         with self.reading() as reader:
-            yield from reader
+            for key in self.keys():
+                yield key, self.get(key, reader)
 
-    def get(self, key):
-        # type: (str) -> Any
-        with self.reading() as reader:
+    def get(self, key, reader=None):
+        # type: (str, Any) -> Any
+        with self.reading(reader) as reader:
             if self.single_value:
-                return reader.get(key)
-            else:
-                reader.set_key(key)
-                return list(reader.iternext_dup())
+                return _s(reader.get(key.encode('utf-8'), db=self.sub_db))
+            with reader.cursor(self.sub_db) as cursor:
+                if not cursor.set_key(key.encode('utf-8')):
+                    return []
+                return [_s(value) for value in cursor.iternext_dup()]
 
     def load(self):
         # type: () -> Dict[str, Any]
-        ret = {}  # type: Dict[str, Any]
-        with self._load_key_translations() as translations, self.reading() as reader:
-            for key in reader.iternext_nodup():
-                translated = translations.get(key)
-                if translated is None:
-                    continue
-                ret[translated] = self.get(key)
-        return ret
-
-    @contextmanager
-    def _load_key_translations(self):
-        # type: () -> Iterator[Any]
-        entry_uuid_db = self.env.open_db('EntryUUID', dupsort=False)
-        with self.env.begin(entry_uuid_db) as txn:
-            yield txn
+        return dict(list(self))
 
 
 class LmdbShard(Shard):
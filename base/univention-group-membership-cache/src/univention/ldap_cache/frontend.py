@@ -30,6 +30,7 @@
 # /usr/share/common-licenses/AGPL-3; if not, see
 # <https://www.gnu.org/licenses/>.
 
+from collections.abc import Iterable
 from typing import Any
 
 from univention.ldap_cache.cache import Cache, get_cache  # noqa: F401
@@ -49,10 +50,33 @@ def _extract_id_from_dn(dn: str) -> str:
     return dn.split(",", 1)[0].split("=", 1)[1]
 
 
+def _groups_for_member(member_dn: str, consider_nested_groups: bool, member_of_cache: Any) -> list[str]:
+    """
+    Resolve the groups of a member with the `memberOf` sub cache,
+    which maps every member to the groups it is directly part of.
+    Only the entries of the member and its (nested) groups are read.
+    """
+    search_for_dns = [member_dn]
+    found: set[str] = set()
+    with member_of_cache.reading() as reader:
+        while search_for_dns:
+            search_for = search_for_dns.pop()
+            for group in member_of_cache.get(search_for, reader) or []:
+                if group not in found:
+                    found.add(group)
+                    search_for_dns.append(group)
+            if not consider_nested_groups:
+                break
+    return sorted(found)
+
+
 def groups_for_user(user_dn: str, consider_nested_groups: bool = True, cache: dict[str, set[str]] | None = None) -> list[str]:
     user_dn = user_dn.lower()
     if cache is None:
         _cache = get_cache()
+        member_of_cache = _cache.get_sub_cache('memberOf')
+        if member_of_cache is not None:
+            return _groups_for_member(user_dn, consider_nested_groups, member_of_cache)
         subcache = _cache.get_sub_cache('uniqueMembers').load()
         cache = {key: {val.lower() for val in values} for key, values in subcache.items()}
     search_for_dns = [user_dn]
@@ -71,6 +95,10 @@ def groups_for_user(user_dn: str, consider_nested_groups: bool = True, cache: di
 def users_in_group(group_dn: str, consider_nested_groups: bool = True, readers: tuple[Any | None, Any | None] = (None, None), group_cache: dict[str, list[str]] = {}) -> list[str]:
     group_dn = group_dn.lower()
     cache = get_cache()
+    if consider_nested_groups and readers == (None, None):
+        nested_users_cache = cache.get_sub_cache('nestedUsers')
+        if nested_users_cache is not None:
+            return sorted(nested_users_cache.get(group_dn) or [])
     member_uid_cache, unique_member_cache = (cache.get_sub_cache(name) for name in ['memberUids', 'uniqueMembers'])
     with member_uid_cache.reading(readers[0]) as member_uid_reader, unique_member_cache.reading(readers[1]) as unique_member_reader:
         ret: set[str] = set()
@@ -105,11 +133,16 @@ def users_groups() -> dict[str, list[str]]:
     cache = get_cache()
     member_uid_cache, unique_member_cache = (cache.get_sub_cache(name) for name in ['memberUids', 'uniqueMembers'])
 
+    nested_users_cache = cache.get_sub_cache('nestedUsers')
+
     group_users: dict[str, list[str]] = {}
     _group_cache: dict[str, list[str]] = {}
-    with member_uid_cache.reading() as member_uid_reader, unique_member_cache.reading() as unique_member_reader:
-        for group in unique_member_cache.keys():
-            group_users[group] = users_in_group(group, readers=(member_uid_reader, unique_member_reader), group_cache=_group_cache)
+    if nested_users_cache is not None:
+        group_users = nested_users_cache.load()
+    else:
+        with member_uid_cache.reading() as member_uid_reader, unique_member_cache.reading() as unique_member_reader:
+            for group in unique_member_cache.keys():
+                group_users[group] = users_in_group(group, readers=(member_uid_reader, unique_member_reader), group_cache=_group_cache)
 
     res: dict[str, set[str]] = {}
     for group, members in group_users.items():
@@ -119,3 +152,69 @@ def users_groups() -> dict[str, list[str]]:
 
     # return groups as sorted list
     return {_extract_id_from_dn(user): sorted(groups) for user, groups in res.items()}
+
+
+def update_nested_users(group_dns: Iterable[str]) -> None:
+    """
+    Update the transitive closure of users in the `nestedUsers` sub cache
+    after the given groups changed.
+    Only these groups and the groups they are (nested) members of are
+    recomputed, the stored closures of all other subgroups are reused.
+    """
+    cache = get_cache()
+    nested_users_cache = cache.get_sub_cache('nestedUsers')
+    if nested_users_cache is None:
+        return
+    member_uid_cache, unique_member_cache, member_of_cache = (cache.get_sub_cache(name) for name in ['memberUids', 'uniqueMembers', 'memberOf'])
+
+    affected: set[str] = set()
+    search_for_dns = [group_dn.lower() for group_dn in group_dns]
+    if member_of_cache is None:
+        affected.update(search_for_dns)
+        affected.update(unique_member_cache.keys())
+    else:
+        with member_of_cache.reading() as member_of_reader:
+            while search_for_dns:
+                search_for = search_for_dns.pop()
+                if search_for not in affected:
+                    affected.add(search_for)
+                    search_for_dns.extend(member_of_cache.get(search_for, member_of_reader) or [])
+
+    computed: dict[str, set[str]] = {}
+    with member_uid_cache.reading() as member_uid_reader, unique_member_cache.reading() as unique_member_reader, nested_users_cache.reading() as nested_users_reader:
+        def _nested_users(group_dn: str) -> set[str]:
+            # walk all reachable groups, so that groups reached again through
+            # cyclic nesting or a second path never contribute a partial result
+            ret: set[str] = set()
+            visited = {group_dn}
+            todo = [group_dn]
+            while todo:
+                dn = todo.pop()
+                if dn != group_dn and dn in computed:
+                    ret.update(computed[dn])
+                    continue
+                if dn not in affected:
+                    # unchanged groups contain no changed subgroup, their stored closure is complete
+                    ret.update(nested_users_cache.get(dn, nested_users_reader) or [])
+                    continue
+                members = unique_member_cache.get(dn, unique_member_reader) or []
+                uids = {uid.lower() for uid in member_uid_cache.get(dn, member_uid_reader) or []}
+                for member in members:
+                    rdn = _extract_id_from_dn(member).lower()
+                    if rdn in uids:
+                        ret.add(member.lower())
+                    elif '%s$' % rdn in uids:
+                        continue
+                    elif member.lower() not in visited:
+                        visited.add(member.lower())
+                        todo.append(member.lower())
+            return ret
+
+        for group_dn in affected:
+            computed[group_dn] = _nested_users(group_dn)
+
+    for group_dn, users in computed.items():
+        if users:
+            nested_users_cache.save(group_dn, sorted(users))
+        else:
+            nested_users_cache.delete(group_dn, [])
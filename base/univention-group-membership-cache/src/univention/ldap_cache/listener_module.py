@@ -31,9 +31,11 @@
 # <https://www.gnu.org/licenses/>.
 
 from collections.abc import Mapping, Sequence  # noqa: F401
+from contextlib import ExitStack
 from logging import getLogger
 
 from univention.ldap_cache.cache import get_cache
+from univention.ldap_cache.frontend import update_nested_users
 from univention.listener.handler import ListenerModuleHandler
 
 
@@ -41,6 +43,7 @@ class LdapCacheHandler(ListenerModuleHandler):
     def __init__(self, *args, **kwargs):
         # type: (*Any, **Any) -> None
         self._counter = 0
+        self._bulk_loading = None  # type: Optional[ExitStack]
         super().__init__(*args, **kwargs)
         cache_logger = getLogger('univention.ldap_cache')
         cache_logger.setLevel(self.logger.level)
@@ -54,27 +57,47 @@ class LdapCacheHandler(ListenerModuleHandler):
             for _name, db in get_cache():
                 db.cleanup()
 
+    def _update_transitive_caches(self, shards, dns):
+        # type: (List[Shard], List[str]) -> None
+        if any(shard.transitive for shard in shards):
+            update_nested_users(dns)
+
     def create(self, dn, new):
         # type: (str, Mapping[str, Sequence[bytes]]) -> None
-        for shard in get_cache().get_shards_for_query(self.config.get_ldap_filter()):
+        shards = get_cache().get_shards_for_query(self.config.get_ldap_filter())
+        for shard in shards:
             shard.add_object((dn, new))
+        self._update_transitive_caches(shards, [dn])
         self._cleanup_cache_if_needed()
 
     def modify(self, dn, old, new, old_dn):
         # type: (str, Mapping[str, Sequence[bytes]], Mapping[str, Sequence[bytes]], Optional[str]) -> None
-        for shard in get_cache().get_shards_for_query(self.config.get_ldap_filter()):
-            shard.rm_object((old_dn or dn, old))
-            shard.add_object((dn, new))
+        shards = get_cache().get_shards_for_query(self.config.get_ldap_filter())
+        for shard in shards:
+            shard.modify_object((old_dn or dn, old), (dn, new))
+        self._update_transitive_caches(shards, [dn, old_dn] if old_dn else [dn])
         self._cleanup_cache_if_needed()
 
     def remove(self, dn, old):
         # type: (str, Mapping[str, Sequence[bytes]]) -> None
-        for shard in get_cache().get_shards_for_query(self.config.get_ldap_filter()):
+        shards = get_cache().get_shards_for_query(self.config.get_ldap_filter())
+        for shard in shards:
             shard.rm_object((dn, old))
+        self._update_transitive_caches(shards, [dn])
         self._cleanup_cache_if_needed()
 
+    def initialize(self):
+        # type: () -> None
+        # all objects are sent to the module now: write them in large transactions until the listener is idle
+        # the caches are read by other processes meanwhile, so leave a consistent state behind more often
+        self._bulk_loading = ExitStack()
+        self._bulk_loading.enter_context(get_cache().bulk_loading(commit_interval=1000))
+
     def post_run(self):
         # type: () -> None
+        if self._bulk_loading is not None:
+            self._bulk_loading.close()
+            self._bulk_loading = None
         self._counter = -1
         self._cleanup_cache_if_needed()
 
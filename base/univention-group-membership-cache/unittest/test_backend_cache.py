@@ -75,6 +75,16 @@ def test__init__(backend, caches):
     assert caches._caches == {}
 
 
+def test_initialized(backend, tmp_path):
+    """An empty sub cache stays initialized once it has been filled."""
+    caches = backend.Caches(str(tmp_path))
+    assert not caches.is_initialized("memberOf")
+    caches.set_initialized("memberOf")
+    assert caches.is_initialized("memberOf")
+    assert backend.Caches(str(tmp_path)).is_initialized("memberOf")
+    assert not caches.is_initialized("nestedUsers")
+
+
 def test_get_shards_for_query(caches, cache, mocker):
     """test get_shards_for_query method."""
     # get unexisting query
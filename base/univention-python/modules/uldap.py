@@ -35,13 +35,18 @@
 import logging
 import random
 import re
-from collections.abc import Callable
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
 from functools import wraps
 from typing import Any
 
 import ldap
+import ldap.filter
 import ldap.sasl
 import ldap.schema
+from ldap.controls import SimplePagedResultsControl
 from ldap.controls.readentry import PostReadControl, PreReadControl
 from ldapurl import LDAPUrl, isLDAPUrl
 
@@ -203,6 +208,144 @@ def _fix_reconnect_handling(func):
     return _decorated
 
 
+class _PolicyCache:
+    """
+    Cache of LDAP entries read while resolving policies.
+
+    Before the entries are used, all cached entries needed by one call of
+    :py:meth:`access.getPolicies` or :py:meth:`access.getPoliciesMany` are
+    validated together by a search for their `entryCSN`. Changed entries are
+    re-fetched. With a positive `ttl` entries are trusted for that many seconds
+    without validation, so changes made through other connections may take up
+    to `ttl` seconds to become effective. At most `size` entries are kept, the
+    least recently used are dropped.
+
+    :param float ttl: Number of seconds an entry is used without validation.
+    :param int size: Maximum number of cached entries.
+    """
+
+    batch = 500
+    """The maximum number of entries validated by one search."""
+
+    def __init__(self, ttl: float = 0, size: int = 1000) -> None:
+        self.ttl = ttl
+        self.size = size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, bytes | None, dict[tuple[str, ...], dict[str, list[bytes]]]]] = OrderedDict()
+
+    @staticmethod
+    def key(dn: str) -> str:
+        """Returns the normalized DN used as key of an entry."""
+        try:
+            return ldap.dn.dn2str(ldap.dn.str2dn(dn)).lower()
+        except ldap.DECODING_ERROR:
+            return dn.lower()
+
+    def references(self, dns: Iterable[str]) -> list[str]:
+        """
+        Return the policies referenced by the cached entries.
+
+        :param dns: The distinguished names of the entries.
+        :returns: The distinguished names of the referenced policies.
+        """
+        result = []
+        with self._lock:
+            for dn in dns:
+                entry = self._entries.get(self.key(dn))
+                if entry is None:
+                    continue
+                for attrs in entry[2].values():
+                    result.extend(x.decode('utf-8') for x in attrs.get('univentionPolicyReference', []))
+        return result
+
+    def validate(self, lo: 'access', dns: Iterable[str]) -> float:
+        """
+        Validate the cached entries with a single search for their `entryCSN`, or
+        one search per :py:attr:`batch` entries. Changed and vanished entries are discarded.
+
+        :param lo: The LDAP connection.
+        :param dns: The distinguished names of the entries.
+        :returns: The time of the validation, to be passed to :py:meth:`get`.
+        """
+        now = time.monotonic()
+        stale: dict[str, str] = {}
+        with self._lock:
+            for dn in dns:
+                key = self.key(dn)
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[0] >= self.ttl:
+                    stale[key] = dn
+        if not stale:
+            return now
+
+        current = {}
+        dns = list(stale.values())
+        for i in range(0, len(dns), self.batch):
+            ldap_filter = '(|%s)' % ''.join(ldap.filter.filter_format('(entryDN=%s)', [dn]) for dn in dns[i:i + self.batch])
+            current.update((self.key(dn), attrs.get('entryCSN', [None])[0]) for dn, attrs in lo.search(filter=ldap_filter, attr=['entryCSN']))
+        with self._lock:
+            for key in stale:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                csn = current.get(key)
+                if csn is not None and csn == entry[1]:
+                    self._entries[key] = (now, csn, entry[2])
+                else:
+                    del self._entries[key]
+        return now
+
+    def get(self, lo: 'access', dn: str, attr: list[str], validated: float | None = None) -> dict[str, list[bytes]] | None:
+        """
+        Return the attributes of a LDAP entry.
+
+        :param lo: The LDAP connection.
+        :param str dn: The distinguished name of the entry.
+        :param attr: The list of attributes to fetch.
+        :param float validated: The time returned by :py:meth:`validate`. Entries validated since then are used as they are.
+        :returns: A dictionary mapping the requested attributes to a list of their values or `None` if the entry is not accessible.
+        """
+        key = self.key(dn)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                checked, csn, variants = entry
+                attrs = variants.get(tuple(attr))
+                if attrs is not None and (now - checked < self.ttl or (validated is not None and checked >= validated)):
+                    self._entries.move_to_end(key)
+                    return attrs
+
+        try:
+            attrs = lo.get(dn, [*attr, 'entryCSN'], required=True)
+        except ldap.NO_SUCH_OBJECT:
+            self.discard(dn)
+            return None
+        csn = attrs.pop('entryCSN', [None])[0]
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            variants = entry[2] if entry is not None and entry[1] == csn else {}
+            variants[tuple(attr)] = attrs
+            self._entries[key] = (now, csn, variants)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return attrs
+
+    def discard(self, dn: str) -> None:
+        """
+        Forget all cached attributes of a LDAP entry.
+
+        :param str dn: The distinguished name of the entry.
+        """
+        with self._lock:
+            self._entries.pop(self.key(dn), None)
+
+    def clear(self) -> None:
+        """Forget all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
 class access:
     """
     The low-level class to access a LDAP server.
@@ -263,6 +406,13 @@ class access:
 
         self.client_connection_attempt = client_retry_count + 1
 
+        try:
+            policy_cache_ttl = float(ucr.get('ldap/client/policy-cache/ttl', 0))
+        except ValueError:
+            log.error("Unable to read ldap/client/policy-cache/ttl, please reset to a number")
+            policy_cache_ttl = 0
+        self._policy_cache = _PolicyCache(policy_cache_ttl, ucr.get_int('ldap/client/policy-cache/size', 1000))
+
         self.__open(ca_certfile)
 
     @_fix_reconnect_handling
@@ -275,6 +425,7 @@ class access:
         """
         self.binddn = binddn
         self.bindpw = bindpw
+        self._policy_cache.clear()
         log.debug('bind binddn=%s', self.binddn)
         self.lo.simple_bind_s(self.binddn, self.bindpw)
 
@@ -287,6 +438,7 @@ class access:
         """
         self.binddn = None
         self.bindpw = bindpw
+        self._policy_cache.clear()
         saml = ldap.sasl.sasl({
             ldap.sasl.CB_AUTHNAME: None,
             ldap.sasl.CB_PASS: bindpw,
@@ -309,6 +461,7 @@ class access:
         """
         self.binddn = None
         self.bindpw = bindpw
+        self._policy_cache.clear()
         oauth = ldap.sasl.sasl({
             ldap.sasl.CB_AUTHNAME: authzid,
             ldap.sasl.CB_PASS: bindpw,
@@ -474,6 +627,64 @@ class access:
         else:
             return self.lo.search_ext_s(*args, **kwargs)
 
+    def search_paged(self, filter: str = '(objectClass=*)', base: str = '', scope: str = 'sub', attr: list[str] = [], required: bool = False, timeout: int = -1, sizelimit: int = 0, serverctrls: list[ldap.controls.LDAPControl] | None = None, page_size: int = 1000) -> Iterator[tuple[str, dict[str, list[bytes]]]]:
+        """
+        Perform LDAP search using the Simple Paged Results control and yield the values page by page.
+        Only one page of entries is held in memory at any time, also for searches with a `sizelimit`:
+        the limit is enforced while iterating, so entries may have been yielded before :py:exc:`ldap.SIZELIMIT_EXCEEDED` is raised.
+
+        :param str filter: LDAP search filter.
+        :param str base: the starting point for the search.
+        :param str scope: Specify the scope of the search to be one of `base`, `base+one`, `one`, `sub`, or `domain` to specify a base object, base plus one-level, one-level, subtree, or children search.
+        :param attr: The list of attributes to fetch.
+        :type attr: list[str]
+        :param bool required: Raise an exception if no object matches.
+        :param int timeout: wait at most timeout seconds for each page to complete. `-1` for no limit.
+        :param int sizelimit: retrieve at most sizelimit entries for a search. `0` for no limit.
+        :param serverctrls: a list of additional :py:class:`ldap.controls.LDAPControl` instances sent to the server along with the LDAP request.
+        :type serverctrls: list[ldap.controls.LDAPControl]
+        :param int page_size: The number of entries to request per page.
+        :returns: An iterator of 2-tuples (dn, values) for each LDAP object, where values is a dictionary mapping attribute names to a list of values.
+        :rtype: Iterator[tuple[str, dict[str, list[bytes]]]]
+        :raises ldap.NO_SUCH_OBJECT: Indicates the target object cannot be found.
+        :raises ldap.SIZELIMIT_EXCEEDED: Indicates that more than `sizelimit` entries match.
+        """
+        log.debug('uldap.search_paged filter=%s base=%s scope=%s attr=%s required=%d timeout=%d sizelimit=%d page_size=%d', filter, base, scope, attr, required, timeout, sizelimit, page_size)
+
+        if not base:
+            base = self.base
+
+        if scope in {'sub', 'domain'}:
+            ldap_scope = ldap.SCOPE_SUBTREE
+        elif scope in {'one', 'base+one'}:
+            ldap_scope = ldap.SCOPE_ONELEVEL
+        else:
+            ldap_scope = ldap.SCOPE_BASE
+
+        found = 0
+        if scope == 'base+one':
+            for entry in self.lo.search_ext_s(base, ldap.SCOPE_BASE, filter, attr, serverctrls=serverctrls, clientctrls=None, timeout=timeout, sizelimit=sizelimit):
+                found += 1
+                yield entry
+
+        # the sizelimit is checked here while iterating, as servers differ in applying it to a single page or the whole search
+        page_ctrl = SimplePagedResultsControl(True, size=min(page_size, sizelimit + 1) if sizelimit else page_size, cookie='')
+        ctrls = [page_ctrl, *(serverctrls or [])]
+        while True:
+            _rtype, res, _rmsgid, resp_ctrls = self.lo.result3(self.lo.search_ext(base, ldap_scope, filter, attr, serverctrls=ctrls, clientctrls=None, timeout=timeout, sizelimit=0))
+            for entry in res:
+                found += 1
+                if sizelimit and found > sizelimit:
+                    raise ldap.SIZELIMIT_EXCEEDED({'desc': 'more than %d objects' % (sizelimit,)})
+                yield entry
+
+            page_ctrl.cookie = next((ctrl.cookie for ctrl in resp_ctrls if ctrl.controlType == SimplePagedResultsControl.controlType), b'')
+            if not page_ctrl.cookie:
+                break
+
+        if required and not found:
+            raise ldap.NO_SUCH_OBJECT({'desc': 'no object'})
+
     def searchDn(self, filter: str = '(objectClass=*)', base: str = '', scope: str = 'sub', unique: bool = False, required: bool = False, timeout: int = -1, sizelimit: int = 0, serverctrls: list[ldap.controls.LDAPControl] | None = None, response: dict[str, ldap.controls.LDAPControl] | None = None) -> list[str]:
         """
         Perform LDAP search and return distinguished names only.
@@ -529,25 +740,79 @@ class access:
 
         merged: dict[str, dict[str, Any]] = {}
         if dn:
-            obj_dn = dn
-            while True:
-                for policy_dn in policies or []:
-                    self._merge_policy(policy_dn, obj_dn, object_classes, merged)
-                dn = self.parentDn(dn) or ''
-                if not dn:
-                    break
-                try:
-                    parent = self.get(dn, attr=['univentionPolicyReference'], required=True)
-                except ldap.NO_SUCH_OBJECT:
-                    break
-                policies = [x.decode('utf-8') for x in parent.get('univentionPolicyReference', [])]
+            ancestors = self._ancestors(dn)
+            # validate all cached containers and policies needed here with one search
+            validated = self._policy_cache.validate(self, [*ancestors, *(policies or []), *self._policy_cache.references(ancestors)])
+            merged = self._resolve_policies(dn, policies, object_classes, ancestors, validated)
 
         univention.debug.debug(
             univention.debug.LDAP, univention.debug.ALL,
             "getPolicies: result: %s" % merged)
         return merged
 
-    def _merge_policy(self, policy_dn: str, obj_dn: str, object_classes: set[bytes], result: dict[str, dict[str, Any]]) -> None:
+    def getPoliciesMany(self, dns: Iterable[str]) -> dict[str, dict[str, dict[str, Any]]]:
+        """
+        Return |UCS| policies for many |LDAP| entries.
+
+        The entries are read and their cached containers and policies are validated with
+        one search per batch, so the containers and policies shared by the entries are
+        only checked once.
+
+        :param dns: The distinguished names of the |LDAP| entries.
+        :returns: A mapping of the distinguished names to the result of :py:meth:`getPolicies`.
+        """
+        dns = list(dns)
+        objects = {}
+        for i in range(0, len(dns), self._policy_cache.batch):
+            ldap_filter = '(|%s)' % ''.join(ldap.filter.filter_format('(entryDN=%s)', [dn]) for dn in dns[i:i + self._policy_cache.batch])
+            objects.update((_PolicyCache.key(dn), attrs) for dn, attrs in self.search(filter=ldap_filter, attr=['univentionPolicyReference', 'objectClass']))
+
+        entries = []
+        needed: dict[str, None] = {}
+        for dn in dns:
+            oattrs = objects.get(_PolicyCache.key(dn), {})
+            policies = [x.decode('utf-8') for x in oattrs.get('univentionPolicyReference', [])]
+            ancestors = self._ancestors(dn)
+            needed.update(dict.fromkeys([*ancestors, *policies]))
+            entries.append((dn, policies, {oc.lower() for oc in oattrs.get('objectClass', [])}, ancestors))
+
+        validated = self._policy_cache.validate(self, [*needed, *self._policy_cache.references(needed)])
+        result = {dn: self._resolve_policies(dn, policies, object_classes, ancestors, validated) for dn, policies, object_classes, ancestors in entries}
+        univention.debug.debug(
+            univention.debug.LDAP, univention.debug.ALL,
+            "getPoliciesMany: result: %s" % result)
+        return result
+
+    def _ancestors(self, dn: str) -> list[str]:
+        """Return the DNs of the containers above an entry up to the root, the nearest first."""
+        ancestors = []
+        while (dn := self.parentDn(dn)):
+            ancestors.append(dn)
+        return ancestors
+
+    def _resolve_policies(self, obj_dn: str, policies: list[str], object_classes: set[bytes], ancestors: list[str], validated: float) -> dict[str, dict[str, Any]]:
+        """
+        Merge the policies of an entry and of its containers.
+
+        :param str obj_dn: Distinguished name of the LDAP object.
+        :param list policies: The policies referenced by the object.
+        :param set object_classes: the set of object classes of the LDAP object.
+        :param list ancestors: The containers of the object, see :py:meth:`_ancestors`.
+        :param float validated: The time the cached entries were validated.
+        :returns: A mapping of policy names to their values.
+        """
+        merged: dict[str, dict[str, Any]] = {}
+        for policy_dn in policies or []:
+            self._merge_policy(policy_dn, obj_dn, object_classes, merged, validated)
+        for parent_dn in ancestors:
+            parent = self._policy_cache.get(self, parent_dn, ['univentionPolicyReference', 'objectClass'], validated)
+            if parent is None:
+                break
+            for policy_dn in parent.get('univentionPolicyReference', []):
+                self._merge_policy(policy_dn.decode('utf-8'), obj_dn, object_classes, merged, validated)
+        return merged
+
+    def _merge_policy(self, policy_dn: str, obj_dn: str, object_classes: set[bytes], result: dict[str, dict[str, Any]], validated: float | None = None) -> None:
         """
         Merge policies into result.
 
@@ -555,8 +820,9 @@ class access:
         :param obj_dn: Distinguished name of the LDAP object.
         :param set object_classes: the set of object classes of the LDAP object.
         :param list result: A mapping, into which the policy is merged.
+        :param float validated: The time the cached policies were validated.
         """
-        pattrs = self.get(policy_dn)
+        pattrs = self._policy_cache.get(self, policy_dn, ['*'], validated)
         if not pattrs:
             return
 
@@ -633,6 +899,7 @@ class access:
         elif not serverctrls:
             serverctrls = []
 
+        self._policy_cache.discard(dn)
         nal: dict[str, Any] = {}
         for i in al:
             key, val = i[0], i[-1]
@@ -748,6 +1015,7 @@ class access:
         :param str dn: The distinguished name of the object to modify.
         :param ml: The modify-list of 3-tuples (attribute-name, old-values, new-values).
         """
+        self._policy_cache.discard(dn)
         try:
             self.lo.modify_ext_s(dn, ml)
         except ldap.REFERRAL as exc:
@@ -770,6 +1038,7 @@ class access:
         if not serverctrls:
             serverctrls = []
 
+        self._policy_cache.discard(dn)
         try:
             _rtype, _rdata, _rmsgid, resp_ctrls = self.lo.modify_ext_s(dn, ml, serverctrls=serverctrls)
         except ldap.REFERRAL as exc:
@@ -830,6 +1099,7 @@ class access:
         if not serverctrls:
             serverctrls = []
 
+        self._policy_cache.clear()  # the DNs of all descendants change, too
         try:
             _rtype, _rdata, _rmsgid, resp_ctrls = self.lo.rename_s(dn, newrdn, newsuperior, serverctrls=serverctrls)
         except ldap.REFERRAL as exc:
@@ -866,6 +1136,7 @@ class access:
 
         if dn:
             log.debug('delete')
+            self._policy_cache.discard(dn)
             try:
                 _rtype, _rdata, _rmsgid, resp_ctrls = self.lo.delete_ext_s(dn, serverctrls=serverctrls)
             except ldap.REFERRAL as exc:
@@ -0,0 +1,196 @@
+#!/usr/bin/python3
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+import re
+
+import ldap
+import pytest
+from univentionunittests import import_module
+
+
+uldap = import_module('uldap', 'modules/', 'univention.uldap', use_installed=False)
+
+BASE = 'dc=example,dc=com'
+USERS = 'cn=users,%s' % BASE
+USER = 'uid=user1,%s' % USERS
+USER2 = 'uid=user2,%s' % USERS
+POLICY = 'cn=pwhistory,cn=policies,%s' % BASE
+
+
+class FakeAccess(uldap.access):
+    """A connection to an in-memory directory, which counts the LDAP requests"""
+
+    def __init__(self, entries, ttl=0, size=1000):
+        self.base = BASE
+        self.reconnect = False
+        self.follow_referral = False
+        self.lo = None
+        self.entries = entries
+        self.gets = []
+        self.searches = []
+        self._policy_cache = uldap._PolicyCache(ttl, size)
+
+    def get(self, dn, attr=[], required=False):
+        self.gets.append(dn)
+        try:
+            entry = self.entries[dn.lower()]
+        except KeyError:
+            if required:
+                raise ldap.NO_SUCH_OBJECT({'desc': 'No such object'})
+            return {}
+        if '*' in attr:
+            return {key: list(value) for key, value in entry.items()}
+        return {key: list(value) for key, value in entry.items() if key in attr}
+
+    def search(self, filter='(objectClass=*)', base='', scope='sub', attr=[], unique=False, required=False, timeout=-1, sizelimit=0, serverctrls=None, response=None):
+        self.searches.append(filter)
+        dns = [dn.lower() for dn in re.findall(r'\(entryDN=([^)]*)\)', filter)]
+        return [(dn, {key: list(value) for key, value in self.entries[dn].items() if key in attr}) for dn in dns if dn in self.entries]
+
+    def change(self, dn, **attrs):
+        entry = self.entries[dn.lower()]
+        entry.update(attrs)
+        entry['entryCSN'] = [entry['entryCSN'][0] + b'1']
+
+
+@pytest.fixture()
+def entries():
+    return {
+        BASE: {'objectClass': [b'domain'], 'entryCSN': [b'1']},
+        USERS: {'objectClass': [b'organizationalRole'], 'univentionPolicyReference': [POLICY.encode('UTF-8')], 'entryCSN': [b'2']},
+        USER: {'objectClass': [b'person'], 'entryCSN': [b'3']},
+        USER2: {'objectClass': [b'person'], 'entryCSN': [b'5']},
+        POLICY.lower(): {'objectClass': [b'top', b'univentionPolicy', b'univentionPolicyPWHistory'], 'univentionPWLength': [b'8'], 'entryCSN': [b'4']},
+    }
+
+
+@pytest.fixture()
+def lo(entries):
+    return FakeAccess(entries)
+
+
+def test_policies(lo):
+    result = lo.getPolicies(USER)
+    assert result['univentionPolicyPWHistory']['univentionPWLength'] == {'policy': POLICY, 'value': [b'8'], 'fixed': False}
+
+
+def test_cached_entries_are_validated_by_one_search(lo):
+    lo.getPolicies(USER)
+    lo.gets.clear()
+    lo.searches.clear()
+
+    lo.getPolicies(USER)
+    assert lo.gets == [USER]
+    assert len(lo.searches) == 1
+
+
+def test_changed_entries_are_fetched_again(lo):
+    lo.getPolicies(USER)
+    lo.change(POLICY, univentionPWLength=[b'12'])
+    lo.gets.clear()
+
+    result = lo.getPolicies(USER)
+    assert result['univentionPolicyPWHistory']['univentionPWLength']['value'] == [b'12']
+    assert lo.gets == [USER, POLICY]
+
+
+def test_removed_references_are_not_used(lo):
+    lo.getPolicies(USER)
+    lo.change(USERS, univentionPolicyReference=[])
+
+    assert lo.getPolicies(USER) == {}
+
+
+@pytest.mark.parametrize('write', [
+    lambda lo: lo.modify_ext_s(POLICY, []),
+    lambda lo: lo.modify_s(POLICY, []),
+    lambda lo: lo.rename_ext_s(POLICY, 'cn=pwhistory2'),
+    lambda lo: lo.delete(POLICY),
+])
+def test_writes_discard_entries(lo, mocker, write):
+    lo.lo = mocker.Mock()
+    lo.lo.modify_ext_s.return_value = lo.lo.rename_s.return_value = lo.lo.delete_ext_s.return_value = (None, None, None, [])
+    mocker.patch.object(uldap, 'ucr', mocker.Mock(is_true=mocker.Mock(return_value=False)))
+    lo.getPolicies(USER)
+    assert uldap._PolicyCache.key(POLICY) in lo._policy_cache._entries
+
+    write(lo)
+    assert uldap._PolicyCache.key(POLICY) not in lo._policy_cache._entries
+
+
+def test_ttl(entries, mocker):
+    now = mocker.patch.object(uldap.time, 'monotonic', return_value=100.0)
+    lo = FakeAccess(entries, ttl=10)
+    lo.getPolicies(USER)
+    lo.change(POLICY, univentionPWLength=[b'12'])
+    lo.searches.clear()
+
+    now.return_value = 105.0
+    result = lo.getPolicies(USER)
+    assert result['univentionPolicyPWHistory']['univentionPWLength']['value'] == [b'8']
+    assert lo.searches == []
+
+    now.return_value = 111.0
+    result = lo.getPolicies(USER)
+    assert result['univentionPolicyPWHistory']['univentionPWLength']['value'] == [b'12']
+    assert len(lo.searches) == 1
+
+
+def test_size(entries):
+    lo = FakeAccess(entries, size=2)
+    lo.getPolicies(USER)
+    assert len(lo._policy_cache._entries) == 2
+
+
+def test_policies_many(lo):
+    expected = {USER: lo.getPolicies(USER), USER2: lo.getPolicies(USER2)}
+    assert lo.getPoliciesMany([USER, USER2]) == expected
+
+
+def test_policies_many_validates_shared_entries_once(lo):
+    lo.getPolicies(USER)
+    lo.gets.clear()
+    lo.searches.clear()
+
+    result = lo.getPoliciesMany([USER, USER2])
+    assert result[USER2]['univentionPolicyPWHistory']['univentionPWLength']['value'] == [b'8']
+    assert lo.gets == []
+    assert len(lo.searches) == 2  # the objects and the validation of the containers and policies
+
+
+def test_policies_many_in_batches(lo, mocker):
+    mocker.patch.object(uldap._PolicyCache, 'batch', 1)
+    lo.getPolicies(USER)
+    lo.searches.clear()
+
+    lo.getPoliciesMany([USER, USER2])
+    assert all(search.count('entryDN=') == 1 for search in lo.searches)
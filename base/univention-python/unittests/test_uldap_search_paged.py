@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+
+import ldap
+import pytest
+from univentionunittests import import_module
+
+
+uldap = import_module('uldap', 'modules/', 'univention.uldap', use_installed=False)
+
+BASE = 'dc=example,dc=com'
+ENTRIES = [('uid=user%d,%s' % (i, BASE), {'uid': [b'user%d' % (i,)]}) for i in range(5)]
+
+
+class FakeLDAPObject:
+    """A server, which returns the entries in pages of the requested size"""
+
+    def __init__(self):
+        self.requests = []
+
+    def search_ext(self, base, scope, filter, attr, serverctrls=None, clientctrls=None, timeout=-1, sizelimit=0):
+        page_ctrl = serverctrls[0]
+        self.requests.append(sizelimit)
+        return (int(page_ctrl.cookie or 0), page_ctrl.size)
+
+    def result3(self, msgid):
+        start, size = msgid
+        cookie = str(start + size).encode('ASCII') if start + size < len(ENTRIES) else b''
+        return (ldap.RES_SEARCH_RESULT, ENTRIES[start:start + size], msgid, [uldap.SimplePagedResultsControl(True, size=size, cookie=cookie)])
+
+
+@pytest.fixture()
+def lo():
+    access = uldap.access.__new__(uldap.access)
+    access.base = BASE
+    access.lo = FakeLDAPObject()
+    return access
+
+
+@pytest.mark.parametrize('sizelimit', [0, 5, 10])
+def test_pages(lo, sizelimit):
+    assert list(lo.search_paged(base=BASE, sizelimit=sizelimit, page_size=2)) == ENTRIES
+    assert lo.lo.requests == [0, 0, 0]
+
+
+def test_sizelimit_is_enforced_while_iterating(lo):
+    result = lo.search_paged(base=BASE, sizelimit=3, page_size=2)
+    assert [next(result) for _ in range(3)] == ENTRIES[:3]
+    with pytest.raises(ldap.SIZELIMIT_EXCEEDED):
+        next(result)
+    assert lo.lo.requests == [0, 0]
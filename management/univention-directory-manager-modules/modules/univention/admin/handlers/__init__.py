@@ -47,7 +47,7 @@ import inspect
 import re
 import sys
 import time
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network
 from logging import getLogger
 from typing import TYPE_CHECKING, Any, Self, overload
@@ -1865,6 +1865,55 @@ class simpleLdap:
             raise univention.admin.uexceptions.noObject('lookup(base=%r, filter_s=%r)' % (base, filter_e))
         return result
 
+    @classmethod
+    def ilookup(
+        cls,
+        co: None,
+        lo: univention.admin.uldap.access,
+        filter_s: str,
+        base: str = '',
+        superordinate: Self | None = None,
+        scope: str = 'sub',
+        required: bool = False,
+        timeout: int = -1,
+        sizelimit: int = 0,
+        serverctrls: list | None = None,
+        page_size: int = 1000,
+    ) -> Iterator[Self]:
+        """
+        Perform a paged LDAP search and lazily yield instances.
+        In contrast to :py:meth:`lookup` only one page of LDAP entries is held in memory at once.
+
+        :param co: obsolete config
+        :param lo: UDM LDAP access object.
+        :param filter_s: LDAP filter string.
+        :param base: LDAP search base distinguished name.
+        :param superordinate: Distinguished name of a superordinate object.
+        :param scope: Specify the scope of the search to be one of `base`, `base+one`, `one`, `sub`, or `domain` to specify a base object, base plus one-level, one-level, subtree, or children search.
+        :param required: Raise an exception if no object matches.
+        :param timeout: wait at most `timeout` seconds for each page to complete. `-1` for no limit.
+        :param sizelimit: retrieve at most `sizelimit` entries for a search. `0` for no limit.
+        :param serverctrls: a list of additional :py:class:`ldap.controls.LDAPControl` instances sent to the server along with the LDAP request.
+        :param page_size: The number of LDAP entries to request per page.
+        :return: An iterator of UDM objects.
+        """
+        filter_e = cls.lookup_filter(filter_s, lo)
+        if superordinate:
+            filter_e = cls.lookup_filter_superordinate(filter_e, superordinate)
+        filter_str = str(filter_e or '')
+        attr = cls._ldap_attributes()
+        found = False
+        for dn, attrs in lo.search_paged(filter_str, base or cls.ldap_base, scope, attr, False, timeout, sizelimit, serverctrls=serverctrls, page_size=page_size):
+            try:
+                obj = cls(co, lo, None, dn=dn, superordinate=superordinate, attributes=attrs)
+            except univention.admin.uexceptions.base as exc:
+                log.error('ilookup() of object %r failed: %s', dn, exc)
+                continue
+            found = True
+            yield obj
+        if required and not found:
+            raise univention.admin.uexceptions.noObject('ilookup(base=%r, filter_s=%r)' % (base, filter_e))
+
     @classmethod
     def lookup_filter(cls, filter_s: str | None = None, lo: univention.admin.uldap.access | None = None) -> univention.admin.filter.conjunction:
         """
@@ -1961,9 +2010,20 @@ class simpleLdap:
     @classmethod
     def identify(cls, dn: str, attr: _Attributes, canonical: bool = False) -> bool:
         ocs = {x.decode('utf-8') for x in attr.get('objectClass', [])}
-        required_object_classes = univention.admin.modules.options(cls.module).get('default', univention.admin.option()).objectClasses - {'top', 'univentionPolicy', 'univentionObjectMetadata', 'person'}
+        required_object_classes = cls.identify_object_classes()
         return (ocs & required_object_classes) == required_object_classes
 
+    @classmethod
+    def identify_object_classes(cls, options: dict[str, univention.admin.option] | None = None) -> set[str]:
+        """
+        Return the object classes a |LDAP| object must have to be identified by :py:meth:`identify`.
+
+        :param options: The options of the module. Defaults to the options of the registered module.
+        """
+        if options is None:
+            options = univention.admin.modules.options(cls.module)
+        return options.get('default', univention.admin.option()).objectClasses - {'top', 'univentionPolicy', 'univentionObjectMetadata', 'person'}
+
     _static_ldap_attributes: set[str] = set()
 
     @classmethod
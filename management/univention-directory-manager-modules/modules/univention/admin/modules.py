@@ -36,8 +36,12 @@ from __future__ import annotations
 
 import copy
 import importlib
+import json
 import locale
 import os
+import tempfile
+import time
+from collections import OrderedDict
 from importlib import reload as reload_module
 from logging import getLogger
 from typing import TYPE_CHECKING, Any, Protocol, overload
@@ -55,6 +59,8 @@ from univention.admin.layout import Group, ILayoutElement, Tab
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from univention.admin.handlers import _Attributes, simpleLdap
 
 
@@ -104,8 +110,46 @@ log = getLogger('ADMIN')
 translation = localization.translation('univention/admin')
 _ = translation.translate
 
+MODULE_INDEX = '/var/cache/univention-directory-manager-modules/modules.json'
+"""File caching the meta data of all |UDM| handler modules."""
+_MODULE_INDEX_VERSION = 2
+"""Version of the format of :py:data:`MODULE_INDEX`, indexes of other versions are rebuilt."""
+
+
+class _LazyModules(dict):
+    """Mapping from module name to Python module, which imports the |UDM| handler modules on first access."""
+
+    def __init__(self, packages: dict[str, str]) -> None:
+        super().__init__(dict.fromkeys(packages))
+        self._packages = packages
+
+    def __getitem__(self, name: str) -> UdmModule:
+        module = super().__getitem__(name)
+        if module is None:
+            module = _import_handler(self._packages[name])
+            super().__setitem__(name, module)
+        return module
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in self:
+            return default
+        return self[name]
+
+    def values(self) -> list[UdmModule]:  # type: ignore[override]
+        return [self[name] for name in self]
+
+    def items(self) -> list[tuple[str, UdmModule]]:  # type: ignore[override]
+        return [(name, self[name]) for name in self]
+
+
 modules: dict[str, UdmModule] = {}
 """Mapping from module name to Python module."""
+_index: dict[str, dict[str, Any]] = {}
+"""Mapping from module name to the meta data of the module."""
+_identify_index: dict[str, list[tuple[frozenset[str], str]]] = {}
+"""Mapping from an object class to the required object classes and names of the modules identifying objects with them."""
+_identify_always: set[str] = set()
+"""Names of the modules identifying all objects."""
 _superordinates: set[str] = set()
 """List of all module names (strings) that are _superordinates."""
 containers: list[UdmModule] = []
@@ -120,44 +164,149 @@ def _ldap_operational_attribute_names(lo: univention.admin.uldap.access) -> set[
 
 
 def update() -> None:
-    """Scan file system and update internal list of |UDM| handler modules."""
-    global modules, _superordinates
-    _modules: dict[str, UdmModule] = {}
-    superordinates: set[str] = set()
+    """
+    Scan file system and update internal list of |UDM| handler modules.
+
+    The meta data of the handler modules is cached in :py:data:`MODULE_INDEX` until a handler directory changes.
+    The handler modules themselves are only imported on first use.
+    """
+    global modules, _index, _superordinates
 
     # since last update(), syntax.d and hooks.d may have changed (Bug #31154)
     univention.admin.syntax.import_syntax_files()
     univention.admin.hook.import_hook_files()
 
-    def _walk(root: str, dir: str, files: list[str]) -> None:
-        for file in files:
-            if not file.endswith('.py') or file.startswith('__'):
-                continue
-            package = os.path.join(dir, file)[len(root) + 1:-len('.py')]
-            log.debug('admin.modules.update: importing "%s"', package)
-            modulepackage = '.'.join(package.split(os.path.sep))
-            m: Any = importlib.import_module('univention.admin.handlers.%s' % (modulepackage,))
-            m.initialized = False
-            if not hasattr(m, 'module'):
-                log.error('admin.modules.update: attribute "module" is missing in module %r', modulepackage)
-                continue
-            _modules[m.module] = m
-            if isContainer(m):
-                containers.append(m)
+    directories = _handler_directories()
+    index = _load_index(directories)
+    if index is None:
+        index = _build_index()
+        _save_index(directories, index)
 
-            superordinates.update(superordinate_names(m))
-
-    for root in univention.admin.handlers.__path__:  # type: ignore
-        for w_root, _w_dirs, w_files in os.walk(root):
-            _walk(root, w_root, w_files)
-    modules = _modules
-    _superordinates = superordinates
+    _index = index
+    modules = _LazyModules({name: entry['package'] for name, entry in index.items()})
+    _superordinates = {name for entry in index.values() for name in entry['superordinates']}
+    _update_identify_index()
+    containers[:] = [modules[name] for name in index if name.startswith('container/')]
+    _definitions.expire()
 
     # since last update(), syntax.d may have new choices
     # put here as one syntax wants to provide all modules
     univention.admin.syntax.update_choices()
 
 
+def _import_handler(package: str) -> UdmModule:
+    log.debug('admin.modules.update: importing "%s"', package)
+    m: Any = importlib.import_module('univention.admin.handlers.%s' % (package,))
+    m.initialized = False
+    return m
+
+
+def _handler_directories() -> dict[str, int]:
+    """Return the modification times of all directories containing |UDM| handler modules."""
+    return {
+        w_root: os.stat(w_root).st_mtime_ns
+        for root in univention.admin.handlers.__path__  # type: ignore
+        for w_root, _w_dirs, _w_files in os.walk(root)
+        if os.path.basename(w_root) != '__pycache__'
+    }
+
+
+def _build_index() -> dict[str, dict[str, Any]]:
+    """Import all |UDM| handler modules and collect their meta data."""
+    index: dict[str, dict[str, Any]] = {}
+    for root in univention.admin.handlers.__path__:  # type: ignore
+        for w_root, _w_dirs, w_files in os.walk(root):
+            for file in w_files:
+                if not file.endswith('.py') or file.startswith('__'):
+                    continue
+                package = '.'.join(os.path.join(w_root, file)[len(root) + 1:-len('.py')].split(os.path.sep))
+                m = _import_handler(package)
+                if not hasattr(m, 'module'):
+                    log.error('admin.modules.update: attribute "module" is missing in module %r', package)
+                    continue
+                index[m.module] = {
+                    'package': package,
+                    'superordinates': superordinate_names(m),
+                    'childs': bool(getattr(m, 'childs', False)),
+                    'object_classes': _identify_object_classes(m),
+                }
+    return index
+
+
+def _identify_object_classes(module: UdmModule) -> list[str] | None:
+    """
+    Return the object classes required by the generic :py:meth:`univention.admin.handlers.simpleLdap.identify`.
+
+    The options are taken from the module itself, as it is not yet registered in :py:data:`modules` while the index is built.
+
+    :returns: the sorted list of object classes or `None` if the module implements its own `identify()`.
+    """
+    if getattr(getattr(module, 'identify', None), '__func__', None) is not univention.admin.handlers.simpleLdap.identify.__func__:
+        return None
+    return sorted(module.identify.__self__.identify_object_classes(getattr(module, 'options', {})))
+
+
+def _update_identify_index() -> None:
+    """Rebuild the inverted index from object classes to the modules identifying objects with them."""
+    global _identify_index, _identify_always
+    identify_index: dict[str, list[tuple[frozenset[str], str]]] = {}
+    identify_always: set[str] = set()
+    for name, entry in _index.items():
+        if entry['object_classes'] is None:
+            continue
+        required = frozenset(entry['object_classes'])
+        if required:
+            # one object class is enough, as all of them must be present
+            identify_index.setdefault(min(required), []).append((required, name))
+        else:
+            identify_always.add(name)
+    _identify_index = identify_index
+    _identify_always = identify_always
+
+
+def _identified(object_classes: set[str]) -> set[str]:
+    """
+    Return the names of the modules with a generic `identify()`, which identify objects with the given object classes.
+
+    :param object_classes: The object classes of the |LDAP| object.
+    """
+    result = set(_identify_always)
+    for oc in object_classes:
+        for required, name in _identify_index.get(oc, ()):
+            if required <= object_classes:
+                result.add(name)
+    return result
+
+
+def _load_index(directories: dict[str, int]) -> dict[str, dict[str, Any]] | None:
+    try:
+        with open(MODULE_INDEX) as fd:
+            cache = json.load(fd)
+    except (OSError, ValueError):
+        return None
+    if cache.get('version') != _MODULE_INDEX_VERSION or cache.get('directories') != directories:
+        log.debug('admin.modules.update: outdated module index %s', MODULE_INDEX)
+        return None
+    return cache.get('modules')
+
+
+def _save_index(directories: dict[str, int], index: dict[str, dict[str, Any]]) -> None:
+    dirname = os.path.dirname(MODULE_INDEX)
+    try:
+        fd, tmp = tempfile.mkstemp(dir=dirname, prefix='.modules.')
+    except OSError as exc:
+        log.debug('admin.modules.update: cannot write module index: %s', exc)
+        return
+    try:
+        with os.fdopen(fd, 'w') as stream:
+            json.dump({'version': _MODULE_INDEX_VERSION, 'directories': directories, 'modules': index}, stream)
+        os.chmod(tmp, 0o644)
+        os.rename(tmp, MODULE_INDEX)
+    except OSError as exc:
+        log.debug('admin.modules.update: cannot write module index: %s', exc)
+        os.unlink(tmp)
+
+
 @overload
 def get(module: UdmModule) -> UdmModule:
     pass
@@ -238,6 +387,7 @@ def init(lo: univention.admin.uldap.access, position: univention.admin.uldap.pos
 
     # add new properties, only for modules in default ldap base
     if lo.compare_dn(configRegistry['ldap/base'].lower(), getattr(module.object, 'ldap_base', configRegistry['ldap/base']).lower()):
+        _definitions.validate(lo, position)
         update_extended_options(lo, module, position)
         update_extended_attributes(lo, module, position)
 
@@ -268,6 +418,78 @@ def init(lo: univention.admin.uldap.access, position: univention.admin.uldap.pos
     module.initialized = True
 
 
+class _DefinitionCache:
+    """
+    Cache of the searches for extended attributes and extended options.
+
+    The searches are shared by all module initializations of the process.
+    All results are discarded as soon as the number or the highest `entryCSN` of the definitions below the
+    domain configuration container change. This is checked at most once every `ttl` seconds and again
+    after each :py:func:`update`. The results of the least recently used connections are dropped
+    when more than `size` bind DNs and bases are cached.
+
+    :param size: The maximum number of cached bind DNs and bases.
+    :param ttl: The number of seconds after which the definitions are checked for changes again.
+    """
+
+    FILTER = '(|(objectClass=univentionUDMProperty)(objectClass=univentionUDMOption))'
+
+    def __init__(self, size: int = 32, ttl: int = 10) -> None:
+        self.size = size
+        self.ttl = ttl
+        self._cache: OrderedDict[tuple[str | None, str], tuple[tuple[int, bytes], dict[tuple[str, str], Any], float]] = OrderedDict()
+
+    def validate(self, lo: univention.admin.uldap.access, position: univention.admin.uldap.position) -> None:
+        """
+        Check the definitions for changes with a single search only requesting their `entryCSN`.
+        Nothing is searched while the last check is not expired.
+
+        :param lo: |LDAP| connection.
+        :param position: |UDM| position instance.
+        """
+        key = (lo.binddn, position.getBase())
+        now = time.time()
+        cached = self._cache.get(key)
+        if cached is None or cached[2] < now:
+            csns = [attrs.get('entryCSN', [b''])[0] for _dn, attrs in lo.search(filter=self.FILTER, base=position.getDomainConfigBase(), attr=['entryCSN'])]
+            generation = (len(csns), max(csns, default=b''))
+            if cached is None or cached[0] != generation:
+                log.debug('modules: extended attribute definitions changed')
+                cached = (generation, {}, 0)
+            self._cache[key] = (generation, cached[1], now + self.ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+    def expire(self) -> None:
+        """Check the definitions for changes on the next :py:meth:`validate` of each connection."""
+        for key, (generation, results, _expire) in self._cache.items():
+            self._cache[key] = (generation, results, 0)
+
+    def search(self, lo: univention.admin.uldap.access, position: univention.admin.uldap.position, filter: str, base: str) -> Any:
+        """
+        Return the cached search result, which is valid since the last call of :py:meth:`validate`.
+
+        :param lo: |LDAP| connection.
+        :param position: |UDM| position instance.
+        :param filter: |LDAP| filter.
+        :param base: |LDAP| base below the domain configuration container.
+        """
+        cached = self._cache.get((lo.binddn, position.getBase()))
+        if cached is None:
+            return lo.search(filter=filter, base=base)
+        results = cached[1]
+        key = (filter, base)
+        try:
+            return results[key]
+        except KeyError:
+            result = results[key] = lo.search(filter=filter, base=base)
+            return result
+
+
+_definitions = _DefinitionCache()
+
+
 def update_extended_options(lo: univention.admin.uldap.access, module: UdmModule, position: univention.admin.uldap.position) -> None:
     """Overwrite options defined via |LDAP|."""
     # get current language
@@ -280,7 +502,7 @@ def update_extended_options(lo: univention.admin.uldap.access, module: UdmModule
 
     # append UDM extended options
     new_options = copy.copy(module.options) if hasattr(module, 'options') else {}
-    for _dn, attrs in lo.search(base=position.getDomainConfigBase(), filter='(&(objectClass=univentionUDMOption)%s)' % (module_filter,)):
+    for _dn, attrs in _definitions.search(lo, position, base=position.getDomainConfigBase(), filter='(&(objectClass=univentionUDMOption)%s)' % (module_filter,)):
         oname = attrs['cn'][0].decode('UTF-8', 'replace')
         shortdesc = _get_translation(lang, attrs, 'univentionUDMOptionTranslationShortDescription;entry-%s', 'univentionUDMOptionShortDescription')
         longdesc = _get_translation(lang, attrs, 'univentionUDMOptionTranslationLongDescription;entry-%s', 'univentionUDMOptionLongDescription')
@@ -298,6 +520,13 @@ def update_extended_options(lo: univention.admin.uldap.access, module: UdmModule
             is_app_option=is_app_option)
     module.options = new_options
 
+    entry = _index.get(name(module))
+    if entry is not None:
+        object_classes = _identify_object_classes(module)
+        if object_classes != entry['object_classes']:
+            entry['object_classes'] = object_classes
+            _update_identify_index()
+
 
 class EA_Layout(dict):
     """Extended attribute layout."""
@@ -375,7 +604,7 @@ def update_extended_attributes(lo: univention.admin.uldap.access, module: UdmMod
         module_filter = '(|(univentionUDMPropertyModule=users/user)%s)' % (module_filter,)
 
     new_property_descriptions = copy.copy(module.property_descriptions)
-    for _dn, attrs in lo.search(base=position.getDomainConfigBase(), filter='(&(objectClass=univentionUDMProperty)%s(univentionUDMPropertyVersion=2))' % (module_filter,)):
+    for _dn, attrs in _definitions.search(lo, position, base=position.getDomainConfigBase(), filter='(&(objectClass=univentionUDMProperty)%s(univentionUDMPropertyVersion=2))' % (module_filter,)):
         # get CLI name
         pname = attrs['univentionUDMPropertyCLIName'][0].decode('UTF-8', 'replace')
         object_class = attrs.get('univentionUDMPropertyObjectClass', [])[0].decode('UTF-8', 'replace')
@@ -658,14 +887,19 @@ def identify(dn: str, attr: dict[str, list[Any]], module_name: str = '', canonic
         modules.get(mt.decode('ASCII', 'replace')) for mt in attr.get('univentionObjectType', [])
     ) if m]
     if not res:
-        for name, module in modules.items():
+        identified = _identified({oc.decode('utf-8') for oc in attr.get('objectClass', [])})
+        for name in modules:
             if module_base is not None and not name.startswith(module_base):
                 continue
+            indexed = name in _index and _index[name]['object_classes'] is not None
+            if indexed and name not in identified:
+                continue  # avoid importing modules, which cannot handle the object anyway
+            module = modules[name]
             if not hasattr(module, 'identify'):
                 log.debug('module %s does not provide identify', module)
                 continue
 
-            if (not module_name or module_name == module.module) and module.identify(dn, attr):
+            if (not module_name or module_name == module.module) and (indexed or module.identify(dn, attr)):
                 res.append(module)
     if not res:
         log.debug('object could not be identified')
@@ -746,7 +980,14 @@ def subordinates(module: UdmName) -> list[UdmModule]:
     :param module: ???
     :returns: list of |UDM| handler modules.
     """
-    return [mod for mod in modules.values() if name(module) in superordinate_names(mod) and not isContainer(mod)]
+    module_name = name(module)
+    result = []
+    for mod in modules:
+        if mod.startswith('container/'):
+            continue
+        if module_name in (_index[mod]['superordinates'] if mod in _index else superordinate_names(modules[mod])):
+            result.append(modules[mod])
+    return result
 
 
 def find_superordinate(dn: str, co: None, lo: univention.admin.uldap.access) -> UdmModule | None:
@@ -887,6 +1128,8 @@ def childs(module_name: UdmName) -> bool:
     :param module_name: the name of the |UDM| module, e.g. `users/user`.
     :returns: `True` if the module has children, `False` otherwise.
     """
+    if isinstance(module_name, str) and module_name in _index:
+        return _index[module_name]['childs']
     module = get(module_name)
     return getattr(module, 'childs', False)
 
@@ -918,6 +1161,45 @@ def lookup(module_name: UdmName, co: None, lo: univention.admin.uldap.access, fi
     return [item for item in tmpres if item]
 
 
+def _provides_ilookup(module: UdmModule, obj: type | None) -> bool:
+    """
+    Check if the `lookup()` of the module is implemented by a class, which also implements a matching `ilookup()`.
+
+    :param module: A |UDM| handler module.
+    :param obj: The object class of the module.
+    """
+    if not isinstance(obj, type) or getattr(obj, 'lookup', None) != module.lookup:
+        return False
+    implementor = next(klass for klass in obj.__mro__ if 'lookup' in vars(klass))
+    return 'ilookup' in vars(implementor)
+
+
+def ilookup(module_name: UdmName, co: None, lo: univention.admin.uldap.access, filter: str = '', base: str = '', superordinate: Any = None, scope: str = 'base+one', required: bool = False, timeout: int = -1, sizelimit: int = 0, serverctrls: list | None = None, page_size: int = 1000) -> Iterator[Any]:
+    """
+    Lazily yield objects of module that match the given criteria.
+
+    The LDAP search is done page by page, so memory usage is independent of the number of objects.
+    Modules with their own `lookup()` implementation fall back to :py:func:`lookup`.
+
+    :param module_name: the name of the |UDM| module, e.g. `users/user`.
+    """
+    module = get(module_name)
+    if not hasattr(module, 'lookup'):
+        return
+
+    obj = getattr(module, 'object', None)
+    if _provides_ilookup(module, obj):
+        tmpres = obj.ilookup(co, lo, filter, base=base, superordinate=superordinate, scope=scope, required=required, timeout=timeout, sizelimit=sizelimit, serverctrls=serverctrls, page_size=page_size)
+    else:
+        kwargs = {'serverctrls': serverctrls} if serverctrls else {}
+        tmpres = iter(module.lookup(co, lo, filter, base=base, superordinate=superordinate, scope=scope, required=required, timeout=timeout, sizelimit=sizelimit, **kwargs))
+
+    # check for 'None' items just in case...
+    for item in tmpres:
+        if item:
+            yield item
+
+
 def isSuperordinate(module: UdmName) -> bool:
     """
     Check if the module is a |UDM| superordinate module.
@@ -3869,6 +3869,32 @@ class _CachedLdap(combobox, metaclass=_ClassChoices):
         del cls._cached_choices[:]
 
 
+class _LazyChoices(metaclass=_ClassChoices):
+    """Mix-in to compute `choices` on first access, as it requires importing |UDM| handler modules."""
+
+    _cached_choices = None  # type: list[tuple[str, str]] | None
+
+    @property
+    def choices(self):
+        return self._auto_choices()
+
+    @classmethod
+    def _auto_choices(cls):
+        # type: () -> list[tuple[str, str]]
+        if cls._cached_choices is None:
+            cls._cached_choices = cls._compute_choices()
+        return cls._cached_choices
+
+    @classmethod
+    def _compute_choices(cls):
+        # type: () -> list[tuple[str, str]]
+        raise NotImplementedError()
+
+    @classmethod
+    def update_choices(cls):
+        cls._cached_choices = None
+
+
 class ldapObjectClass(_CachedLdap):
     """Syntax to enter a |LDAP| objectClass name."""
 
@@ -5640,7 +5666,7 @@ class nfssync(select):
     ]
 
 
-class univentionAdminModules(select):
+class univentionAdminModules(_LazyChoices, select):
     """
     Syntax for selecting an |UDM| module.
 
@@ -5654,7 +5680,7 @@ class univentionAdminModules(select):
     """
 
     # we need a fallback
-    choices = [
+    _fallback_choices = [
         ('computers/domaincontroller_backup', 'Computer: Backup Directory Node'),
         ('computers/domaincontroller_master', 'Computer: Primary Directory Node'),
         ('computers/domaincontroller_slave', 'Computer: Replica Directory Node'),
@@ -5758,9 +5784,11 @@ class univentionAdminModules(select):
         raise univention.admin.uexceptions.valueInvalidSyntax(_('"%s" is not a Univention Admin Module.') % text)
 
     @classmethod
-    def update_choices(cls):
+    def _compute_choices(cls):
         """Update internal list of |UDM| modules in :py:class:`univentionAdminModules`."""
-        cls.choices = cls.sort_choices((
+        if not univention.admin.modules.modules:
+            return cls._fallback_choices
+        return cls.sort_choices((
             (name, univention.admin.modules.short_description(mod))
             for name, mod in univention.admin.modules.modules.items()
             if not univention.admin.modules.virtual(mod)
@@ -5805,29 +5833,30 @@ class timeSpec(select):
     choices = [('', _('No Reboot')), ('now', _('Immediately')), *_times]
 
 
-class optionsUsersUser(select):
+class optionsUsersUser(_LazyChoices, select):
     """Syntax to select options for |UDM| module :py:class:`univention.admin.handlers.users.user`."""
 
-    choices = [('pki', _('Public key infrastructure account'))]
+    _fallback_choices = [('pki', _('Public key infrastructure account'))]
 
     @classmethod
-    def update_choices(cls):
+    def _compute_choices(cls):
         users = univention.admin.modules.get('users/user')
-        if users:
-            cls.choices = [(key, x.short_description) for key, x in users.options.items() if key != 'default']
+        if not users:
+            return cls._fallback_choices
+        return [(key, x.short_description) for key, x in users.options.items() if key != 'default']
 
 
 __register_choice_update_function(optionsUsersUser.update_choices)
 
 
-class allModuleOptions(combobox):
+class allModuleOptions(_LazyChoices, combobox):
     """Syntax to select options for |UDM| modules."""
 
     depends = 'module'
 
     @classmethod
-    def update_choices(cls):
-        cls.choices = cls.get_choices(None, {'dependencies': {cls.depends: list(univention.admin.modules.modules)}})
+    def _compute_choices(cls):
+        return cls.get_choices(None, {'dependencies': {cls.depends: list(univention.admin.modules.modules)}})
 
     @classmethod
     def get_choices(cls, lo, options):
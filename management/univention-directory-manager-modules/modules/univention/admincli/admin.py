@@ -973,7 +973,7 @@ class CLI:
         print(filter, file=self.stdout)
 
         try:
-            for object in univention.admin.modules.lookup(module, None, lo, scope='sub', superordinate=superordinate, base=position.getDn(), filter=filter):
+            for object in univention.admin.modules.ilookup(module, None, lo, scope='sub', superordinate=superordinate, base=position.getDn(), filter=filter):
                 print('DN: %s' % univention.admin.objects.dn(object), file=self.stdout)
                 if not univention.admin.modules.virtual(module_name):
                     object.open()
@@ -62,6 +62,7 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import json
 from typing import TYPE_CHECKING, Any
 
 import aiohttp
@@ -69,7 +70,7 @@ import uritemplate
 
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+    from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
 
 try:
     aiter  # noqa: B018
@@ -391,6 +392,30 @@ class UDM(Client):
         obj = await mod.get(dn)
         return obj
 
+    async def batch(self, operations: Iterable[dict[str, Any]], parallelism: int | None = None) -> AsyncIterator[dict[str, Any]]:
+        """
+        Create, modify or remove many objects with a single request.
+
+        Each operation is a dictionary with the keys `action` (`create`, `modify` or `remove`), `object_type`, `dn`, `position`,
+        `superordinate`, `options`, `policies` and `properties` and an optional `id`.
+        The results are yielded in the order the operations are finished.
+        """
+        await self.load()
+        assert self.entry is not None
+        uri = self.client.get_relation(self.entry, 'udm:batch')['href']
+        body = ''.join(json.dumps(operation) + '\n' for operation in operations).encode('UTF-8')
+        headers = dict(self.client.default_headers, **{'Content-Type': 'application/x-ndjson', 'Accept': 'application/x-ndjson'})
+        params = {'parallelism': str(parallelism)} if parallelism else None
+        try:
+            async with self.client.session.post(uri, data=body, params=params, headers=headers) as response:
+                if response.status >= 399:
+                    await self.client.eval_response(response)
+                async for line in response.content:
+                    if line.strip():
+                        yield json.loads(line)
+        except aiohttp.ClientConnectionError as exc:  # pragma: no cover
+            raise ConnectionError(exc)
+
     def __repr__(self) -> str:
         return f'UDM(uri={self.uri!r}, username={self.username!r}, password=***)'
 
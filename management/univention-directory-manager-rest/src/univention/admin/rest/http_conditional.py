@@ -59,8 +59,11 @@ def last_modified(date):
 class ConditionalResource:
 
     def set_entity_tags(self, obj, check_conditionals=True, remove_after_check=False):
-        self.set_header('Etag', self.get_etag(obj))
-        modified = self.modified_from_timestamp(obj.oldattr['modifyTimestamp'][0].decode('utf-8', 'replace'))
+        self.set_entity_tags_from_attributes(self.get_etag(obj), obj.oldattr, check_conditionals, remove_after_check)
+
+    def set_entity_tags_from_attributes(self, etag, attrs, check_conditionals=True, remove_after_check=False):
+        self.set_header('Etag', etag)
+        modified = self.modified_from_timestamp(attrs['modifyTimestamp'][0].decode('utf-8', 'replace'))
         if modified:
             self.set_header('Last-Modified', last_modified(modified))
         if check_conditionals:
@@ -73,15 +76,21 @@ class ConditionalResource:
         # generate as early as possible, to not cause side effects e.g. default values in obj.info. It must be the same value for GET and PUT
         if not obj._open:
             raise RuntimeError('Object was not opened!')
+        return self.entity_tag(obj.dn, obj.module, obj.oldattr)
+
+    def entity_tag(self, dn, module, attrs):
         etag = hashlib.sha1()
-        etag.update(obj.dn.encode('utf-8', 'replace'))
-        etag.update(obj.module.encode('utf-8', 'replace'))
-        etag.update(b''.join(obj.oldattr.get('entryCSN', [])))
-        etag.update((obj.entry_uuid or '').encode('utf-8'))
+        etag.update(dn.encode('utf-8', 'replace'))
+        etag.update(module.encode('utf-8', 'replace'))
+        etag.update(b''.join(attrs.get('entryCSN', [])))
+        etag.update(b''.join(attrs.get('entryUUID', [])[:1]))
         # etag.update(json.dumps({k: [v.decode('ISO8859-1', 'replace') for v in val] for k, val in obj.oldattr.items()}, sort_keys=True).encode('utf-8'))
         # etag.update(json.dumps(obj.info, sort_keys=True).encode('utf-8'))
         return '"%s"' % etag.hexdigest()
 
+    def is_conditional_request(self):
+        return any(header in self.request.headers for header in ('If-Match', 'If-None-Match', 'If-Modified-Since', 'If-Unmodified-Since'))
+
     def modified_from_timestamp(self, timestamp):
         modified = time.strptime(timestamp, '%Y%m%d%H%M%SZ')
         # make sure Last-Modified is only send if it is not now
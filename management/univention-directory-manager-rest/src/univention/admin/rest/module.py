@@ -39,6 +39,7 @@ import contextvars
 import copy
 import functools
 import io
+import itertools
 import json
 import logging
 import operator
@@ -56,12 +57,14 @@ import tornado.gen
 import tornado.httpclient
 import tornado.httputil
 import tornado.ioloop
+import tornado.locks
 import tornado.log
 import tornado.web
 from concurrent.futures import ThreadPoolExecutor
 from ldap.controls import SimplePagedResultsControl
 from ldap.controls.readentry import PostReadControl
 from ldap.controls.sss import SSSRequestControl
+from ldap.controls.vlv import VLVRequestControl, VLVResponseControl
 from ldap.dn import explode_rdn
 from ldap.filter import filter_format
 from tornado.concurrent import run_on_executor
@@ -86,6 +89,7 @@ from univention.admin.rest.sanitizer import (
     ObjectPropertySanitizer, PatchRepresentation, PropertiesSanitizer, Query, Sanitizer, SanitizerBase, SearchSanitizer,
     StringSanitizer, ValidationError, sanitize,
 )
+from univention.admin.rest.search_sessions import search_sessions
 from univention.admin.rest.shared_memory import JsonEncoder, shared_memory
 from univention.admin.rest.utils import (
     RE_UUID, NotFound, _get_post_read_entry_uuid, _map_normalized_dn, decode_properties, parse_content_type, quote_dn,
@@ -112,6 +116,10 @@ from univention.password import generate_password, password_config
 _ = Translation('univention-directory-manager-rest').translate
 
 MAX_WORKERS = ucr.get('directory/manager/rest/max-worker-threads', 35)
+BATCH_PARALLELISM = ucr.get_int('directory/manager/rest/batch/parallelism', 4)
+STREAM_CHUNK_SIZE = 100
+_VLV_SUPPORT: dict[str, bool] = {}
+"""Mapping from LDAP URI to the support of Virtual List View and server side sorting."""
 request_id_context = contextvars.ContextVar("request_id")
 
 log = logging.getLogger('MODULE')
@@ -219,8 +227,10 @@ class ResourceBase(SanitizerBase, HAL, HTML):
 
     @property
     def ldap_write_connection(self):
-        auth_type, _username, userdn, password = shared_memory.authenticated[self.request.headers.get('Authorization')]
-        return get_user_ldap_write_connection(auth_type, userdn, password)[0]
+        if not hasattr(self.request, 'ldap_write_connection'):  # cache for the whole request, which eliminates the IPC to the shared memory
+            auth_type, _username, userdn, password = shared_memory.authenticated[self.request.headers.get('Authorization')]
+            self.request.ldap_write_connection = get_user_ldap_write_connection(auth_type, userdn, password)[0]
+        return self.request.ldap_write_connection
 
     def _auth_check_allowed_groups(self):
         if self.request.username in ('cn=admin',):
@@ -245,6 +255,9 @@ class ResourceBase(SanitizerBase, HAL, HTML):
 
     def get_module_object(self, object_type, dn, ldap_connection=None):
         module = self.get_module(object_type, ldap_connection=ldap_connection)
+        return module, self.get_udm_object(module, dn)
+
+    def get_udm_object(self, module, dn):
         try:
             obj = module.get(dn)
         except UDM_Error as exc:
@@ -252,8 +265,8 @@ class ResourceBase(SanitizerBase, HAL, HTML):
                 raise
             obj = None
         if not obj:
-            raise NotFound(object_type, dn)
-        return module, obj
+            raise NotFound(module.name, dn)
+        return obj
 
     def get_object_by_dn(self, dn, ldap_connection=None):
         object_type = get_module(None, dn, self.ldap_connection).module
@@ -290,6 +303,9 @@ class ResourceBase(SanitizerBase, HAL, HTML):
             elif name in ('application/json',):
                 lang = 'json'
                 break
+            elif name in ('application/x-ndjson',):
+                lang = 'ndjson'
+                break
         if not lang:
             raise HTTPError(406, 'The requested Content-Type does not exists. Specify a valid Accept header.')
         if lang == 'html' and not ucr.is_true('directory/manager/rest/html-view-enabled'):
@@ -327,6 +343,8 @@ class ResourceBase(SanitizerBase, HAL, HTML):
     def content_negotiation(self, response):
         self.add_header('Vary', ', '.join(self.vary()))
         lang = self.request.content_negotiation_lang
+        if lang == 'ndjson':  # only object collections are streamed, everything else is a single JSON document
+            lang = 'json'
         formatter = getattr(self, f'{self.request.method.lower()}_{lang}', getattr(self, f'get_{lang}'))
         codec = getattr(self, f'content_negotiation_{lang}')
         self.finish(codec(formatter(response), response))
@@ -581,6 +599,7 @@ class Modules(Resource):
         self.add_link(result, 'udm:license', self.urljoin('license') + '/', name='license', title=_('UCS license'))
         self.add_link(result, 'udm:ldap-base', self.urljoin('ldap/base') + '/', title=_('LDAP base'))
         self.add_link(result, 'udm:relations', self.urljoin('relation') + '/', name='relation', title=_('All link relations'))
+        self.add_link(result, 'udm:batch', self.urljoin('batch'), title=_('Batch operations'))
         self.add_caching(public=True)
         self.content_negotiation(result)
 
@@ -1303,424 +1322,331 @@ class FormBase:
         return superordinate
 
 
-class Objects(ConditionalResource, FormBase, ReportingBase, _OpenAPIBase, Resource):
-    """Search for objects"""
-
-    get_template = 'search_form.html'
-
-    @sanitize
-    async def get(
-        self,
-        object_type: str,
-        position: str = Query(DNSanitizer(required=False, default=None, allow_none=True), description="Position which is used as search base."),
-        ldap_filter: str = Query(
-            LDAPFilterSanitizer(required=False, default="", allow_none=True),
-            alias='filter',
-            description="A LDAP filter which may contain `UDM` property names instead of `LDAP` attribute names.",
-            examples={
-                "any-object": {
-                    "value": "(objectClass=*)",
-                },
-                "admin-user": {
-                    "value": "(|(username=Administrator)(username=Admin*))",
-                },
-            },
-        ),
-        query: dict = Query(
-            DictSanitizer({}, default_sanitizer=LDAPSearchSanitizer(required=False, default='*', add_asterisks=False, use_asterisks=True), key_sanitizer=ObjectPropertySanitizer()),
-            description="The values to search for (propertyname and search filter value). Alternatively with `filter` a raw LDAP filter can be given.",
-            style="deepObject",
-            examples={
-                'nothing': {
-                    'value': None,
-                },
-                'property': {
-                    'value': {'': '*'},
-                },
-            },
-        ),
-        property: str = Query(
-            ObjectPropertySanitizer(required=False, default=None),
-            description="The property to search for if not specified via `query`",
-        ),
-        scope: str = Query(ChoicesSanitizer(choices=['sub', 'one', 'base', 'base+one'], default='sub'), description="The LDAP search scope (sub, base, one)."),
-        hidden: bool = Query(BoolSanitizer(default=True), description="Include hidden/system objects in the response.", example=True),
-        opened: bool = Query(BoolSanitizer(default=True), description="Wheather to open the object in case certain properties are requested.", example=True),
-        properties: list[str] = Query(
-            ListSanitizer(StringSanitizer(), required=False, default=['*'], allow_none=True, min_elements=0),
-            style="form",
-            explode=True,
-            description="The properties which should be returned, if not given all properties are returned.",
-            examples={
-                'no restrictions': {'value': None},
-                'only small subset': {'value': ['username', 'firstname', 'lastname']},
-            },
-        ),
-        superordinate: str | None = Query(
-            DNSanitizer(required=False, default=None, allow_none=True),
-            description="The superordinate DN of the objects to find. `position` is sufficient.",
-            # example=f"cn=superordinate,{ldap_base}"
-        ),
-        dir: str = Query(
-            ChoicesSanitizer(choices=['ASC', 'DESC'], default='ASC'),
-            deprecated=True,
-            description="**Broken/Experimental**: The Sort direction (ASC or DESC).",
-        ),
-        by: str = Query(
-            StringSanitizer(required=False),
-            deprecated=True,
-            description="**Broken/Experimental**: Sort the search result by the specified property.",
-            # example="username",
-        ),
-        page: int = Query(
-            IntegerSanitizer(required=False, default=1, minimum=1),
-            deprecated=True,
-            description="**Broken/Experimental**: The search page, starting at one.",
-            example=1,
-        ),
-        limit: int = Query(
-            IntegerSanitizer(required=False, default=None, allow_none=True, minimum=0),
-            deprecated=True,
-            description="**Broken/Experimental**: How many results should be shown per page.",
-            examples={
-                "no limit": {"value": "", "summary": "get all entries"},
-                "limit to 50": {"value": 50, "summary": "limit to 50 entries"},
-            },
-        ),
-    ):
-        """Search for {module.object_name_plural} objects"""
-        module = self.get_module(object_type)
-        result = self._options(object_type)
+class ObjectModificationBase(FormBase):
+    """Base class for creating, modifying and removing UDM objects"""
 
-        search = bool(self.request.query)
-        properties = properties[:]
-        direction = dir
-        property_ = property
-        reverse = direction == 'DESC'
-        items_per_page = limit
+    async def create(self, object_type, dn=None, representation=None, result=None, module=None, **kwargs):
+        module = module or self.get_module(object_type, ldap_connection=self.ldap_write_connection)
+        if isinstance(representation, list):
+            def get_patch_replacements(field):
+                for path, pname, op, value in representation:
+                    if op != 'replace':
+                        continue
+                    if path == field:
+                        return value
+            container = get_patch_replacements('position')
+            superordinate = get_patch_replacements('superordinate')
+        else:
+            container = representation['position']
+            superordinate = representation['superordinate']
+        if dn:
+            container = self.ldap_write_connection.parentDn(dn)
+            # TODO: validate that properties are equal to rdn
 
-        if not ldap_filter:
-            filters = filter(None, [(module._object_property_filter(attribute or property_ or None, value, hidden)) for attribute, value in query.items()])
-            if filters:
-                ldap_filter = str(univention.admin.filter.conjunction('&', [univention.admin.filter.parse(fil) for fil in filters]))
+        ldap_position = univention.admin.uldap.position(module.ldap_base)
+        if container:
+            ldap_position.setDn(container)
+        elif superordinate:
+            ldap_position.setDn(superordinate)
+        else:
+            ldap_position.setDn(module.get_default_container())
 
-        # TODO: replace the superordinate concept with container
         superordinate = self.superordinate_dn_to_object(module, superordinate)
-        if superordinate:
-            position = position or superordinate.dn
 
-        objects = []
-        if search:  # TODO: check if searching is allowed
-            try:
-                objects, last_page = await self.search(module, position, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, opened)
-            except ObjectDoesNotExist as exc:
-                self.raise_sanitization_error('position', str(exc), type='query')
-            except SuperordinateDoesNotExist as exc:
-                self.raise_sanitization_error('superordinate', str(exc), type='query')
+        obj = module.module.object(None, self.ldap_write_connection, ldap_position, superordinate=superordinate)
+        obj.open()
+        self.set_properties(module, obj, representation, result)
 
-        if opened and properties == ['dn']:  # backwards compatibility with older clients
-            opened = False
-        props = [_prop for _prop in properties if _prop not in ('dn')] if not opened else properties
-        if not opened:
-            properties = ['dn']
+        if dn and not self.ldap_write_connection.compare_dn(dn, obj._ldap_dn()):
+            self.raise_sanitization_error('dn', _('Trying to create an object with wrong RDN.'))
 
-        for obj in objects or []:
-            if obj is None:
-                continue
-            objmodule = UDM_Module(obj.module, ldap_connection=self.ldap_connection, ldap_position=self.ldap_position)
+        dn = await self.pool_submit(self.handle_udm_errors, obj.create, **kwargs)
+        return obj
 
-            entry = Object.get_representation(objmodule, obj, properties, self.ldap_connection, opened=opened)
-            uri = entry['uri'] = self.abspath(obj.module, quote_dn(obj.dn))
-            if not opened and props and props != ['*']:
-                uri = uri + f"?{urlencode({'properties': props}, True)}"
-            self.add_link(entry, 'self', uri, name=entry['dn'], title=entry['id'], dont_set_http_header=True)
-            self.add_resource(result, 'udm:object', entry)
+    async def modify(self, module, obj, representation, result, **kwargs):
+        assert obj._open
+        self.set_properties(module, obj, representation, result)
+        await self.pool_submit(self.handle_udm_errors, obj.modify, **kwargs)
+        return obj
 
-        if items_per_page:
-            self.add_link(result, 'first', self.urljoin('', page='1'), title=_('First page'))
-            if page > 1:
-                self.add_link(result, 'prev', self.urljoin('', page=str(page - 1)), title=_('Previous page'))
-            if not last_page:
-                self.add_link(result, 'next', self.urljoin('', page=str(page + 1)), title=_('Next page'))
-            else:
-                self.add_link(result, 'last', self.urljoin('', page=str(last_page)), title=_('Last page'))
+    def handle_udm_errors(self, action, *args, **kwargs):
+        try:
+            exists_msg = None
+            error = None
+            try:
+                return action(*args, **kwargs)
+            except udm_errors.objectExists as exc:
+                exists_msg = f'dn: {exc.args[0]}'
+                error = exc
+            except udm_errors.uidAlreadyUsed as exc:
+                exists_msg = '(uid)'
+                error = exc
+            except udm_errors.groupNameAlreadyUsed as exc:
+                exists_msg = '(group)'
+                error = exc
+            except udm_errors.dhcpServerAlreadyUsed as exc:
+                exists_msg = '(dhcpserver)'
+                error = exc
+            except udm_errors.macAlreadyUsed as exc:
+                exists_msg = '(mac)'
+                error = exc
+            except udm_errors.noLock as exc:
+                exists_msg = '(nolock)'
+                error = exc
+            if exists_msg and error:
+                self.raise_sanitization_error('dn', _('Object exists: %s: %s') % (exists_msg, str(UDM_Error(error))))
+        except (udm_errors.pwQuality, udm_errors.pwToShort, udm_errors.pwalreadyused) as exc:
+            self.raise_sanitization_error(('properties', 'password'), str(UDM_Error(exc)))
+        except udm_errors.invalidOptions as exc:
+            self.raise_sanitization_error('options', str(UDM_Error(exc)))
+        except udm_errors.insufficientInformation as exc:
+            if exc.missing_properties:
+                self.raise_sanitization_errors([('properties', property_name), _('The property "%(name)s" is required.') % {'name': property_name}] for property_name in exc.missing_properties)
+            self.raise_sanitization_error('dn', str(UDM_Error(exc)))
+        except (udm_errors.invalidOperation, udm_errors.invalidChild) as exc:
+            self.raise_sanitization_error('dn', str(UDM_Error(exc)))  # TODO: invalidOperation and invalidChild should be 403 Forbidden
+        except udm_errors.alreadyUsedInSubtree as exc:
+            self.raise_sanitization_error('position', str(UDM_Error(exc)))
+        except udm_errors.invalidDhcpEntry as exc:
+            self.raise_sanitization_error(('properties', 'dhcpEntryZone'), str(UDM_Error(exc)))
+        except udm_errors.circularGroupDependency as exc:
+            self.raise_sanitization_error(('properties', 'memberOf'), str(UDM_Error(exc)))  # or "nestedGroup"
+        except (udm_errors.valueError) as exc:  # valueInvalidSyntax, valueRequired, etc.
+            self.raise_sanitization_error(('properties', getattr(exc, 'property', 'properties')), str(UDM_Error(exc)))
+        except udm_errors.prohibitedUsername as exc:
+            self.raise_sanitization_error(('properties', 'username'), str(UDM_Error(exc)))
+        except udm_errors.uidNumberAlreadyUsedAsGidNumber as exc:
+            self.raise_sanitization_error(('properties', 'uidNumber'), str(UDM_Error(exc)))
+        except udm_errors.gidNumberAlreadyUsedAsUidNumber as exc:
+            self.raise_sanitization_error(('properties', 'gidNumber'), str(UDM_Error(exc)))
+        except udm_errors.mailAddressUsed as exc:
+            self.raise_sanitization_error(('properties', 'mailPrimaryAddress'), str(UDM_Error(exc)))
+        except (udm_errors.adGroupTypeChangeLocalToAny, udm_errors.adGroupTypeChangeDomainLocalToUniversal, udm_errors.adGroupTypeChangeToLocal, udm_errors.adGroupTypeChangeUniversalToGlobal, udm_errors.adGroupTypeChangeGlobalToUniversal, udm_errors.adGroupTypeChangeDomainLocalToGlobal, udm_errors.adGroupTypeChangeGlobalToDomainLocal) as exc:
+            self.raise_sanitization_error(('properties', 'adGroupType'), str(UDM_Error(exc)))
+        except udm_errors.permissionDenied as exc:
+            raise HTTPError(403, str(exc))
+        except udm_errors.base as exc:
+            UDM_Error(exc).reraise()
 
-        if search:
-            for i, report_type in enumerate(sorted(self.reports_cfg.get_report_names(object_type)), 1):
-                self.add_link(result, 'udm:report', self.urljoin('report', quote(report_type)) + '{?dn}', name=report_type, title=_('Create %s report') % _(report_type), method='POST', templated=True)
-                self.add_button(result, self.urljoin('report', quote(report_type)), 'POST', rel='udm:report', name=report_type, id='report%d' % (i,), label=_('Create %s report') % _(report_type), **{'hx-boost': 'false', 'hx-vals': 'js:{dn: getAllSelectedDNs()}', 'hx-disable': 'true'})
+    def set_properties(self, module, obj, representation, result):
+        if isinstance(representation, list):
+            self.set_patch_properties(module, obj, representation, result)
+            return
 
-            self.add_button(result, self.urljoin('multi-edit'), 'POST', name='multi-edit', id='multi-edit', rel='edit-form', label=_('Modify (multi edit)'), title=_('Modify %s (multi edit)') % (module.object_name_plural,))
-            self.add_button(result, self.urljoin('remove'), 'POST', name='remove', id='remove', rel='udm:object/remove', label=_('Delete'), title=_('Delete %s') % (module.object_name_plural,))
-            self.add_button(result, self.urljoin('move'), 'POST', name='move', id='move', rel='udm:object/move', label=_('Move to'), title=_('Move %s') % (module.object_name_plural,))
+        options = representation['options'] or {}  # TODO: AppAttributes.data_for_module(self.name).items() ?
+        options_enable = {opt for opt, enabled in options.items() if enabled}
+        options_disable = {opt for opt, enabled in options.items() if enabled is False}  # ignore None!
+        obj.options = list(set(obj.options) - options_disable | options_enable)
+        if representation['policies']:
+            obj.policies = functools.reduce(operator.add, representation['policies'].values())
+        try:
+            properties = PropertiesSanitizer(_copy_value=False).sanitize(representation['properties'], module=module, obj=obj)
+        except MultiValidationError as exc:
+            multi_error = exc
+            properties = representation['properties']
+            for prop_name in multi_error.validation_errors:
+                properties.pop(prop_name)
         else:
-            for i, report_type in enumerate(sorted(self.reports_cfg.get_report_names(object_type)), 1):
-                self.add_link(result, 'udm:report', self.urljoin('report', quote(report_type)) + '{?dn}', name=report_type, title=_('Create %s report') % _(report_type), method='POST', templated=True)
+            multi_error = MultiValidationError()
 
-        search_layout = []
-        search_layout_base = [
-            {'label': _('Search for %s') % (module.object_name_plural,), 'description': f'{module.object_name_plural} ({module.description})', 'layout': [
-                ['property', 'query*', ''],
-                {'layout': search_layout, 'description': '', 'label': _('Advanced options'), 'opened': False},
-            ]},
-        ]
-        self.add_layout(result, search_layout_base, 'search')
-        form = self.add_form(result, self.urljoin(''), 'GET', rel='search', id='search', name='search', layout='search')
-        self.add_form_element(form, 'position', position or '', label=_('Search in'), **{'data-dynamic': self.urljoin('default-containers')})
-        search_layout.append(['position', 'hidden'])
-        if superordinate_names(module):
-            self.add_form_element(form, 'superordinate', superordinate.dn if superordinate else '', label=_('Superordinate'))
-            search_layout.append(['superordinate'])
-        searchable_properties = [{'value': '', 'label': _('Defaults')}] + [{'value': prop['id'], 'label': prop['label']} for prop in module.properties(None) if prop.get('searchable')]
-        self.add_form_element(form, 'property', property_ or '', element='select', options=searchable_properties, label=_('Property'), **{'data-size': 'One'})
-        self.add_form_element(form, 'query*', query.get('', '*'), label=_('Search for'), placeholder=_('Search value (e.g. *)'), **{'data-size': 'TwoThird'})
-        self.add_form_element(form, 'scope', scope, element='select', options=[{'value': 'sub'}, {'value': 'one'}, {'value': 'base'}, {'value': 'base+one'}], label=_('Search scope'))
-        self.add_form_element(form, 'hidden', '1', type='checkbox', checked=bool(hidden), label=_('Include hidden objects'))
-        # self.add_form_element(form, 'fields', list(fields))
-        if module.supports_pagination:
-            self.add_form_element(form, 'limit', str(items_per_page or '0'), type='number', label=_('Limit'), **{'data-size': 'OneThird'})
-            self.add_form_element(form, 'page', str(page or '1'), type='number', label=_('Selected page'), **{'data-size': 'OneThird'})
-            self.add_form_element(form, 'by', by or '', element='select', options=searchable_properties, label=_('Sort by'), **{'data-size': 'OneThird'})
-            self.add_form_element(form, 'dir', direction if direction in ('ASC', 'DESC') else 'ASC', element='select', options=[{'value': 'ASC', 'label': _('Ascending')}, {'value': 'DESC', 'label': _('Descending')}], label=_('Direction'), **{'data-size': 'OneThird'})
-            search_layout.append(['page', 'limit', 'by', 'dir'])
-        self.add_form_element(form, '', _('Search'), type='submit', **{'data-size': 'OneThird'})
+        # FIXME: for the automatic IP address assignment, we need to make sure that
+        # the network is set before the IP address (see Bug #24077, comment 6)
+        # The following code is a workaround to make sure that this is the
+        # case, however, this should be fixed correctly.
+        # This workaround has been documented as Bug #25163.
+        def _tmp_cmp(i):
+            if i[0] == 'mac':  # must be set before network, dhcpEntryZone
+                return ("\x00", i[1])
+            if i[0] == 'network':  # must be set before ip, dhcpEntryZone, dnsEntryZoneForward, dnsEntryZoneReverse
+                return ("\x01", i[1])
+            if i[0] in ('ip', 'mac'):  # must be set before dnsEntryZoneReverse, dnsEntryZoneForward
+                return ("\x02", i[1])
+            return i
 
-        if search:
-            result['results'] = len(self.get_resources(result, 'udm:object'))
-        else:
-            self.add_link(result, 'udm:layout', self.urljoin('layout'), title=_('Module layout'))
-            self.add_link(result, 'udm:properties', self.urljoin('properties'), title=_('Module properties'))
-            for policy_module in module.policies:
-                policy_module = policy_module['objectType']
-                self.add_link(result, 'udm:policy-result', self.urljoin(f'{policy_module}/{{?policy,position}}'), name=policy_module, title=_('Evaluate referenced %s policies') % (policy_module,), templated=True)
+        password_properties = module.password_properties
+        for property_name, value in sorted(properties.items(), key=_tmp_cmp):
+            self.set_property(obj, property_name, value, result, multi_error, password_properties)
 
-        self.add_caching(public=False, no_cache=True, no_store=True, max_age=1, must_revalidate=True)
-        self.content_negotiation(result)
+        self.raise_sanitization_multi_error(multi_error)
 
-    async def search(self, module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, opened):
-        ctrls = {}
-        serverctrls = []
-        hashed = (self.request.user_dn, module.name, container or None, ldap_filter or None, superordinate or None, scope or None, hidden or None, items_per_page or None, by or None, reverse or None)
-        session = shared_memory.search_sessions.get(hashed, {})
-        last_cookie = session.get('last_cookie', '')
-        current_page = session.get('page', 0)
-        page_ctrl = SimplePagedResultsControl(True, size=items_per_page, cookie=last_cookie)  # TODO: replace with VirtualListViewRequest
-        if module.supports_pagination:
-            if items_per_page:
-                serverctrls.append(page_ctrl)
-            if by in ('uid', 'uidNumber', 'cn'):
-                rule = ':caseIgnoreOrderingMatch' if by not in ('uidNumber',) else ''
-                serverctrls.append(SSSRequestControl(ordering_rules=['%s%s%s' % ('-' if reverse else '', by, rule)]))
-        objects = []
-        # TODO: we have to store the results of the previous pages (or make them cacheable)
-        # FIXME: we have to store the session across all processes
-        ucr['directory/manager/web/sizelimit'] = ucr.get('ldap/sizelimit', '400000')
-        last_page = page
-        for _i in range(current_page, page or 1):
-            # TODO: if we want to improve performance one day for `opened == False` pass `simple=True`
-            objects = await self.pool_submit(module.search, container, superordinate=superordinate, filter=ldap_filter, scope=scope, hidden=hidden, serverctrls=serverctrls, response=ctrls)
-            for control in ctrls.get('ctrls', []):
-                if control.controlType == SimplePagedResultsControl.controlType:
-                    page_ctrl.cookie = control.cookie
-            if not page_ctrl.cookie:
-                shared_memory.search_sessions.pop(hashed, None)
-                break
+    def set_property(self, obj, property_name, value, result, multi_error, password_properties):
+        if property_name in password_properties:
+            log.debug('Setting password property %s', property_name)
         else:
-            shared_memory.search_sessions[hashed] = {'last_cookie': page_ctrl.cookie, 'page': page}
-            last_page = 0
-        # TODO: move into module.search(opened=True) and then into object.lookup()! because that does error handling.
-        if opened and objects:
-            for obj in objects:
-                obj.open()
-        return (objects, last_page)
+            log.debug('Setting property %s to %r', property_name, value)
 
-    def get_html(self, response):
-        if self.request.method not in ('GET', 'HEAD'):
-            return super().get_html(response)
+        try:
+            try:
+                obj[property_name] = value
+            except KeyError:
+                if property_name != 'objectFlag':
+                    raise
+            except udm_errors.ipOverridesNetwork as exc:
+                self.add_resource(result, 'udm:warning', {'message': '%s' % exc.message})
+                return
+            except udm_errors.valueMayNotChange:
+                if obj[property_name] == value:  # UDM does not check equality before raising the exception
+                    return
+                raise udm_errors.valueMayNotChange()  # the original exception is ugly!
+            except udm_errors.valueRequired:
+                if value is None:
+                    # examples where this happens:
+                    # "password" of users/user: because password is required but on modify() None is send, which must not alter the current password
+                    # "unixhome" of users/user: is required, set to None in the request, the default value is set afterwards in create(). Bug #50053
+                    if property_name in password_properties:
+                        log.debug('Ignore unsetting password property %s', property_name)
+                    else:
+                        current_value = obj.info.pop(property_name, None)
+                        log.debug('Unsetting property %s value %r', property_name, current_value)
+                    return
+                raise
+        except (udm_errors.valueInvalidSyntax, udm_errors.valueError, udm_errors.valueMayNotChange, udm_errors.valueRequired, udm_errors.noProperty) as exc:
+            exc.message = ''
+            try:
+                self.raise_sanitization_error(property_name, _('The property %(name)s has an invalid value: %(details)s') % {'name': property_name, 'details': str(exc)})
+            except ValidationError as exc:
+                multi_error.add_error(exc, property_name)
 
-        r = response.copy()
-        r.pop('entries', None)
-        num_of_entries = r.pop('results', 0)
-        root = super().get_html(r)
+    def set_patch_properties(self, module, obj, patch_document, result):
+        multi_error = MultiValidationError()
+        for path, property_name, op, value in patch_document:
+            if path == 'properties':
+                self.set_patch_property(module, obj, op, property_name, value, result, multi_error)
+            elif path == 'superordinate':
+                if op in ('add', 'replace') or (op == 'remove' and not value):
+                    obj.superordinate = self.superordinate_dn_to_object(module, value)
+                elif op in ('remove',):
+                    if self.ldap_connection.compare_dn(obj.superordinate.dn, value):
+                        obj.superordinate = None
+            elif path == 'options':
+                if op == 'replace':
+                    obj.options = []
+                if op in ('add', 'replace') and value:
+                    obj.options.append(value)
+                if op == 'remove':
+                    if value and value in obj.options:  # TODO: be strict when value not in obj.options?
+                        obj.options.remove(value)
+                    elif not value:
+                        obj.options = []
+            elif path == 'policies':
+                if op == 'replace':
+                    obj.policies = []
+                if op in ('add', 'replace') and value:
+                    obj.policy_reference(value)
+                if op == 'remove':
+                    if value:
+                        obj.policy_dereference(value)
+                    elif not value:
+                        obj.policies = []
 
-        grid = ET.Element('div', **{'class': 'grid'})
-        childs = [child for child in root if child.attrib.get('id') != 'search']
-        root = next(child for child in root if child.attrib.get('id') == 'search')
-        grid_header = ET.SubElement(grid, 'div', **{'class': 'grid-header'})
-        grid_header.extend(childs)
-        root.append(grid)
+        if multi_error.has_errors():  # TODO: use raise_sanitization_multi_error
+            class FalseSanitizer(Sanitizer):
+                def sanitize(self):
+                    raise multi_error
+            self.sanitize_arguments(FalseSanitizer(), _result_func=lambda x: {'body': x}, _fieldname='patch')
 
-        has_four_rows = self.request.decoded_query_arguments.get('property')
-        if not isinstance(has_four_rows, str):
-            has_four_rows = None
-        table = ET.SubElement(grid, 'table')
-        table_header = ET.SubElement(table, 'tr')
-        th1 = ET.SubElement(table_header, 'th', **{'class': 'check'})  # TODO: all-checkbox
-        ET.SubElement(table_header, 'th').text = 'Name'  # TODO: sort-direction switch
-        if has_four_rows:
-            th4 = ET.SubElement(table_header, 'th')
-            th4.text = has_four_rows
-        ET.SubElement(table_header, 'th').text = 'Path'
+    def set_patch_property(self, module, obj, op, property_name, value, result, multi_error):
+        try:
+            prop = module.module.property_descriptions[property_name]
+        except KeyError:
+            if property_name == 'objectFlag':
+                return
+            self.add_resource(result, 'udm:warning', {'message': 'No attribute with name %r in this module, value not set.' % (property_name,)})
+            return
 
-        ET.SubElement(grid_header, 'span').text = f'{{num}} users of {num_of_entries} selected.'
+        value = prop.syntax.parse_command_line(value)
 
-        # There is a bug in chrome, so we cannot have form='report1 report2'. so, only 1 report is possible :-/
-        ET.SubElement(th1, 'input', type='checkbox', name='dn', form=' '.join([report['id'] for report in self.get_resources(response, 'udm:form') if report['rel'] == 'udm:report'][-1:]))
+        current_values = obj[property_name] if prop.multivalue else [obj[property_name]]
+        current_values = list(current_values or [])
+        if current_values == ['']:
+            current_values = []
 
-        for thing in self.get_resources(response, 'udm:object'):
-            row = ET.SubElement(table, 'tr')
-            x = thing.copy()
+        if op == 'replace':
+            current_values = []
 
-            td1 = ET.SubElement(row, 'td', **{'class': 'check'})
-            td2 = ET.SubElement(row, 'td')
-            if has_four_rows:
-                td4 = ET.SubElement(row, 'td')
-                th4.text = UDM_Module(thing['objectType'], ldap_connection=self.ldap_connection, ldap_position=self.ldap_position).get_property(has_four_rows).short_description
-            td3 = ET.SubElement(row, 'td')
+        if op in ('add', 'replace'):
+            if value in current_values:
+                self.add_resource(result, 'udm:warning', {'message': 'cannot append %s to %s, value exists' % (value, property_name)})
+                return
+            if prop.multivalue:
+                value = [*current_values, value]
+            elif op == 'add':
+                self.add_resource(result, 'udm:warning', {'message': 'appending to a single value property (%s) is not supported.' % (property_name,)})
+                return
+        elif op == 'remove' and value is None:
+            pass
+        elif op == 'remove':
+            try:
+                normalized_val = prop.syntax.parse(value)
+            except (univention.admin.uexceptions.valueInvalidSyntax, univention.admin.uexceptions.valueError):
+                normalized_val = None
 
-            # There is a bug in chrome, so we cannot have form='report1 report2'. so, only 1 report is possible :-/
-            ET.SubElement(td1, 'input', type='checkbox', name='dn', value=x['dn'])  # form=' '.join([report['id'] for report in self.get_resources(response, 'udm:form') if report['rel'] == 'udm:report'][-1:]))
+            if value in current_values:
+                current_values.remove(value)
+            elif normalized_val is not None and normalized_val in current_values:
+                current_values.remove(normalized_val)
+            else:
+                self.add_resource(result, 'udm:warning', {'message': 'cannot remove %s from %s, value does not exist' % (value, property_name)})
+                return
 
-            ET.SubElement(td2, 'img', src=self.urljoin('favicon.ico'), **{'class': 'grid-icon'})
-            a = ET.SubElement(td2, "a", href=x.pop('uri') + '/edit', rel="udm:object item")
-            a.text = x['id']
+            value = current_values if prop.multivalue else None
 
-            td3.text = ldap_dn2path(thing['position'] or '')
+        password_properties = module.password_properties
+        self.set_property(obj, property_name, value, result, multi_error, password_properties)
 
-            if has_four_rows:
-                td4.text = thing['properties'].get(has_four_rows)  # TODO: syntax.to_string()
+    def remove_object(self, obj, recursive=True, cleanup=True):
+        try:
+            log.info('Removing LDAP object %s', obj.dn)
+            obj.remove(remove_childs=recursive)
+            if cleanup:
+                udm_objects.performCleanup(obj)
+        except udm_errors.base as exc:
+            UDM_Error(exc).reraise()
 
-            if self.debug_mode_enabled:
-                pre = ET.SubElement(row, "script", dn=x['dn'], type='application/json')
-                pre.text = json.dumps(x, indent=4)
-        return root
 
-    @sanitize
-    async def post(
-        self,
-        object_type,
-        representation: dict = JSONPayload(
-            position=DNSanitizer(required=False, allow_none=True),
-            superordinate=DNSanitizer(required=False, allow_none=True),
-            options=DictSanitizer({}, default_sanitizer=BooleanSanitizer(), required=False),
-            policies=DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer()), required=False),
-            properties=DictSanitizer({}, required=True),
-        ),
-        patch_document: list = PatchRepresentation(),
-    ):
-        """Create a new {module.object_name} object"""
-        obj = Object(self.application, self.request)
-        obj.ldap_connection, obj.ldap_position = self.ldap_connection, self.ldap_position
-        serverctrls = [PostReadControl(True, ['entryUUID', 'modifyTimestamp', 'entryCSN'])]
-        response = {}
-        result = {}
-        new_obj = await obj.create(object_type, None, representation or patch_document, result, serverctrls=serverctrls, response=response)
-        self.set_header('Location', self.urljoin(quote_dn(new_obj.dn)))
-        self.set_entity_tags(new_obj, check_conditionals=False)
-        self.set_status(201)
-        self.add_caching(public=False, no_cache=True, must_revalidate=True)
+class Objects(ConditionalResource, ObjectModificationBase, ReportingBase, _OpenAPIBase, Resource):
+    """Search for objects"""
 
-        uuid = _get_post_read_entry_uuid(response)
-
-        result.update({
-            'dn': new_obj.dn,
-            'uuid': uuid,
-        })
-        self.content_negotiation(result)
-
-    def _options(self, object_type):
-        result = {}
-        module = self.get_module(object_type)
-        parent = self.get_parent_object_type(module)
-        methods = ['GET', 'OPTIONS']
-        self.add_link(result, 'udm:object-modules', self.urljoin('../../'), title=_('All modules'))
-        self.add_link(result, 'up', self.urljoin('../'), title=parent.object_name_plural)
-        self.add_link(result, 'self', self.urljoin(''), name=module.name, title=module.object_name_plural)
-        self.add_link(result, 'describedby', self.urljoin(''), title=_('%s module') % (module.name,), method='OPTIONS')
-        if 'search' in module.operations:
-            searchfields = ['position', 'query*', 'filter', 'scope', 'hidden', 'properties*', 'opened']
-            if superordinate_names(module):
-                searchfields.append('superordinate')
-            if module.supports_pagination:
-                searchfields.extend(['limit', 'page', 'by', 'dir'])
-            self.add_link(result, 'search', self.urljoin('') + '{?%s}' % ','.join(searchfields), templated=True, title=_('Search for %s') % (module.object_name_plural,))
-        if 'add' in module.operations:
-            methods.append('POST')
-            self.add_link(result, 'create-form', self.urljoin('add'), title=_('Create a %s') % (module.object_name,))
-            self.add_link(result, 'create-form', self.urljoin('add') + '{?position,superordinate%s}' % (',template' if module.template else ''), templated=True, title=_('Create a %s') % (module.object_name,))
-        if module.help_link or module.help_text:
-            self.add_link(result, 'help', module.help_link or '', title=module.help_text or module.help_link)
-        self.add_link(result, 'icon', self.urljoin('favicon.ico'), type='image/x-icon')
-        if module.has_tree:
-            self.add_link(result, 'udm:tree', self.urljoin('tree'), title=_('Object type tree'))
-#        self.add_link(result, '', self.urljoin(''))
-        self.set_header('Allow', ', '.join(methods))
-        return result
-
-    def options_html(self, response):
-        # root = self.get_html(response)
-        root = ET.Element('script', type='application/json')
-        root.text = json.dumps(response, indent=4)
-        return root
-
-
-class ObjectsMove(Resource):
-    """Move multiple objects at the same time"""
-
-    @sanitize
-    async def post(
-        self,
-        object_type,
-        position: str = Body(DNSanitizer(required=True)),
-        dn: list[str] = Body(ListSanitizer(DNSanitizer(required=True), min_elements=1)),
-    ):
-        # FIXME: this can only move objects of the same object_type but should move everything
-        dns = dn  # TODO: validate: moveable, etc.
-
-        status_id = str(uuid.uuid4())
-        status = shared_memory.dict()
-        status.update({
-            'id': status_id,
-            'finished': False,
-            'errors': False,
-            'moved': shared_memory.list(),
-        })
-
-        try:
-            shared_memory.queue[self.request.user_dn]
-        except KeyError:
-            shared_memory.queue[self.request.user_dn] = shared_memory.dict()
-        shared_memory.queue[self.request.user_dn][status_id] = status
-
-        self.set_status(202)
-        self.set_header('Location', self.abspath('progress', status['id']))
-        self.finish()
-        try:
-            for i, dn in enumerate(dns, 1):
-                module = get_module(object_type, dn, self.ldap_write_connection)
-                dn = await self.pool_submit(module.move, dn, position)
-                status['moved'].append(dn)
-                status['description'] = _('Moved %d of %d objects. Last object was: %s.') % (i, len(dns), dn)
-                status['max'] = len(dns)
-                status['value'] = i
-        except Exception:
-            status['errors'] = True
-            status['traceback'] = traceback.format_exc()  # FIXME: error handling
-            raise
-        else:
-            status['uri'] = self.urljoin(quote_dn(dn))
-        finally:
-            status['finished'] = True
-
-
-class Object(ConditionalResource, FormBase, _OpenAPIBase, Resource):
-    """Get, modify, create, remove, rename or move an UDM object"""
+    get_template = 'search_form.html'
 
     @sanitize
     async def get(
         self,
         object_type: str,
-        dn: str,
+        position: str = Query(DNSanitizer(required=False, default=None, allow_none=True), description="Position which is used as search base."),
+        ldap_filter: str = Query(
+            LDAPFilterSanitizer(required=False, default="", allow_none=True),
+            alias='filter',
+            description="A LDAP filter which may contain `UDM` property names instead of `LDAP` attribute names.",
+            examples={
+                "any-object": {
+                    "value": "(objectClass=*)",
+                },
+                "admin-user": {
+                    "value": "(|(username=Administrator)(username=Admin*))",
+                },
+            },
+        ),
+        query: dict = Query(
+            DictSanitizer({}, default_sanitizer=LDAPSearchSanitizer(required=False, default='*', add_asterisks=False, use_asterisks=True), key_sanitizer=ObjectPropertySanitizer()),
+            description="The values to search for (propertyname and search filter value). Alternatively with `filter` a raw LDAP filter can be given.",
+            style="deepObject",
+            examples={
+                'nothing': {
+                    'value': None,
+                },
+                'property': {
+                    'value': {'': '*'},
+                },
+            },
+        ),
+        property: str = Query(
+            ObjectPropertySanitizer(required=False, default=None),
+            description="The property to search for if not specified via `query`",
+        ),
+        scope: str = Query(ChoicesSanitizer(choices=['sub', 'one', 'base', 'base+one'], default='sub'), description="The LDAP search scope (sub, base, one)."),
+        hidden: bool = Query(BoolSanitizer(default=True), description="Include hidden/system objects in the response.", example=True),
+        opened: bool = Query(BoolSanitizer(default=True), description="Wheather to open the object in case certain properties are requested.", example=True),
         properties: list[str] = Query(
             ListSanitizer(StringSanitizer(), required=False, default=['*'], allow_none=True, min_elements=0),
             style="form",
@@ -1731,554 +1657,909 @@ class Object(ConditionalResource, FormBase, _OpenAPIBase, Resource):
                 'only small subset': {'value': ['username', 'firstname', 'lastname']},
             },
         ),
-        copy: bool = Query(BoolSanitizer(default=False), description="**Experimental**: Might be used in the future for copying.", example=False),  # TODO: move into own resource: ./copy
+        superordinate: str | None = Query(
+            DNSanitizer(required=False, default=None, allow_none=True),
+            description="The superordinate DN of the objects to find. `position` is sufficient.",
+            # example=f"cn=superordinate,{ldap_base}"
+        ),
+        dir: str = Query(
+            ChoicesSanitizer(choices=['ASC', 'DESC'], default='ASC'),
+            deprecated=True,
+            description="**Broken/Experimental**: The Sort direction (ASC or DESC).",
+        ),
+        by: str = Query(
+            StringSanitizer(required=False),
+            deprecated=True,
+            description="**Broken/Experimental**: Sort the search result by the specified property.",
+            # example="username",
+        ),
+        page: int = Query(
+            IntegerSanitizer(required=False, default=1, minimum=1),
+            deprecated=True,
+            description="**Broken/Experimental**: The search page, starting at one.",
+            example=1,
+        ),
+        limit: int = Query(
+            IntegerSanitizer(required=False, default=None, allow_none=True, minimum=0),
+            deprecated=True,
+            description="**Broken/Experimental**: How many results should be shown per page.",
+            examples={
+                "no limit": {"value": "", "summary": "get all entries"},
+                "limit to 50": {"value": 50, "summary": "limit to 50 entries"},
+            },
+        ),
     ):
-        """
-        Get a representation of the {module.object_name} object with all its properties, policies, options, metadata and references.
-        Includes also instructions how to modify, remove or move the object.
-        """
-        dn = unquote_dn(dn)
+        """Search for {module.object_name_plural} objects"""
+        module = self.get_module(object_type)
+        result = self._options(object_type)
+
+        search = bool(self.request.query)
         properties = properties[:]
+        direction = dir
+        property_ = property
+        reverse = direction == 'DESC'
+        items_per_page = limit
 
-        if object_type == 'users/self' and not self.ldap_connection.compare_dn(dn, self.request.user_dn):
-            raise HTTPError(403)
+        if not ldap_filter:
+            filters = filter(None, [(module._object_property_filter(attribute or property_ or None, value, hidden)) for attribute, value in query.items()])
+            if filters:
+                ldap_filter = str(univention.admin.filter.conjunction('&', [univention.admin.filter.parse(fil) for fil in filters]))
 
-        try:
-            module, obj = await self.pool_submit(self.get_module_object, object_type, dn)
-        except NotFound:
-            # FIXME: return HTTP 410 Gone for removed objects
-            # if self.ldap_connection.searchDn(filter_format('(&(reqDN=%s)(reqType=d))', [dn]), base='cn=translog'):
-            #     raise Gone(object_type, dn)
-            raise
-        if object_type not in ('users/self', 'users/passwd') and not univention.admin.modules.recognize(object_type, obj.dn, obj.oldattr):
-            raise NotFound(object_type, dn)
+        # TODO: replace the superordinate concept with container
+        superordinate = self.superordinate_dn_to_object(module, superordinate)
+        if superordinate:
+            position = position or superordinate.dn
 
-        self.set_entity_tags(obj)
+        if opened and properties == ['dn']:  # backwards compatibility with older clients
+            opened = False
+        props = [_prop for _prop in properties if _prop not in ('dn')] if not opened else properties
+        if not opened:
+            properties = ['dn']
 
-        props = {}
-        props.update(self._options(object_type, obj.dn))
-        props['uri'] = self.abspath(obj.module, quote_dn(obj.dn))
-        props.update(self.get_representation(module, obj, properties, self.ldap_connection, copy))
-        for reference in module.get_references(obj):
-            # TODO: add a reference for the "position" object?!
-            if reference['module'] != 'udm':
-                continue  # can not happen currently
-            for dn in set(_map_normalized_dn(filter(None, [reference['id']]))):
-                rel = {'__policies': 'udm:object/policy/reference'}.get(reference['property'], 'udm:object/property/reference/%s' % (reference['property'],))
-                self.add_link(props, rel, self.abspath(reference['objectType'], quote_dn(dn)), name=dn, title=reference['label'], dont_set_http_header=True)
+        objects = []
+        if search:  # TODO: check if searching is allowed
+            try:
+                if self.request.content_negotiation_lang == 'ndjson' and not items_per_page:
+                    await self.stream(module, position, ldap_filter, superordinate, scope, hidden, properties, props, opened)
+                    return
+                objects, last_page = await self.search(module, position, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, opened)
+            except ObjectDoesNotExist as exc:
+                self.raise_sanitization_error('position', str(exc), type='query')
+            except SuperordinateDoesNotExist as exc:
+                self.raise_sanitization_error('superordinate', str(exc), type='query')
 
-        if module.name == 'networks/network':
-            self.add_link(props, 'udm:next-free-ip', self.urljoin(quote_dn(obj.dn), 'next-free-ip-address'), title=_('Next free IP address'))
+        for obj in objects or []:
+            if obj is None:
+                continue
+            self.add_resource(result, 'udm:object', self.get_entry(obj, properties, props, opened))
 
-        if obj.has_property('jpegPhoto'):
-            self.add_link(props, 'udm:user-photo', self.urljoin(quote_dn(obj.dn), 'properties/jpegPhoto.jpg'), type='image/jpeg', title=_('User photo'))
+        if items_per_page:
+            self.add_link(result, 'first', self.urljoin('', page='1'), title=_('First page'))
+            if page > 1:
+                self.add_link(result, 'prev', self.urljoin('', page=str(page - 1)), title=_('Previous page'))
+            if not last_page:
+                self.add_link(result, 'next', self.urljoin('', page=str(page + 1)), title=_('Next page'))
+            else:
+                self.add_link(result, 'last', self.urljoin('', page=str(last_page)), title=_('Last page'))
 
-        if module.name == 'users/user':
-            self.add_link(props, 'udm:service-specific-password', self.urljoin(quote_dn(obj.dn), 'service-specific-password'), title=_('Generate a new service specific password'))
-        self.add_link(props, 'udm:layout', self.urljoin(quote_dn(obj.dn), 'layout'), title=_('Module layout'))
-        self.add_link(props, 'udm:properties', self.urljoin(quote_dn(obj.dn), 'properties'), title=_('Module properties'))
-        for policy_module in props.get('policies', {}).keys():
-            self.add_link(props, 'udm:policy-result', self.urljoin(quote_dn(obj.dn), f'{policy_module}/{{?policy}}'), name=policy_module, title=_('Evaluate referenced %s policies') % (policy_module,), templated=True)
+        if search:
+            for i, report_type in enumerate(sorted(self.reports_cfg.get_report_names(object_type)), 1):
+                self.add_link(result, 'udm:report', self.urljoin('report', quote(report_type)) + '{?dn}', name=report_type, title=_('Create %s report') % _(report_type), method='POST', templated=True)
+                self.add_button(result, self.urljoin('report', quote(report_type)), 'POST', rel='udm:report', name=report_type, id='report%d' % (i,), label=_('Create %s report') % _(report_type), **{'hx-boost': 'false', 'hx-vals': 'js:{dn: getAllSelectedDNs()}', 'hx-disable': 'true'})
 
-        self.add_caching(public=False, must_revalidate=True)
-        self.content_negotiation(props)
+            self.add_button(result, self.urljoin('multi-edit'), 'POST', name='multi-edit', id='multi-edit', rel='edit-form', label=_('Modify (multi edit)'), title=_('Modify %s (multi edit)') % (module.object_name_plural,))
+            self.add_button(result, self.urljoin('remove'), 'POST', name='remove', id='remove', rel='udm:object/remove', label=_('Delete'), title=_('Delete %s') % (module.object_name_plural,))
+            self.add_button(result, self.urljoin('move'), 'POST', name='move', id='move', rel='udm:object/move', label=_('Move to'), title=_('Move %s') % (module.object_name_plural,))
+        else:
+            for i, report_type in enumerate(sorted(self.reports_cfg.get_report_names(object_type)), 1):
+                self.add_link(result, 'udm:report', self.urljoin('report', quote(report_type)) + '{?dn}', name=report_type, title=_('Create %s report') % _(report_type), method='POST', templated=True)
 
-    def _options(self, object_type, dn):
-        dn = unquote_dn(dn)
-        module = self.get_module(object_type)
-        props = {}
-        parent_module = self.get_parent_object_type(module)
-        self.add_link(props, 'udm:object-modules', self.urljoin('../../'), title=_('All modules'))
-        self.add_link(props, 'udm:object-module', self.urljoin('../'), name=parent_module.name, title=parent_module.object_name_plural)
-        # self.add_link(props, 'udm:object-types', self.urljoin('../'))
-        self.add_link(props, 'type', self.urljoin('x/../'), name=module.name, title=module.object_name)
-        self.add_link(props, 'up', self.urljoin('x/../'), name=module.name, title=module.object_name)
-        self.add_link(props, 'self', self.urljoin(''), title=dn)
-        self.add_link(props, 'describedby', self.urljoin(''), title=_('%s module') % (module.name,), method='OPTIONS')
-        self.add_link(props, 'icon', self.urljoin('favicon.ico'), type='image/x-icon')
-        self.add_link(props, 'udm:object/remove', self.urljoin(''), method='DELETE')
-        self.add_link(props, 'udm:object/edit', self.urljoin(''), method='PUT')
-        # self.add_link(props, '', self.urljoin('report/PDF Document?dn=%s' % (quote(obj.dn),))) # rel=alternate media=print?
-#        for mod in module.child_modules:
-#            mod = self.get_module(mod['id'])
-#            if mod and set(superordinate_names(mod)) & {module.name, }:
-#                self.add_link(props, 'udm:children-types', self.urljoin('../../%s/?superordinate=%s' % (quote(mod.name), quote(obj.dn))), name=mod.name, title=mod.object_name_plural)
+        search_layout = []
+        search_layout_base = [
+            {'label': _('Search for %s') % (module.object_name_plural,), 'description': f'{module.object_name_plural} ({module.description})', 'layout': [
+                ['property', 'query*', ''],
+                {'layout': search_layout, 'description': '', 'label': _('Advanced options'), 'opened': False},
+            ]},
+        ]
+        self.add_layout(result, search_layout_base, 'search')
+        form = self.add_form(result, self.urljoin(''), 'GET', rel='search', id='search', name='search', layout='search')
+        self.add_form_element(form, 'position', position or '', label=_('Search in'), **{'data-dynamic': self.urljoin('default-containers')})
+        search_layout.append(['position', 'hidden'])
+        if superordinate_names(module):
+            self.add_form_element(form, 'superordinate', superordinate.dn if superordinate else '', label=_('Superordinate'))
+            search_layout.append(['superordinate'])
+        searchable_properties = [{'value': '', 'label': _('Defaults')}] + [{'value': prop['id'], 'label': prop['label']} for prop in module.properties(None) if prop.get('searchable')]
+        self.add_form_element(form, 'property', property_ or '', element='select', options=searchable_properties, label=_('Property'), **{'data-size': 'One'})
+        self.add_form_element(form, 'query*', query.get('', '*'), label=_('Search for'), placeholder=_('Search value (e.g. *)'), **{'data-size': 'TwoThird'})
+        self.add_form_element(form, 'scope', scope, element='select', options=[{'value': 'sub'}, {'value': 'one'}, {'value': 'base'}, {'value': 'base+one'}], label=_('Search scope'))
+        self.add_form_element(form, 'hidden', '1', type='checkbox', checked=bool(hidden), label=_('Include hidden objects'))
+        # self.add_form_element(form, 'fields', list(fields))
+        if module.supports_pagination:
+            self.add_form_element(form, 'limit', str(items_per_page or '0'), type='number', label=_('Limit'), **{'data-size': 'OneThird'})
+            self.add_form_element(form, 'page', str(page or '1'), type='number', label=_('Selected page'), **{'data-size': 'OneThird'})
+            self.add_form_element(form, 'by', by or '', element='select', options=searchable_properties, label=_('Sort by'), **{'data-size': 'OneThird'})
+            self.add_form_element(form, 'dir', direction if direction in ('ASC', 'DESC') else 'ASC', element='select', options=[{'value': 'ASC', 'label': _('Ascending')}, {'value': 'DESC', 'label': _('Descending')}], label=_('Direction'), **{'data-size': 'OneThird'})
+            search_layout.append(['page', 'limit', 'by', 'dir'])
+        self.add_form_element(form, '', _('Search'), type='submit', **{'data-size': 'OneThird'})
 
-        methods = ['GET', 'OPTIONS']
-        if module.childs:
-            self.add_link(props, 'udm:children-types', self.urljoin(quote_dn(dn), 'children-types'), name=module.name, title=_('Sub object types of %s') % (module.object_name,))
+        if search:
+            result['results'] = len(self.get_resources(result, 'udm:object'))
+        else:
+            self.add_link(result, 'udm:layout', self.urljoin('layout'), title=_('Module layout'))
+            self.add_link(result, 'udm:properties', self.urljoin('properties'), title=_('Module properties'))
+            for policy_module in module.policies:
+                policy_module = policy_module['objectType']
+                self.add_link(result, 'udm:policy-result', self.urljoin(f'{policy_module}/{{?policy,position}}'), name=policy_module, title=_('Evaluate referenced %s policies') % (policy_module,), templated=True)
 
-        can_modify = set(module.operations) & {'edit', 'move', 'subtree_move'}
-        can_remove = 'remove' in module.operations
-        if can_modify or can_remove:
-            if can_modify:
-                methods.extend(['PUT', 'PATCH'])
-            if can_remove:
-                methods.append('DELETE')
-                self.add_button(props, action='', method='DELETE', title=_('Remove this %s') % (module.object_name,), **{'hx-confirm': _("Are you sure you want to delete this %s?") % (module.object_name,)})
-            self.add_link(props, 'edit-form', self.urljoin(quote_dn(dn), 'edit'), title=_('Modify, move or remove this %s') % (module.object_name,))
+        self.add_caching(public=False, no_cache=True, no_store=True, max_age=1, must_revalidate=True)
+        self.content_negotiation(result)
 
-        self.set_header('Allow', ', '.join(methods))
-        if 'PATCH' in methods:
-            self.set_header('Accept-Patch', 'application/json-patch+json, application/json')
-        return props
+    def get_entry(self, obj, properties, props, opened):
+        objmodule = UDM_Module(obj.module, ldap_connection=self.ldap_connection, ldap_position=self.ldap_position)
 
-    @classmethod
-    def get_representation(cls, module, obj, properties, ldap_connection, copy=False, add=False, opened=True):
-        def _remove_uncopyable_properties(obj):
-            if not copy:
-                return
-            for name, p in obj.descriptions.items():
-                if not p.copyable:
-                    obj.info.pop(name, None)
+        entry = Object.get_representation(objmodule, obj, properties, self.ldap_connection, opened=opened)
+        uri = entry['uri'] = self.abspath(obj.module, quote_dn(obj.dn))
+        if not opened and props and props != ['*']:
+            uri = uri + f"?{urlencode({'properties': props}, True)}"
+        self.add_link(entry, 'self', uri, name=entry['dn'], title=entry['id'], dont_set_http_header=True)
+        return entry
 
-        # TODO: check if we really want to set the default values
-        _remove_uncopyable_properties(obj)
-        obj.set_defaults = True
-        obj.set_default_values()
-        _remove_uncopyable_properties(obj)
+    async def stream(self, module, container, ldap_filter, superordinate, scope, hidden, properties, props, opened):
+        """Write the found objects as one JSON document per line while they are fetched page wise from LDAP, so that the memory usage does not depend on the number of objects."""
+        ucr['directory/manager/web/sizelimit'] = ucr.get('ldap/sizelimit', '400000')
+        objects = iter(await self.pool_submit(module.search, container, superordinate=superordinate, filter=ldap_filter, scope=scope, hidden=hidden, stream=True) or [])
+        chunk = await self.pool_submit(self._get_entries, objects, properties, props, opened)
 
-        values = {}
-        if properties:
-            if opened and not obj._open and ('*' in properties or any(prop not in obj.info for prop in properties)):
-                # TODO: i think we need error handling here, because between receiving the object and opening it, it or referenced objects might be removed.
-                # best would be if lookup() would support opening because that already does error handling.
+        self.add_header('Vary', ', '.join(self.vary()))
+        self.set_header('Content-Type', 'application/x-ndjson')
+        self.add_caching(public=False, no_cache=True, no_store=True, max_age=1, must_revalidate=True)
+        while chunk:
+            self.write(''.join(json.dumps(entry, cls=JsonEncoder) + '\n' for entry in chunk))
+            await self.flush()
+            try:
+                chunk = await self.pool_submit(self._get_entries, objects, properties, props, opened)
+            except Exception as exc:
+                # the status code has already been sent, so the error is reported as last line
+                log.exception('Streaming the search result failed')
+                self.write(json.dumps({'error': {'code': 500, 'title': responses[500], 'message': str(exc)}}) + '\n')
+                break
+        self.finish()
+
+    def _get_entries(self, objects, properties, props, opened):
+        entries = []
+        for obj in itertools.islice(objects, STREAM_CHUNK_SIZE):
+            if opened:
                 obj.open()
+            entries.append(self.get_entry(obj, properties, props, opened))
+        return entries
 
-            for key in obj.descriptions:
-                if key in properties and obj.has_property(key) and obj.descriptions[key].lazy_loading_fn:
-                    obj.descriptions[key].lazy_load(obj)
+    async def search(self, module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, opened):
+        ucr['directory/manager/web/sizelimit'] = ucr.get('ldap/sizelimit', '400000')
+        if module.supports_pagination and items_per_page and await self.supports_vlv():
+            objects, last_page = await self._search_vlv(module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse)
+        else:
+            objects, last_page = await self._search_paged(module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse)
+        # TODO: move into module.search(opened=True) and then into object.lookup()! because that does error handling.
+        if opened and objects:
+            for obj in objects:
+                obj.open()
+        return (objects, last_page)
 
-            if '*' not in properties:
-                values = {key: value for (key, value) in obj.info.items() if (key in properties) and obj.descriptions[key].show_in_lists}
-            else:
-                values = {key: obj[key] for key in obj.descriptions if (add or obj.has_property(key)) and obj.descriptions[key].show_in_lists}
+    async def supports_vlv(self):
+        """Check if the LDAP server supports Virtual List View and server side sorting."""
+        uri = self.ldap_connection.lo.uri
+        if uri not in _VLV_SUPPORT:
+            try:
+                rootdse = await self.pool_submit(self.ldap_connection.lo.lo.read_rootdse_s, attrlist=['supportedControl'])
+            except ldap.LDAPError as exc:
+                log.warning('Could not read supported controls: %s', exc)
+                return False
+            controls = set((rootdse or {}).get('supportedControl', []))
+            _VLV_SUPPORT[uri] = {VLVRequestControl.controlType.encode('ASCII'), SSSRequestControl.controlType.encode('ASCII')} <= controls
+        return _VLV_SUPPORT[uri]
+
+    def _sort_control(self, by, reverse, default=None):
+        if by in ('uid', 'uidNumber', 'cn'):
+            rule = ':caseIgnoreOrderingMatch' if by not in ('uidNumber',) else ''
+            return SSSRequestControl(ordering_rules=['%s%s%s' % ('-' if reverse else '', by, rule)])
+        if default:
+            return SSSRequestControl(ordering_rules=['%s%s' % ('-' if reverse else '', default)])
+
+    async def _search_vlv(self, module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse):
+        """Fetch only the requested page by using Virtual List View, which requires server side sorting."""
+        page = page or 1
+        ctrls = {}
+        vlv_ctrl = VLVRequestControl(True, before_count=0, after_count=items_per_page - 1, offset=(page - 1) * items_per_page + 1, content_count=0)
+        serverctrls = [self._sort_control(by, reverse, 'entryUUID'), vlv_ctrl]
+        objects = await self.pool_submit(module.search, container, superordinate=superordinate, filter=ldap_filter, scope=scope, hidden=hidden, serverctrls=serverctrls, response=ctrls)
+        content_count = next((control.content_count for control in ctrls.get('ctrls', []) if control.controlType == VLVResponseControl.controlType), 0)
+        last_page = max(1, -(-content_count // items_per_page))
+        return (objects, page if page >= last_page else 0)
+
+    async def _search_paged(self, module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse):
+        """Walk the Simple Paged Results cookie forward up to the requested page."""
+        hashed = (self.request.user_dn, module.name, container or None, ldap_filter or None, superordinate or None, scope or None, hidden or None, items_per_page or None, by or None, reverse or None)
+        current_page = (page or 1) - 1
+        last_cookie = search_sessions.get(hashed, current_page) if current_page else None
+        if last_cookie is None:
+            return await self._walk_pages(module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, hashed, 0, '')
+        try:
+            return await self._walk_pages(module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, hashed, current_page, last_cookie)
+        except (ldap.LDAPError, udm_errors.ldapError) as exc:
+            # a cookie is only valid on the LDAP connection which issued it, e.g. not after the connection was re-established
+            if not isinstance(getattr(exc, 'original_exception', exc), ldap.UNWILLING_TO_PERFORM | ldap.PROTOCOL_ERROR):
+                raise
+            log.debug('Paged results cookie of page %d was rejected, searching from the first page: %s', current_page, exc)
+            search_sessions.pop(hashed, current_page)
+            return await self._walk_pages(module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, hashed, 0, '')
 
-            for passwd in module.password_properties:
-                if passwd in values:
-                    values[passwd] = None
-            values = dict(decode_properties(module, obj, values))
+    async def _walk_pages(self, module, container, ldap_filter, superordinate, scope, hidden, items_per_page, page, by, reverse, hashed, current_page, last_cookie):
+        ctrls = {}
+        serverctrls = []
+        page_ctrl = SimplePagedResultsControl(True, size=items_per_page, cookie=last_cookie)
+        if module.supports_pagination:
+            if items_per_page:
+                serverctrls.append(page_ctrl)
+            sort_ctrl = self._sort_control(by, reverse)
+            if sort_ctrl:
+                serverctrls.append(sort_ctrl)
+        objects = []
+        # TODO: we have to store the results of the previous pages (or make them cacheable)
+        last_page = page
+        for i in range(current_page, page or 1):
+            # TODO: if we want to improve performance one day for `opened == False` pass `simple=True`
+            objects = await self.pool_submit(module.search, container, superordinate=superordinate, filter=ldap_filter, scope=scope, hidden=hidden, serverctrls=serverctrls, response=ctrls)
+            for control in ctrls.get('ctrls', []):
+                if control.controlType == SimplePagedResultsControl.controlType:
+                    page_ctrl.cookie = control.cookie
+            if not page_ctrl.cookie:
+                break
+            search_sessions.set(hashed, i + 1, page_ctrl.cookie)
+        else:
+            last_page = 0
+        return (objects, last_page)
 
-        if add:
-            # we need to remove dynamic default values as they reference other currently not set variables
-            # (e.g. shares/share sets sambaName='' or users/user sets unixhome=/home/)
-            for name, p in obj.descriptions.items():
-                regex = re.compile(r'<(?P<key>[^>]+)>(?P<ext>\[[\d:]+\])?')  # from univention.admin.pattern_replace()
-                if name not in obj.info or name not in values:
-                    continue
-                if isinstance(p.base_default, str) and regex.search(p.base_default):
-                    values[name] = None
+    def get_html(self, response):
+        if self.request.method not in ('GET', 'HEAD'):
+            return super().get_html(response)
 
-        props = {}
-        props['dn'] = obj.dn
-        props['objectType'] = module.name
-        props['id'] = module.obj_description(obj)
-        if not props['id']:
-            props['id'] = '+'.join(explode_rdn(obj.dn, True))
-        # props['path'] = ldap_dn2path(obj.dn, include_rdn=False)
-        props['position'] = ldap_connection.parentDn(obj.dn) if obj.dn else obj.position.getDn()
-        props['properties'] = values
-        props['options'] = {opt['id']: opt['value'] for opt in module.get_options(udm_object=obj)}
-        props['policies'] = {}
-        if opened and ('*' in properties or add):
-            for policy in module.policies:
-                props['policies'].setdefault(policy['objectType'], [])
-            for policy in obj.policies:
-                pol_mod = get_module(None, policy, ldap_connection)
-                if pol_mod and pol_mod.name:
-                    props['policies'].setdefault(pol_mod.name, []).append(policy)
-        if superordinate_names(module):
-            props['superordinate'] = obj.superordinate and obj.superordinate.dn
-        if obj.entry_uuid:
-            props['uuid'] = obj.entry_uuid
-        # TODO: objectFlag is available for every module. remove the extended attribute and always map it.
-        # alternative: add some other meta information to this object, e.g. is_hidden_object: True, is_synced_from_active_directory: True, ...
-        if opened and ('*' in properties or 'objectFlag' in properties):
-            props['properties'].setdefault('objectFlag', [x.decode('utf-8', 'replace') for x in obj.oldattr.get('univentionObjectFlag', [])])
-        if copy or add:
-            props.pop('dn', None)
-            props.pop('id', None)
-        if not opened:
-            props.pop('policies', None)
-            props.pop('options', None)
-        return props
+        r = response.copy()
+        r.pop('entries', None)
+        num_of_entries = r.pop('results', 0)
+        root = super().get_html(r)
+
+        grid = ET.Element('div', **{'class': 'grid'})
+        childs = [child for child in root if child.attrib.get('id') != 'search']
+        root = next(child for child in root if child.attrib.get('id') == 'search')
+        grid_header = ET.SubElement(grid, 'div', **{'class': 'grid-header'})
+        grid_header.extend(childs)
+        root.append(grid)
+
+        has_four_rows = self.request.decoded_query_arguments.get('property')
+        if not isinstance(has_four_rows, str):
+            has_four_rows = None
+        table = ET.SubElement(grid, 'table')
+        table_header = ET.SubElement(table, 'tr')
+        th1 = ET.SubElement(table_header, 'th', **{'class': 'check'})  # TODO: all-checkbox
+        ET.SubElement(table_header, 'th').text = 'Name'  # TODO: sort-direction switch
+        if has_four_rows:
+            th4 = ET.SubElement(table_header, 'th')
+            th4.text = has_four_rows
+        ET.SubElement(table_header, 'th').text = 'Path'
+
+        ET.SubElement(grid_header, 'span').text = f'{{num}} users of {num_of_entries} selected.'
+
+        # There is a bug in chrome, so we cannot have form='report1 report2'. so, only 1 report is possible :-/
+        ET.SubElement(th1, 'input', type='checkbox', name='dn', form=' '.join([report['id'] for report in self.get_resources(response, 'udm:form') if report['rel'] == 'udm:report'][-1:]))
+
+        for thing in self.get_resources(response, 'udm:object'):
+            row = ET.SubElement(table, 'tr')
+            x = thing.copy()
+
+            td1 = ET.SubElement(row, 'td', **{'class': 'check'})
+            td2 = ET.SubElement(row, 'td')
+            if has_four_rows:
+                td4 = ET.SubElement(row, 'td')
+                th4.text = UDM_Module(thing['objectType'], ldap_connection=self.ldap_connection, ldap_position=self.ldap_position).get_property(has_four_rows).short_description
+            td3 = ET.SubElement(row, 'td')
+
+            # There is a bug in chrome, so we cannot have form='report1 report2'. so, only 1 report is possible :-/
+            ET.SubElement(td1, 'input', type='checkbox', name='dn', value=x['dn'])  # form=' '.join([report['id'] for report in self.get_resources(response, 'udm:form') if report['rel'] == 'udm:report'][-1:]))
+
+            ET.SubElement(td2, 'img', src=self.urljoin('favicon.ico'), **{'class': 'grid-icon'})
+            a = ET.SubElement(td2, "a", href=x.pop('uri') + '/edit', rel="udm:object item")
+            a.text = x['id']
+
+            td3.text = ldap_dn2path(thing['position'] or '')
+
+            if has_four_rows:
+                td4.text = thing['properties'].get(has_four_rows)  # TODO: syntax.to_string()
+
+            if self.debug_mode_enabled:
+                pre = ET.SubElement(row, "script", dn=x['dn'], type='application/json')
+                pre.text = json.dumps(x, indent=4)
+        return root
 
     @sanitize
-    async def put(
+    async def post(
         self,
         object_type,
-        dn,
         representation: dict = JSONPayload(
-            position=DNSanitizer(required=True),
+            position=DNSanitizer(required=False, allow_none=True),
             superordinate=DNSanitizer(required=False, allow_none=True),
-            options=DictSanitizer({}, default_sanitizer=BooleanSanitizer()),
-            policies=DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer())),
+            options=DictSanitizer({}, default_sanitizer=BooleanSanitizer(), required=False),
+            policies=DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer()), required=False),
             properties=DictSanitizer({}, required=True),
         ),
         patch_document: list = PatchRepresentation(),
     ):
-        """Modify or move an {module.object_name} object"""
-        dn = unquote_dn(dn)
-        try:
-            module, obj = await self.pool_submit(self.get_module_object, object_type, dn, ldap_connection=self.ldap_write_connection)
-        except NotFound:
-            module, obj = None, None
-
+        """Create a new {module.object_name} object"""
         serverctrls = [PostReadControl(True, ['entryUUID', 'modifyTimestamp', 'entryCSN'])]
         response = {}
-        if not obj:
-            module = self.get_module(object_type)
-            result = {}
+        result = {}
+        new_obj = await self.create(object_type, None, representation or patch_document, result, serverctrls=serverctrls, response=response)
+        self.set_header('Location', self.urljoin(quote_dn(new_obj.dn)))
+        self.set_entity_tags(new_obj, check_conditionals=False)
+        self.set_status(201)
+        self.add_caching(public=False, no_cache=True, must_revalidate=True)
 
-            obj = await self.create(object_type, dn, representation or patch_document, result, serverctrls=serverctrls, response=response)
-            self.set_header('Location', self.urljoin(quote_dn(obj.dn)))
-            self.set_status(201)
-            self.add_caching(public=False, must_revalidate=True)
+        uuid = _get_post_read_entry_uuid(response)
 
-            uuid = _get_post_read_entry_uuid(response)
+        result.update({
+            'dn': new_obj.dn,
+            'uuid': uuid,
+        })
+        self.content_negotiation(result)
+
+    def _options(self, object_type):
+        result = {}
+        module = self.get_module(object_type)
+        parent = self.get_parent_object_type(module)
+        methods = ['GET', 'OPTIONS']
+        self.add_link(result, 'udm:object-modules', self.urljoin('../../'), title=_('All modules'))
+        self.add_link(result, 'up', self.urljoin('../'), title=parent.object_name_plural)
+        self.add_link(result, 'self', self.urljoin(''), name=module.name, title=module.object_name_plural)
+        self.add_link(result, 'describedby', self.urljoin(''), title=_('%s module') % (module.name,), method='OPTIONS')
+        if 'search' in module.operations:
+            searchfields = ['position', 'query*', 'filter', 'scope', 'hidden', 'properties*', 'opened']
+            if superordinate_names(module):
+                searchfields.append('superordinate')
+            if module.supports_pagination:
+                searchfields.extend(['limit', 'page', 'by', 'dir'])
+            self.add_link(result, 'search', self.urljoin('') + '{?%s}' % ','.join(searchfields), templated=True, title=_('Search for %s') % (module.object_name_plural,))
+        if 'add' in module.operations:
+            methods.append('POST')
+            self.add_link(result, 'create-form', self.urljoin('add'), title=_('Create a %s') % (module.object_name,))
+            self.add_link(result, 'create-form', self.urljoin('add') + '{?position,superordinate%s}' % (',template' if module.template else ''), templated=True, title=_('Create a %s') % (module.object_name,))
+        if module.help_link or module.help_text:
+            self.add_link(result, 'help', module.help_link or '', title=module.help_text or module.help_link)
+        self.add_link(result, 'icon', self.urljoin('favicon.ico'), type='image/x-icon')
+        if module.has_tree:
+            self.add_link(result, 'udm:tree', self.urljoin('tree'), title=_('Object type tree'))
+#        self.add_link(result, '', self.urljoin(''))
+        self.set_header('Allow', ', '.join(methods))
+        return result
+
+    def options_html(self, response):
+        # root = self.get_html(response)
+        root = ET.Element('script', type='application/json')
+        root.text = json.dumps(response, indent=4)
+        return root
+
+
+class ObjectsMove(Resource):
+    """Move multiple objects at the same time"""
+
+    @sanitize
+    async def post(
+        self,
+        object_type,
+        position: str = Body(DNSanitizer(required=True)),
+        dn: list[str] = Body(ListSanitizer(DNSanitizer(required=True), min_elements=1)),
+    ):
+        # FIXME: this can only move objects of the same object_type but should move everything
+        dns = dn  # TODO: validate: moveable, etc.
+
+        status_id = str(uuid.uuid4())
+        status = shared_memory.dict()
+        status.update({
+            'id': status_id,
+            'finished': False,
+            'errors': False,
+            'moved': shared_memory.list(),
+        })
+
+        try:
+            shared_memory.queue[self.request.user_dn]
+        except KeyError:
+            shared_memory.queue[self.request.user_dn] = shared_memory.dict()
+        shared_memory.queue[self.request.user_dn][status_id] = status
+
+        self.set_status(202)
+        self.set_header('Location', self.abspath('progress', status['id']))
+        self.finish()
+        try:
+            for i, dn in enumerate(dns, 1):
+                module = get_module(object_type, dn, self.ldap_write_connection)
+                dn = await self.pool_submit(module.move, dn, position)
+                status['moved'].append(dn)
+                status['description'] = _('Moved %d of %d objects. Last object was: %s.') % (i, len(dns), dn)
+                status['max'] = len(dns)
+                status['value'] = i
+        except Exception:
+            status['errors'] = True
+            status['traceback'] = traceback.format_exc()  # FIXME: error handling
+            raise
+        else:
+            status['uri'] = self.urljoin(quote_dn(dn))
+        finally:
+            status['finished'] = True
+
+
+@tornado.web.stream_request_body
+class Batch(ObjectModificationBase, Resource):
+    """Create, modify or remove many objects of any object type with a single request"""
+
+    operation_sanitizer = DictSanitizer({
+        'action': ChoicesSanitizer(choices=['create', 'modify', 'remove'], required=True),
+        'object_type': StringSanitizer(required=True),
+        'dn': DNSanitizer(required=False, allow_none=True),
+        'position': DNSanitizer(required=False, allow_none=True),
+        'superordinate': DNSanitizer(required=False, allow_none=True),
+        'options': DictSanitizer({}, default_sanitizer=BooleanSanitizer(), required=False),
+        'policies': DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer()), required=False),
+        'properties': DictSanitizer({}, required=False),
+        'cleanup': BoolSanitizer(default=True),
+        'recursive': BoolSanitizer(default=True),
+    })
+
+    def prepare(self):
+        self._content_type = parse_content_type(self.request.headers.get('Content-Type', ''))
+        self._chunks = []
+        self._operations = []
+        super().prepare()
+
+    def decode_request_arguments(self):
+        self.request.body_arguments = {}  # the operations are decoded by data_received() and get_operations()
+
+    def data_received(self, chunk):
+        if self._content_type != 'application/x-ndjson':
+            self._chunks.append(chunk)
+            return
+        lines = b''.join([*self._chunks, chunk]).split(b'\n')
+        self._chunks = [lines.pop()]  # the incomplete last line
+        self._operations.extend(self._decode_line(line) for line in lines if line.strip())
 
+    @sanitize
+    async def post(
+        self,
+        parallelism: int = Query(IntegerSanitizer(required=False, default=BATCH_PARALLELISM, minimum=1, maximum=int(MAX_WORKERS)), description="The number of operations which are executed concurrently."),
+    ):
+        """
+        Execute a list of operations, given as JSON array or as one JSON object per line (`application/x-ndjson`).
+        The result of each operation is streamed back as one JSON object per line as soon as it is finished.
+        The lines of `application/x-ndjson` are decoded while the request body arrives.
+        The operations are executed after the request body has been received completely,
+        so the size of a batch is limited by the maximum body size of the HTTP server (100 MB).
+        """
+        operations = enumerate(self.get_operations())
+        modules = {}
+        lock = tornado.locks.Lock()
+
+        self.set_header('Content-Type', 'application/x-ndjson')
+        self.add_caching(public=False, no_store=True, no_cache=True, must_revalidate=True)
+
+        async def worker():
+            for index, operation in operations:
+                result = await self.execute(modules, index, operation)
+                async with lock:
+                    self.write(json.dumps(result, cls=JsonEncoder) + '\n')
+                    await self.flush()
+
+        await tornado.gen.multi([worker() for _ in range(parallelism)])
+        self.finish()
+
+    def get_operations(self):
+        if self._content_type == 'application/json':
+            try:
+                operations = json.loads(b''.join(self._chunks))
+            except ValueError as exc:
+                raise HTTPError(400, _('Invalid JSON document: %r') % (exc,))
+            if not isinstance(operations, list):
+                raise HTTPError(400, _('The JSON document must be a list of operations.'))
+            return operations
+        if self._content_type == 'application/x-ndjson':
+            self.data_received(b'\n')  # the last line is not necessarily terminated
+            return self._operations
+        raise HTTPError(415, _('The Content-Type must be "application/json" or "application/x-ndjson".'))
+
+    def _decode_line(self, line):
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            return HTTPError(400, _('Invalid JSON document: %r') % (exc,))
+
+    async def execute(self, modules, index, operation):
+        result = {'index': index}
+        if isinstance(operation, dict) and 'id' in operation:
+            result['id'] = operation['id']
+        try:
+            if isinstance(operation, Exception):
+                raise operation
+            operation = self.sanitize_arguments(self.operation_sanitizer, 'operation', {'operation': operation})
+            action, object_type, dn = operation['action'], operation['object_type'], operation['dn']
+            if action != 'create' and not dn:
+                self.raise_sanitization_error('dn', _('The DN of the object is required.'))
+            if object_type not in modules:
+                modules[object_type] = self.get_module(object_type, ldap_connection=self.ldap_write_connection)
+            module = modules[object_type]
+            serverctrls = [PostReadControl(True, ['entryUUID'])]
+            response = {}
+
+            if action == 'create':
+                operation['properties'] = operation['properties'] or {}
+                obj = await self.create(object_type, dn, operation, result, module=module, serverctrls=serverctrls, response=response)
+                result['status'] = 201
+            elif action == 'modify':
+                obj = await self.pool_submit(self.get_udm_object, module, dn)
+                operation['properties'] = operation['properties'] or {}  # unset options and policies are kept as they are
+                obj = await self.modify(module, obj, operation, result, serverctrls=serverctrls, response=response)
+                result['status'] = 200
+            else:
+                obj = await self.pool_submit(self.get_udm_object, module, dn)
+                await self.pool_submit(self.remove_object, obj, operation['recursive'], operation['cleanup'])
+                result['status'] = 204
             result.update({
                 'dn': obj.dn,
-                'uuid': uuid,
+                'uuid': _get_post_read_entry_uuid(response) or obj.entry_uuid,
+                'uri': self.abspath(object_type, quote_dn(obj.dn)),
             })
-            self.content_negotiation(result)
-            return
-
-        self.set_entity_tags(obj)
+        except Exception as exc:
+            result.update(self.get_error(exc))
+        return result
 
-        position = representation.get('position')
-        if position and not self.ldap_write_connection.compare_dn(self.ldap_write_connection.parentDn(dn), position):
-            await self.move(module, dn, position)
-            return
+    def get_error(self, exc):
+        details = None
+        if isinstance(exc, UMC_Error):
+            status, message = exc.status, str(exc)
+            if isinstance(exc, UnprocessableEntity):
+                details = exc.result
+        elif isinstance(exc, HTTPError):
+            status, message = exc.status_code, exc.log_message or responses.get(exc.status_code, '')
+        elif isinstance(exc, UDM_Error | udm_errors.base):
+            status, message = 400, str(exc)
+        elif isinstance(exc, ldap.SERVER_DOWN | ldap.CONNECT_ERROR):
+            status, message = 503, str(LDAP_ServerDown())
         else:
-            result = {}
-            obj = await self.modify(module, obj, representation or patch_document, result, serverctrls=serverctrls, response=response)
-            self.set_header('Location', self.urljoin(quote_dn(obj.dn)))
-            self.set_entity_tags(obj, check_conditionals=False)
-            self.add_caching(public=False, must_revalidate=True, no_cache=True, no_store=True)
-            if result:
-                self.content_negotiation(result)
-            else:
-                self.set_status(204)
-            raise Finish()
+            log.exception('Batch operation failed')
+            status, message = 500, str(exc)
+        return {
+            'status': status,
+            'error': {
+                'code': status,
+                'title': responses.get(status, ''),
+                'message': message,
+                'error': details,
+            },
+        }
+
+
+class Object(ConditionalResource, ObjectModificationBase, _OpenAPIBase, Resource):
+    """Get, modify, create, remove, rename or move an UDM object"""
 
     @sanitize
-    async def patch(
+    async def get(
         self,
-        object_type,
-        dn,
-        representation: dict = JSONPayload(
-            position=DNSanitizer(required=False, default=''),
-            superordinate=DNSanitizer(required=False, allow_none=True),
-            options=DictSanitizer({}, default_sanitizer=BooleanSanitizer(), required=False),
-            policies=DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer()), required=False),
-            properties=DictSanitizer({}),
+        object_type: str,
+        dn: str,
+        properties: list[str] = Query(
+            ListSanitizer(StringSanitizer(), required=False, default=['*'], allow_none=True, min_elements=0),
+            style="form",
+            explode=True,
+            description="The properties which should be returned, if not given all properties are returned.",
+            examples={
+                'no restrictions': {'value': None},
+                'only small subset': {'value': ['username', 'firstname', 'lastname']},
+            },
         ),
-        patch_document: list = PatchRepresentation(),
+        copy: bool = Query(BoolSanitizer(default=False), description="**Experimental**: Might be used in the future for copying.", example=False),  # TODO: move into own resource: ./copy
     ):
-        """Modify an {module.object_name} object (moving is currently not possible)"""
+        """
+        Get a representation of the {module.object_name} object with all its properties, policies, options, metadata and references.
+        Includes also instructions how to modify, remove or move the object.
+        """
         dn = unquote_dn(dn)
-        module, obj = await self.pool_submit(self.get_module_object, object_type, dn, self.ldap_write_connection)
+        properties = properties[:]
+
+        if object_type == 'users/self' and not self.ldap_connection.compare_dn(dn, self.request.user_dn):
+            raise HTTPError(403)
+
+        if self.is_conditional_request():
+            await self.check_conditional_requests_unopened(object_type, dn)
+
+        try:
+            module, obj = await self.pool_submit(self.get_module_object, object_type, dn)
+        except NotFound:
+            # FIXME: return HTTP 410 Gone for removed objects
+            # if self.ldap_connection.searchDn(filter_format('(&(reqDN=%s)(reqType=d))', [dn]), base='cn=translog'):
+            #     raise Gone(object_type, dn)
+            raise
+        if object_type not in ('users/self', 'users/passwd') and not univention.admin.modules.recognize(object_type, obj.dn, obj.oldattr):
+            raise NotFound(object_type, dn)
 
         self.set_entity_tags(obj)
 
-        if not patch_document:
-            entry = Object.get_representation(module, obj, ['*'], self.ldap_write_connection, False)
-            if representation['options'] is None:
-                representation['options'] = entry['options']
-            if representation['policies'] is None:
-                representation['policies'] = entry['policies']
-            if representation['properties'] is None:
-                representation['properties'] = {}
-            if representation['position'] is None:
-                representation['position'] = entry['position']
-            if representation['superordinate'] is None:
-                representation['superordinate'] = entry.get('superordinate')
-        else:
-            representation = patch_document
+        props = {}
+        props.update(self._options(object_type, obj.dn))
+        props['uri'] = self.abspath(obj.module, quote_dn(obj.dn))
+        props.update(self.get_representation(module, obj, properties, self.ldap_connection, copy))
+        for reference in module.get_references(obj):
+            # TODO: add a reference for the "position" object?!
+            if reference['module'] != 'udm':
+                continue  # can not happen currently
+            for dn in set(_map_normalized_dn(filter(None, [reference['id']]))):
+                rel = {'__policies': 'udm:object/policy/reference'}.get(reference['property'], 'udm:object/property/reference/%s' % (reference['property'],))
+                self.add_link(props, rel, self.abspath(reference['objectType'], quote_dn(dn)), name=dn, title=reference['label'], dont_set_http_header=True)
 
-        serverctrls = [PostReadControl(True, ['entryUUID', 'modifyTimestamp', 'entryCSN'])]
-        response = {}
-        result = {}
-        obj = await self.modify(module, obj, representation, result, serverctrls=serverctrls, response=response)
+        if module.name == 'networks/network':
+            self.add_link(props, 'udm:next-free-ip', self.urljoin(quote_dn(obj.dn), 'next-free-ip-address'), title=_('Next free IP address'))
 
-        self.set_entity_tags(obj, check_conditionals=False)
-        self.add_caching(public=False, must_revalidate=True, no_cache=True, no_store=True)
-        self.set_header('Location', self.urljoin(quote_dn(obj.dn)))
-        if result:
-            self.content_negotiation(result)
-        else:
-            self.set_status(204)
-        raise Finish()
+        if obj.has_property('jpegPhoto'):
+            self.add_link(props, 'udm:user-photo', self.urljoin(quote_dn(obj.dn), 'properties/jpegPhoto.jpg'), type='image/jpeg', title=_('User photo'))
 
-    async def create(self, object_type, dn=None, representation=None, result=None, **kwargs):
-        module = self.get_module(object_type, ldap_connection=self.ldap_write_connection)
-        if isinstance(representation, list):
-            def get_patch_replacements(field):
-                for path, pname, op, value in representation:
-                    if op != 'replace':
-                        continue
-                    if path == field:
-                        return value
-            container = get_patch_replacements('position')
-            superordinate = get_patch_replacements('superordinate')
-        else:
-            container = representation['position']
-            superordinate = representation['superordinate']
-        if dn:
-            container = self.ldap_write_connection.parentDn(dn)
-            # TODO: validate that properties are equal to rdn
+        if module.name == 'users/user':
+            self.add_link(props, 'udm:service-specific-password', self.urljoin(quote_dn(obj.dn), 'service-specific-password'), title=_('Generate a new service specific password'))
+        self.add_link(props, 'udm:layout', self.urljoin(quote_dn(obj.dn), 'layout'), title=_('Module layout'))
+        self.add_link(props, 'udm:properties', self.urljoin(quote_dn(obj.dn), 'properties'), title=_('Module properties'))
+        for policy_module in props.get('policies', {}).keys():
+            self.add_link(props, 'udm:policy-result', self.urljoin(quote_dn(obj.dn), f'{policy_module}/{{?policy}}'), name=policy_module, title=_('Evaluate referenced %s policies') % (policy_module,), templated=True)
 
-        ldap_position = univention.admin.uldap.position(module.ldap_base)
-        if container:
-            ldap_position.setDn(container)
-        elif superordinate:
-            ldap_position.setDn(superordinate)
-        else:
-            ldap_position.setDn(module.get_default_container())
+        self.add_caching(public=False, must_revalidate=True)
+        self.content_negotiation(props)
 
-        superordinate = self.superordinate_dn_to_object(module, superordinate)
+    async def check_conditional_requests_unopened(self, object_type, dn):
+        """Answer conditional requests by reading only the operational attributes of the LDAP object, without opening the UDM object."""
+        # the entity tag is built from the DN of the request, which may be spelled differently than the DN of the opened object:
+        # only answer "304 Not Modified" early, but let preconditions which may fail be evaluated with the opened object
+        if any(header in self.request.headers for header in ('If-Match', 'If-Unmodified-Since')):
+            return
+        try:
+            attrs = await self.pool_submit(self.ldap_connection.get, dn, attr=['entryCSN', 'entryUUID', 'modifyTimestamp', 'univentionObjectType'])
+        except ldap.LDAPError:
+            return
+        # otherwise the object might not be of this module, which is only detected by opening it
+        if object_type.encode('UTF-8') not in attrs.get('univentionObjectType', []):
+            return
+        if attrs.get('modifyTimestamp'):
+            self.set_entity_tags_from_attributes(self.entity_tag(dn, object_type, attrs), attrs, remove_after_check=True)
 
-        obj = module.module.object(None, self.ldap_write_connection, ldap_position, superordinate=superordinate)
-        obj.open()
-        self.set_properties(module, obj, representation, result)
+    def _options(self, object_type, dn):
+        dn = unquote_dn(dn)
+        module = self.get_module(object_type)
+        props = {}
+        parent_module = self.get_parent_object_type(module)
+        self.add_link(props, 'udm:object-modules', self.urljoin('../../'), title=_('All modules'))
+        self.add_link(props, 'udm:object-module', self.urljoin('../'), name=parent_module.name, title=parent_module.object_name_plural)
+        # self.add_link(props, 'udm:object-types', self.urljoin('../'))
+        self.add_link(props, 'type', self.urljoin('x/../'), name=module.name, title=module.object_name)
+        self.add_link(props, 'up', self.urljoin('x/../'), name=module.name, title=module.object_name)
+        self.add_link(props, 'self', self.urljoin(''), title=dn)
+        self.add_link(props, 'describedby', self.urljoin(''), title=_('%s module') % (module.name,), method='OPTIONS')
+        self.add_link(props, 'icon', self.urljoin('favicon.ico'), type='image/x-icon')
+        self.add_link(props, 'udm:object/remove', self.urljoin(''), method='DELETE')
+        self.add_link(props, 'udm:object/edit', self.urljoin(''), method='PUT')
+        # self.add_link(props, '', self.urljoin('report/PDF Document?dn=%s' % (quote(obj.dn),))) # rel=alternate media=print?
+#        for mod in module.child_modules:
+#            mod = self.get_module(mod['id'])
+#            if mod and set(superordinate_names(mod)) & {module.name, }:
+#                self.add_link(props, 'udm:children-types', self.urljoin('../../%s/?superordinate=%s' % (quote(mod.name), quote(obj.dn))), name=mod.name, title=mod.object_name_plural)
 
-        if dn and not self.ldap_write_connection.compare_dn(dn, obj._ldap_dn()):
-            self.raise_sanitization_error('dn', _('Trying to create an object with wrong RDN.'))
+        methods = ['GET', 'OPTIONS']
+        if module.childs:
+            self.add_link(props, 'udm:children-types', self.urljoin(quote_dn(dn), 'children-types'), name=module.name, title=_('Sub object types of %s') % (module.object_name,))
 
-        dn = await self.pool_submit(self.handle_udm_errors, obj.create, **kwargs)
-        return obj
+        can_modify = set(module.operations) & {'edit', 'move', 'subtree_move'}
+        can_remove = 'remove' in module.operations
+        if can_modify or can_remove:
+            if can_modify:
+                methods.extend(['PUT', 'PATCH'])
+            if can_remove:
+                methods.append('DELETE')
+                self.add_button(props, action='', method='DELETE', title=_('Remove this %s') % (module.object_name,), **{'hx-confirm': _("Are you sure you want to delete this %s?") % (module.object_name,)})
+            self.add_link(props, 'edit-form', self.urljoin(quote_dn(dn), 'edit'), title=_('Modify, move or remove this %s') % (module.object_name,))
 
-    async def modify(self, module, obj, representation, result, **kwargs):
-        assert obj._open
-        self.set_properties(module, obj, representation, result)
-        await self.pool_submit(self.handle_udm_errors, obj.modify, **kwargs)
-        return obj
+        self.set_header('Allow', ', '.join(methods))
+        if 'PATCH' in methods:
+            self.set_header('Accept-Patch', 'application/json-patch+json, application/json')
+        return props
 
-    def handle_udm_errors(self, action, *args, **kwargs):
-        try:
-            exists_msg = None
-            error = None
-            try:
-                return action(*args, **kwargs)
-            except udm_errors.objectExists as exc:
-                exists_msg = f'dn: {exc.args[0]}'
-                error = exc
-            except udm_errors.uidAlreadyUsed as exc:
-                exists_msg = '(uid)'
-                error = exc
-            except udm_errors.groupNameAlreadyUsed as exc:
-                exists_msg = '(group)'
-                error = exc
-            except udm_errors.dhcpServerAlreadyUsed as exc:
-                exists_msg = '(dhcpserver)'
-                error = exc
-            except udm_errors.macAlreadyUsed as exc:
-                exists_msg = '(mac)'
-                error = exc
-            except udm_errors.noLock as exc:
-                exists_msg = '(nolock)'
-                error = exc
-            if exists_msg and error:
-                self.raise_sanitization_error('dn', _('Object exists: %s: %s') % (exists_msg, str(UDM_Error(error))))
-        except (udm_errors.pwQuality, udm_errors.pwToShort, udm_errors.pwalreadyused) as exc:
-            self.raise_sanitization_error(('properties', 'password'), str(UDM_Error(exc)))
-        except udm_errors.invalidOptions as exc:
-            self.raise_sanitization_error('options', str(UDM_Error(exc)))
-        except udm_errors.insufficientInformation as exc:
-            if exc.missing_properties:
-                self.raise_sanitization_errors([('properties', property_name), _('The property "%(name)s" is required.') % {'name': property_name}] for property_name in exc.missing_properties)
-            self.raise_sanitization_error('dn', str(UDM_Error(exc)))
-        except (udm_errors.invalidOperation, udm_errors.invalidChild) as exc:
-            self.raise_sanitization_error('dn', str(UDM_Error(exc)))  # TODO: invalidOperation and invalidChild should be 403 Forbidden
-        except udm_errors.alreadyUsedInSubtree as exc:
-            self.raise_sanitization_error('position', str(UDM_Error(exc)))
-        except udm_errors.invalidDhcpEntry as exc:
-            self.raise_sanitization_error(('properties', 'dhcpEntryZone'), str(UDM_Error(exc)))
-        except udm_errors.circularGroupDependency as exc:
-            self.raise_sanitization_error(('properties', 'memberOf'), str(UDM_Error(exc)))  # or "nestedGroup"
-        except (udm_errors.valueError) as exc:  # valueInvalidSyntax, valueRequired, etc.
-            self.raise_sanitization_error(('properties', getattr(exc, 'property', 'properties')), str(UDM_Error(exc)))
-        except udm_errors.prohibitedUsername as exc:
-            self.raise_sanitization_error(('properties', 'username'), str(UDM_Error(exc)))
-        except udm_errors.uidNumberAlreadyUsedAsGidNumber as exc:
-            self.raise_sanitization_error(('properties', 'uidNumber'), str(UDM_Error(exc)))
-        except udm_errors.gidNumberAlreadyUsedAsUidNumber as exc:
-            self.raise_sanitization_error(('properties', 'gidNumber'), str(UDM_Error(exc)))
-        except udm_errors.mailAddressUsed as exc:
-            self.raise_sanitization_error(('properties', 'mailPrimaryAddress'), str(UDM_Error(exc)))
-        except (udm_errors.adGroupTypeChangeLocalToAny, udm_errors.adGroupTypeChangeDomainLocalToUniversal, udm_errors.adGroupTypeChangeToLocal, udm_errors.adGroupTypeChangeUniversalToGlobal, udm_errors.adGroupTypeChangeGlobalToUniversal, udm_errors.adGroupTypeChangeDomainLocalToGlobal, udm_errors.adGroupTypeChangeGlobalToDomainLocal) as exc:
-            self.raise_sanitization_error(('properties', 'adGroupType'), str(UDM_Error(exc)))
-        except udm_errors.permissionDenied as exc:
-            raise HTTPError(403, str(exc))
-        except udm_errors.base as exc:
-            UDM_Error(exc).reraise()
+    @classmethod
+    def get_representation(cls, module, obj, properties, ldap_connection, copy=False, add=False, opened=True):
+        def _remove_uncopyable_properties(obj):
+            if not copy:
+                return
+            for name, p in obj.descriptions.items():
+                if not p.copyable:
+                    obj.info.pop(name, None)
 
-    def set_properties(self, module, obj, representation, result):
-        if isinstance(representation, list):
-            self.set_patch_properties(module, obj, representation, result)
-            return
+        # TODO: check if we really want to set the default values
+        _remove_uncopyable_properties(obj)
+        obj.set_defaults = True
+        obj.set_default_values()
+        _remove_uncopyable_properties(obj)
 
-        options = representation['options'] or {}  # TODO: AppAttributes.data_for_module(self.name).items() ?
-        options_enable = {opt for opt, enabled in options.items() if enabled}
-        options_disable = {opt for opt, enabled in options.items() if enabled is False}  # ignore None!
-        obj.options = list(set(obj.options) - options_disable | options_enable)
-        if representation['policies']:
-            obj.policies = functools.reduce(operator.add, representation['policies'].values())
-        try:
-            properties = PropertiesSanitizer(_copy_value=False).sanitize(representation['properties'], module=module, obj=obj)
-        except MultiValidationError as exc:
-            multi_error = exc
-            properties = representation['properties']
-            for prop_name in multi_error.validation_errors:
-                properties.pop(prop_name)
-        else:
-            multi_error = MultiValidationError()
+        values = {}
+        if properties:
+            if opened and not obj._open and ('*' in properties or any(prop not in obj.info for prop in properties)):
+                # TODO: i think we need error handling here, because between receiving the object and opening it, it or referenced objects might be removed.
+                # best would be if lookup() would support opening because that already does error handling.
+                obj.open()
 
-        # FIXME: for the automatic IP address assignment, we need to make sure that
-        # the network is set before the IP address (see Bug #24077, comment 6)
-        # The following code is a workaround to make sure that this is the
-        # case, however, this should be fixed correctly.
-        # This workaround has been documented as Bug #25163.
-        def _tmp_cmp(i):
-            if i[0] == 'mac':  # must be set before network, dhcpEntryZone
-                return ("\x00", i[1])
-            if i[0] == 'network':  # must be set before ip, dhcpEntryZone, dnsEntryZoneForward, dnsEntryZoneReverse
-                return ("\x01", i[1])
-            if i[0] in ('ip', 'mac'):  # must be set before dnsEntryZoneReverse, dnsEntryZoneForward
-                return ("\x02", i[1])
-            return i
+            for key in obj.descriptions:
+                if key in properties and obj.has_property(key) and obj.descriptions[key].lazy_loading_fn:
+                    obj.descriptions[key].lazy_load(obj)
 
-        password_properties = module.password_properties
-        for property_name, value in sorted(properties.items(), key=_tmp_cmp):
-            self.set_property(obj, property_name, value, result, multi_error, password_properties)
+            if '*' not in properties:
+                values = {key: value for (key, value) in obj.info.items() if (key in properties) and obj.descriptions[key].show_in_lists}
+            else:
+                values = {key: obj[key] for key in obj.descriptions if (add or obj.has_property(key)) and obj.descriptions[key].show_in_lists}
 
-        self.raise_sanitization_multi_error(multi_error)
+            for passwd in module.password_properties:
+                if passwd in values:
+                    values[passwd] = None
+            values = dict(decode_properties(module, obj, values))
 
-    def set_property(self, obj, property_name, value, result, multi_error, password_properties):
-        if property_name in password_properties:
-            log.debug('Setting password property %s', property_name)
-        else:
-            log.debug('Setting property %s to %r', property_name, value)
+        if add:
+            # we need to remove dynamic default values as they reference other currently not set variables
+            # (e.g. shares/share sets sambaName='' or users/user sets unixhome=/home/)
+            for name, p in obj.descriptions.items():
+                regex = re.compile(r'<(?P<key>[^>]+)>(?P<ext>\[[\d:]+\])?')  # from univention.admin.pattern_replace()
+                if name not in obj.info or name not in values:
+                    continue
+                if isinstance(p.base_default, str) and regex.search(p.base_default):
+                    values[name] = None
+
+        props = {}
+        props['dn'] = obj.dn
+        props['objectType'] = module.name
+        props['id'] = module.obj_description(obj)
+        if not props['id']:
+            props['id'] = '+'.join(explode_rdn(obj.dn, True))
+        # props['path'] = ldap_dn2path(obj.dn, include_rdn=False)
+        props['position'] = ldap_connection.parentDn(obj.dn) if obj.dn else obj.position.getDn()
+        props['properties'] = values
+        props['options'] = {opt['id']: opt['value'] for opt in module.get_options(udm_object=obj)}
+        props['policies'] = {}
+        if opened and ('*' in properties or add):
+            for policy in module.policies:
+                props['policies'].setdefault(policy['objectType'], [])
+            for policy in obj.policies:
+                pol_mod = get_module(None, policy, ldap_connection)
+                if pol_mod and pol_mod.name:
+                    props['policies'].setdefault(pol_mod.name, []).append(policy)
+        if superordinate_names(module):
+            props['superordinate'] = obj.superordinate and obj.superordinate.dn
+        if obj.entry_uuid:
+            props['uuid'] = obj.entry_uuid
+        # TODO: objectFlag is available for every module. remove the extended attribute and always map it.
+        # alternative: add some other meta information to this object, e.g. is_hidden_object: True, is_synced_from_active_directory: True, ...
+        if opened and ('*' in properties or 'objectFlag' in properties):
+            props['properties'].setdefault('objectFlag', [x.decode('utf-8', 'replace') for x in obj.oldattr.get('univentionObjectFlag', [])])
+        if copy or add:
+            props.pop('dn', None)
+            props.pop('id', None)
+        if not opened:
+            props.pop('policies', None)
+            props.pop('options', None)
+        return props
 
+    @sanitize
+    async def put(
+        self,
+        object_type,
+        dn,
+        representation: dict = JSONPayload(
+            position=DNSanitizer(required=True),
+            superordinate=DNSanitizer(required=False, allow_none=True),
+            options=DictSanitizer({}, default_sanitizer=BooleanSanitizer()),
+            policies=DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer())),
+            properties=DictSanitizer({}, required=True),
+        ),
+        patch_document: list = PatchRepresentation(),
+    ):
+        """Modify or move an {module.object_name} object"""
+        dn = unquote_dn(dn)
         try:
-            try:
-                obj[property_name] = value
-            except KeyError:
-                if property_name != 'objectFlag':
-                    raise
-            except udm_errors.ipOverridesNetwork as exc:
-                self.add_resource(result, 'udm:warning', {'message': '%s' % exc.message})
-                return
-            except udm_errors.valueMayNotChange:
-                if obj[property_name] == value:  # UDM does not check equality before raising the exception
-                    return
-                raise udm_errors.valueMayNotChange()  # the original exception is ugly!
-            except udm_errors.valueRequired:
-                if value is None:
-                    # examples where this happens:
-                    # "password" of users/user: because password is required but on modify() None is send, which must not alter the current password
-                    # "unixhome" of users/user: is required, set to None in the request, the default value is set afterwards in create(). Bug #50053
-                    if property_name in password_properties:
-                        log.debug('Ignore unsetting password property %s', property_name)
-                    else:
-                        current_value = obj.info.pop(property_name, None)
-                        log.debug('Unsetting property %s value %r', property_name, current_value)
-                    return
-                raise
-        except (udm_errors.valueInvalidSyntax, udm_errors.valueError, udm_errors.valueMayNotChange, udm_errors.valueRequired, udm_errors.noProperty) as exc:
-            exc.message = ''
-            try:
-                self.raise_sanitization_error(property_name, _('The property %(name)s has an invalid value: %(details)s') % {'name': property_name, 'details': str(exc)})
-            except ValidationError as exc:
-                multi_error.add_error(exc, property_name)
+            module, obj = await self.pool_submit(self.get_module_object, object_type, dn, ldap_connection=self.ldap_write_connection)
+        except NotFound:
+            module, obj = None, None
 
-    def set_patch_properties(self, module, obj, patch_document, result):
-        multi_error = MultiValidationError()
-        for path, property_name, op, value in patch_document:
-            if path == 'properties':
-                self.set_patch_property(module, obj, op, property_name, value, result, multi_error)
-            elif path == 'superordinate':
-                if op in ('add', 'replace') or (op == 'remove' and not value):
-                    obj.superordinate = self.superordinate_dn_to_object(module, value)
-                elif op in ('remove',):
-                    if self.ldap_connection.compare_dn(obj.superordinate.dn, value):
-                        obj.superordinate = None
-            elif path == 'options':
-                if op == 'replace':
-                    obj.options = []
-                if op in ('add', 'replace') and value:
-                    obj.options.append(value)
-                if op == 'remove':
-                    if value and value in obj.options:  # TODO: be strict when value not in obj.options?
-                        obj.options.remove(value)
-                    elif not value:
-                        obj.options = []
-            elif path == 'policies':
-                if op == 'replace':
-                    obj.policies = []
-                if op in ('add', 'replace') and value:
-                    obj.policy_reference(value)
-                if op == 'remove':
-                    if value:
-                        obj.policy_dereference(value)
-                    elif not value:
-                        obj.policies = []
+        serverctrls = [PostReadControl(True, ['entryUUID', 'modifyTimestamp', 'entryCSN'])]
+        response = {}
+        if not obj:
+            module = self.get_module(object_type)
+            result = {}
 
-        if multi_error.has_errors():  # TODO: use raise_sanitization_multi_error
-            class FalseSanitizer(Sanitizer):
-                def sanitize(self):
-                    raise multi_error
-            self.sanitize_arguments(FalseSanitizer(), _result_func=lambda x: {'body': x}, _fieldname='patch')
+            obj = await self.create(object_type, dn, representation or patch_document, result, serverctrls=serverctrls, response=response)
+            self.set_header('Location', self.urljoin(quote_dn(obj.dn)))
+            self.set_status(201)
+            self.add_caching(public=False, must_revalidate=True)
 
-    def set_patch_property(self, module, obj, op, property_name, value, result, multi_error):
-        try:
-            prop = module.module.property_descriptions[property_name]
-        except KeyError:
-            if property_name == 'objectFlag':
-                return
-            self.add_resource(result, 'udm:warning', {'message': 'No attribute with name %r in this module, value not set.' % (property_name,)})
+            uuid = _get_post_read_entry_uuid(response)
+
+            result.update({
+                'dn': obj.dn,
+                'uuid': uuid,
+            })
+            self.content_negotiation(result)
             return
 
-        value = prop.syntax.parse_command_line(value)
+        self.set_entity_tags(obj)
 
-        current_values = obj[property_name] if prop.multivalue else [obj[property_name]]
-        current_values = list(current_values or [])
-        if current_values == ['']:
-            current_values = []
+        position = representation.get('position')
+        if position and not self.ldap_write_connection.compare_dn(self.ldap_write_connection.parentDn(dn), position):
+            await self.move(module, dn, position)
+            return
+        else:
+            result = {}
+            obj = await self.modify(module, obj, representation or patch_document, result, serverctrls=serverctrls, response=response)
+            self.set_header('Location', self.urljoin(quote_dn(obj.dn)))
+            self.set_entity_tags(obj, check_conditionals=False)
+            self.add_caching(public=False, must_revalidate=True, no_cache=True, no_store=True)
+            if result:
+                self.content_negotiation(result)
+            else:
+                self.set_status(204)
+            raise Finish()
 
-        if op == 'replace':
-            current_values = []
+    @sanitize
+    async def patch(
+        self,
+        object_type,
+        dn,
+        representation: dict = JSONPayload(
+            position=DNSanitizer(required=False, default=''),
+            superordinate=DNSanitizer(required=False, allow_none=True),
+            options=DictSanitizer({}, default_sanitizer=BooleanSanitizer(), required=False),
+            policies=DictSanitizer({}, default_sanitizer=ListSanitizer(DNSanitizer()), required=False),
+            properties=DictSanitizer({}),
+        ),
+        patch_document: list = PatchRepresentation(),
+    ):
+        """Modify an {module.object_name} object (moving is currently not possible)"""
+        dn = unquote_dn(dn)
+        module, obj = await self.pool_submit(self.get_module_object, object_type, dn, self.ldap_write_connection)
 
-        if op in ('add', 'replace'):
-            if value in current_values:
-                self.add_resource(result, 'udm:warning', {'message': 'cannot append %s to %s, value exists' % (value, property_name)})
-                return
-            if prop.multivalue:
-                value = [*current_values, value]
-            elif op == 'add':
-                self.add_resource(result, 'udm:warning', {'message': 'appending to a single value property (%s) is not supported.' % (property_name,)})
-                return
-        elif op == 'remove' and value is None:
-            pass
-        elif op == 'remove':
-            try:
-                normalized_val = prop.syntax.parse(value)
-            except (univention.admin.uexceptions.valueInvalidSyntax, univention.admin.uexceptions.valueError):
-                normalized_val = None
+        self.set_entity_tags(obj)
 
-            if value in current_values:
-                current_values.remove(value)
-            elif normalized_val is not None and normalized_val in current_values:
-                current_values.remove(normalized_val)
-            else:
-                self.add_resource(result, 'udm:warning', {'message': 'cannot remove %s from %s, value does not exist' % (value, property_name)})
-                return
+        if not patch_document:
+            entry = Object.get_representation(module, obj, ['*'], self.ldap_write_connection, False)
+            if representation['options'] is None:
+                representation['options'] = entry['options']
+            if representation['policies'] is None:
+                representation['policies'] = entry['policies']
+            if representation['properties'] is None:
+                representation['properties'] = {}
+            if representation['position'] is None:
+                representation['position'] = entry['position']
+            if representation['superordinate'] is None:
+                representation['superordinate'] = entry.get('superordinate')
+        else:
+            representation = patch_document
 
-            value = current_values if prop.multivalue else None
+        serverctrls = [PostReadControl(True, ['entryUUID', 'modifyTimestamp', 'entryCSN'])]
+        response = {}
+        result = {}
+        obj = await self.modify(module, obj, representation, result, serverctrls=serverctrls, response=response)
 
-        password_properties = module.password_properties
-        self.set_property(obj, property_name, value, result, multi_error, password_properties)
+        self.set_entity_tags(obj, check_conditionals=False)
+        self.add_caching(public=False, must_revalidate=True, no_cache=True, no_store=True)
+        self.set_header('Location', self.urljoin(quote_dn(obj.dn)))
+        if result:
+            self.content_negotiation(result)
+        else:
+            self.set_status(204)
+        raise Finish()
 
     async def move(self, module, dn, position):
         if module.childs:
@@ -2347,15 +2628,7 @@ class Object(ConditionalResource, FormBase, _OpenAPIBase, Resource):
         self.set_entity_tags(obj, remove_after_check=True)
 
         try:
-            def remove():
-                try:
-                    log.info('Removing LDAP object %s', dn)
-                    obj.remove(remove_childs=recursive)
-                    if cleanup:
-                        udm_objects.performCleanup(obj)
-                except udm_errors.base as exc:
-                    UDM_Error(exc).reraise()
-            await self.pool_submit(remove)
+            await self.pool_submit(self.remove_object, obj, recursive, cleanup)
         except udm_errors.primaryGroupUsed:
             raise
         self.add_caching(public=False, must_revalidate=True)
@@ -3179,6 +3452,7 @@ class Application(tornado.web.Application):
             (f"/udm/(networks/network)/{dn}/next-free-ip-address", NextFreeIpAddress),
             (f"/udm/(users/user)/{dn}/service-specific-password", ServiceSpecificPassword),
             ("/udm/progress/([a-z0-9]{8}-[a-z0-9]{4}-[a-z0-9]{4}-[a-z0-9]{4}-[a-z0-9]{12})", Operations),
+            ("/udm/batch", Batch),
             (r"/udm/((?:css|js|img|schema|swaggerui)/.*)", tornado.web.StaticFileHandler, {"path": "/var/www/univention/udm", "default_filename": "index.html"}),
             # TODO: decorator for dn argument, which makes sure no invalid dn syntax is used
         ], default_handler_class=Nothing, **settings)
@@ -177,6 +177,7 @@ class RelationsBase:
             'license-check': 'Check if the license limits are reached',
             'license-import': 'Import a new license in LDIF format',
             'service-specific-password': 'Generate a new service specific password',
+            'batch': 'create, modify or remove many objects with a single request',
             'error': 'Error',
             'warning': 'Warning',
         }
@@ -405,6 +406,8 @@ class _OpenAPIBase:
             },
             'object.delete.query.recursive': {
             },
+            'batch.post.query.parallelism': {
+            },
             'user-agent': {
                 "in": "header",
                 "name": "User-Agent",
@@ -644,8 +647,8 @@ class _OpenAPIBase:
         def _openapi_quote(string):
             return string.replace('~', '~0').replace('/', '~1')
 
-        from univention.admin.rest.module import Object, ObjectAdd, Objects
-        classes = {'object': Object, 'objects': Objects, 'template': ObjectAdd}
+        from univention.admin.rest.module import Batch, Object, ObjectAdd, Objects
+        classes = {'object': Object, 'objects': Objects, 'template': ObjectAdd, 'batch': Batch}
         for name, klass in classes.items():
             for method in ('get', 'post', 'put', 'delete'):
                 func = getattr(klass, method, None)
@@ -749,8 +752,10 @@ class _OpenAPIBase:
                     "tags": [tag],
                 }
                 openapi_responses['objects.%s.get.response.success' % (model_name,)] = {
-                    "description": "Successfull search (if query parameters were given) or a object type overview.",
-                    "content": content_schema_ref(f"#/components/schemas/{_openapi_quote(model_name)}.list"),
+                    "description": "Successfull search (if query parameters were given) or a object type overview. With `Accept: application/x-ndjson` the found objects are streamed as one JSON document per line.",
+                    "content": dict(content_schema_ref(f"#/components/schemas/{_openapi_quote(model_name)}.list"), **{
+                        'application/x-ndjson': {'schema': {'$ref': f"#/components/schemas/{_openapi_quote(model_name)}"}},
+                    }),
                     "headers": global_response_headers(),
                     "links": _search_links,
                 }
@@ -1031,6 +1036,54 @@ class _OpenAPIBase:
                 },
             }
 
+        if not object_type:
+            openapi_tags.append({
+                'description': 'Create, modify or remove many objects of any object type.',
+                'name': 'batch',
+            })
+            openapi_schemas['batch-operation'] = _param_to_openapi(Param(Batch.operation_sanitizer))['schema']
+            openapi_schemas['batch-operation']['properties']['id'] = {
+                'description': 'An identifier of the operation, which is returned unchanged in the result of the operation.',
+            }
+            openapi_schemas['batch-operation']['required'] = ['action', 'object_type']
+            openapi_schemas['batch-result'] = {
+                'type': 'object',
+                'properties': {
+                    'index': {'type': 'integer', 'description': 'The position of the operation in the request.'},
+                    'id': {'description': 'The identifier of the operation, if given.'},
+                    'status': {'type': 'integer', 'description': 'The HTTP status code of the operation.'},
+                    'dn': {'$ref': '#/components/schemas/dn'},
+                    'uuid': {'$ref': '#/components/schemas/uuid'},
+                    'uri': {'type': 'string', 'format': 'uri'},
+                    'error': {'type': 'object', 'additionalProperties': True},
+                },
+            }
+            openapi_paths['/batch'] = {
+                'post': {
+                    'summary': docstring('batch', 'post', None),
+                    'operationId': 'udm:batch',
+                    'parameters': [
+                        {'$ref': '#/components/parameters/batch.post.query.parallelism'},
+                        *global_parameters,
+                    ],
+                    'requestBody': {
+                        'content': {
+                            'application/x-ndjson': {'schema': {'$ref': '#/components/schemas/batch-operation'}},
+                            'application/json': {'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/batch-operation'}}},
+                        },
+                        'required': True,
+                    },
+                    'responses': global_responses({
+                        200: {
+                            'description': 'The results of the operations, one JSON object per line in the order of completion.',
+                            'headers': global_response_headers(),
+                            'content': {'application/x-ndjson': {'schema': {'$ref': '#/components/schemas/batch-result'}}},
+                        },
+                    }),
+                    'tags': ['batch'],
+                },
+            }
+
         url = list(urlparse(self.abspath('')))
         fqdn = '%(hostname)s.%(domainname)s' % ucr
         urls = [
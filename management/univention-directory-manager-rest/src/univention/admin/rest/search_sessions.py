@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+#
+# Univention Management Console
+#  Univention Directory Manager Module
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+"""
+Storage of the paging cookies of searches.
+
+The cookie to continue a search after a page is stored under a key derived from the search parameters and the page number.
+The LDAP server only accepts a Simple Paged Results cookie on the connection which issued it. So the cookies are kept in a
+LRU cache local to each process and are not shared with other processes or REST API servers, where they would always be rejected.
+Requests for later pages of a search, which are answered by another process, walk through the pages from the first one.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+
+from univention.config_registry import ucr
+
+
+class SearchSessions:
+    """The paging cookies of searches of the current process."""
+
+    def __init__(self, ttl: int = 300, size: int = 1000) -> None:
+        self.ttl = ttl
+        self.size = size
+        self._cache: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    @staticmethod
+    def key(search: tuple, page: int) -> str:
+        return hashlib.sha256(json.dumps([search, page], default=str).encode('UTF-8')).hexdigest()
+
+    def get(self, search: tuple, page: int) -> bytes | None:
+        """Get the cookie to continue the search after the given page."""
+        key = self.key(search, page)
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        if cached[1] < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return cached[0]
+
+    def set(self, search: tuple, page: int, cookie: bytes) -> None:
+        """Store the cookie to continue the search after the given page."""
+        key = self.key(search, page)
+        self._cache[key] = (cookie, time.monotonic() + self.ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+    def pop(self, search: tuple, page: int) -> None:
+        self._cache.pop(self.key(search, page), None)
+
+
+search_sessions = SearchSessions(
+    ttl=ucr.get_int('directory/manager/rest/search-sessions/ttl', 300),
+    size=ucr.get_int('directory/manager/rest/search-sessions/cache-size', 1000),
+)
@@ -43,7 +43,6 @@ class _SharedMemory(managers.SyncManager):
 
     children = {}
     queue = {}
-    search_sessions = {}
     authenticated = {}
 
     def start(self, *args, **kwargs):
@@ -56,7 +55,6 @@ class _SharedMemory(managers.SyncManager):
         # we must create the parent dictionary instance before forking but after Python importing
         self.children = self.dict()
         self.queue = self.dict()
-        self.search_sessions = self.dict()
         self.authenticated = self.dict()
 
 
@@ -34,6 +34,8 @@
 
 from html import escape
 
+import ldap
+
 import univention.admin.mapping as ua_mapping
 import univention.admin.modules as ua_modules
 import univention.admin.objects as ua_objects
@@ -117,6 +119,11 @@ class AdminConnection:
     def clear_cache(self):
         del self._cached
         self._cached = {}
+        self._policies = {}
+
+    def prefetch_policies(self, dns):
+        """Resolve the policies of the objects of a report together, so that their shared containers and policies are only read once."""
+        self._policies.update(self._access.getPoliciesMany([dn for dn in dns if dn not in self._cached]))
 
     def get_object(self, module, dn):
         if dn in self.__reverse:  # this value has been escaped => use <self.__reverse> to unescape
@@ -234,7 +241,9 @@ class AdminConnection:
 
     def _get_policies(self, obj):
         dict = {}
-        policies = self._access.getPolicies(obj.dn)
+        policies = self._policies.pop(obj.dn, None)
+        if policies is None:
+            policies = self._access.getPolicies(obj.dn)
         for policy_oc, attrs in policies.items():
             module_name = ua_objects.ocToType(policy_oc)
             module = ua_modules.get(module_name)
@@ -271,6 +280,16 @@ def clear_cache():
     _admin.clear_cache()
 
 
+def prefetch_policies(dns):
+    if not _admin:
+        return
+    try:
+        _admin.prefetch_policies(dns)
+    except (ldap.LDAPError, ua_exceptions.ldapError) as exc:
+        # the policies are then resolved for each object
+        ud.debug(ud.ADMIN, ud.WARN, 'Resolving the policies of the report objects failed: %s' % (exc,))
+
+
 def get_object(module, dn):
     if not _admin:
         return None
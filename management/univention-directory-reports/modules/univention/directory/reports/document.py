@@ -120,6 +120,7 @@ class Document:
         elif self._header:
             self.__append_file(fd, self._header)
 
+        admin.prefetch_policies([dn for dn in objects if isinstance(dn, str)])
         for dn in objects:
             if isinstance(dn, str):
                 obj = admin.get_object(None, dn)
@@ -639,7 +639,7 @@ class Instance(Base, ProgressMixin, metaclass=UDMModuleMeta):
         scope = request.options.get('scope', 'sub')
         hidden = request.options.get('hidden')
         fields = (set(request.options.get('fields', []) or []) | {objectProperty}) - {'name', 'None'}
-        result = module.search(container, objectProperty, objectPropertyValue, superordinate, scope=scope, hidden=hidden, allow_asterisks=USE_ASTERISKS)
+        result = module.search(container, objectProperty, objectPropertyValue, superordinate, scope=scope, hidden=hidden, allow_asterisks=USE_ASTERISKS, stream=True)
         if result is None:
             return []
 
@@ -43,6 +43,7 @@ import re
 import sys
 import threading
 import traceback
+from contextlib import contextmanager
 from functools import reduce
 from json import load
 
@@ -658,8 +659,15 @@ class UDM_Module:
             MODULE.warn('Failed to modify LDAP object %s: %s: %s' % (obj.dn, e.__class__.__name__, str(e)))
             UDM_Error(e).reraise()
 
-    def search(self, container=None, attribute=None, value=None, superordinate=None, scope='sub', filter='', simple=False, simple_attrs=None, hidden=True, serverctrls=None, response=None, allow_asterisks=True):
-        """Searches for LDAP objects based on a search pattern"""
+    def search(self, container=None, attribute=None, value=None, superordinate=None, scope='sub', filter='', simple=False, simple_attrs=None, hidden=True, serverctrls=None, response=None, allow_asterisks=True, stream=False):
+        """
+        Searches for LDAP objects based on a search pattern
+
+        With `stream` the UDM objects are returned by a generator, which
+        fetches them page wise from LDAP while being consumed. The sizelimit
+        is then enforced while consuming, so objects may have been returned
+        before :class:`SearchLimitReached` is raised.
+        """
         ldap_connection, ldap_position = self.get_ldap_connection()
         if container == 'all':
             container = ldap_position.getBase()
@@ -671,9 +679,12 @@ class UDM_Module:
             filter_s = self._object_property_filter(attribute, value, hidden, allow_asterisks)
 
         MODULE.info('Searching for LDAP objects: container = %s, filter = %s, superordinate = %s' % (container, filter_s, superordinate))
-        result = None
-        try:
-            sizelimit = int(ucr.get('directory/manager/web/sizelimit', '2000') or 2000)
+        sizelimit = int(ucr.get('directory/manager/web/sizelimit', '2000') or 2000)
+        if stream and not serverctrls and not (simple and self.allows_simple_lookup()) and self.module:
+            return self._isearch(ldap_connection, filter_s, container, superordinate, scope, sizelimit)
+
+        result = []
+        with self._search_errors(ldap_connection, container, superordinate):
             if simple and self.allows_simple_lookup():
                 lookup_filter = self.lookup_filter(filter, ldap_connection)
                 if lookup_filter is None:
@@ -685,15 +696,39 @@ class UDM_Module:
                         result = ldap_connection.searchDn(filter=str(lookup_filter), base=container, scope=scope, sizelimit=sizelimit, serverctrls=serverctrls, response=response)
             else:
                 if self.module:
-                    kwargs = {}
-                    if serverctrls and 'serverctrls' in inspect.getfullargspec(self.module.lookup).args:  # not every UDM handler supports serverctrls
-                        kwargs['serverctrls'] = serverctrls
-                        kwargs['response'] = response
+                    kwargs = self._lookup_serverctrls(serverctrls, response)
                     result = self.module.lookup(None, ldap_connection, filter_s, base=container, superordinate=superordinate, scope=scope, sizelimit=sizelimit, **kwargs)
                 else:
                     result = None
+
+        # call the garbage collector manually as many parallel request may cause the
+        # process to use too much memory
+        MODULE.info('Triggering garbage collection')
+        gc.collect()
+
+        return result
+
+    def _isearch(self, ldap_connection, filter_s, container, superordinate, scope, sizelimit):
+        # the search itself is unlimited, so that it is always paged, and the sizelimit is enforced while the objects are consumed
+        with self._search_errors(ldap_connection, container, superordinate):
+            for found, obj in enumerate(udm_modules.ilookup(self.module, None, ldap_connection, filter_s, base=container, superordinate=superordinate, scope=scope, sizelimit=0), 1):
+                if sizelimit and found > sizelimit:
+                    raise udm_errors.ldapSizelimitExceeded()
+                yield obj
+
+    def _lookup_serverctrls(self, serverctrls, response):
+        kwargs = {}
+        if serverctrls and 'serverctrls' in inspect.getfullargspec(self.module.lookup).args:  # not every UDM handler supports serverctrls
+            kwargs['serverctrls'] = serverctrls
+            kwargs['response'] = response
+        return kwargs
+
+    @contextmanager
+    def _search_errors(self, ldap_connection, container, superordinate):
+        try:
+            yield
         except udm_errors.insufficientInformation:
-            return []
+            return
         except udm_errors.ldapTimeout:
             raise SearchTimeoutError()
         except udm_errors.ldapSizelimitExceeded:
@@ -708,13 +743,6 @@ class UDM_Module:
                     raise ObjectDoesNotExist(container)
             UDM_Error(e).reraise()
 
-        # call the garbage collector manually as many parallel request may cause the
-        # process to use too much memory
-        MODULE.info('Triggering garbage collection')
-        gc.collect()
-
-        return result
-
     def get(self, ldap_dn=None, superordinate=None, attributes=[]):
         """Retrieves details for a given LDAP object"""
         ldap_connection, _ldap_position = self.get_ldap_connection()
@@ -65,14 +65,17 @@ used
 """
 
 
+import hashlib
 import itertools
 import json
 import operator
 import os
+import time
 import traceback
 from fnmatch import fnmatch
 
 import ldap
+import ldap.dn
 from ldap.filter import filter_format
 
 import univention.admin.handlers.computers.domaincontroller_backup as dc_backup
@@ -81,7 +84,7 @@ import univention.admin.handlers.computers.domaincontroller_slave as dc_slave
 import univention.admin.uexceptions as udm_errors
 from univention.admin.handlers.computers import memberserver
 
-from .config import ucr
+from .config import ACL_CACHE_TTL, ACL_SERVICE_CACHE_TTL, ucr
 from .log import ACL
 
 
@@ -120,6 +123,158 @@ class Rule(dict):  # noqa: PLW1641
         return self.fromUser == other.fromUser and self.host == other.host and self.command == other.command and self.flavor == other.flavor and self.options == other.options
 
 
+class _CompiledRules:
+    """
+    The rules applying to one host, indexed by their command pattern.
+
+    Rules with a command without wildcard are looked up by the command,
+    rules with a trailing wildcard by the prefixes of the command. The
+    option and flavor patterns are converted into simple comparisons.
+    """
+
+    def __init__(self, rules):
+        self.commands = {}
+        self.prefixes = {}
+        for rule in rules:
+            matcher = (self._compile_options(rule.options), self._compile_flavor(rule.flavor))
+            command = rule.command
+            if command.endswith('*'):
+                self.prefixes.setdefault(command[:-1], []).append(matcher)
+            else:
+                self.commands.setdefault(command, []).append(matcher)
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes})
+
+    @staticmethod
+    def _compile_options(options):
+        forbidden = []
+        patterns = []
+        for key, value in options.items():
+            # a key starting with ! means it may not be available
+            if key.startswith('!'):
+                forbidden.append(key[1:])
+            if value is not None:
+                patterns.append((key, value[:-1] if value.endswith('*') else value, value.endswith('*')))
+        return tuple(forbidden), tuple(patterns)
+
+    @staticmethod
+    def _compile_flavor(flavor):
+        if flavor is None or flavor == '*':
+            return None
+        return (flavor, flavor[:-1] if flavor.endswith('*') else None)
+
+    def is_allowed(self, command, options, flavor):
+        if any(self._match(matcher, options, flavor) for matcher in self.commands.get(command, ())):
+            return True
+        for length in self.prefix_lengths:
+            if length > len(command):
+                break
+            if any(self._match(matcher, options, flavor) for matcher in self.prefixes.get(command[:length], ())):
+                return True
+        return False
+
+    @staticmethod
+    def _match(matcher, opts, flavor):
+        (forbidden, patterns), flavor_pattern = matcher
+        if flavor_pattern is not None:
+            exact, prefix = flavor_pattern
+            if flavor != exact and not (prefix is not None and flavor and flavor.startswith(prefix)):
+                return False
+        if any(key in opts for key in forbidden):
+            return False
+        for key, value, is_prefix in patterns:
+            if key not in opts:  # no rule available -> OK
+                continue
+            options = (opts[key],) if isinstance(opts[key], str) else opts[key]
+            for option in options:
+                if not (option.startswith(value) if is_prefix else option == value):
+                    return False
+        return True
+
+
+class _LDAPCache:
+    """
+    Cache of the LDAP data needed to resolve ACLs, shared between all
+    sessions of the UMC server.
+
+    Operation sets are trusted for `ttl` seconds. After that all stale
+    operation sets of a user are validated by a single search for their
+    `entryCSN` and only the changed ones are read again. The hosts
+    providing a service are looked up again after `service_ttl` seconds.
+
+    The policies granting the operation sets to the user and the groups are
+    read by :py:meth:`univention.uldap.access.getPoliciesMany`, whose cache
+    is validated by `entryCSN` unless `ldap/client/policy-cache/ttl` is set.
+    Changed policies then take effect after at most that many seconds.
+
+    :param float ttl: Number of seconds an operation set is used without validation.
+    :param float service_ttl: Number of seconds the hosts providing a service are cached.
+    """
+
+    OPERATION_SET_ATTRIBUTES = ['umcOperationSetHost', 'umcOperationSetFlavor', 'umcOperationSetCommand']
+
+    def __init__(self, ttl, service_ttl):
+        self.ttl = ttl
+        self.service_ttl = service_ttl
+        self._operation_sets = {}
+        self._services = {}
+
+    @staticmethod
+    def key(dn):
+        """Returns the normalized DN used as key of an operation set."""
+        try:
+            return ldap.dn.dn2str(ldap.dn.str2dn(dn)).lower()
+        except ldap.DECODING_ERROR:
+            return dn.lower()
+
+    def operation_sets(self, lo, dns):
+        """Returns a dictionary mapping the normalized DN of each given operation set to its attributes, see :py:meth:`key`."""
+        now = time.monotonic()
+        result = {}
+        stale = {}
+        for dn in dns:
+            key = self.key(dn)
+            checked, csn, attrs = self._operation_sets.get(key, (None, None, None))
+            if checked is not None and now - checked < self.ttl:
+                result[key] = attrs
+            else:
+                stale[key] = (dn, csn)
+
+        current = {}
+        if stale:
+            ldap_filter = '(|%s)' % ''.join(filter_format('(entryDN=%s)', [dn]) for dn, _csn in stale.values())
+            current = {self.key(dn): attrs.get('entryCSN', [None])[0] for dn, attrs in lo.search(filter=ldap_filter, attr=['entryCSN'])}
+        for key, (dn, csn) in stale.items():
+            if key not in current:
+                self._operation_sets.pop(key, None)
+                result[key] = {}
+                continue
+            if csn is None or csn != current[key]:
+                attrs = lo.get(dn, [*self.OPERATION_SET_ATTRIBUTES, 'entryCSN'])
+                csn = attrs.pop('entryCSN', [None])[0]
+            else:
+                attrs = self._operation_sets[key][2]
+            self._operation_sets[key] = (now, csn, attrs)
+            result[key] = attrs
+        return result
+
+    def service_hosts(self, lo, service, base):
+        """Returns the names of all servers providing the given service."""
+        now = time.monotonic()
+        checked, hosts = self._services.get(service, (None, None))
+        if checked is None or now - checked >= self.service_ttl:
+            hosts = []
+            for role in ACLs._systemroles:
+                servers = role.lookup(None, lo, filter_format('univentionService=%s', [service]), base=base)
+                hosts.extend(server['name'] for server in servers if 'name' in server)
+            self._services[service] = (now, hosts)
+        return hosts
+
+    def clear(self):
+        """Forget all cached entries."""
+        self._operation_sets.clear()
+        self._services.clear()
+
+
 class ACLs:
     """
     Provides methods to determine the access rights of users to
@@ -138,12 +293,19 @@ class ACLs:
 
     def __init__(self, ldap_base=None, acls=None):
         self.__ldap_base = ldap_base
+        self.__compiled = {}
+        self.__hash = None
         self.acls = []
         if acls:
             self.acls = [Rule(x) for x in acls]
 
     def reload(self):
         self.acls = []
+        self._invalidate()
+
+    def _invalidate(self):
+        self.__compiled = {}
+        self.__hash = None
 
     def _expand_hostlist(self, lo, hostlist):
         hosts = []
@@ -158,11 +320,7 @@ class ACLs:
                     hosts.append(ucr['hostname'])
             elif host.startswith('service:'):
                 service = host[len('service:'):]
-                for role in ACLs._systemroles:
-                    servers = role.lookup(None, lo, filter_format('univentionService=%s', [service]), base=self.__ldap_base)
-                    for server in servers:
-                        if 'name' in server:
-                            hosts.append(server['name'])
+                hosts.extend(_cache.service_hosts(lo, service, self.__ldap_base))
             elif host == '*':
                 hosts.append(ucr['hostname'])
             elif fnmatch(ucr['hostname'], host):
@@ -192,6 +350,7 @@ class ACLs:
                 command, options = self.__parse_command(command.decode('utf-8'))
                 new_rule = Rule({'fromUser': fromUser, 'host': host, 'command': command, 'options': options, 'flavor': flavor[0].decode('utf-8')})
                 self.acls.append(new_rule)
+        self._invalidate()
 
     def __compare_rules(self, rule1, rule2):
         """Hacky version of rule comparison"""
@@ -210,71 +369,12 @@ class ACLs:
             else:
                 return rule2
 
-    def __option_match(self, opt_pattern, opts):
-        match = ACLs.MATCH_FULL
-        for key, value in opt_pattern.items():
-            # a key starting with ! means it may not be available
-            if key.startswith('!') and key[1:] in opts:
-                return ACLs.MATCH_NONE
-            # else if key not in opts no rule available -> OK
-            if key not in opts:
-                continue
-
-            if isinstance(opts[key], str):
-                options = (opts[key], )
-            else:
-                options = opts[key]
-            for option in options:
-                if not value.endswith('*'):
-                    if value != option:
-                        return ACLs.MATCH_NONE
-                elif not option.startswith(value[: -1]):
-                    return ACLs.MATCH_NONE
-
-            match = ACLs.MATCH_FULL
-
-        return match
-
-    def __command_match(self, cmd1, cmd2):
-        """
-        if cmd1 == cmd2 return self.COMMAND_MATCH
-        if cmd2 is part of cmd1 return self.COMMAND_PART
-        if noting return self.COMMAND_NONE
-        """
-        if cmd1 == cmd2:
-            return ACLs.MATCH_FULL
-
-        if cmd1 and cmd1.endswith('*') and cmd2.startswith(cmd1[:-1]):
-            return ACLs.MATCH_PART
-
-        return ACLs.MATCH_NONE
-
-    def __flavor_match(self, flavor1, flavor2):
-        """
-        if flavor1 == flavor2 or flavor1 is None or the pattern '*' return self.COMMAND_MATCH
-        if flavor2 is part of flavor1 return self.COMMAND_PART
-        if noting return self.COMMAND_NONE
-        """
-        if flavor1 == flavor2 or flavor1 is None or flavor1 == '*':
-            return ACLs.MATCH_FULL
-
-        if flavor1.endswith('*') and flavor2 and flavor2.startswith(flavor1[:-1]):
-            return ACLs.MATCH_PART
-
-        return ACLs.MATCH_NONE
-
-    def _is_allowed(self, acls, command, hostname, options, flavor):
-        for rule in acls:
-            if hostname and rule.host != '*' and rule.host != hostname:
-                continue
-            match = self.__command_match(rule.command, command)
-            opt_match = self.__option_match(rule.options, options)
-            flavor_match = self.__flavor_match(rule.flavor, flavor)
-            if match in (ACLs.MATCH_PART, ACLs.MATCH_FULL) and opt_match == ACLs.MATCH_FULL and flavor_match in (ACLs.MATCH_PART, ACLs.MATCH_FULL):
-                return True
-
-        # default is to prohibit the command execution
-        return False
+    def _compiled(self, hostname):
+        """Returns the rules applying to the given host, compiled once per set of ACLs."""
+        compiled = self.__compiled.get(hostname)
+        if compiled is None:
+            compiled = self.__compiled[hostname] = _CompiledRules(rule for rule in self.acls if rule.host in ('*', hostname))
+        return compiled
 
     def is_command_allowed(self, command, hostname=None, options={}, flavor=None):
         """
@@ -290,12 +390,13 @@ class ACLs:
         if not hostname:
             hostname = ucr['hostname']
 
-        # first check the group rules. If the group policy allows the
-        # command there is no need to check the user policy
-        user_rules = [x for x in self.acls if x.fromUser]
-        group_rules = [x for x in self.acls if not x.fromUser]
+        return self._compiled(hostname).is_allowed(command, options, flavor)
 
-        return self._is_allowed(user_rules + group_rules, command, hostname, options, flavor)
+    def hash(self):
+        """Returns a hash of the ACL definitions, which is equal for users having the same rules."""
+        if self.__hash is None:
+            self.__hash = hashlib.sha256(json.dumps(sorted(json.dumps(rule, sort_keys=True) for rule in self.acls)).encode('UTF-8')).hexdigest()
+        return self.__hash
 
     def _dump(self):
         """Dumps the ACLs for the user"""
@@ -318,6 +419,7 @@ class ACLs:
             return False
 
         self.acls = []
+        self._invalidate()
         for rule in acls:
             if rule not in self.acls:
                 if 'flavor' not in rule:
@@ -369,16 +471,14 @@ class LDAP_ACLs(ACLs):
 
         self._dump()
 
-    def _get_policy_for_dn(self, lo, dn):
-        policy = lo.getPolicies(dn, policies=[], attrs={}, result={}, fixedattrs={})
-
-        return policy.get('umcPolicy', None)
-
     def _read_from_ldap(self, lo):
         # TODO: check for fixed attributes
         try:
             userdn = lo.searchDn(filter_format('(&(objectClass=person)(uid=%s))', [self.username]), unique=True)[0]
-            policy = self._get_policy_for_dn(lo, userdn)
+            # TODO: check for nested groups
+            groupDNs = lo.searchDn(filter=filter_format('uniqueMember=%s', [userdn]))
+            # the containers and policies shared by the user and the groups are only validated once
+            policies = lo.getPoliciesMany([userdn, *groupDNs])
         except (udm_errors.base, ldap.LDAPError, IndexError) as exc:
             if not isinstance(exc, IndexError):
                 ACL.warn('Error reading credentials from LDAP for user %s: %s' % (self.username, traceback.format_exc()))
@@ -386,18 +486,22 @@ class LDAP_ACLs(ACLs):
             self._read_from_file(self.username)
             return
 
+        granted = []
+        policy = policies[userdn].get('umcPolicy')
         if policy and 'umcPolicyGrantedOperationSet' in policy:
             for value in policy['umcPolicyGrantedOperationSet']['value']:
-                self._append(lo, LDAP_ACLs.FROM_USER, lo.get(value.decode('UTF-8')))
-
-        # TODO: check for nested groups
-        groupDNs = lo.searchDn(filter=filter_format('uniqueMember=%s', [userdn]))
+                granted.append((LDAP_ACLs.FROM_USER, value.decode('UTF-8')))
 
         for gDN in groupDNs:
-            policy = self._get_policy_for_dn(lo, gDN)
+            policy = policies[gDN].get('umcPolicy')
             if policy and 'umcPolicyGrantedOperationSet' in policy:
                 for value in policy['umcPolicyGrantedOperationSet']['value']:
-                    self._append(lo, LDAP_ACLs.FROM_GROUP, lo.get(value.decode('UTF-8')))
+                    granted.append((LDAP_ACLs.FROM_GROUP, value.decode('UTF-8')))
+
+        # most operation sets are granted by many groups, so each one is only read once
+        operation_sets = _cache.operation_sets(lo, {dn for _from_user, dn in granted})
+        for from_user, dn in granted:
+            self._append(lo, from_user, operation_sets[_cache.key(dn)])
 
         # make the ACLs unique
         self.acls.sort(key=operator.itemgetter('fromUser', 'host', 'command', 'flavor'))
@@ -407,3 +511,7 @@ class LDAP_ACLs(ACLs):
             result.append(next(g))
 
         self.acls[:] = result
+        self._invalidate()
+
+
+_cache = _LDAPCache(ACL_CACHE_TTL, ACL_SERVICE_CACHE_TTL)
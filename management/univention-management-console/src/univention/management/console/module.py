@@ -421,8 +421,13 @@ class Manager(dict):
 
     DIRECTORY = os.path.join(sys.prefix, 'share/univention-management-console/modules')
 
+    #: maximum number of different ACLs whose permitted commands are cached
+    CACHE_SIZE = 1000
+
     def __init__(self):
         dict.__init__(self)
+        self.__signature = None
+        self.__permitted_commands = {}
 
     def modules(self):
         """Returns list of module names"""
@@ -431,13 +436,21 @@ class Manager(dict):
     def load(self):
         """
         Loads the list of available modules. As the list is cleared
-        before, the method can also be used for reloading
+        before, the method can also be used for reloading. The files are
+        only parsed again if any of them was added, removed or modified.
         """
+        filenames = sorted(filename for filename in os.listdir(Manager.DIRECTORY) if filename.endswith('.xml'))
+        try:
+            signature = [(filename, os.stat(os.path.join(Manager.DIRECTORY, filename)).st_mtime_ns) for filename in filenames]
+        except FileNotFoundError:  # removed while listing
+            signature = None
+        if signature is not None and signature == self.__signature:
+            RESOURCES.debug('Modules are unchanged')
+            return
+
         RESOURCES.info('Loading modules ...')
         modules = {}
-        for filename in os.listdir(Manager.DIRECTORY):
-            if not filename.endswith('.xml'):
-                continue
+        for filename in filenames:
             try:
                 parsed_xml = ET.parse(os.path.join(Manager.DIRECTORY, filename))  # noqa: S314
                 RESOURCES.debug('Loaded module %s' % filename)
@@ -453,6 +466,8 @@ class Manager(dict):
                 continue
         self.clear()
         self.update(modules)
+        self.__signature = signature
+        self.__permitted_commands.clear()
 
     def is_command_allowed(self, acls, command, hostname=None, options={}, flavor=None):
         for module_xmls in self.values():
@@ -479,7 +494,19 @@ class Manager(dict):
         according to the ACLs (instance of LDAP_ACLs)
 
         { id : Module, ... }
+
+        The result is cached for users with the same ACLs until the
+        modules or the UCR variables deactivating them change.
         """
+        key = (acls.hash(), hostname, tuple(sorted((key, value) for key, value in ucr.items() if key.startswith('umc/module/') and key.endswith('/disabled'))))
+        modules = self.__permitted_commands.get(key)
+        if modules is None:
+            if len(self.__permitted_commands) >= self.CACHE_SIZE:
+                self.__permitted_commands.clear()
+            modules = self.__permitted_commands[key] = self._permitted_commands(hostname, acls)
+        return dict(modules)
+
+    def _permitted_commands(self, hostname, acls):
         RESOURCES.info('Retrieving list of permitted commands')
         modules = {}
         for module_id in self:
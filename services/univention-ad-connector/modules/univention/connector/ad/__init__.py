@@ -35,6 +35,7 @@
 
 import base64
 import calendar
+import concurrent.futures
 import copy
 import os
 import re
@@ -60,6 +61,8 @@ import univention.connector.ad.mapping
 import univention.debug2 as ud
 import univention.uldap
 from univention.config_registry import ConfigRegistry
+from univention.connector.groupcache import GroupMemberCache
+from univention.connector.workers import SyncStatistics, is_independent
 
 
 LDAP_SERVER_SHOW_DELETED_OID = "1.2.840.113556.1.4.417"
@@ -67,6 +70,8 @@ LDB_CONTROL_DOMAIN_SCOPE_OID = "1.2.840.113556.1.4.1339"
 
 # page results
 PAGE_SIZE = 1000
+# number of USNs searched at once for changes
+USN_WINDOW = 10000
 
 
 class netbiosDomainnameNotFound(Exception):
@@ -89,27 +94,33 @@ def set_univentionObjectFlag_to_synced(connector, key, ucs_object):
 
 
 def group_members_sync_from_ucs(connector, key, object):
-    return connector.group_members_sync_from_ucs(key, object)
+    with connector.membership_lock:
+        return connector.group_members_sync_from_ucs(key, object)
 
 
 def object_memberships_sync_from_ucs(connector, key, object):
-    return connector.object_memberships_sync_from_ucs(key, object)
+    with connector.membership_lock:
+        return connector.object_memberships_sync_from_ucs(key, object)
 
 
 def group_members_sync_to_ucs(connector, key, object):
-    return connector.group_members_sync_to_ucs(key, object)
+    with connector.membership_lock:
+        return connector.group_members_sync_to_ucs(key, object)
 
 
 def object_memberships_sync_to_ucs(connector, key, object):
-    return connector.object_memberships_sync_to_ucs(key, object)
+    with connector.membership_lock:
+        return connector.object_memberships_sync_to_ucs(key, object)
 
 
 def primary_group_sync_from_ucs(connector, key, object):
-    return connector.primary_group_sync_from_ucs(key, object)
+    with connector.membership_lock:
+        return connector.primary_group_sync_from_ucs(key, object)
 
 
 def primary_group_sync_to_ucs(connector, key, object):
-    return connector.primary_group_sync_to_ucs(key, object)
+    with connector.membership_lock:
+        return connector.primary_group_sync_to_ucs(key, object)
 
 
 def disable_user_from_ucs(connector, key, object):
@@ -483,6 +494,8 @@ class ad(univention.connector.ucs):
         # * entry flushed during delete+move at in sync_to_ucs and sync_from_ucs
         self.group_member_mapping_cache_con = {}
 
+        groupcachedbfile = '/etc/univention/%s/groupcache.sqlite' % self.CONFIGBASENAME
+
         # Save the old members of a group
         # The connector is object based, at least in the direction AD/AD to LDAP, because we don't
         # have a local cache. group_members_cache_ucs and group_members_cache_con help to
@@ -493,22 +506,45 @@ class ad(univention.connector.ucs):
         # from the group. For this we remove only members who are in the local cache.
 
         # UCS groups and UCS members
-        # * initialized during start
+        # * initialized during start, persisted in groupcache.sqlite and only updated for the groups changed meanwhile
         # * entry updated in group_members_sync_from_ucs and object_memberships_sync_from_ucs
         # * entry flushed for group object in sync_to_ucs / add_in_ucs
         # * entry used for decision in group_members_sync_to_ucs
-        self.group_members_cache_ucs = {}
+        self.group_members_cache_ucs = GroupMemberCache(groupcachedbfile, 'UCS')
 
         # AD groups and AD members
-        # * initialized during start
+        # * initialized during start, persisted in groupcache.sqlite and only updated for the groups changed meanwhile
         # * entry updated in group_members_sync_to_ucs and object_memberships_sync_to_ucs
         # * entry flushed for group object in sync_from_ucs / ADD
         # * entry used for decision in group_members_sync_from_ucs
-        self.group_members_cache_con = {}
+        self.group_members_cache_con = GroupMemberCache(groupcachedbfile, 'AD')
 
     def init_group_cache(self):
         ud.debug(ud.LDAP, ud.PROCESS, 'Building internal group membership cache')
-        ad_groups = self.__search_ad(filter='objectClass=group', attrlist=['member'])
+        cache = self.group_members_cache_con
+        # the USNs are only valid for the domain controller they were read from
+        server, _, usn = (cache.load() or '').rpartition('@')
+        highest_usn = self.__get_highestCommittedUSN()
+        if server != self.ad_ldap_host or not usn.isdigit() or int(usn) > highest_usn:
+            cache.clear()
+            ad_groups = self.__search_ad(filter='objectClass=group', attrlist=['member'])
+        else:
+            groups = {dn.lower() for dn, _attrs in self.__search_ad(filter='objectClass=group', attrlist=['1.1']) if dn}
+            for group in set(cache) - groups:
+                del cache[group]
+            ad_groups = self.__search_ad(filter='(&(objectClass=group)(uSNChanged>=%d))' % (int(usn) + 1,), attrlist=['member'])
+            # moving or renaming a member changes the member attribute of its groups, but not their uSNChanged
+            for dn, attrs in self.__search_ad(filter='(&(uSNChanged>=%d)(memberOf=*))' % (int(usn) + 1,), attrlist=['memberOf']):
+                if not dn:
+                    continue
+                for group in attrs.get('memberOf', []):
+                    group = group.decode('UTF-8').lower()
+                    if group in cache:
+                        del cache[group]
+            missing = groups - set(cache) - {dn.lower() for dn, _attrs in ad_groups if dn}
+            for group in missing:
+                ad_groups += self.__search_ad(base=group, scope=ldap.SCOPE_BASE, filter='objectClass=group', attrlist=['member'])
+            ud.debug(ud.LDAP, ud.PROCESS, 'Reading the members of %d of %d AD groups' % (len(ad_groups), len(groups)))
         ud.debug(ud.LDAP, ud.ALL, "__init__: ad_groups: %s" % ad_groups)
         for ad_group in ad_groups:
             if not ad_group or not ad_group[0]:
@@ -522,14 +558,9 @@ class ad(univention.connector.ucs):
                 member_cache.update(m.lower() for m in ad_members)
 
         ud.debug(ud.LDAP, ud.ALL, "__init__: self.group_members_cache_con: %s" % self.group_members_cache_con)
+        cache.save('%s@%d' % (self.ad_ldap_host, highest_usn))
 
-        for ucs_group in self.search_ucs(filter='objectClass=univentionGroup', attr=['uniqueMember']):
-            group_lower = ucs_group[0].lower()
-            self.group_members_cache_ucs[group_lower] = set()
-            if ucs_group[1]:
-                for member in ucs_group[1].get('uniqueMember'):
-                    self.group_members_cache_ucs[group_lower].add(member.decode('UTF-8').lower())
-        ud.debug(ud.LDAP, ud.ALL, "__init__: self.group_members_cache_ucs: %s" % self.group_members_cache_ucs)
+        self.init_group_cache_ucs()
         ud.debug(ud.LDAP, ud.PROCESS, 'Internal group membership cache was created')
 
     def init_ldap_connections(self):
@@ -607,6 +638,14 @@ class ad(univention.connector.ucs):
 
         self.profiling = self.configRegistry.is_true('%s/ad/poll/profiling' % self.CONFIGBASENAME, False)
 
+    def clone(self):
+        clone = super().clone()
+        clone.drs = None
+        clone.samr = None
+        clone.dom_handle = None
+        clone.open_ad()
+        return clone
+
     def open_drs_connection(self):
         lp = LoadParm()
         Net(creds=None, lp=lp)
@@ -704,6 +743,20 @@ class ad(univention.connector.ucs):
 
         self.ad_ldap_partitions = (self.ad_ldap_base,)
 
+    def save_group_cache(self):
+        """
+        Write the group member caches and advance the AD watermark to the
+        changes processed so far: all changes up to the committed lastUSN except
+        the rejected ones, which are synchronized again later.
+        The members were read completely on startup, so the watermark is never
+        lowered below the one written by :meth:`init_group_cache`.
+        """
+        server, _, usn = (self.group_members_cache_con.watermark or '').rpartition('@')
+        if server != self.ad_ldap_host or not usn.isdigit():
+            return super().save_group_cache()
+        processed = min([int(self._get_config_option('AD', 'lastUSN'))] + [int(rejected) - 1 for rejected, _dn in self._list_rejected()])
+        super().save_group_cache('%s@%d' % (self.ad_ldap_host, max(int(usn), processed)))
+
     def _get_lastUSN(self):
         return max(self.__lastUSN, int(self._get_config_option('AD', 'lastUSN')))
 
@@ -891,8 +944,17 @@ class ad(univention.connector.ucs):
         return fix_dn_in_search(res)
 
     def __search_ad_changes(self, show_deleted=False, filter=''):
-        """search ad for changes since last update (changes greater lastUSN)"""
+        """
+        search ad for changes since last update (changes greater lastUSN)
+
+        The changes are searched in windows of USNs. For each window a tuple
+        of the highest USN of the window and the sorted changes is yielded.
+        While the changes of one window are synchronized, the next window is
+        already searched.
+        """
         lastUSN = self._get_lastUSN()
+        highestCommittedUSN = self.__get_highestCommittedUSN()
+        usn_window = self.configRegistry.get_int('%s/ad/poll/usn-window' % self.CONFIGBASENAME, USN_WINDOW)
         # filter erweitern um "(|(uSNChanged>=lastUSN+1)(uSNCreated>=lastUSN+1))"
         # +1 da suche nur nach '>=', nicht nach '>' möglich
 
@@ -910,52 +972,58 @@ class ad(univention.connector.ucs):
 
             return self.__search_ad_partitions(filter=usnFilter, show_deleted=show_deleted)
 
-        def sort_ad_changes(res, last_usn):
+        def search_ad_changes_in_window(lowerUSN, higherUSN):
+            # Objects created since lastUSN are found in the window of their uSNCreated, all other objects in the
+            # window of their uSNChanged. So every object is found only once and creations are synced first.
+            usn_filter = _ad_changes_filter('uSNCreated', lowerUSN, higherUSN)
+            if lastUSN > 0:
+                # During the init phase we have to search for created and changed objects
+                changed_filter = '(&%s%s)' % (_ad_changes_filter('uSNChanged', lowerUSN, higherUSN), format_escaped('(uSNCreated<={0!e})', lastUSN))
+                usn_filter = '(|%s%s)' % (changed_filter, usn_filter)
+            try:
+                return sort_ad_changes(search_ad_changes_by_attribute(usn_filter))
+            except ldap.SIZELIMIT_EXCEEDED:
+                # The LDAP control page results was not successful. Without this control
+                # AD does not return more than 1000 results. We are going to split the
+                # search.
+                if not higherUSN or higherUSN - lowerUSN < 1000:
+                    raise
+                ud.debug(ud.LDAP, ud.PROCESS, "Need to split results between USNs %s and %s" % (lowerUSN, higherUSN))
+                return sort_ad_changes([
+                    element
+                    for tmpUSN in range(lowerUSN, higherUSN + 1, 999)
+                    for element in search_ad_changes_in_window(tmpUSN, min(tmpUSN + 998, higherUSN))
+                ])
+
+        def sort_ad_changes(res):
             def _sortkey_ascending_usncreated(element):
                 return int(element[1]['uSNCreated'][0])
 
             def _sortkey_ascending_usnchanged(element):
                 return int(element[1]['uSNChanged'][0])
 
-            if last_usn <= 0:
+            if lastUSN <= 0:
                 return sorted(res, key=_sortkey_ascending_usncreated)
-            else:
-                created_since_last = [x for x in res if int(x[1]['uSNCreated'][0]) > last_usn]
-                changed_since_last = [x for x in res if int(x[1]['uSNChanged'][0]) > last_usn and x not in created_since_last]
-                return sorted(created_since_last, key=_sortkey_ascending_usncreated) + sorted(changed_since_last, key=_sortkey_ascending_usnchanged)
-
-        # search for objects with uSNCreated and uSNChanged in the known range
-        try:
-            usn_filter = _ad_changes_filter('uSNCreated', lastUSN + 1)
-            if lastUSN > 0:
-                # During the init phase we have to search for created and changed objects
-                usn_filter = '(|%s%s)' % (_ad_changes_filter('uSNChanged', lastUSN + 1), usn_filter)
-            return sort_ad_changes(search_ad_changes_by_attribute(usn_filter), lastUSN)
-        except (ldap.SERVER_DOWN, SystemExit):
-            raise
-        except ldap.SIZELIMIT_EXCEEDED:
-            # The LDAP control page results was not successful. Without this control
-            # AD does not return more than 1000 results. We are going to split the
-            # search.
-            highestCommittedUSN = self.__get_highestCommittedUSN()
-            tmpUSN = lastUSN
-            ud.debug(ud.LDAP, ud.PROCESS, "Need to split results. highest USN is %s, lastUSN is %s" % (highestCommittedUSN, lastUSN))
-            returnObjects = []
-            while (tmpUSN != highestCommittedUSN):
-                tmp_lastUSN = tmpUSN
-                tmpUSN += 999
-                if tmpUSN > highestCommittedUSN:
-                    tmpUSN = highestCommittedUSN
-
-                ud.debug(ud.LDAP, ud.INFO, "__search_ad_changes: search between USNs %s and %s" % (tmp_lastUSN + 1, tmpUSN))
-
-                usn_filter = _ad_changes_filter('uSNCreated', tmp_lastUSN + 1, tmpUSN)
-                if tmp_lastUSN > 0:
-                    # During the init phase we have to search for created and changed objects
-                    usn_filter = '(|%s%s)' % (_ad_changes_filter('uSNChanged', tmp_lastUSN + 1, tmpUSN), usn_filter)
-                returnObjects += search_ad_changes_by_attribute(usn_filter)
-
-            return sort_ad_changes(returnObjects, lastUSN)
+            created_since_last = []
+            changed_since_last = []
+            for element in res:
+                (created_since_last if _sortkey_ascending_usncreated(element) > lastUSN else changed_since_last).append(element)
+            return sorted(created_since_last, key=_sortkey_ascending_usncreated) + sorted(changed_since_last, key=_sortkey_ascending_usnchanged)
+
+        if not highestCommittedUSN:  # unknown, search for all changes at once
+            windows = [(lastUSN + 1, None)]
+        else:
+            windows = [(lowerUSN, min(lowerUSN + usn_window - 1, highestCommittedUSN)) for lowerUSN in range(lastUSN + 1, highestCommittedUSN + 1, usn_window)]
+        if len(windows) > 1:
+            ud.debug(ud.LDAP, ud.PROCESS, "Search changes between USNs %s and %s in %d windows" % (lastUSN + 1, highestCommittedUSN, len(windows)))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(search_ad_changes_in_window, *windows[0]) if windows else None
+            for i, (_lowerUSN, higherUSN) in enumerate(windows):
+                changes = future.result()
+                if i + 1 < len(windows):
+                    future = executor.submit(search_ad_changes_in_window, *windows[i + 1])
+                yield higherUSN, changes
 
     def __search_ad_changeUSN(self, changeUSN, show_deleted=True, filter=''):
         """search ad for change with id"""
@@ -1852,21 +1920,9 @@ class ad(univention.connector.ucs):
         """poll for changes in AD"""
         # search from last_usn for changes
         change_count = 0
-        changes = []
-        try:
-            changes = self.__search_ad_changes(show_deleted=show_deleted)
-        except ldap.SERVER_DOWN:
-            raise
-        except Exception:  # FIXME: which exception is to be caught?
-            self._debug_traceback(ud.WARN, "Exception during search_ad_changes")
-
-        if self.profiling and changes:
-            ud.debug(ud.LDAP, ud.PROCESS, "POLL FROM CON: Incoming %s" % (len(changes),))
+        windows = self.__search_ad_changes(show_deleted=show_deleted)
 
         print("--------------------------------------")
-        print("try to sync %s changes from AD" % len(changes))
-        print("done:", end=' ')
-        sys.stdout.flush()
         done = {'counter': 0}
         ad_object = None
         lastUSN = self._get_lastUSN()
@@ -1885,90 +1941,107 @@ class ad(univention.connector.ucs):
             ud.debug(ud.LDAP, ud.INFO, "UCS LDAP connection was closed, re-open the connection.")
             self.open_ucs()
 
-        for element in changes:
-            old_element = copy.deepcopy(element)
-            ad_object = self.__object_from_element(element)
+        statistics = SyncStatistics(self.workers.count)
 
-            if not ad_object:
-                print_progress(True)
-                continue
+        # the end of the last window whose changes are all synced
+        completedUSN = lastUSN
+        completed = False
+        while True:
+            try:
+                higherUSN, changes = next(windows)
+            except StopIteration:
+                completed = True
+                break
+            except ldap.SERVER_DOWN:
+                raise
+            except Exception:  # FIXME: which exception is to be caught?
+                self._debug_traceback(ud.WARN, "Exception during search_ad_changes")
+                break
 
-            property_key = self.__identify_ad_type(ad_object)
-            if not property_key:
-                ud.debug(ud.LDAP, ud.INFO, "ignoring not identified object dn: %r" % (ad_object['dn'],))
-                newUSN = max(self.__get_change_usn(ad_object), newUSN)
-                print_progress(True)
-                continue
+            if self.profiling and changes:
+                ud.debug(ud.LDAP, ud.PROCESS, "POLL FROM CON: Incoming %s" % (len(changes),))
+
+            print("try to sync %s changes from AD" % len(changes))
+            print("done:", end=' ')
+            sys.stdout.flush()
+
+            def classified(changes):
+                nonlocal newUSN
+                for element in changes:
+                    old_element = copy.deepcopy(element)
+                    ad_object = self.__object_from_element(element)
 
-            force_sync = False
-            if self._ignore_object(property_key, ad_object):
-                if ad_object['modtype'] == 'move':
-                    ud.debug(ud.LDAP, ud.INFO, "object_from_element: Detected a move of an AD object into a ignored tree: dn: %s" % ad_object['dn'])
-                    ad_object['deleted_dn'] = ad_object['olddn']
-                    ad_object['dn'] = ad_object['olddn']
-                    ad_object['modtype'] = 'delete'
-                    # check the move target
-                elif ad_object['modtype'] == 'delete' and not self.ucs_object_ignored(ad_object['dn'], property_key):
-                    ud.debug(ud.LDAP, ud.INFO, "object_from_element: deleting UCS object for ignored AD object %s because UCS object is not ignored" % ad_object['dn'])
-                    # if we have an allwofilter like description=sync the deleted tombstone AD object
-                    # is missing the information to check for _ignore_object
-                    # in this case (deleted in AD and AD object ignored) we check the UCS object and if not ignored
-                    # we delete the object in UCS
-                    force_sync = True
+                    if not ad_object:
+                        print_progress(True)
+                        continue
+
+                    property_key = self.__identify_ad_type(ad_object)
+                    if not property_key:
+                        ud.debug(ud.LDAP, ud.INFO, "ignoring not identified object dn: %r" % (ad_object['dn'],))
+                        newUSN = max(self.__get_change_usn(ad_object), newUSN)
+                        print_progress(True)
+                        continue
+
+                    force_sync = False
+                    if self._ignore_object(property_key, ad_object):
+                        if ad_object['modtype'] == 'move':
+                            ud.debug(ud.LDAP, ud.INFO, "object_from_element: Detected a move of an AD object into a ignored tree: dn: %s" % ad_object['dn'])
+                            ad_object['deleted_dn'] = ad_object['olddn']
+                            ad_object['dn'] = ad_object['olddn']
+                            ad_object['modtype'] = 'delete'
+                            # check the move target
+                        elif ad_object['modtype'] == 'delete' and not self.ucs_object_ignored(ad_object['dn'], property_key):
+                            ud.debug(ud.LDAP, ud.INFO, "object_from_element: deleting UCS object for ignored AD object %s because UCS object is not ignored" % ad_object['dn'])
+                            # if we have an allwofilter like description=sync the deleted tombstone AD object
+                            # is missing the information to check for _ignore_object
+                            # in this case (deleted in AD and AD object ignored) we check the UCS object and if not ignored
+                            # we delete the object in UCS
+                            force_sync = True
+                        else:
+                            self.__update_lastUSN(ad_object)
+                            print_progress()
+                            continue
+
+                    if ad_object['dn'].find('\\0ACNF:') > 0:
+                        ud.debug(ud.LDAP, ud.PROCESS, 'Ignore conflicted object: %s' % ad_object['dn'])
+                        self.__update_lastUSN(ad_object)
+                        print_progress()
+                        continue
+
+                    yield (old_element, property_key, ad_object, force_sync)
+
+            # the USNs are only updated by this thread, the workers just synchronize the changes
+            for (_element, _property_key, ad_object, _force_sync), sync_successfull in self.workers.run(classified(changes), lambda connector, change: connector.__sync_change_to_ucs(*change), self.__classify_change, statistics):
+                if sync_successfull:
+                    change_count += 1
+                    newUSN = max(self.__get_change_usn(ad_object), newUSN)
                 else:
+                    ud.debug(ud.LDAP, ud.WARN, "sync to ucs was not successful, save rejected")
+                    ud.debug(ud.LDAP, ud.WARN, "object was: %s" % ad_object['dn'])
+                    self.save_rejected(ad_object)
                     self.__update_lastUSN(ad_object)
-                    print_progress()
-                    continue
 
-            if ad_object['dn'].find('\\0ACNF:') > 0:
-                ud.debug(ud.LDAP, ud.PROCESS, 'Ignore conflicted object: %s' % ad_object['dn'])
-                self.__update_lastUSN(ad_object)
                 print_progress()
-                continue
 
-            sync_successfull = False
-            try:
-                try:
-                    mapped_object = self._object_mapping(property_key, ad_object)
-                    if not force_sync and self._ignore_object(property_key, mapped_object):
-                        sync_successfull = True
-                    else:
-                        sync_successfull = self.sync_to_ucs(property_key, mapped_object, ad_object['dn'], ad_object)
-                except univention.admin.uexceptions.ldapError as msg:
-                    if isinstance(msg.original_exception, ldap.SERVER_DOWN):
-                        raise msg.original_exception
-                    raise
-            except ldap.SERVER_DOWN:
-                ud.debug(ud.LDAP, ud.ERROR, "Got server down during sync, re-open the connection to UCS and AD")
-                time.sleep(1)
-                self.open_ucs()
-                self.open_ad()
-            except Exception:  # FIXME: which exception is to be caught?
-                self._debug_traceback(ud.WARN, "Exception during poll/sync_to_ucs")
+            print("")
 
-            if sync_successfull:
-                change_count += 1
-                newUSN = max(self.__get_change_usn(ad_object), newUSN)
-                try:
-                    GUID = old_element[1]['objectGUID'][0]
-                    self._set_DN_for_GUID(GUID, old_element[0])
-                except ldap.SERVER_DOWN:
-                    raise
-                except Exception:  # FIXME: which exception is to be caught?
-                    self._debug_traceback(ud.WARN, "Exception during set_DN_for_GUID")
-            else:
-                ud.debug(ud.LDAP, ud.WARN, "sync to ucs was not successful, save rejected")
-                ud.debug(ud.LDAP, ud.WARN, "object was: %s" % ad_object['dn'])
-                self.save_rejected(ad_object)
-                self.__update_lastUSN(ad_object)
-
-            print_progress()
-
-        print("")
+            # all changes up to the end of the window are synced, so they are not searched again.
+            # Synced objects may carry a higher USN of a later change, which is only safe to store after the last window.
+            if higherUSN is not None:
+                completedUSN = higherUSN
+                self._set_lastUSN(completedUSN)
+                self._commit_lastUSN()
 
-        if newUSN != lastUSN:
-            self._set_lastUSN(newUSN)
+        if not completed:
+            # the remaining windows are searched again by the next poll
+            self._set_lastUSN(completedUSN)
             self._commit_lastUSN()
+        elif max(newUSN, completedUSN) != lastUSN:
+            self._set_lastUSN(max(newUSN, completedUSN))
+            self._commit_lastUSN()
+
+        if statistics:
+            print(statistics)
 
         # return number of synced objects
         rejected = self._list_rejected()
@@ -1979,6 +2052,46 @@ class ad(univention.connector.ucs):
             ud.debug(ud.LDAP, ud.PROCESS, "POLL FROM CON: Processed %s" % (change_count,))
         return change_count
 
+    def __sync_change_to_ucs(self, element, property_key, ad_object, force_sync=False):
+        """sync a change from AD to UCS, returns whether it was successful"""
+        sync_successfull = False
+        try:
+            try:
+                mapped_object = self._object_mapping(property_key, ad_object)
+                if not force_sync and self._ignore_object(property_key, mapped_object):
+                    sync_successfull = True
+                else:
+                    sync_successfull = self.sync_to_ucs(property_key, mapped_object, ad_object['dn'], ad_object)
+            except univention.admin.uexceptions.ldapError as msg:
+                if isinstance(msg.original_exception, ldap.SERVER_DOWN):
+                    raise msg.original_exception
+                raise
+        except ldap.SERVER_DOWN:
+            ud.debug(ud.LDAP, ud.ERROR, "Got server down during sync, re-open the connection to UCS and AD")
+            time.sleep(1)
+            self.open_ucs()
+            self.open_ad()
+        except Exception:  # FIXME: which exception is to be caught?
+            self._debug_traceback(ud.WARN, "Exception during poll/sync_to_ucs")
+
+        if sync_successfull:
+            try:
+                GUID = element[1]['objectGUID'][0]
+                self._set_DN_for_GUID(GUID, element[0])
+            except ldap.SERVER_DOWN:
+                raise
+            except Exception:  # FIXME: which exception is to be caught?
+                self._debug_traceback(ud.WARN, "Exception during set_DN_for_GUID")
+        return sync_successfull
+
+    def __classify_change(self, change):
+        """The objectGUID of the changed object and whether the change must be synchronized serially"""
+        element, property_key, ad_object, _force_sync = change
+        GUID = element[1].get('objectGUID', [None])[0]
+        if ad_object['modtype'] not in ('add', 'modify'):
+            return GUID, True
+        return GUID, not is_independent(self.modules.get(property_key))
+
     def __has_attribute_value_changed(self, attribute, object_old, new_object):
         return object_old["attributes"].get(attribute) != new_object["attributes"].get(attribute)
 
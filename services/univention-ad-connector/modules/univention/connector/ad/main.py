@@ -208,6 +208,8 @@ def _connect(ad, poll_sleep, baseconfig_retry_rejected):
             change_counter = 0
             retry_rejected += 1
 
+        ad.save_group_cache()
+
         print('- sleep %s seconds (%s/%s until resync) -' % (poll_sleep, retry_rejected, baseconfig_retry_rejected))
         sys.stdout.flush()
         time.sleep(poll_sleep)
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+#
+# Univention AD Connector
+#  persistent cache of the group members
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+
+import functools
+import json
+import sqlite3
+
+import univention.debug2 as ud
+
+
+class _Members(set):
+    """The members of one group, which mark the group as changed when they are modified."""
+
+    __slots__ = ('_changed', '_dn')
+
+    def __init__(self, members, changed, dn):
+        super().__init__(members)
+        self._changed = changed
+        self._dn = dn
+
+
+def _modifies(name):
+    method = getattr(set, name)
+
+    @functools.wraps(method)
+    def modify(self, *args):
+        self._changed.add(self._dn)
+        return method(self, *args)
+    return modify
+
+
+for _name in ('add', 'remove', 'discard', 'pop', 'clear', 'update', 'difference_update', 'intersection_update', 'symmetric_difference_update', '__ior__', '__iand__', '__isub__', '__ixor__'):
+    setattr(_Members, _name, _modifies(_name))
+
+
+class GroupMemberCache(dict):
+    """
+    Members of the groups of one side, stored in a SQLite database.
+
+    The cache maps the lower cased DN of each group to the set of the lower cased DNs of its members.
+    Modifications are tracked, so that :meth:`save` only writes the changed groups.
+    The watermark stored together with the members is the `USN` or `entryCSN` up to which
+    the members were read from the directory. On startup only the groups changed
+    afterwards need to be read again.
+    """
+
+    def __init__(self, filename, table):
+        super().__init__()
+        self.filename = filename
+        self.table = table
+        self.watermark = None
+        self._changed = set()
+        self._dbcon = sqlite3.connect(self.filename)
+        with self._dbcon:
+            self._dbcon.execute("CREATE TABLE IF NOT EXISTS '%s' (dn TEXT PRIMARY KEY, members TEXT)" % (self.table,))
+            self._dbcon.execute("CREATE TABLE IF NOT EXISTS watermarks (name TEXT PRIMARY KEY, value TEXT)")
+
+    def __setitem__(self, dn, members):
+        self._changed.add(dn)
+        super().__setitem__(dn, _Members(members, self._changed, dn))
+
+    def __delitem__(self, dn):
+        super().__delitem__(dn)
+        self._changed.add(dn)
+
+    def setdefault(self, dn, members=()):
+        if dn not in self:
+            self[dn] = members
+        return self[dn]
+
+    def pop(self, dn, *default):
+        self._changed.add(dn)
+        return super().pop(dn, *default)
+
+    def update(self, *args, **kwargs):
+        for dn, members in dict(*args, **kwargs).items():
+            self[dn] = members
+
+    def clear(self):
+        self._changed.update(self)
+        super().clear()
+
+    def load(self):
+        """Read the persisted groups. Returns the watermark or `None` if the cache must be rebuilt completely."""
+        super().clear()
+        self._changed.clear()
+        self.watermark = None
+        try:
+            row = self._dbcon.execute("SELECT value FROM watermarks WHERE name=?", (self.table,)).fetchone()
+            if row:
+                for dn, members in self._dbcon.execute("SELECT dn, members FROM '%s'" % (self.table,)):  # noqa: S608
+                    super().__setitem__(dn, _Members(json.loads(members), self._changed, dn))
+                self.watermark = row[0]
+        except (sqlite3.Error, ValueError) as exc:
+            ud.debug(ud.LDAP, ud.WARN, "GroupMemberCache: could not read %s: %s" % (self.table, exc))
+            super().clear()
+        return self.watermark
+
+    def save(self, watermark=None):
+        """Write the changed groups and optionally a new watermark."""
+        if watermark is not None and str(watermark) == self.watermark:
+            watermark = None
+        if not self._changed and watermark is None:
+            return
+        changed = set(self._changed)
+        try:
+            with self._dbcon:
+                for dn in changed:
+                    if dn in self:
+                        self._dbcon.execute("INSERT OR REPLACE INTO '%s' (dn, members) VALUES (?, ?)" % (self.table,), (dn, json.dumps(sorted(self[dn]))))  # noqa: S608
+                    else:
+                        self._dbcon.execute("DELETE FROM '%s' WHERE dn=?" % (self.table,), (dn,))  # noqa: S608
+                if watermark is not None:
+                    self._dbcon.execute("INSERT OR REPLACE INTO watermarks (name, value) VALUES (?, ?)", (self.table, str(watermark)))
+        except sqlite3.Error as exc:
+            ud.debug(ud.LDAP, ud.ERROR, "GroupMemberCache: could not write %s: %s" % (self.table, exc))
+            return
+        self._changed.difference_update(changed)
+        if watermark is not None:
+            self.watermark = str(watermark)
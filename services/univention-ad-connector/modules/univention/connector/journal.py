@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+#
+# Univention AD Connector
+#  journal of the UCS changes
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+
+"""
+Journal of the UCS changes to be synchronized by the connector.
+
+The listener module appends each change as a pickled tuple `(dn, new, old, old_dn)`
+together with the time of the change to a SQLite database in the listener directory,
+which the connector consumes in the order of these timestamps.
+The listener module does not import this module, so the schema is repeated there.
+Before, each change was stored in a file of its own, named by its timestamp. Such files
+are still written by the resync scripts, they are imported into the journal by
+:meth:`ChangeJournal.import_files` with the timestamp of their name.
+"""
+
+import os
+import pickle  # noqa: S403
+import sqlite3
+import time
+
+import univention.debug2 as ud
+
+
+JOURNAL_FILENAME = 'journal.sqlite'
+
+
+class JournalEntry:
+    """
+    A pending change in the journal.
+
+    Consecutive changes of the same object may be coalesced into one entry,
+    which then covers the rows of all these changes.
+    """
+
+    def __init__(self, journal, position, change):
+        self.journal = journal
+        self.ids = [position[1]]
+        self.position = position
+        self.change = change
+
+    @property
+    def name(self):
+        """The name of the entry, which is used instead of a filename for rejected changes."""
+        return '%s#%d' % (self.journal.filename, self.ids[0])
+
+    @property
+    def dn(self):
+        return self.change[0]
+
+    def coalesce(self, position, change):
+        dn, new, _old, _old_dn = change
+        self.ids.append(position[1])
+        self.position = position
+        self.change = (dn, new, self.change[2], self.change[3])
+
+
+def _entryUUID(attributes):
+    return (attributes or {}).get('entryUUID', [None])[0]
+
+
+def coalescable(change, following):
+    """
+    Whether a change can be merged with the following change of the same object into one change.
+
+    Additions and modifications of an object are merged, deletions and moves are never merged into a previous change.
+    """
+    _dn, new, _old, _old_dn = change
+    _dn, following_new, _following_old, following_old_dn = following
+    return bool(new and following_new and not following_old_dn and _entryUUID(new) and _entryUUID(new) == _entryUUID(following_new))
+
+
+def _load(data):
+    (dn, new, old, old_dn) = pickle.loads(data, encoding='bytes')  # noqa: S301
+    # With the Python 2 listener pickle files we got bytes here, otherwise already string
+    if isinstance(dn, bytes):
+        dn = dn.decode('utf-8')
+    if isinstance(old_dn, bytes):
+        old_dn = old_dn.decode('utf-8')
+    return (dn, new, old, old_dn)
+
+
+class ChangeJournal:
+    """
+    Journal of the UCS changes, stored in a SQLite database in WAL mode.
+
+    The changes are ordered by their timestamp and then by their ID. The position `(timestamp, id)`
+    of the last row of an entry is :attr:`JournalEntry.position`.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.filename = os.path.join(directory, JOURNAL_FILENAME)
+        if not os.path.exists(self.filename):
+            # the changes contain password hashes
+            os.close(os.open(self.filename, os.O_WRONLY | os.O_CREAT, 0o600))
+        self._dbcon = sqlite3.connect(self.filename, timeout=60)
+        self._dbcon.execute('PRAGMA journal_mode=WAL')
+        # The listener modules write the changes with synchronous=FULL. The connector mostly removes and rejects changes,
+        # in WAL mode with synchronous=NORMAL only the last of these transactions may be rolled back on power loss,
+        # which just synchronizes the changes again.
+        self._dbcon.execute('PRAGMA synchronous=NORMAL')
+        with self._dbcon:
+            self._dbcon.execute('CREATE TABLE IF NOT EXISTS changes (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, dn TEXT NOT NULL, change BLOB NOT NULL, rejected INTEGER NOT NULL DEFAULT 0)')
+            self._dbcon.execute('CREATE INDEX IF NOT EXISTS changes_pending ON changes (rejected, timestamp, id)')
+
+    def append(self, dn, new, old, old_dn, timestamp=None):
+        """
+        Append a change.
+
+        :param timestamp: The time of the change, defaults to now.
+        """
+        with self._dbcon:
+            self._dbcon.execute('INSERT INTO changes (timestamp, dn, change) VALUES (?, ?, ?)', (time.time() if timestamp is None else timestamp, dn, pickle.dumps((dn, new, old, old_dn))))
+
+    def import_files(self, ignore=()):
+        """
+        Move the changes stored in files in the listener directory into the journal.
+        They are ordered by the timestamp in their filename, so files left over from before
+        the update are synchronized before the changes of the journal.
+
+        :param ignore: The filenames to skip, e.g. the files of rejected changes.
+        :returns: The filenames of broken files, which could not be imported.
+        """
+        broken = []
+        filenames = []
+        for name in os.listdir(self.directory):
+            try:
+                filenames.append((float(name), os.path.join(self.directory, name)))
+            except ValueError:
+                continue
+        # the files are removed after their change was appended, so the change must be on disk
+        self._dbcon.execute('PRAGMA synchronous=FULL')
+        try:
+            for timestamp, filename in sorted(filenames):
+                if filename in ignore or not os.path.isfile(filename):
+                    continue
+                try:
+                    with open(filename, 'rb') as fob:
+                        (dn, new, old, old_dn) = _load(fob.read())
+                        if not (isinstance(dn, str) and isinstance(new, dict) and isinstance(old, dict)):
+                            raise pickle.UnpicklingError('invalid change')
+                except OSError:
+                    continue  # file not found so there's nothing to sync
+                except (pickle.UnpicklingError, EOFError, ValueError, TypeError) as exc:
+                    ud.debug(ud.LDAP, ud.ERROR, 'import_files: invalid pickle file %s: %s' % (filename, str(exc) or 'file empty'))
+                    broken.append(filename)
+                    continue
+                self.append(dn, new, old, old_dn, timestamp)
+                os.remove(filename)
+        finally:
+            self._dbcon.execute('PRAGMA synchronous=NORMAL')
+        return broken
+
+    def pending(self, limit, after=(0.0, 0), coalesce=coalescable):
+        """
+        Get the oldest pending changes, which were not rejected.
+
+        :param limit: The maximum number of changes to read.
+        :param after: Only read the changes following this position `(timestamp, id)`, see :attr:`JournalEntry.position`.
+        :param coalesce: Function which decides if a change is merged with the directly following change of the same object.
+            Changes of an object are not merged across the changes of other objects, which could depend on them.
+        """
+        entries = []
+        broken = []
+        for timestamp, id_, dn, data in self._dbcon.execute('SELECT timestamp, id, dn, change FROM changes WHERE rejected = 0 AND (timestamp, id) > (?, ?) ORDER BY timestamp, id LIMIT ?', (*after, limit)):
+            try:
+                change = _load(data)
+            except (pickle.UnpicklingError, EOFError, ValueError, TypeError) as exc:
+                ud.debug(ud.LDAP, ud.ERROR, 'pending: invalid change %d in %s: %s' % (id_, self.filename, exc))
+                broken.append((id_,))
+                continue
+            entry = entries[-1] if entries else None
+            if entry is not None and entry.dn == dn and coalesce(entry.change, change):
+                entry.coalesce((timestamp, id_), change)
+                continue
+            entry = JournalEntry(self, (timestamp, id_), change)
+            entries.append(entry)
+        if broken:
+            with self._dbcon:
+                self._dbcon.executemany('DELETE FROM changes WHERE id = ?', broken)
+        return entries
+
+    def __len__(self):
+        return self._dbcon.execute('SELECT COUNT(*) FROM changes WHERE rejected = 0').fetchone()[0]
+
+    def _id(self, name):
+        filename, _sep, id_ = name.rpartition('#')
+        if filename != self.filename or not id_.isdigit():
+            return None
+        return int(id_)
+
+    def owns(self, name):
+        """Whether the name is the name of an entry of this journal (and not the filename of a change)."""
+        return self._id(name) is not None
+
+    def get(self, name):
+        """Get the entry with the given name or `None`, if the entry does not exist."""
+        id_ = self._id(name)
+        row = self._dbcon.execute('SELECT timestamp, change FROM changes WHERE id = ?', (id_,)).fetchone() if id_ is not None else None
+        if row is None:
+            return None
+        return JournalEntry(self, (row[0], id_), _load(row[1]))
+
+    def remove(self, entry):
+        """Remove a synchronized entry."""
+        with self._dbcon:
+            self._dbcon.executemany('DELETE FROM changes WHERE id = ?', [(id_,) for id_ in entry.ids])
+
+    def discard(self, name):
+        """Remove the entry with the given name."""
+        with self._dbcon:
+            self._dbcon.execute('DELETE FROM changes WHERE id = ?', (self._id(name),))
+
+    def reject(self, entry):
+        """Mark an entry as rejected. The entry is no longer pending, but kept until it is synchronized or removed."""
+        with self._dbcon:
+            self._dbcon.execute('UPDATE changes SET change = ?, rejected = 1 WHERE id = ?', (pickle.dumps(entry.change), entry.ids[0]))
+            self._dbcon.executemany('DELETE FROM changes WHERE id = ?', [(id_,) for id_ in entry.ids[1:]])
+        del entry.ids[1:]
+
+    def forget_rejected(self, keep):
+        """Remove all rejected entries, except the ones with the given names."""
+        keep = {self._id(name) for name in keep}
+        rejected = [id_ for id_, in self._dbcon.execute('SELECT id FROM changes WHERE rejected = 1')]
+        with self._dbcon:
+            self._dbcon.executemany('DELETE FROM changes WHERE id = ?', [(id_,) for id_ in rejected if id_ not in keep])
+
+    def clear(self):
+        with self._dbcon:
+            self._dbcon.execute('DELETE FROM changes')
@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+#
+# Univention AD Connector
+#  concurrent synchronization of independent objects
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+
+"""
+Concurrent synchronization of the changes of independent objects.
+
+By default the connector synchronizes one change after another. With more than one worker,
+the changes are synchronized by a pool of threads. Each thread uses its own copy of the
+connector, see :meth:`univention.connector.ucs.clone`, so the connections to LDAP and to the
+SQLite databases are not shared, while the caches are.
+
+Each change is classified by a key, the entryUUID or objectGUID of the object, and whether it
+must be run serially:
+
+* the changes of one object are run one after another in the order they were queued,
+* serial changes, e.g. of containers and groups, moves and removals, depend on other objects.
+  They are run alone, after all changes queued before them and before all changes queued after them.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+
+#: UDM modules of objects which have no children and are no groups, changes of other objects are run serially
+INDEPENDENT_MODULES = ('users/', 'computers/')
+
+#: number of changes per worker which are run concurrently before waiting for all of them
+BATCH_SIZE = 32
+
+
+def is_independent(module):
+    """Whether changes of objects of the UDM module may be run concurrently to changes of other objects"""
+    return bool(module) and module.module.startswith(INDEPENDENT_MODULES)
+
+
+class SyncStatistics:
+    """Throughput and latency of the synchronization of the changes of one poll"""
+
+    def __init__(self, workers=1):
+        self.workers = workers
+        self.start = time.monotonic()
+        self.latencies = []
+
+    def add(self, latency):
+        self.latencies.append(latency)
+
+    def __len__(self):
+        return len(self.latencies)
+
+    def __str__(self):
+        elapsed = time.monotonic() - self.start
+        count = len(self.latencies)
+        return 'Synced %d changes in %.2fs with %d worker(s): %.1f changes/s, latency per object %.3fs average, %.3fs maximum' % (
+            count,
+            elapsed,
+            self.workers,
+            count / elapsed if elapsed else 0.0,
+            sum(self.latencies) / count if count else 0.0,
+            max(self.latencies, default=0.0),
+        )
+
+
+def schedule(items, classify, batch_size):
+    """
+    Split the changes into batches, which must be run one after another.
+
+    A batch is a list of lanes, which may be run concurrently. A lane is the list of the
+    changes of one object. Serial changes and changes without key get a batch of their own.
+    """
+    lanes = {}
+    size = 0
+    for item in items:
+        key, serial = classify(item)
+        if serial or not key:
+            if lanes:
+                yield list(lanes.values())
+                lanes, size = {}, 0
+            yield [[item]]
+            continue
+        lanes.setdefault(key, []).append(item)
+        size += 1
+        if size >= batch_size:
+            yield list(lanes.values())
+            lanes, size = {}, 0
+    if lanes:
+        yield list(lanes.values())
+
+
+class SyncWorkers:
+    """
+    The threads synchronizing the changes.
+
+    :param connector: the connector, which is cloned for each thread.
+    :param count: the number of threads. With one worker all changes are run by the connector itself in the calling thread.
+    """
+
+    def __init__(self, connector, count=1):
+        self.connector = connector
+        self.count = max(1, count)
+        self._local = threading.local()
+        self._executor = None
+
+    def run(self, items, sync, classify, statistics=None):
+        """
+        Synchronize the changes by calling `sync(connector, item)` and yield `(item, result)` when each is finished.
+
+        `classify(item)` returns the key of the object and whether the change must be run serially; it
+        is only called with more than one worker. The items are consumed lazily, so with one worker each
+        change is classified and synchronized before the next one is taken.
+        If a change raises an exception, the following changes of the same object are skipped and the
+        exception is raised after the changes of the other objects of the batch are finished.
+        """
+        if self.count == 1:
+            for item in items:
+                yield item, self._sync(sync, self.connector, item, statistics)
+            return
+
+        for batch in schedule(items, classify, self.count * BATCH_SIZE):
+            if len(batch) == 1:
+                for item in batch[0]:
+                    yield item, self._sync(sync, self.connector, item, statistics)
+                continue
+
+            futures = [self.executor.submit(self._run_lane, sync, lane, statistics) for lane in batch]
+            error = None
+            try:
+                for future in as_completed(futures):
+                    results, exc = future.result()
+                    yield from results
+                    error = error or exc
+            finally:
+                wait(futures)
+            if error is not None:
+                raise error
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.count, thread_name_prefix='sync-worker')
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _sync(self, sync, connector, item, statistics):
+        start = time.monotonic()
+        result = sync(connector, item)
+        if statistics is not None:
+            statistics.add(time.monotonic() - start)
+        return result
+
+    def _run_lane(self, sync, lane, statistics):
+        results = []
+        try:
+            connector = self._thread_connector()
+            for item in lane:
+                results.append((item, self._sync(sync, connector, item, statistics)))
+        except (Exception, SystemExit) as exc:
+            return results, exc
+        return results, None
+
+    def _thread_connector(self):
+        connector = getattr(self._local, 'connector', None)
+        if connector is None:
+            connector = self._local.connector = self.connector.clone()
+        return connector
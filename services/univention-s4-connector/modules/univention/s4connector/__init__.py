@@ -43,11 +43,13 @@ import random
 import re
 import sqlite3 as lite
 import sys
+import threading
 import traceback
 from types import FunctionType
 
 import ldap
 from ldap.controls.readentry import PostReadControl
+from ldap.filter import filter_format
 from samba.dcerpc import misc
 from samba.ndr import ndr_unpack
 
@@ -57,8 +59,11 @@ import univention.admin.uldap
 import univention.debug as ud_c
 import univention.debug2 as ud
 import univention.uldap
+from univention.s4connector.journal import ChangeJournal, coalescable
+from univention.s4connector.ldap_filter import compile_filter
 from univention.s4connector.lockingdb import LockingDB
 from univention.s4connector.s4cache import S4Cache
+from univention.s4connector.workers import SyncStatistics, SyncWorkers, is_independent
 
 
 term_signal_caught = False
@@ -498,6 +503,11 @@ class ucs:
         self.init_debug()
 
         self.listener_dir = listener_dir
+        self._journal = None
+        self._workers = None
+
+        # group memberships are changed by one worker at a time
+        self.membership_lock = threading.RLock()
 
         configdbfile = '/etc/univention/%s/s4internal.sqlite' % self.CONFIGBASENAME
         self.config = configdb(configdbfile)
@@ -512,15 +522,83 @@ class ucs:
             if not self.config.has_section(section):
                 self.config.add_section(section)
 
+        self.compile_filters()
+
+    def compile_filters(self):
+        """Parse the LDAP filters of all mappings once, so that the objects are only matched against the parsed filters"""
+        for key, prop in self.property.items():
+            for name in ('con_search_filter', 'ignore_filter', 'match_filter', 'allow_filter'):
+                filter = getattr(prop, name, None)
+                if not filter:
+                    continue
+                try:
+                    compile_filter(filter)
+                except ValueError as exc:
+                    ud.debug(ud.LDAP, ud.WARN, "compile_filters: invalid %s of mapping %r: %s" % (name, key, exc))
+
     def init_ldap_connections(self):
         self.open_ucs()
 
+    def init_group_cache_ucs(self):
+        """
+        Load the members of the UCS groups. Only the groups changed since the
+        cache was saved the last time are read from LDAP.
+        """
+        cache = self.group_members_cache_ucs
+        watermark = cache.load()
+        csns = {dn.lower(): attrs['entryCSN'][0].decode('ASCII') for dn, attrs in self.search_ucs(filter='objectClass=univentionGroup', attr=['entryCSN'])}
+        if watermark is None:
+            ucs_groups = self.search_ucs(filter='objectClass=univentionGroup', attr=['uniqueMember'])
+        else:
+            for group in set(cache) - set(csns):
+                del cache[group]
+            ucs_groups = self.search_ucs(filter=filter_format('(&(objectClass=univentionGroup)(entryCSN>=%s))', [watermark]), attr=['uniqueMember'])
+            missing = set(csns) - set(cache) - {dn.lower() for dn, _attrs in ucs_groups}
+            ucs_groups += [(dn, self.lo.get(dn, attr=['uniqueMember'])) for dn in missing]
+        ud.debug(ud.LDAP, ud.PROCESS, 'Reading the members of %d of %d UCS groups' % (len(ucs_groups), len(csns)))
+
+        for ucs_group in ucs_groups:
+            group_lower = ucs_group[0].lower()
+            self.group_members_cache_ucs[group_lower] = set()
+            if ucs_group[1]:
+                for member in ucs_group[1].get('uniqueMember', []):
+                    self.group_members_cache_ucs[group_lower].add(member.decode('UTF-8').lower())
+        ud.debug(ud.LDAP, ud.ALL, "__init__: self.group_members_cache_ucs: %s" % self.group_members_cache_ucs)
+        cache.save(max(csns.values(), default=watermark or ''))
+
+    def save_group_cache(self, watermark_con=None):
+        """
+        Write the changes of the group member caches to disk and advance the
+        watermark of the connected side to `watermark_con`.
+        The watermark of the UCS groups is only advanced on startup: the journal
+        is written by the listener asynchronously, so no `entryCSN` up to which
+        all UCS changes were processed is known while the connector runs.
+        """
+        self.group_members_cache_ucs.save()
+        self.group_members_cache_con.save(watermark_con)
+
     def __enter__(self):
         return self
 
     def __exit__(self, etype=None, exc=None, etraceback=None):
+        if self._workers is not None:
+            self._workers.close()
         self.close_debug()
 
+    def clone(self):
+        """
+        Copy the connector for a worker thread: the mapping and the caches are shared,
+        but the connections to the SQLite databases and to LDAP are opened again.
+        """
+        clone = copy.copy(self)
+        clone._journal = None
+        clone._workers = None
+        clone.config = configdb(self.config.filename)
+        clone.s4cache = S4Cache(self.s4cache.filename)
+        clone.lockingdb = LockingDB(self.lockingdb.filename)
+        clone.open_ucs()
+        return clone
+
     def dn_mapped_to_base(self, dn, base):
         """Introduced for Bug #33110: Fix case of base part of DN"""
         if dn.endswith(base):
@@ -592,6 +670,34 @@ class ucs:
     def _get_config_items(self, section):
         return self.config.items(section)
 
+    @property
+    def journal(self):
+        """The journal of the UCS changes in the listener directory, opened on first use"""
+        if self._journal is None:
+            self._journal = ChangeJournal(self.listener_dir)
+        return self._journal
+
+    @property
+    def workers(self):
+        """The threads synchronizing independent objects concurrently, configured by `connector/s4/poll/workers`"""
+        if self._workers is None:
+            try:
+                count = int(self.configRegistry.get('%s/s4/poll/workers' % self.CONFIGBASENAME, 1))
+            except ValueError:
+                count = 1
+            self._workers = SyncWorkers(self, count)
+        return self._workers
+
+    def _coalescable(self, change, following):
+        """Changes written by the connector itself are skipped when they are read back, so they must not be coalesced with other changes"""
+        return coalescable(change, following) and not any(self._is_entryCSN_commited_by_connector(new) for new in (change[1], following[1]))
+
+    def _is_entryCSN_commited_by_connector(self, attributes):
+        entryUUID = attributes.get('entryUUID', [b''])[0].decode('ASCII')
+        entryCSN = attributes.get('entryCSN', [b''])[0].decode('ASCII')
+        value = self._get_config_option('UCS entryCSN', entryUUID)
+        return bool(value) and entryCSN in value.split(',')
+
     def _save_rejected_ucs(self, filename, dn, resync=True, reason=''):
         if not resync:
             # Note that unescaped <> are invalid in DNs. See also:
@@ -696,7 +802,13 @@ class ucs:
         ud.debug(ud.LDAP, level, '%s: %s%s' % (direction, prefix, ': %s' % message if message else ''))
 
     def __sync_file_from_ucs(self, filename, append_error='', traceback_level=ud.WARN):
-        """sync changes from UCS stored in given file"""
+        """sync changes from UCS stored in given file or journal entry"""
+        if self.journal.owns(filename):
+            entry = self.journal.get(filename)
+            if entry is None:
+                return True  # entry not found so there's nothing to sync
+            return self.__sync_change_from_ucs(filename, entry.change, traceback_level=traceback_level)
+
         try:
             with open(filename, 'rb') as fob:
                 (dn, new, old, old_dn) = pickle.load(fob, encoding='bytes')
@@ -714,6 +826,11 @@ class ucs:
             self._save_rejected_ucs(filename, 'unknown', resync=False, reason='broken file')
             return False
 
+        return self.__sync_change_from_ucs(filename, (dn, new, old, old_dn), traceback_level=traceback_level)
+
+    def __sync_change_from_ucs(self, filename, change, traceback_level=ud.WARN):
+        """sync a change from UCS, which is saved as rejected under the given filename if it fails"""
+        (dn, new, old, old_dn) = change
         if dn == 'cn=Subschema':
             return True
 
@@ -849,6 +966,38 @@ class ucs:
             ud.debug(ud.LDAP, ud.INFO, "__sync_file_from_ucs: No mapping was found for dn: %s" % dn)
             return True
 
+    def __sync_entry_from_ucs(self, entry, traceback_level=ud.WARN):
+        """sync a journal entry, which is saved as rejected if it fails"""
+        # If the list contains more than one file, the DN will be synced later
+        # but if the object was added or removed, the synchonization is required
+        for i in [0, 1]:  # do it twice if the LDAP connection was closed
+            try:
+                return self.__sync_change_from_ucs(entry.name, entry.change, traceback_level=traceback_level)
+            except (ldap.SERVER_DOWN, SystemExit):
+                # once again, ldap idletimeout ...
+                if i == 0:
+                    self.open_ucs()
+                    continue
+                raise
+            except Exception:
+                self._save_rejected_ucs(entry.name, entry.dn)
+                # We may dropped the parent object, so don't show this warning
+                self._debug_traceback(traceback_level, "sync failed, saved as rejected \n\t%s" % entry.name)
+                return False
+
+    def __classify_entry(self, entry):
+        """The entryUUID of the changed object and whether the change must be synchronized serially"""
+        (dn, new, old, old_dn) = entry.change
+        attributes = {key.decode('UTF-8') if isinstance(key, bytes) else key: value for key, value in (new or old).items()}
+        entryUUID = attributes.get('entryUUID', [b''])[0].decode('ASCII')
+        if not new or (old_dn and old_dn != dn):
+            return entryUUID, True
+        try:
+            module, _key = self.identify_udm_object(dn, attributes)
+        except Exception:  # the failure is handled when the change is synchronized
+            return entryUUID, True
+        return entryUUID, not is_independent(module)
+
     def get_ucs_ldap_object_dn(self, dn):
 
         for _i in [0, 1]:  # do it twice if the LDAP connection was closed
@@ -948,6 +1097,7 @@ class ucs:
     def resync_rejected_ucs(self):
         """tries to resync rejected changes from UCS"""
         rejected = self._list_rejected_ucs()
+        self.journal.forget_rejected(filename for (filename, _dn) in self.list_rejected_ucs())
         change_counter = 0
         print("--------------------------------------")
         print("Sync %s rejected changes from UCS" % len(rejected))
@@ -958,10 +1108,13 @@ class ucs:
                 ud.debug(ud.LDAP, ud.PROCESS, 'sync UCS > AD: Resync rejected file: %s' % (filename))
                 try:
                     if self.__sync_file_from_ucs(filename, append_error=' rejected'):
-                        try:
-                            os.remove(os.path.join(filename))
-                        except OSError:  # file not found
-                            pass
+                        if self.journal.owns(filename):
+                            self.journal.discard(filename)
+                        else:
+                            try:
+                                os.remove(os.path.join(filename))
+                            except OSError:  # file not found
+                                pass
                         self._remove_rejected_ucs(filename)
                         change_counter += 1
                 except ldap.SERVER_DOWN:
@@ -979,84 +1132,56 @@ class ucs:
         pass
 
     def poll_ucs(self):
-        """poll changes from UCS: iterates over files exported by directory-listener module"""
+        """poll changes from UCS: iterates over the journal written by directory-listener module"""
         # check for changes from ucs ldap directory
 
         ud.debug(ud.LDAP, ud.INFO, "sync UCS > AD: polling")
         change_counter = 0
         MAX_SYNC_IN_ONE_INTERVAL = 50000
+        CHUNK_SIZE = 1000
 
-        self.rejected_files = self._list_rejected_filenames_ucs()
+        self.rejected_files = set(self._list_rejected_filenames_ucs())
+
+        # changes stored in files, e.g. by resync_object_from_ucs.py
+        for filename in self.journal.import_files(ignore=self.rejected_files):
+            # ignore corrupted pickle file, but save as rejected to not try again
+            self._save_rejected_ucs(filename, 'unknown', resync=False, reason='broken file')
 
         print("--------------------------------------")
-        print("try to sync %s changes from UCS" % (min(len(os.listdir(self.listener_dir)) - 1, MAX_SYNC_IN_ONE_INTERVAL)))
+        print("try to sync %s changes from UCS" % (min(len(self.journal), MAX_SYNC_IN_ONE_INTERVAL)))
         print("done:", end=' ')
         sys.stdout.flush()
         done_counter = 0
 
-        def _only_floats(iterable):
-            for el in iterable:
-                try:
-                    float(el)
-                    yield el
-                except ValueError:
-                    continue
-
-        files = sorted(_only_floats(os.listdir(self.listener_dir)), key=float)
-        # Only synchronize the first MAX_SYNC_IN_ONE_INTERVAL changes otherwise
-        # the change list is too long and it took too much time
-        files = files[:MAX_SYNC_IN_ONE_INTERVAL]
-
         # We may dropped the parent object, so don't show the traceback in any case
         traceback_level = ud.WARN
 
-        for listener_file in files:
-            sync_successfull = False
-            filename = os.path.join(self.listener_dir, listener_file)
-            if os.path.isdir(filename):
-                continue
-            if filename not in self.rejected_files:
-                try:
-                    with open(filename, 'rb') as fob:
-                        (dn, _new, _old, old_dn) = pickle.load(fob, encoding='bytes')
-                        if isinstance(dn, bytes):
-                            dn = dn.decode('utf-8')
-                        if isinstance(old_dn, bytes):
-                            old_dn = old_dn.decode('utf-8')
-                except OSError:
-                    continue  # file not found so there's nothing to sync
-                except (pickle.UnpicklingError, EOFError) as exc:
-                    message = 'file empty' if isinstance(exc, EOFError) else exc
-                    ud.debug(ud.LDAP, ud.ERROR, f'poll_ucs: invalid pickle file {filename}: {message}')
-                    # ignore corrupted pickle file, but save as rejected to not try again
-                    self._save_rejected_ucs(filename, 'unknown', resync=False, reason='broken file')
-                    continue
-
-                # If the list contains more than one file, the DN will be synced later
-                # but if the object was added or removed, the synchonization is required
-                for i in [0, 1]:  # do it twice if the LDAP connection was closed
-                    try:
-                        sync_successfull = self.__sync_file_from_ucs(filename, traceback_level=traceback_level)
-                    except (ldap.SERVER_DOWN, SystemExit):
-                        # once again, ldap idletimeout ...
-                        if i == 0:
-                            self.open_ucs()
-                            continue
-                        raise
-                    except Exception:
-                        self._save_rejected_ucs(filename, dn)
-                        # We may dropped the parent object, so don't show this warning
-                        self._debug_traceback(traceback_level, "sync failed, saved as rejected \n\t%s" % filename)
-                    if sync_successfull:
-                        os.remove(os.path.join(self.listener_dir, listener_file))
-                        change_counter += 1
-                    break
+        statistics = SyncStatistics(self.workers.count)
 
-            done_counter += 1
-            print("%s" % done_counter, end=' ')
-            sys.stdout.flush()
+        # Only synchronize the first MAX_SYNC_IN_ONE_INTERVAL changes otherwise
+        # the change list is too long and it took too much time
+        position = (0.0, 0)
+        while done_counter < MAX_SYNC_IN_ONE_INTERVAL:
+            entries = self.journal.pending(min(CHUNK_SIZE, MAX_SYNC_IN_ONE_INTERVAL - done_counter), after=position, coalesce=self._coalescable)
+            if not entries:
+                break
+            position = max(entry.position for entry in entries)
+
+            # the journal is only used by this thread, the workers just synchronize the changes
+            for entry, sync_successfull in self.workers.run(entries, lambda connector, entry: connector.__sync_entry_from_ucs(entry, traceback_level), self.__classify_entry, statistics):
+                if sync_successfull:
+                    self.journal.remove(entry)
+                    change_counter += 1
+                elif self._get_config_option('UCS rejected', entry.name):
+                    self.journal.reject(entry)
+
+                done_counter += 1
+                print("%s" % done_counter, end=' ')
+                sys.stdout.flush()
 
         print("")
+        if statistics:
+            print(statistics)
 
         self.rejected_files = self._list_rejected_filenames_ucs()
 
@@ -1564,121 +1689,7 @@ class ucs:
         - nur * als Wildcard
         - geht "lachser" mit Verschachtelten Klammern um
         '''
-        filter_connectors = ['!', '&', '|']
-
-        def list_lower(elements):
-            if isinstance(elements, list):
-                retlist = []
-                for le in elements:
-                    retlist.append(le.lower())
-                return retlist
-            else:
-                return elements
-
-        def dict_lower(dict_):
-            if isinstance(dict_, dict):
-                retdict = {}
-                for key in dict_:
-                    retdict[key.lower()] = dict_[key]
-                return retdict
-            else:
-                return dict_
-
-        def attribute_filter(filter, attributes):
-            attributes = dict_lower(attributes)
-
-            pos = filter.find('=')
-            if pos < 0:
-                raise ValueError('missing "=" in filter: %s' % filter)
-            attribute = filter[:pos].lower()
-            if not attribute:
-                raise ValueError('missing attribute in filter: %s' % filter)
-            value = filter[pos + 1:]
-
-            if attribute.endswith(':1.2.840.113556.1.4.803:'):
-                # bitwise filter
-                attribute_name = attribute.replace(':1.2.840.113556.1.4.803:', '')
-                attribute_value = attributes.get(attribute_name)
-                if attribute_value:
-                    try:
-                        if isinstance(attribute_value, list):
-                            attribute_value = int(attribute_value[0])
-                        int_value = int(value)
-                        return attribute_value & int_value == int_value
-                    except ldap.SERVER_DOWN:
-                        raise
-                    except Exception:
-                        ud.debug(ud.LDAP, ud.WARN, "attribute_filter: Failed to convert attributes for bitwise filter")
-                        return False
-
-            if value == '*':
-                return attribute in list_lower(attributes.keys())
-            elif attribute in attributes:
-                return value.lower().encode('UTF-8') in list_lower(attributes[attribute])
-            else:
-                return False
-
-        def connecting_filter(filter, attributes):
-
-            def walk(filter, attributes):
-
-                def split(filter):
-                    opened = []
-                    closed = []
-                    level = 0
-                    for pos, char in enumerate(filter):
-                        if char == '(':
-                            if level == 0:
-                                opened.append(pos)
-                            level += 1
-                        elif char == ')':
-                            if level == 1:
-                                closed.append(pos)
-                            level -= 1
-                        if level < 0:
-                            raise ValueError("too many ')' in filter: %s" % filter)
-
-                    if len(opened) != len(closed):
-                        raise ValueError("'(' and ')' don't match in filter: %s" % filter)
-                    filters = []
-                    for i in range(len(opened)):
-                        filters.append(filter[opened[i] + 1:closed[i]])
-                    return filters
-
-                if filter[0] == '(':
-                    if not filter[-1] == ')':
-                        raise ValueError("matching ) missing in filter: %s" % filter)
-                    else:
-                        filters = split(filter)
-                        results = []
-                        for filter in filters:
-                            results.append(subfilter(filter, attributes))
-                        return results
-                else:
-                    return [subfilter(filter, attributes)]
-
-            if filter[0] == '!':
-                return not subfilter(filter[1:], attributes)
-            elif filter[0] == '|':
-                return 1 in walk(filter[1:], attributes)
-            elif filter[0] == '&':
-                return 0 not in walk(filter[1:], attributes)
-
-        def subfilter(filter, attributes):
-
-            if filter[0] == '(':
-                if not filter[-1] == ')':
-                    raise ValueError("matching ) missing in filter: %s" % filter)
-                else:
-                    return subfilter(filter[1:-1], attributes)
-
-            elif filter[0] in filter_connectors:
-                return connecting_filter(filter, attributes)
-
-            else:
-                return attribute_filter(filter, attributes)
-
-        return subfilter(filter, attributes)
+        return compile_filter(filter)(attributes)
 
     def _ignore_object(self, key, object):
         """
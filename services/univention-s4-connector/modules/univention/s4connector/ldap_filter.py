@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+#
+# Univention S4 Connector
+#  evaluation of the LDAP filters of the mappings
+#
+# Like what you see? Join us!
+# https://www.univention.com/about-us/careers/vacancies/
+#
+# Copyright 2024 Univention GmbH
+#
+# https://www.univention.de/
+#
+# All rights reserved.
+#
+# The source code of this program is made available
+# under the terms of the GNU Affero General Public License version 3
+# (GNU AGPL V3) as published by the Free Software Foundation.
+#
+# Binary versions of this program provided by Univention to you as
+# well as other copyrighted, protected or trademarked materials like
+# Logos, graphics, fonts, specific documentations and configurations,
+# cryptographic keys etc. are subject to a license agreement between
+# you and Univention and not subject to the GNU AGPL V3.
+#
+# In the case you use this program under the terms of the GNU AGPL V3,
+# the program is provided in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License with the Debian GNU/Linux or Univention distribution in file
+# /usr/share/common-licenses/AGPL-3; if not, see
+# <https://www.gnu.org/licenses/>.
+
+
+"""
+Evaluation of the LDAP filters of the connector mappings.
+
+Each filter is parsed only once into a predicate, which is then applied to
+the attributes of many objects. The matching follows the semantics the
+connector always had:
+
+* attribute names and values are compared case insensitively,
+* `*` is only supported as presence filter, not as substring wildcard,
+* the bitwise AND matching rule `1.2.840.113556.1.4.803` is supported,
+* values may contain escaped characters like `\\2a` (:rfc:`4515`).
+"""
+
+import functools
+import re
+from collections.abc import Callable
+from typing import Any
+
+import univention.debug2 as ud
+
+
+Predicate = Callable[[Any], bool]
+
+BITWISE_AND = ':1.2.840.113556.1.4.803:'
+
+_ESCAPED = re.compile(rb'\\([0-9a-fA-F]{2})')
+
+
+def _unescape(value: str) -> bytes:
+    return _ESCAPED.sub(lambda match: bytes.fromhex(match.group(1).decode('ASCII')), value.lower().encode('UTF-8')).lower()
+
+
+def _split(filter: str) -> list[str]:
+    """Split a list of parenthesized filters like `(a=1)(|(b=2)(c=3))` into its top level filters."""
+    opened = []
+    closed = []
+    level = 0
+    for pos, char in enumerate(filter):
+        if char == '(':
+            if level == 0:
+                opened.append(pos)
+            level += 1
+        elif char == ')':
+            if level == 1:
+                closed.append(pos)
+            level -= 1
+        if level < 0:
+            raise ValueError("too many ')' in filter: %s" % filter)
+
+    if len(opened) != len(closed):
+        raise ValueError("'(' and ')' don't match in filter: %s" % filter)
+    return [filter[start + 1:end] for start, end in zip(opened, closed)]
+
+
+def _attribute_filter(filter: str) -> Predicate:
+    pos = filter.find('=')
+    if pos < 0:
+        raise ValueError('missing "=" in filter: %s' % filter)
+    attribute = filter[:pos].lower()
+    if not attribute:
+        raise ValueError('missing attribute in filter: %s' % filter)
+    value = filter[pos + 1:]
+
+    if attribute.endswith(BITWISE_AND):
+        attribute = attribute[:-len(BITWISE_AND)]
+        try:
+            mask = int(value)
+        except ValueError:
+            mask = None
+
+        def bitwise_and(attributes):
+            attribute_value = attributes.get(attribute)
+            if not attribute_value:
+                return False
+            try:
+                if mask is None:
+                    raise ValueError(value)
+                if isinstance(attribute_value, list):
+                    attribute_value = int(attribute_value[0])
+                return attribute_value & mask == mask
+            except Exception:
+                ud.debug(ud.LDAP, ud.WARN, "attribute_filter: Failed to convert attributes for bitwise filter")
+                return False
+        return bitwise_and
+
+    if value == '*':
+        return lambda attributes: attribute in attributes
+
+    expected = _unescape(value)
+
+    def equality(attributes):
+        try:
+            values = attributes[attribute]
+        except KeyError:
+            return False
+        if isinstance(values, list):
+            return any(val.lower() == expected for val in values)
+        return expected in values
+    return equality
+
+
+def _components(filter: str) -> list[Predicate]:
+    if filter[0] == '(':
+        if filter[-1] != ')':
+            raise ValueError("matching ) missing in filter: %s" % filter)
+        return [_compile(component) for component in _split(filter)]
+    return [_compile(filter)]
+
+
+def _compile(filter: str) -> Predicate:
+    if filter[0] == '(':
+        if filter[-1] != ')':
+            raise ValueError("matching ) missing in filter: %s" % filter)
+        return _compile(filter[1:-1])
+
+    if filter[0] == '!':
+        negated = _compile(filter[1:])
+        return lambda attributes: not negated(attributes)
+    if filter[0] == '|':
+        alternatives = _components(filter[1:])
+        return lambda attributes: any(predicate(attributes) for predicate in alternatives)
+    if filter[0] == '&':
+        conditions = _components(filter[1:])
+        return lambda attributes: all(predicate(attributes) for predicate in conditions)
+    return _attribute_filter(filter)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_filter(filter: str) -> Predicate:
+    """
+    Parse a LDAP filter into a predicate.
+
+    :param filter: The LDAP filter, e.g. `(&(objectClass=user)(!(userAccountControl:1.2.840.113556.1.4.803:=2)))`.
+    :returns: A function, which takes the attributes of an object and returns whether they match the filter.
+    :raises ValueError: if the filter is malformed.
+    """
+    predicate = _compile(filter)
+
+    def match(attributes):
+        if isinstance(attributes, dict):
+            attributes = {key.lower(): value for key, value in attributes.items()}
+        return predicate(attributes)
+    return match
@@ -53,6 +53,8 @@ import univention.debug2 as ud
 import univention.s4connector
 import univention.uldap
 from univention.config_registry import ConfigRegistry
+from univention.s4connector.groupcache import GroupMemberCache
+from univention.s4connector.workers import SyncStatistics, is_independent
 
 
 LDAP_SERVER_SHOW_DELETED_OID = "1.2.840.113556.1.4.417"
@@ -66,27 +68,33 @@ PAGE_SIZE = 1000
 
 
 def group_members_sync_from_ucs(connector, key, object):
-    return connector.group_members_sync_from_ucs(key, object)
+    with connector.membership_lock:
+        return connector.group_members_sync_from_ucs(key, object)
 
 
 def object_memberships_sync_from_ucs(connector, key, object):
-    return connector.object_memberships_sync_from_ucs(key, object)
+    with connector.membership_lock:
+        return connector.object_memberships_sync_from_ucs(key, object)
 
 
 def group_members_sync_to_ucs(connector, key, object):
-    return connector.group_members_sync_to_ucs(key, object)
+    with connector.membership_lock:
+        return connector.group_members_sync_to_ucs(key, object)
 
 
 def object_memberships_sync_to_ucs(connector, key, object):
-    return connector.object_memberships_sync_to_ucs(key, object)
+    with connector.membership_lock:
+        return connector.object_memberships_sync_to_ucs(key, object)
 
 
 def primary_group_sync_from_ucs(connector, key, object):
-    return connector.primary_group_sync_from_ucs(key, object)
+    with connector.membership_lock:
+        return connector.primary_group_sync_from_ucs(key, object)
 
 
 def primary_group_sync_to_ucs(connector, key, object):
-    return connector.primary_group_sync_to_ucs(key, object)
+    with connector.membership_lock:
+        return connector.primary_group_sync_to_ucs(key, object)
 
 
 def disable_user_from_ucs(connector, key, object):
@@ -591,6 +599,8 @@ class s4(univention.s4connector.ucs):
         # * entry flushed during delete+move at in sync_to_ucs and sync_from_ucs
         self.group_member_mapping_cache_con = {}
 
+        groupcachedbfile = '/etc/univention/%s/s4groupcache.sqlite' % self.CONFIGBASENAME
+
         # Save the old members of a group
         # The connector is object based, at least in the direction AD/AD to LDAP, because we don't
         # have a local cache. group_members_cache_ucs and group_members_cache_con help to
@@ -601,18 +611,18 @@ class s4(univention.s4connector.ucs):
         # from the group. For this we remove only members who are in the local cache.
 
         # UCS groups and UCS members
-        # * initialized during start
+        # * initialized during start, persisted in s4groupcache.sqlite and only updated for the groups changed meanwhile
         # * entry updated in group_members_sync_from_ucs and object_memberships_sync_from_ucs
         # * entry flushed for group object in sync_to_ucs / add_in_ucs
         # * entry used for decision in group_members_sync_to_ucs
-        self.group_members_cache_ucs = {}
+        self.group_members_cache_ucs = GroupMemberCache(groupcachedbfile, 'UCS')
 
         # AD groups and AD members
-        # * initialized during start
+        # * initialized during start, persisted in s4groupcache.sqlite and only updated for the groups changed meanwhile
         # * entry updated in group_members_sync_to_ucs and object_memberships_sync_to_ucs
         # * entry flushed for group object in sync_from_ucs / ADD
         # * entry used for decision in group_members_sync_from_ucs
-        self.group_members_cache_con = {}
+        self.group_members_cache_con = GroupMemberCache(groupcachedbfile, 'S4')
 
     def init_ldap_connections(self):
         super().init_ldap_connections()
@@ -625,7 +635,30 @@ class s4(univention.s4connector.ucs):
 
     def init_group_cache(self):
         ud.debug(ud.LDAP, ud.PROCESS, 'Building internal group membership cache')
-        s4_groups = self.__search_s4(filter='objectClass=group', attrlist=['member'])
+        cache = self.group_members_cache_con
+        # the USNs are only valid for the domain controller they were read from
+        server, _, usn = (cache.load() or '').rpartition('@')
+        highest_usn = self.__get_highestCommittedUSN()
+        if server != self.s4_ldap_host or not usn.isdigit() or int(usn) > highest_usn:
+            cache.clear()
+            s4_groups = self.__search_s4(filter='objectClass=group', attrlist=['member'])
+        else:
+            groups = {dn.lower() for dn, _attrs in self.__search_s4(filter='objectClass=group', attrlist=['1.1']) if dn}
+            for group in set(cache) - groups:
+                del cache[group]
+            s4_groups = self.__search_s4(filter='(&(objectClass=group)(uSNChanged>=%d))' % (int(usn) + 1,), attrlist=['member'])
+            # moving or renaming a member changes the member attribute of its groups, but not their uSNChanged
+            for dn, attrs in self.__search_s4(filter='(&(uSNChanged>=%d)(memberOf=*))' % (int(usn) + 1,), attrlist=['memberOf']):
+                if not dn:
+                    continue
+                for group in attrs.get('memberOf', []):
+                    group = fix_dn(group.decode('UTF-8')).lower()
+                    if group in cache:
+                        del cache[group]
+            missing = groups - set(cache) - {dn.lower() for dn, _attrs in s4_groups if dn}
+            for group in missing:
+                s4_groups += self.__search_s4(base=group, scope=ldap.SCOPE_BASE, filter='objectClass=group', attrlist=['member'])
+            ud.debug(ud.LDAP, ud.PROCESS, 'Reading the members of %d of %d S4 groups' % (len(s4_groups), len(groups)))
         ud.debug(ud.LDAP, ud.ALL, "__init__: s4_groups: %s" % s4_groups)
         for s4_group in s4_groups:
             if not s4_group or not s4_group[0]:
@@ -639,19 +672,19 @@ class s4(univention.s4connector.ucs):
                 member_cache.update(m.lower() for m in s4_members)
 
         ud.debug(ud.LDAP, ud.ALL, "__init__: self.group_members_cache_con: %s" % self.group_members_cache_con)
+        cache.save('%s@%d' % (self.s4_ldap_host, highest_usn))
 
-        for ucs_group in self.search_ucs(filter='objectClass=univentionGroup', attr=['uniqueMember']):
-            group_lower = ucs_group[0].lower()
-            self.group_members_cache_ucs[group_lower] = set()
-            if ucs_group[1]:
-                for member in ucs_group[1].get('uniqueMember'):
-                    self.group_members_cache_ucs[group_lower].add(member.decode('UTF-8').lower())
-        ud.debug(ud.LDAP, ud.ALL, "__init__: self.group_members_cache_ucs: %s" % self.group_members_cache_ucs)
+        self.init_group_cache_ucs()
         ud.debug(ud.LDAP, ud.PROCESS, 'Internal group membership cache was created')
 
     def s4_search_ext_s(self, *args, **kwargs):
         return fix_dn_in_search(self.lo_s4.lo.search_ext_s(*args, **kwargs))
 
+    def clone(self):
+        clone = super().clone()
+        clone.open_s4()
+        return clone
+
     def open_s4(self):
         tls_mode = 2
         if '%s/s4/ldap/ssl' % self.CONFIGBASENAME in self.configRegistry and self.configRegistry['%s/s4/ldap/ssl' % self.CONFIGBASENAME] == "no":
@@ -686,6 +719,20 @@ class s4(univention.s4connector.ucs):
         else:
             self.s4_ldap_partitions = (self.s4_ldap_base, "DC=DomainDnsZones,%s" % self.s4_ldap_base, "DC=ForestDnsZones,%s" % self.s4_ldap_base)
 
+    def save_group_cache(self):
+        """
+        Write the group member caches and advance the S4 watermark to the
+        changes processed so far: all changes up to the committed lastUSN except
+        the rejected ones, which are synchronized again later.
+        The members were read completely on startup, so the watermark is never
+        lowered below the one written by :meth:`init_group_cache`.
+        """
+        server, _, usn = (self.group_members_cache_con.watermark or '').rpartition('@')
+        if server != self.s4_ldap_host or not usn.isdigit():
+            return super().save_group_cache()
+        processed = min([int(self._get_config_option('S4', 'lastUSN'))] + [int(rejected) - 1 for rejected, _dn in self._list_rejected()])
+        super().save_group_cache('%s@%d' % (self.s4_ldap_host, max(int(usn), processed)))
+
     def _get_lastUSN(self):
         return max(self.__lastUSN, int(self._get_config_option('S4', 'lastUSN')))
 
@@ -1825,69 +1872,50 @@ class s4(univention.s4connector.ucs):
             ud.debug(ud.LDAP, ud.INFO, "UCS LDAP connection was closed, re-open the connection.")
             self.open_ucs()
 
-        for element in changes:
-            old_element = copy.deepcopy(element)
-            ad_object = self.__object_from_element(element)
+        def classified(changes):
+            nonlocal newUSN
+            for element in changes:
+                old_element = copy.deepcopy(element)
+                ad_object = self.__object_from_element(element)
 
-            if not ad_object:
-                print_progress(True)
-                continue
+                if not ad_object:
+                    print_progress(True)
+                    continue
 
-            property_key = self.__identify_s4_type(ad_object)
-            if not property_key:
-                self.context_log(property_key, ad_object, 'ignoring not identified object', level=ud.INFO)
-                newUSN = max(self.__get_change_usn(ad_object), newUSN)
-                print_progress(True)
-                continue
+                property_key = self.__identify_s4_type(ad_object)
+                if not property_key:
+                    self.context_log(property_key, ad_object, 'ignoring not identified object', level=ud.INFO)
+                    newUSN = max(self.__get_change_usn(ad_object), newUSN)
+                    print_progress(True)
+                    continue
 
-            if self._ignore_object(property_key, ad_object):
-                if ad_object['modtype'] == 'move':
-                    ud.debug(ud.LDAP, ud.INFO, "object_from_element: Detected a move of an S4 object into a ignored tree: dn: %s" % ad_object['dn'])
-                    ad_object['deleted_dn'] = ad_object['olddn']
-                    ad_object['dn'] = ad_object['olddn']
-                    ad_object['modtype'] = 'delete'
-                    # check the move target
-                else:
+                if self._ignore_object(property_key, ad_object):
+                    if ad_object['modtype'] == 'move':
+                        ud.debug(ud.LDAP, ud.INFO, "object_from_element: Detected a move of an S4 object into a ignored tree: dn: %s" % ad_object['dn'])
+                        ad_object['deleted_dn'] = ad_object['olddn']
+                        ad_object['dn'] = ad_object['olddn']
+                        ad_object['modtype'] = 'delete'
+                        # check the move target
+                    else:
+                        self.__update_lastUSN(ad_object)
+                        print_progress()
+                        continue
+
+                if ad_object['dn'].find('\\0ACNF:') > 0:
+                    ud.debug(ud.LDAP, ud.PROCESS, 'Ignore conflicted object: %s' % ad_object['dn'])
                     self.__update_lastUSN(ad_object)
                     print_progress()
                     continue
 
-            if ad_object['dn'].find('\\0ACNF:') > 0:
-                ud.debug(ud.LDAP, ud.PROCESS, 'Ignore conflicted object: %s' % ad_object['dn'])
-                self.__update_lastUSN(ad_object)
-                print_progress()
-                continue
+                yield (old_element, property_key, ad_object)
 
-            sync_successfull = False
-            try:
-                try:
-                    mapped_object = self._object_mapping(property_key, ad_object)
-                    if not self._ignore_object(property_key, mapped_object):
-                        sync_successfull = self.sync_to_ucs(property_key, mapped_object, ad_object['dn'], ad_object)
-                    else:
-                        sync_successfull = True
-                except univention.admin.uexceptions.ldapError as msg:
-                    if isinstance(msg.original_exception, ldap.SERVER_DOWN):
-                        raise msg.original_exception
-                    raise
-            except ldap.SERVER_DOWN:
-                ud.debug(ud.LDAP, ud.ERROR, "Got server down during sync, re-open the connection to UCS and S4")
-                time.sleep(1)
-                self.open_ucs()
-                self.open_s4()
-            except Exception:  # FIXME: which exception is to be caught?
-                self._debug_traceback(ud.WARN, "Exception during poll/sync_to_ucs")
+        statistics = SyncStatistics(self.workers.count)
 
+        # the USNs are only updated by this thread, the workers just synchronize the changes
+        for (_element, property_key, ad_object), sync_successfull in self.workers.run(classified(changes), lambda connector, change: connector.__sync_change_to_ucs(*change), self.__classify_change, statistics):
             if sync_successfull:
                 change_count += 1
                 newUSN = max(self.__get_change_usn(ad_object), newUSN)
-                try:
-                    GUID = old_element[1]['objectGUID'][0]
-                    self._set_DN_for_GUID(GUID, old_element[0])
-                except ldap.SERVER_DOWN:
-                    raise
-                except Exception:  # FIXME: which exception is to be caught?
-                    self._debug_traceback(ud.WARN, "Exception during set_DN_for_GUID")
             else:
                 self.context_log(property_key, ad_object, 'sync was not successful, save rejected', level=ud.INFO)
                 self.save_rejected(ad_object)
@@ -1896,6 +1924,8 @@ class s4(univention.s4connector.ucs):
             print_progress()
 
         print("")
+        if statistics:
+            print(statistics)
 
         if newUSN != lastUSN:
             self._set_lastUSN(newUSN)
@@ -1908,6 +1938,46 @@ class s4(univention.s4connector.ucs):
         sys.stdout.flush()
         return change_count
 
+    def __sync_change_to_ucs(self, element, property_key, ad_object):
+        """sync a change from S4 to UCS, returns whether it was successful"""
+        sync_successfull = False
+        try:
+            try:
+                mapped_object = self._object_mapping(property_key, ad_object)
+                if not self._ignore_object(property_key, mapped_object):
+                    sync_successfull = self.sync_to_ucs(property_key, mapped_object, ad_object['dn'], ad_object)
+                else:
+                    sync_successfull = True
+            except univention.admin.uexceptions.ldapError as msg:
+                if isinstance(msg.original_exception, ldap.SERVER_DOWN):
+                    raise msg.original_exception
+                raise
+        except ldap.SERVER_DOWN:
+            ud.debug(ud.LDAP, ud.ERROR, "Got server down during sync, re-open the connection to UCS and S4")
+            time.sleep(1)
+            self.open_ucs()
+            self.open_s4()
+        except Exception:  # FIXME: which exception is to be caught?
+            self._debug_traceback(ud.WARN, "Exception during poll/sync_to_ucs")
+
+        if sync_successfull:
+            try:
+                GUID = element[1]['objectGUID'][0]
+                self._set_DN_for_GUID(GUID, element[0])
+            except ldap.SERVER_DOWN:
+                raise
+            except Exception:  # FIXME: which exception is to be caught?
+                self._debug_traceback(ud.WARN, "Exception during set_DN_for_GUID")
+        return sync_successfull
+
+    def __classify_change(self, change):
+        """The objectGUID of the changed object and whether the change must be synchronized serially"""
+        element, property_key, ad_object = change
+        GUID = element[1].get('objectGUID', [None])[0]
+        if ad_object['modtype'] not in ('add', 'modify'):
+            return GUID, True
+        return GUID, not is_independent(self.modules.get(property_key))
+
     def __has_attribute_value_changed(self, attribute, old_ucs_object, new_ucs_object):
         return old_ucs_object.get(attribute) != new_ucs_object.get(attribute)
 
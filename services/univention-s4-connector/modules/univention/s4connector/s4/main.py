@@ -208,6 +208,8 @@ def _connect(s4, poll_sleep, baseconfig_retry_rejected):
             change_counter = 0
             retry_rejected += 1
 
+        s4.save_group_cache()
+
         print('- sleep %s seconds (%s/%s until resync) -' % (poll_sleep, retry_rejected, baseconfig_retry_rejected))
         sys.stdout.flush()
         time.sleep(poll_sleep)
@@ -37,7 +37,7 @@ from __future__ import annotations
 
 import os
 import pickle  # noqa: S403
-import shutil
+import sqlite3
 import subprocess
 import time
 
@@ -56,6 +56,9 @@ s4_init_mode = False
 group_objects = []
 connector_needs_restart = False
 
+JOURNAL_FILENAME = 'journal.sqlite'
+journals: dict[str, sqlite3.Connection] = {}
+
 dirs = [listener.configRegistry.get('connector/s4/listener/dir', '/var/lib/univention-connector/s4')]
 if listener.configRegistry.get('connector/listener/additionalbasenames'):
     for configbasename in listener.configRegistry['connector/listener/additionalbasenames'].split(' '):
@@ -83,22 +86,38 @@ def _load_old_object(directory: str) -> tuple[str, dict[str, list[bytes]]]:
     return (old_dn, old_object)
 
 
-def _dump_changes_to_file_and_check_file(directory: str, dn: str, new: dict[str, list[bytes]] | None, old: dict[str, list[bytes]] | None, old_dn: str | None) -> None:
+def _journal(directory: str) -> sqlite3.Connection:
+    # The changes are consumed by univention.s4connector.journal.ChangeJournal, which uses the same schema.
+    # That module is not imported here, as importing the connector modifies UDM.
+    if directory not in journals:
+        filename = os.path.join(directory, JOURNAL_FILENAME)
+        if not os.path.exists(filename):
+            # the changes contain password hashes
+            os.close(os.open(filename, os.O_WRONLY | os.O_CREAT, 0o600))
+        dbcon = sqlite3.connect(filename, timeout=60)
+        dbcon.execute('PRAGMA journal_mode=WAL')
+        # the listener does not deliver a change again once the module handled it, so it must be on disk
+        dbcon.execute('PRAGMA synchronous=FULL')
+        with dbcon:
+            dbcon.execute('CREATE TABLE IF NOT EXISTS changes (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL, dn TEXT NOT NULL, change BLOB NOT NULL, rejected INTEGER NOT NULL DEFAULT 0)')
+            dbcon.execute('CREATE INDEX IF NOT EXISTS changes_pending ON changes (rejected, timestamp, id)')
+        journals[directory] = dbcon
+    return journals[directory]
+
+
+def _close_journal(directory: str) -> None:
+    dbcon = journals.pop(directory, None)
+    if dbcon is not None:
+        dbcon.close()
+
+
+def _dump_changes_to_journal(directory: str, dn: str, new: dict[str, list[bytes]] | None, old: dict[str, list[bytes]] | None, old_dn: str | None) -> None:
     ob = (dn, new, old, old_dn)
 
-    tmpdir = os.path.join(directory, 'tmp')
-    filename = '%f' % (time.time(),)
-    filepath = os.path.join(tmpdir, filename)
-
-    with open(filepath, 'wb+') as fd:
-        os.chmod(filepath, 0o600)
-        p = pickle.Pickler(fd)
-        p.dump(ob)
-        p.clear_memo()
-
-    # prevent a race condition between the pickle file is only partly written to disk and then read
-    # by moving it to the final location after it is completely written to disk
-    shutil.move(filepath, os.path.join(directory, filename))
+    # the change is committed to the journal in one transaction, so the connector never reads a partly written change
+    dbcon = _journal(directory)
+    with dbcon:
+        dbcon.execute('INSERT INTO changes (timestamp, dn, change) VALUES (?, ?, ?)', (time.time(), dn, pickle.dumps(ob)))
 
 
 def _is_module_disabled() -> bool:
@@ -150,13 +169,13 @@ def handler(dn: str, new: dict[str, list[bytes]] | None, old: dict[str, list[byt
                 #  https://forge.univention.org/bugzilla/show_bug.cgi?id=32542
                 if old_dn and new.get('entryUUID') != old_object.get('entryUUID'):
                     ud.debug(ud.LISTENER, ud.PROCESS, "The entryUUID attribute of the saved object (%s) does not match the entryUUID attribute of the current object (%s). This can be normal in a selective replication scenario." % (old_dn, dn))
-                    _dump_changes_to_file_and_check_file(directory, old_dn, {}, old_object, None)
+                    _dump_changes_to_journal(directory, old_dn, {}, old_object, None)
                     old_dn = None
 
                 if s4_init_mode and new and b'univentionGroup' in new.get('objectClass', []):
                     group_objects.append((dn, new, old, old_dn))
 
-                _dump_changes_to_file_and_check_file(directory, dn, new, old, old_dn)
+                _dump_changes_to_journal(directory, dn, new, old, old_dn)
 
                 if os.path.exists(os.path.join(directory, 'tmp', 'old_dn')):
                     os.unlink(os.path.join(directory, 'tmp', 'old_dn'))
@@ -171,6 +190,7 @@ def clean() -> None:
         for directory in dirs:
             if not os.path.exists(directory):
                 continue
+            _close_journal(directory)
             for filename in os.listdir(directory):
                 if filename != "tmp":
                     os.remove(os.path.join(directory, filename))
@@ -192,12 +212,7 @@ def postrun() -> None:
             s4_init_mode = False
             for ob in group_objects:
                 for directory in dirs:
-                    filename = os.path.join(directory, "%f" % time.time())
-                    with open(filename, 'wb+') as fd:
-                        os.chmod(filename, 0o600)
-                        p = pickle.Pickler(fd)
-                        p.dump(ob)
-                        p.clear_memo()
+                    _dump_changes_to_journal(directory, *ob)
             del group_objects
             group_objects = []
         finally:
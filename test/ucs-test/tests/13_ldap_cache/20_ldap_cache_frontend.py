@@ -44,3 +44,37 @@ def test_users_in_group(udm, group1, group2, user1, user2, user3):
     udm.modify_object('groups/group', dn=group2, nestedGroup=[group1], wait_for_replication=True)
     assert users_in_group(group2, consider_nested_groups=False) == []
     assert sorted(users_in_group(group2)) == sorted([user1.lower(), user2.lower(), user3.lower()])
+
+
+def test_groups_for_user_after_removal(udm, group1, group2, user1, get_cache):
+    """Test if the reverse membership cache follows modifications of a group."""
+    udm.modify_object('groups/group', dn=group1, users=[user1], wait_for_replication=False)
+    udm.modify_object('groups/group', dn=group2, nestedGroup=group1, wait_for_replication=True)
+    assert get_cache().get_sub_cache('memberOf').get(user1.lower())
+    assert {group1.lower(), group2.lower()} <= set(groups_for_user(user1))
+    udm.modify_object('groups/group', dn=group1, remove={'users': [user1]}, wait_for_replication=True)
+    result_groups = groups_for_user(user1)
+    assert group1.lower() not in result_groups
+    assert group2.lower() not in result_groups
+
+
+def test_users_in_group_nested_update(udm, group1, group2, group3, user1, user2):
+    """Test if the nested users of all parent groups are updated when a subgroup changes."""
+    udm.modify_object('groups/group', dn=group1, users=[user1], wait_for_replication=False)
+    udm.modify_object('groups/group', dn=group2, nestedGroup=[group1], wait_for_replication=False)
+    udm.modify_object('groups/group', dn=group3, nestedGroup=[group2], wait_for_replication=True)
+    assert users_in_group(group3) == [user1.lower()]
+    udm.modify_object('groups/group', dn=group1, append={'users': [user2]}, wait_for_replication=True)
+    assert sorted(users_in_group(group3)) == sorted([user1.lower(), user2.lower()])
+    udm.modify_object('groups/group', dn=group2, remove={'nestedGroup': [group1]}, wait_for_replication=True)
+    assert users_in_group(group3) == []
+    assert sorted(users_in_group(group1)) == sorted([user1.lower(), user2.lower()])
+
+
+def test_users_in_group_nested_second_path(udm, group1, group2, group3, user1, user2):
+    """Test if a subgroup reached through several parent groups contributes all of its users."""
+    udm.modify_object('groups/group', dn=group1, users=[user1, user2], wait_for_replication=False)
+    udm.modify_object('groups/group', dn=group2, nestedGroup=[group1], wait_for_replication=False)
+    udm.modify_object('groups/group', dn=group3, nestedGroup=[group1, group2], wait_for_replication=True)
+    assert sorted(users_in_group(group3)) == sorted([user1.lower(), user2.lower()])
+    assert sorted(users_in_group(group2)) == sorted([user1.lower(), user2.lower()])
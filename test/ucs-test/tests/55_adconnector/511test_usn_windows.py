@@ -0,0 +1,146 @@
+#!/usr/share/ucs-test/runner pytest-3 -s
+## desc: "Test the AD->UCS sync of changes spread over several USN windows"
+## exposure: dangerous
+## packages:
+## - univention-ad-connector
+## tags:
+##  - skip_admember
+
+import subprocess
+
+import ldap
+import pytest
+
+import adconnector
+from adconnector import connector_running_on_this_host, connector_setup
+
+
+# This is something weird. The `adconnector.ADConnection()` MUST be
+# instantiated, before `UCSTestUDM` is imported.
+AD = adconnector.ADConnection()
+import univention.connector.ad  # noqa: E402
+import univention.testing.connector_common as tcommon  # noqa: E402
+from univention.testing.strings import random_username  # noqa: E402
+from univention.testing.udm import UCSTestUDM  # noqa: E402
+
+
+USERS = 10
+
+
+class Interrupted(BaseException):
+    """Stops the poll like a crash of the connector"""
+
+
+def usn_created(dn):
+    return int(AD.get_attribute(dn, 'uSNCreated')[0])
+
+
+def poll_interrupted(interrupt):
+    """Run one poll of a connector in this process, which is interrupted by `interrupt(connector)`, and return the stored lastUSN"""
+    connector = univention.connector.ad.ad.main()
+    connector.init_ldap_connections()
+    connector.init_group_cache()
+    with connector:
+        interrupt(connector)
+        try:
+            connector.poll()
+        except Interrupted:
+            pass
+        return int(connector._get_config_option('AD', 'lastUSN'))
+
+
+@pytest.fixture()
+def stopped_connector_with_changes(ucr):
+    """Create users in AD while the connector is stopped. The first user is modified last, so it carries the highest USN."""
+    with connector_setup("sync"):
+        ucr.handler_set(['connector/ad/poll/usn-window=3'])
+        adconnector.restart_adconnector()
+        adconnector.wait_for_sync()
+        subprocess.check_call(["service", "univention-ad-connector", "stop"])
+        usernames = [random_username() for _ in range(USERS)]
+        user_dns = []
+        try:
+            user_dns.extend(AD.createuser(username) for username in usernames)
+            AD.set_attributes(user_dns[0], description=b'modified')
+            yield user_dns
+
+            # the next poll syncs the changes which were not checkpointed
+            adconnector.restart_adconnector()
+            adconnector.wait_for_sync()
+            base = ldap.dn.str2dn(tcommon.configRegistry['ldap/base'])
+            for username in usernames:
+                udm_user_dn = ldap.dn.dn2str([[("uid", username, ldap.AVA_STRING)], [("CN", "users", ldap.AVA_STRING)], *base])
+                tcommon.verify_udm_object("users/user", udm_user_dn, {"username": username})
+        finally:
+            for user_dn in user_dns:
+                AD.delete(user_dn)
+            ucr.revert_to_original_registry()
+            adconnector.restart_adconnector()
+
+
+@pytest.mark.skipif(not connector_running_on_this_host(), reason="Univention AD Connector not configured.")
+def test_crash_during_poll_keeps_unsynced_windows(stopped_connector_with_changes):
+    user_dns = stopped_connector_with_changes
+
+    def interrupt(connector):
+        sync_to_ucs = connector.sync_to_ucs
+
+        def _sync_to_ucs(property_key, object, pre_mapped_ad_dn, original_object=None):
+            if pre_mapped_ad_dn.lower() == user_dns[USERS // 2].lower():
+                raise Interrupted()
+            return sync_to_ucs(property_key, object, pre_mapped_ad_dn, original_object)
+        connector.sync_to_ucs = _sync_to_ucs
+
+    lastUSN = poll_interrupted(interrupt)
+    assert lastUSN < usn_created(user_dns[USERS // 2])
+
+
+@pytest.mark.skipif(not connector_running_on_this_host(), reason="Univention AD Connector not configured.")
+def test_search_error_during_poll_keeps_unsearched_windows(stopped_connector_with_changes):
+    user_dns = stopped_connector_with_changes
+
+    def interrupt(connector):
+        search_ad_partitions = connector._ad__search_ad_partitions
+        calls = []
+
+        def _search_ad_partitions(*args, **kwargs):
+            calls.append(args)
+            if len(calls) > 1:
+                raise RuntimeError('search failed')
+            return search_ad_partitions(*args, **kwargs)
+        connector._ad__search_ad_partitions = _search_ad_partitions
+
+    lastUSN = poll_interrupted(interrupt)
+    assert lastUSN < usn_created(user_dns[-1])
+
+
+@pytest.mark.skipif(not connector_running_on_this_host(), reason="Univention AD Connector not configured.")
+def test_sync_changes_in_small_usn_windows(ucr):
+    with connector_setup("sync"), UCSTestUDM() as udm:
+        ucr.handler_set(['connector/ad/poll/usn-window=3'])
+        adconnector.restart_adconnector()
+        try:
+            groupname = random_username()
+            group_dn = AD.group_create(groupname)
+            usernames = [random_username() for _ in range(USERS)]
+            user_dns = [AD.createuser(username) for username in usernames]
+            for user_dn in user_dns:
+                AD.add_to_group(group_dn, user_dn)
+            adconnector.wait_for_sync()
+
+            base = ldap.dn.str2dn(tcommon.configRegistry['ldap/base'])
+            udm_user_dns = [ldap.dn.dn2str([[("uid", username, ldap.AVA_STRING)], [("CN", "users", ldap.AVA_STRING)], *base]) for username in usernames]
+            for username, udm_user_dn in zip(usernames, udm_user_dns):
+                tcommon.verify_udm_object("users/user", udm_user_dn, {"username": username})
+            udm_group_dn = ldap.dn.dn2str([[("cn", groupname, ldap.AVA_STRING)], [("CN", "groups", ldap.AVA_STRING)], *base])
+            udm.verify_udm_object("groups/group", udm_group_dn, {"users": udm_user_dns})
+
+            for user_dn in user_dns:
+                AD.delete(user_dn)
+            AD.delete(group_dn)
+            adconnector.wait_for_sync()
+            for udm_user_dn in udm_user_dns:
+                tcommon.verify_udm_object("users/user", udm_user_dn, None)
+        finally:
+            ucr.revert_to_original_registry()
+            adconnector.restart_adconnector()
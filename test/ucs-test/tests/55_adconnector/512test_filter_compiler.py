@@ -0,0 +1,210 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test and benchmark the compiled LDAP filters of the connector mappings
+## exposure: safe
+## packages:
+## - univention-ad-connector
+
+import time
+
+import pytest
+
+from univention.connector.ldap_filter import compile_filter
+
+
+USER = {
+    'objectClass': [b'top', b'person', b'organizationalPerson', b'user'],
+    'cn': [b'Anna Alster'],
+    'sAMAccountName': [b'anna.alster'],
+    'userAccountControl': [b'66050'],
+    'memberOf': [b'CN=Domain Users,CN=Users,DC=example,DC=com', b'CN=Sales,CN=Users,DC=example,DC=com'],
+    'description': [b'Sales (Berlin) *'],
+}
+COMPUTER = {
+    'objectClass': [b'top', b'person', b'organizationalPerson', b'user', b'computer'],
+    'cn': [b'WIN10-042'],
+    'sAMAccountName': [b'WIN10-042$'],
+    'userAccountControl': [b'4096'],
+    'operatingSystem': [b'Windows 10 Pro'],
+}
+GROUP = {
+    'objectClass': [b'top', b'group'],
+    'cn': [b'Domain Admins'],
+    'groupType': [b'-2147483646'],
+    'isCriticalSystemObject': [b'TRUE'],
+}
+
+# similar to the filters of the default mapping
+USER_FILTER = '(&(|(&(objectClass=person)(objectClass=organizationalPerson)(objectClass=user))(objectClass=inetOrgPerson))(!(objectClass=computer))(!(isCriticalSystemObject=TRUE)))'
+COMPUTER_FILTER = '(&(objectClass=computer)(userAccountControl:1.2.840.113556.1.4.803:=4096))'
+IGNORE_FILTER = '(|(cn=Administrator)(cn=krbtgt)(cn=Guest)(cn=DefaultAccount)(cn=WDAGUtilityAccount)(userAccountControl:1.2.840.113556.1.4.803:=2048))'
+
+
+def reference_filter_match(filter, attributes):
+    """The matcher used by the connector before the filters were compiled, which parses the filter for every object"""
+    filter_connectors = ['!', '&', '|']
+
+    def list_lower(elements):
+        if isinstance(elements, list):
+            retlist = []
+            for le in elements:
+                retlist.append(le.lower())
+            return retlist
+        else:
+            return elements
+
+    def dict_lower(dict_):
+        if isinstance(dict_, dict):
+            retdict = {}
+            for key in dict_:
+                retdict[key.lower()] = dict_[key]
+            return retdict
+        else:
+            return dict_
+
+    def attribute_filter(filter, attributes):
+        attributes = dict_lower(attributes)
+
+        pos = filter.find('=')
+        if pos < 0:
+            raise ValueError('missing "=" in filter: %s' % filter)
+        attribute = filter[:pos].lower()
+        if not attribute:
+            raise ValueError('missing attribute in filter: %s' % filter)
+        value = filter[pos + 1:]
+
+        if attribute.endswith(':1.2.840.113556.1.4.803:'):
+            # bitwise filter
+            attribute_name = attribute.replace(':1.2.840.113556.1.4.803:', '')
+            attribute_value = attributes.get(attribute_name)
+            if attribute_value:
+                try:
+                    if isinstance(attribute_value, list):
+                        attribute_value = int(attribute_value[0])
+                    int_value = int(value)
+                    return attribute_value & int_value == int_value
+                except Exception:
+                    return False
+
+        if value == '*':
+            return attribute in list_lower(attributes.keys())
+        elif attribute in attributes:
+            return value.lower().encode('UTF-8') in list_lower(attributes[attribute])
+        else:
+            return False
+
+    def connecting_filter(filter, attributes):
+
+        def walk(filter, attributes):
+
+            def split(filter):
+                opened = []
+                closed = []
+                level = 0
+                for pos, char in enumerate(filter):
+                    if char == '(':
+                        if level == 0:
+                            opened.append(pos)
+                        level += 1
+                    elif char == ')':
+                        if level == 1:
+                            closed.append(pos)
+                        level -= 1
+                    if level < 0:
+                        raise ValueError("too many ')' in filter: %s" % filter)
+
+                if len(opened) != len(closed):
+                    raise ValueError("'(' and ')' don't match in filter: %s" % filter)
+                filters = []
+                for i in range(len(opened)):
+                    filters.append(filter[opened[i] + 1:closed[i]])
+                return filters
+
+            if filter[0] == '(':
+                if not filter[-1] == ')':
+                    raise ValueError("matching ) missing in filter: %s" % filter)
+                else:
+                    filters = split(filter)
+                    results = []
+                    for filter in filters:
+                        results.append(subfilter(filter, attributes))
+                    return results
+            else:
+                return [subfilter(filter, attributes)]
+
+        if filter[0] == '!':
+            return not subfilter(filter[1:], attributes)
+        elif filter[0] == '|':
+            return 1 in walk(filter[1:], attributes)
+        elif filter[0] == '&':
+            return 0 not in walk(filter[1:], attributes)
+
+    def subfilter(filter, attributes):
+
+        if filter[0] == '(':
+            if not filter[-1] == ')':
+                raise ValueError("matching ) missing in filter: %s" % filter)
+            else:
+                return subfilter(filter[1:-1], attributes)
+
+        elif filter[0] in filter_connectors:
+            return connecting_filter(filter, attributes)
+
+        else:
+            return attribute_filter(filter, attributes)
+
+    return subfilter(filter, attributes)
+
+
+@pytest.mark.parametrize('filter,attributes,expected', [
+    (USER_FILTER, USER, True),
+    (USER_FILTER, COMPUTER, False),
+    (USER_FILTER, GROUP, False),
+    (COMPUTER_FILTER, COMPUTER, True),
+    (COMPUTER_FILTER, USER, False),
+    (IGNORE_FILTER, USER, False),
+    ('objectClass=group', GROUP, True),
+    ('(OBJECTCLASS=GROUP)', GROUP, True),
+    ('(sAMAccountName=ANNA.ALSTER)', USER, True),
+    ('(operatingSystem=*)', COMPUTER, True),
+    ('(operatingSystem=*)', USER, False),
+    ('(cn=Anna*)', USER, False),
+    (r'(description=Sales \28Berlin\29 \2a)', USER, True),
+    (r'(description=Sales \28berlin\29 \2A)', USER, True),
+    ('(userAccountControl:1.2.840.113556.1.4.803:=2)', USER, True),
+    ('(userAccountControl:1.2.840.113556.1.4.803:=2)', COMPUTER, False),
+    ('(userAccountControl:1.2.840.113556.1.4.803:=2)', GROUP, False),
+    ('(groupType:1.2.840.113556.1.4.803:=2147483648)', GROUP, True),
+    ('(groupType:1.2.840.113556.1.4.803:=4)', GROUP, False),
+    ('(!(cn=Domain Admins))', GROUP, False),
+])
+def test_filter_match(filter, attributes, expected):
+    assert compile_filter(filter)(attributes) is expected
+
+
+@pytest.mark.parametrize('filter', [
+    '(cn)',
+    '(=foo)',
+    '(&(cn=foo)',
+    '(&(cn=foo)))',
+])
+def test_invalid_filter(filter):
+    with pytest.raises(ValueError):
+        compile_filter(filter)
+
+
+def test_benchmark_filter_match():
+    objects = [USER, COMPUTER, GROUP] * 2000
+    filters = [USER_FILTER, COMPUTER_FILTER, IGNORE_FILTER]
+
+    start = time.monotonic()
+    reference = [bool(reference_filter_match(filter, attributes)) for attributes in objects for filter in filters]
+    uncompiled = time.monotonic() - start
+
+    start = time.monotonic()
+    predicates = [compile_filter(filter) for filter in filters]
+    compiled = [predicate(attributes) for attributes in objects for predicate in predicates]
+    precompiled = time.monotonic() - start
+    print('%d matches: previous matcher %.3fs, compiled once %.3fs' % (len(compiled), uncompiled, precompiled))
+
+    assert reference == compiled
+    assert precompiled < uncompiled
@@ -0,0 +1,50 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test the persistent group member cache of the connector
+## exposure: safe
+## packages:
+## - univention-ad-connector
+
+from univention.connector.groupcache import GroupMemberCache
+
+
+GROUP = 'cn=group,dc=example,dc=com'
+USER1 = 'uid=user1,dc=example,dc=com'
+USER2 = 'uid=user2,dc=example,dc=com'
+
+
+def test_not_persisted(tmp_path):
+    cache = GroupMemberCache(str(tmp_path / 'groupcache.sqlite'), 'UCS')
+    assert cache.load() is None
+    assert cache == {}
+
+
+def test_save_and_load(tmp_path):
+    filename = str(tmp_path / 'groupcache.sqlite')
+    cache = GroupMemberCache(filename, 'UCS')
+    cache[GROUP] = {USER1}
+    cache.setdefault(GROUP, set()).add(USER2)
+    cache.save('20240101000000.000000Z#000000#000#000000')
+
+    cache = GroupMemberCache(filename, 'UCS')
+    assert cache.load() == '20240101000000.000000Z#000000#000#000000'
+    assert cache == {GROUP: {USER1, USER2}}
+    assert GroupMemberCache(filename, 'AD').load() is None
+
+
+def test_save_changes_only(tmp_path):
+    filename = str(tmp_path / 'groupcache.sqlite')
+    cache = GroupMemberCache(filename, 'AD')
+    cache.update({GROUP: {USER1}, 'cn=other,dc=example,dc=com': set()})
+    cache.save('dc.example.com@42')
+
+    cache.load()
+    cache[GROUP].remove(USER1)
+    cache[GROUP].add(USER2)
+    del cache['cn=other,dc=example,dc=com']
+    assert cache._changed == {GROUP, 'cn=other,dc=example,dc=com'}
+    cache.save()
+    assert not cache._changed
+
+    cache = GroupMemberCache(filename, 'AD')
+    assert cache.load() == 'dc.example.com@42'
+    assert cache == {GROUP: {USER2}}
@@ -0,0 +1,97 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test the journal of the UCS changes of the connector
+## exposure: safe
+## packages:
+## - univention-ad-connector
+
+import os
+import pickle  # noqa: S403
+import stat
+
+import pytest
+
+from univention.connector.journal import ChangeJournal
+
+
+DN = 'uid=user1,dc=example,dc=com'
+OTHER = 'uid=user2,dc=example,dc=com'
+
+
+def user(uuid=b'1', description=b'a'):
+    return {'entryUUID': [uuid], 'description': [description]}
+
+
+@pytest.fixture()
+def journal(tmp_path):
+    return ChangeJournal(str(tmp_path))
+
+
+def test_permissions(journal):
+    assert stat.S_IMODE(os.stat(journal.filename).st_mode) == 0o600
+
+
+def test_order(journal):
+    journal.append(DN, user(), {}, None)
+    journal.append(OTHER, user(b'2'), {}, None)
+    assert [entry.dn for entry in journal.pending(10)] == [DN, OTHER]
+    assert len(journal) == 2
+
+
+@pytest.mark.parametrize('changes,coalesced', [
+    pytest.param([(user(), {}, None), (user(description=b'b'), user(), None)], [(user(description=b'b'), {}, None)], id='add+modify'),
+    pytest.param([(user(), {}, None), ({}, user(), None)], [(user(), {}, None), ({}, user(), None)], id='add+delete'),
+    pytest.param([({}, user(), None), (user(b'2'), {}, None)], [({}, user(), None), (user(b'2'), {}, None)], id='delete+add'),
+    pytest.param([(user(), {}, None), (user(b'2'), user(), None)], [(user(), {}, None), (user(b'2'), user(), None)], id='other-uuid'),
+    pytest.param([(user(), {}, None), (user(description=b'b'), {}, OTHER)], [(user(), {}, None), (user(description=b'b'), {}, OTHER)], id='move'),
+])
+def test_coalesce(journal, changes, coalesced):
+    for new, old, old_dn in changes:
+        journal.append(DN, new, old, old_dn)
+    assert [entry.change for entry in journal.pending(10)] == [(DN, new, old, old_dn) for new, old, old_dn in coalesced]
+
+
+def test_coalesce_only_directly_following(journal):
+    journal.append(DN, user(), {}, None)
+    journal.append(OTHER, user(b'2'), {}, None)
+    journal.append(DN, user(description=b'b'), user(), None)
+    assert [entry.ids for entry in journal.pending(10)] == [[1], [2], [3]]
+
+
+def test_remove_and_reject(journal):
+    journal.append(DN, user(), {}, None)
+    journal.append(DN, user(description=b'b'), user(), None)
+    journal.append(OTHER, user(b'2'), {}, None)
+    first, second = journal.pending(10)
+    assert first.ids == [1, 2]
+
+    journal.reject(first)
+    journal.remove(second)
+    assert journal.pending(10) == []
+    assert journal.get(first.name).change == (DN, user(description=b'b'), {}, None)
+
+    journal.forget_rejected([first.name])
+    assert journal.get(first.name) is not None
+    journal.forget_rejected([])
+    assert journal.get(first.name) is None
+
+
+def test_import_files(journal, tmp_path):
+    with open(tmp_path / '1700000000.000001', 'wb') as fd:
+        pickle.dump((DN, user(), {}, None), fd)
+    (tmp_path / '1700000000.000002').write_bytes(b'')
+    (tmp_path / 'tmp').mkdir()
+
+    assert journal.import_files() == [str(tmp_path / '1700000000.000002')]
+    assert not (tmp_path / '1700000000.000001').exists()
+    assert [entry.change for entry in journal.pending(10)] == [(DN, user(), {}, None)]
+
+
+def test_import_files_in_order(journal, tmp_path):
+    journal.append(OTHER, user(b'2'), {}, None)
+    with open(tmp_path / '1700000000.000001', 'wb') as fd:
+        pickle.dump((DN, user(), {}, None), fd)
+
+    assert journal.import_files() == []
+    entries = journal.pending(1)
+    assert [entry.dn for entry in entries] == [DN]
+    assert [entry.dn for entry in journal.pending(10, after=entries[-1].position)] == [OTHER]
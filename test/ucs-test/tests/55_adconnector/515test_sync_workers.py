@@ -0,0 +1,146 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test the concurrent synchronization of independent objects by the connector
+## exposure: safe
+## packages:
+## - univention-ad-connector
+
+import threading
+import time
+
+import pytest
+
+from univention.connector.workers import SyncStatistics, SyncWorkers, schedule
+
+
+class Connector:
+
+    def __init__(self):
+        self.clones = []
+
+    def clone(self):
+        clone = Connector()
+        self.clones.append(clone)
+        return clone
+
+
+class Recorder:
+    """Records the order of the synchronized changes and checks that serial changes run alone"""
+
+    def __init__(self, duration=0.0):
+        self.duration = duration
+        self.lock = threading.Lock()
+        self.running = 0
+        self.order = []
+        self.connectors = set()
+
+    def __call__(self, connector, item):
+        key, serial = item[:2]
+        with self.lock:
+            assert not serial or self.running == 0
+            self.running += 1
+            self.connectors.add(connector)
+        time.sleep(self.duration)
+        with self.lock:
+            self.running -= 1
+            self.order.append(item)
+        if item[2:] == ('fail',):
+            raise ValueError(item)
+        return key
+
+
+def classify(item):
+    return item[0], item[1]
+
+
+def test_schedule():
+    items = [('a', False, 1), ('b', False, 1), ('a', False, 2), ('c', True, 1), ('b', False, 2), (None, False, 1)]
+    assert list(schedule(items, classify, 10)) == [
+        [[('a', False, 1), ('a', False, 2)], [('b', False, 1)]],
+        [[('c', True, 1)]],
+        [[('b', False, 2)]],
+        [[(None, False, 1)]],
+    ]
+
+
+def test_schedule_batch_size():
+    items = [(key, False) for key in 'abcde']
+    assert [len(batch) for batch in schedule(items, classify, 2)] == [2, 2, 1]
+
+
+def test_sequential():
+    connector = Connector()
+    recorder = Recorder()
+    items = [('a', True), ('b', False), ('a', False)]
+    results = list(SyncWorkers(connector, 1).run(iter(items), recorder, classify=None))
+    assert results == [(item, item[0]) for item in items]
+    assert recorder.order == items
+    assert recorder.connectors == {connector}
+    assert not connector.clones
+
+
+def test_order_per_object():
+    connector = Connector()
+    recorder = Recorder(0.001)
+    items = [('user%d' % (i % 7,), False, i) for i in range(60)]
+    items[20] = ('container', True, 20)
+    items[40] = ('group', True, 40)
+    workers = SyncWorkers(connector, 4)
+    try:
+        results = list(workers.run(items, recorder, classify))
+    finally:
+        workers.close()
+
+    assert sorted(item for item, _result in results) == sorted(items)
+    for key in {item[0] for item in items}:
+        assert [item for item in recorder.order if item[0] == key] == [item for item in items if item[0] == key]
+    # the serial changes are barriers
+    position = {item: i for i, item in enumerate(recorder.order)}
+    for barrier in (20, 40):
+        assert all(position[item] < position[items[barrier]] for item in items[:barrier])
+        assert all(position[item] > position[items[barrier]] for item in items[barrier + 1:])
+    # serial changes are run by the connector, all others by its clones
+    assert connector in recorder.connectors
+    assert 1 <= len(connector.clones) <= 4
+
+
+def test_failure():
+    connector = Connector()
+    recorder = Recorder()
+    items = [('a', False, 'fail'), ('b', False), ('a', False), ('c', True)]
+    workers = SyncWorkers(connector, 2)
+    results = []
+    try:
+        with pytest.raises(ValueError):
+            for item, _result in workers.run(items, recorder, classify):
+                results.append(item)
+    finally:
+        workers.close()
+    assert results == [('b', False)]
+    assert ('a', False) not in recorder.order
+    assert ('c', True) not in recorder.order
+
+
+def test_statistics():
+    statistics = SyncStatistics(4)
+    assert not statistics
+    statistics.add(0.5)
+    statistics.add(1.5)
+    assert len(statistics) == 2
+    assert 'Synced 2 changes' in str(statistics)
+    assert 'with 4 worker(s)' in str(statistics)
+    assert '1.000s average, 1.500s maximum' in str(statistics)
+
+
+def test_benchmark_workers():
+    items = [('user%d' % (i,), False) for i in range(200)]
+    durations = {}
+    for count in (1, 8):
+        statistics = SyncStatistics(count)
+        workers = SyncWorkers(Connector(), count)
+        try:
+            assert len(list(workers.run(items, Recorder(0.005), classify, statistics))) == len(items)
+        finally:
+            workers.close()
+        durations[count] = time.monotonic() - statistics.start
+        print(statistics)
+    assert durations[8] < durations[1] / 2
@@ -0,0 +1,73 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test that the persistent group member cache follows members renamed while the connector was stopped and advances its watermark
+## exposure: dangerous
+## packages:
+## - univention-ad-connector
+## tags:
+##  - skip_admember
+
+import subprocess
+
+import ldap
+import pytest
+
+import adconnector
+from adconnector import connector_running_on_this_host, connector_setup
+from univention.connector.groupcache import GroupMemberCache
+from univention.testing.strings import random_username
+
+
+AD = adconnector.ADConnection()
+GROUP_CACHE = '/etc/univention/connector/groupcache.sqlite'
+
+
+def watermark():
+    cache = GroupMemberCache(GROUP_CACHE, 'AD')
+    return int(cache.load().rpartition('@')[2])
+
+
+def cached_members(group_dn):
+    cache = GroupMemberCache(GROUP_CACHE, 'AD')
+    cache.load()
+    return cache.get(group_dn.lower(), set())
+
+
+@pytest.mark.skipif(not connector_running_on_this_host(), reason="Univention AD Connector not configured.")
+def test_member_renamed_while_stopped():
+    with connector_setup("write"):
+        group_dn = AD.group_create(random_username())
+        user_dn = AD.createuser(random_username())
+        AD.add_to_group(group_dn, user_dn)
+        try:
+            adconnector.restart_adconnector()
+            adconnector.wait_for_sync()
+            assert user_dn.lower() in cached_members(group_dn)
+
+            subprocess.check_call(["service", "univention-ad-connector", "stop"])
+            try:
+                new_user_dn = ldap.dn.dn2str([[("CN", random_username(), ldap.AVA_STRING)], *ldap.dn.str2dn(user_dn)[1:]])
+                AD.move(user_dn, new_user_dn)
+                user_dn = new_user_dn
+            finally:
+                adconnector.restart_adconnector()
+            adconnector.wait_for_sync()
+
+            members = cached_members(group_dn)
+            assert user_dn.lower() in members
+            assert len(members) == 1
+        finally:
+            AD.delete(user_dn)
+            AD.delete(group_dn)
+
+
+@pytest.mark.skipif(not connector_running_on_this_host(), reason="Univention AD Connector not configured.")
+def test_watermark_advances_after_poll():
+    with connector_setup("sync"):
+        adconnector.restart_adconnector()
+        adconnector.wait_for_sync()
+        group_dn = AD.group_create(random_username())
+        try:
+            adconnector.wait_for_sync()
+            assert watermark() >= int(AD.get_attribute(group_dn, 'uSNChanged')[0])
+        finally:
+            AD.delete(group_dn)
@@ -9,9 +9,13 @@
 
 import os
 import subprocess
+import time
+from unittest import mock
 
 import pytest
 
+import univention.admin.modules
+import univention.admin.uldap
 import univention.testing.strings as uts
 import univention.testing.udm as udm_test
 from univention.testing import utils, utils as testing_utils
@@ -99,6 +103,29 @@ class Test_UDMExtension:
         udm.remove_object('settings/extended_attribute', dn=extended_attribute)
         utils.verify_ldap_object(extended_attribute, should_exist=False)
 
+    @pytest.mark.tags('udm')
+    @pytest.mark.roles('domaincontroller_master')
+    @pytest.mark.exposure('careful')
+    def test_extended_attribute_change_is_initialized(self, udm, properties):
+        """The next module init() picks up a changed settings/extended_attribute"""
+        lo, position = univention.admin.uldap.getAdminConnection()
+        univention.admin.modules.update()
+        module = univention.admin.modules.get('users/user')
+        univention.admin.modules.init(lo, position, module)
+        assert properties['CLIName'] not in module.property_descriptions
+
+        extended_attribute = udm.create_object('settings/extended_attribute', position=udm.UNIVENTION_CONTAINER, **properties)
+        univention.admin.modules.update()
+        univention.admin.modules.init(lo, position, module)
+        assert module.property_descriptions[properties['CLIName']].short_description == properties['shortDescription']
+
+        description = uts.random_string()
+        udm.modify_object('settings/extended_attribute', dn=extended_attribute, shortDescription=description)
+        ttl = univention.admin.modules._definitions.ttl
+        with mock.patch.object(univention.admin.modules.time, 'time', return_value=time.time() + ttl + 1):
+            univention.admin.modules.init(lo, position, module)
+        assert module.property_descriptions[properties['CLIName']].short_description == description
+
     @pytest.mark.tags('udm')
     @pytest.mark.roles('domaincontroller_master')
     @pytest.mark.exposure('careful')
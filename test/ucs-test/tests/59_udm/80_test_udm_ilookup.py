@@ -0,0 +1,51 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test the paged streaming lookup of UDM objects
+## tags: [udm]
+## roles: [domaincontroller_master]
+## exposure: careful
+## packages:
+## - univention-directory-manager-tools
+
+import pytest
+
+import univention.admin.modules as udm_modules
+import univention.admin.uexceptions
+
+
+@pytest.fixture()
+def users(udm, lo):
+    udm_modules.update()
+    return {udm.create_user()[0] for _ in range(5)}
+
+
+@pytest.fixture()
+def ldap_filter(users):
+    return '(|%s)' % ''.join('(uid=%s)' % dn.split(',', 1)[0].split('=', 1)[1] for dn in users)
+
+
+@pytest.mark.parametrize('page_size', [1, 2, 1000])
+def test_ilookup_equals_lookup(lo, users, ldap_filter, page_size):
+    expected = {obj.dn for obj in udm_modules.lookup('users/user', None, lo, scope='sub', filter=ldap_filter)}
+    result = udm_modules.ilookup('users/user', None, lo, scope='sub', filter=ldap_filter, page_size=page_size)
+    assert not isinstance(result, list)
+    assert {obj.dn for obj in result} == expected == users
+
+
+def test_ilookup_sizelimit(lo, users, ldap_filter):
+    result = udm_modules.ilookup('users/user', None, lo, scope='sub', filter=ldap_filter, sizelimit=2, page_size=1)
+    # the limit is enforced while the pages are consumed
+    assert next(result).dn in users
+    assert next(result).dn in users
+    with pytest.raises(univention.admin.uexceptions.ldapSizelimitExceeded):
+        next(result)
+
+
+def test_ilookup_sizelimit_pages(lo, users, ldap_filter):
+    result = udm_modules.ilookup('users/user', None, lo, scope='sub', filter=ldap_filter, sizelimit=len(users), page_size=1)
+    assert {obj.dn for obj in result} == users
+
+
+def test_ilookup_required(lo, ldap_base):
+    result = udm_modules.ilookup('users/user', None, lo, base=ldap_base, scope='sub', filter='(uid=does-not-exist)', required=True)
+    with pytest.raises(univention.admin.uexceptions.noObject):
+        list(result)
@@ -0,0 +1,63 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test startup time of the UDM CLI with and without the cached module index
+## tags: [udm]
+## roles: [domaincontroller_master]
+## exposure: careful
+## packages:
+## - univention-directory-manager-tools
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import univention.admin.modules as udm_modules
+
+
+ROUNDS = 5
+STARTUP = 'import univention.admincli.admin'
+
+
+def startup_time() -> float:
+    start = time.monotonic()
+    subprocess.run([sys.executable, '-c', STARTUP], check=True)
+    return time.monotonic() - start
+
+
+@pytest.fixture()
+def module_index():
+    try:
+        with open(udm_modules.MODULE_INDEX, 'rb') as fd:
+            saved = fd.read()
+    except FileNotFoundError:
+        saved = None
+    yield udm_modules.MODULE_INDEX
+    if saved is None:
+        return
+    with open(udm_modules.MODULE_INDEX, 'wb') as fd:
+        fd.write(saved)
+
+
+def remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def test_module_index_created(module_index):
+    remove(module_index)
+    startup_time()
+    assert os.path.exists(module_index)
+
+
+def test_benchmark_udm_startup(module_index):
+    before = []
+    for _ in range(ROUNDS):
+        remove(module_index)
+        before.append(startup_time())
+    after = [startup_time() for _ in range(ROUNDS)]
+    print('UDM CLI startup: before %.3fs, after %.3fs' % (min(before), min(after)))
+    assert min(after) < min(before)
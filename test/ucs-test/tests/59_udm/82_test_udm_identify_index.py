@@ -0,0 +1,48 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test the object class index of UDM identify() built from scratch
+## tags: [udm]
+## roles: [domaincontroller_master]
+## exposure: careful
+## packages:
+## - univention-directory-manager-tools
+
+import os
+
+import pytest
+
+import univention.admin.modules as udm_modules
+
+
+@pytest.fixture()
+def fresh_index():
+    try:
+        with open(udm_modules.MODULE_INDEX, 'rb') as fd:
+            saved = fd.read()
+    except FileNotFoundError:
+        saved = None
+    try:
+        os.remove(udm_modules.MODULE_INDEX)
+    except FileNotFoundError:
+        pass
+    udm_modules.update()
+    yield udm_modules._index
+    if saved is not None:
+        with open(udm_modules.MODULE_INDEX, 'wb') as fd:
+            fd.write(saved)
+    udm_modules.update()
+
+
+def test_index_object_classes(fresh_index):
+    for name in ('groups/group', 'mail/domain', 'networks/network', 'policies/pwhistory'):
+        assert fresh_index[name]['object_classes'], name
+    assert fresh_index['groups/group']['object_classes'] == ['univentionGroup']
+    assert 'groups/group' not in udm_modules._identify_always
+
+
+def test_identify_without_object_type(fresh_index, udm, lo):
+    dn = udm.create_group()[0]
+    attr = lo.get(dn)
+    attr.pop('univentionObjectType', None)
+    identified = [module.module for module in udm_modules.identify(dn, attr)]
+    assert 'groups/group' in identified
+    assert 'mail/domain' not in identified
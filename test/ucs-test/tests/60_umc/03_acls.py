@@ -58,3 +58,62 @@ def test_acls(udm, ucr):
     _test_new_acl(operation_sets[7], ['service:LDAP', 'service:FOO'])
     _test_new_acl(operation_sets[8], ['service:BAR'], False)
     _test_new_acl(operation_sets[9], ['*%s' % hostname[2:]])
+
+
+def test_acls_changed_operation_set(udm):
+    test_user, username = udm.create_user(wait_for_replication=False, check_for_drs_replication=False, wait_for=False)
+    operation_set = udm.create_object(
+        'settings/umc_operationset',
+        position="cn=operations,cn=UMC,cn=univention,%s" % udm.LDAP_BASE,
+        name='join-cached',
+        description='Join cached',
+        operation=["join/*", "lib/server/*"],
+        wait_for_replication=False,
+    )
+    policy_dn = udm.create_object(
+        'policies/umc',
+        position="cn=UMC,cn=policies,%s" % udm.LDAP_BASE,
+        name='test-umc-policy-cached',
+        allow=operation_set,
+        wait_for_replication=False,
+    )
+    udm.modify_object('users/user', dn=test_user, policy_reference=policy_dn, wait_for_replication=False)
+
+    data = Client(None, username, 'univention').umc_command('join/scripts/query').result
+    assert isinstance(data, list), data
+
+    # the operation set is cached by the UMC server and must be read again after it changed
+    udm.modify_object('settings/umc_operationset', dn=operation_set, operation=["lib/server/*"], wait_for_replication=False)
+    with pytest.raises(Forbidden):
+        Client(None, username, 'univention').umc_command('join/scripts/query').result  # noqa: B018
+
+
+def test_acls_changed_group_policy(udm):
+    test_user, username = udm.create_user(wait_for_replication=False, check_for_drs_replication=False, wait_for=False)
+    operation_set = udm.create_object(
+        'settings/umc_operationset',
+        position="cn=operations,cn=UMC,cn=univention,%s" % udm.LDAP_BASE,
+        name='join-group',
+        description='Join group',
+        operation=["join/*", "lib/server/*"],
+        wait_for_replication=False,
+    )
+    policy_dn = udm.create_object(
+        'policies/umc',
+        position="cn=UMC,cn=policies,%s" % udm.LDAP_BASE,
+        name='test-umc-policy-group',
+        allow=operation_set,
+        wait_for_replication=False,
+    )
+    groups = [udm.create_group(wait_for_replication=False)[0] for _ in range(3)]
+    for group in groups:
+        udm.modify_object('groups/group', dn=group, append={'users': [test_user]}, wait_for_replication=False)
+    udm.modify_object('groups/group', dn=groups[-1], policy_reference=policy_dn, wait_for_replication=False)
+
+    data = Client(None, username, 'univention').umc_command('join/scripts/query').result
+    assert isinstance(data, list), data
+
+    # the policies of all groups are resolved together and must follow the change of the granting policy
+    udm.modify_object('policies/umc', dn=policy_dn, remove={'allow': [operation_set]}, wait_for_replication=False)
+    with pytest.raises(Forbidden):
+        Client(None, username, 'univention').umc_command('join/scripts/query').result  # noqa: B018
@@ -0,0 +1,71 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test matching of UMC commands against ACL rules
+## roles:
+##  - domaincontroller_master
+## packages:
+##  - univention-management-console
+## exposure: safe
+
+import time
+from unittest import mock
+
+import pytest
+
+from univention.management.console.acl import ACLs
+from univention.management.console.module import Manager
+
+
+HOSTNAME = 'host1'
+
+
+def rule(command, host='*', options=None, flavor=None, fromUser=False):
+    return {'fromUser': fromUser, 'host': host, 'command': command, 'options': options or {}, 'flavor': flavor}
+
+
+@pytest.mark.parametrize('rules,command,options,flavor,allowed', [
+    ([rule('udm/query')], 'udm/query', {}, None, True),
+    ([rule('udm/query')], 'udm/get', {}, None, False),
+    ([rule('udm/*')], 'udm/get', {}, None, True),
+    ([rule('udm/*')], 'ud', {}, None, False),
+    ([rule('*')], 'join/scripts/query', {}, None, True),
+    ([rule('udm/*', host='host2')], 'udm/get', {}, None, False),
+    ([rule('udm/*', host='host2'), rule('udm/get', host=HOSTNAME)], 'udm/get', {}, None, True),
+    ([rule('udm/*', flavor='users/user')], 'udm/get', {}, 'users/user', True),
+    ([rule('udm/*', flavor='users/user')], 'udm/get', {}, 'groups/group', False),
+    ([rule('udm/*', flavor='users/*')], 'udm/get', {}, 'users/contact', True),
+    ([rule('udm/*', flavor='users/*')], 'udm/get', {}, None, False),
+    ([rule('udm/*', flavor='*')], 'udm/get', {}, None, True),
+    ([rule('udm/*', options={'objectType': 'users/*'})], 'udm/get', {'objectType': 'users/user'}, None, True),
+    ([rule('udm/*', options={'objectType': 'users/*'})], 'udm/get', {'objectType': ['users/user', 'groups/group']}, None, False),
+    ([rule('udm/*', options={'objectType': 'users/user'})], 'udm/get', {'objectType': 'users/userx'}, None, False),
+    ([rule('udm/*', options={'objectType': 'users/user'})], 'udm/get', {}, None, True),
+    ([rule('udm/*', options={'!objectType': None})], 'udm/get', {'objectType': 'users/user'}, None, False),
+    ([rule('udm/*', options={'!objectType': None})], 'udm/get', {}, None, True),
+    ([], 'udm/get', {}, None, False),
+])
+def test_is_command_allowed(rules, command, options, flavor, allowed):
+    assert ACLs(acls=rules).is_command_allowed(command, HOSTNAME, options, flavor) is allowed
+
+
+def test_hash():
+    rules = [rule('udm/*', fromUser=True), rule('join/*')]
+    assert ACLs(acls=rules).hash() == ACLs(acls=rules[::-1]).hash()
+    assert ACLs(acls=rules).hash() != ACLs(acls=rules[:1]).hash()
+
+
+def test_benchmark_permitted_commands(record_property):
+    manager = Manager()
+    manager.load()
+    acls = ACLs(acls=[rule('%s%d/*' % (prefix, i), options={'objectType': 'users/*'}) for prefix in ('udm', 'foo/bar', 'baz') for i in range(200)] + [rule('udm/*', flavor='users/*')])
+
+    with mock.patch.object(manager, '_permitted_commands', wraps=manager._permitted_commands) as permitted_commands:
+        start = time.monotonic()
+        first = manager.permitted_commands(HOSTNAME, acls)
+        record_property('uncached', time.monotonic() - start)
+        start = time.monotonic()
+        second = manager.permitted_commands(HOSTNAME, acls)
+        record_property('cached', time.monotonic() - start)
+
+    assert first == second
+    assert 'udm' in first
+    permitted_commands.assert_called_once_with(HOSTNAME, acls)
@@ -17,6 +17,7 @@ import univention.admin.modules
 from univention.admin.rest.client import (
     UDM as UDMClient, Forbidden, PreconditionFailed, Unauthorized, UnprocessableEntity,
 )
+from univention.admin.rest.utils import quote_dn
 from univention.config_registry import ucr
 from univention.lib.misc import custom_groupname
 from univention.testing.conftest import locale_available
@@ -106,6 +107,47 @@ def test_etag_after_create_via_post(udm, udm_client, random_string):
     assert response.headers['Etag'] == etag
 
 
+def test_etag_not_modified_without_opening_object(udm, udm_client):
+    """make sure a 304 Not Modified is answered faster than a full GET"""
+    userdn, _username = udm.create_user()
+    user = udm_client.get('users/user').get(userdn)
+    auth = (udm_client.username, udm_client.password)
+    headers = {'Accept-Encoding': 'identity', 'Accept': 'application/json'}
+
+    def duration(headers):
+        start = time.monotonic()
+        response = requests.get(user.uri, auth=auth, headers=headers)
+        return time.monotonic() - start, response.status_code
+
+    full = min(duration(headers) for _ in range(5))
+    not_modified = min(duration(dict(headers, **{'If-None-Match': user.etag})) for _ in range(5))
+    print('full GET: %.3fs, 304 Not Modified: %.3fs' % (full[0], not_modified[0]))
+    assert full[1] == 200
+    assert not_modified[1] == 304
+    assert not_modified[0] < full[0]
+
+
+def test_conditional_request_of_other_module(udm, udm_client):
+    """make sure a conditional request does not answer 304 for an object of another module"""
+    groupdn, _groupname = udm.create_group()
+    uri = udm_client.get('users/user').uri + quote_dn(groupdn)
+    auth = (udm_client.username, udm_client.password)
+    headers = {'Accept-Encoding': 'identity', 'Accept': 'application/json'}
+    response = requests.get(uri, auth=auth, headers=dict(headers, **{'If-None-Match': '*'}))
+    assert response.status_code == 404
+
+
+def test_conditional_request_with_differently_spelled_dn(udm, udm_client):
+    """make sure If-Match is compared with the entity tag of the object if the DN in the URL is spelled differently"""
+    userdn, _username = udm.create_user()
+    uri = udm_client.get('users/user').uri + quote_dn(userdn.replace('uid=', 'UID=').replace('cn=', 'CN='))
+    auth = (udm_client.username, udm_client.password)
+    headers = {'Accept-Encoding': 'identity', 'Accept': 'application/json'}
+    etag = requests.get(uri, auth=auth, headers=headers).headers['Etag']
+    response = requests.get(uri, auth=auth, headers=dict(headers, **{'If-Match': etag, 'Range': 'bytes=0-'}))
+    assert response.status_code == 200
+
+
 def test_etag_after_modify_via_put(udm, udm_client):
     """make sure that changes to an object via PUT change the Etag and respect If-Match"""
     userdn, _username = udm.create_user()
@@ -0,0 +1,57 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test random page access and deep page latency of the UDM REST API
+## tags: [udm,apptest]
+## roles: [domaincontroller_master]
+## exposure: dangerous
+## packages:
+##   - univention-directory-manager-rest
+
+import time
+
+import pytest
+import requests
+
+from univention.config_registry import ucr
+
+
+USERS = 200
+LIMIT = 10
+URI = 'https://%s/univention/udm/users/user/' % (ucr['ldap/master'],)
+HEADERS = {'Accept-Encoding': 'identity', 'Accept': 'application/json'}
+
+
+@pytest.fixture(scope='session')
+def auth(account):
+    return (account.username, account.bindpw)
+
+
+@pytest.fixture(scope='session')
+def users(udm_session, random_string):
+    prefix = random_string()
+    for i in range(USERS):
+        udm_session.create_user(username='%s%04d' % (prefix, i), wait_for_replication=False)
+    return prefix
+
+
+def get_page(auth, prefix, page):
+    params = {'query[username]': '%s*' % (prefix,), 'limit': LIMIT, 'page': page, 'by': 'uid', 'properties': 'username'}
+    start = time.monotonic()
+    response = requests.get(URI, auth=auth, headers=HEADERS, params=params)
+    duration = time.monotonic() - start
+    assert response.status_code == 200, response.text
+    entries = response.json()['_embedded'].get('udm:object', [])
+    return [entry['properties']['username'] for entry in entries], duration
+
+
+def test_random_page_access(auth, users):
+    page, _duration = get_page(auth, users, USERS // LIMIT)
+    assert page == ['%s%04d' % (users, i) for i in range(USERS - LIMIT, USERS)]
+    page, _duration = get_page(auth, users, 2)
+    assert page == ['%s%04d' % (users, i) for i in range(LIMIT, 2 * LIMIT)]
+
+
+def test_benchmark_deep_page(auth, users):
+    first = min(get_page(auth, users, 1)[1] for _ in range(3))
+    deep = min(get_page(auth, users, USERS // LIMIT)[1] for _ in range(3))
+    print('first page: %.3fs, page %d: %.3fs' % (first, USERS // LIMIT, deep))
+    assert deep < first * 3
@@ -0,0 +1,66 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test paging through search results with search sessions
+## tags: [udm,apptest]
+## roles: [domaincontroller_master]
+## exposure: dangerous
+## packages:
+##   - univention-directory-manager-rest
+
+import subprocess
+import time
+
+import pytest
+import requests
+
+from univention.admin.rest.search_sessions import SearchSessions
+from univention.config_registry import ucr
+
+
+USERS = 25
+LIMIT = 10
+URI = 'https://%s/univention/udm/users/user/' % (ucr['ldap/master'],)
+HEADERS = {'Accept-Encoding': 'identity', 'Accept': 'application/json'}
+
+
+@pytest.fixture(scope='session')
+def users(udm_session, random_string):
+    prefix = random_string()
+    for i in range(USERS):
+        udm_session.create_user(username='%s%04d' % (prefix, i), wait_for_replication=False)
+    return prefix
+
+
+def test_search_sessions():
+    sessions = SearchSessions(ttl=60, size=1)
+    search = ('uid=Administrator', 'users/user', None)
+    assert sessions.get(search, 1) is None
+    sessions.set(search, 1, b'cookie1')
+    assert sessions.get(search, 1) == b'cookie1'
+    sessions.set(search, 2, b'cookie2')
+    assert sessions.get(search, 1) is None
+    assert sessions.get(search, 2) == b'cookie2'
+    assert sessions.get(search[:-1], 2) is None
+    sessions.pop(search, 2)
+    assert sessions.get(search, 2) is None
+
+
+def search_page(account, users, page):
+    params = {'query[username]': '%s*' % (users,), 'limit': LIMIT, 'page': page, 'by': 'uid', 'properties': 'username'}
+    response = requests.get(URI, auth=(account.username, account.bindpw), headers=HEADERS, params=params)
+    assert response.status_code == 200, response.text
+    return [entry['properties']['username'] for entry in response.json()['_embedded'].get('udm:object', [])]
+
+
+def test_paging(account, users):
+    found = []
+    for page in range(1, USERS // LIMIT + 2):
+        found.extend(search_page(account, users, page))
+    assert found == ['%s%04d' % (users, i) for i in range(USERS)]
+
+
+def test_paging_after_restart(account, users):
+    search_page(account, users, 1)
+    # neither the stored cookies nor the LDAP connections which issued them survive
+    subprocess.check_call(['systemctl', 'restart', 'univention-directory-manager-rest'])
+    time.sleep(1)
+    assert search_page(account, users, 2) == ['%s%04d' % (users, i) for i in range(LIMIT, 2 * LIMIT)]
@@ -0,0 +1,136 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv --tb=native
+## desc: Test batch operations of the UDM REST API
+## tags: [udm,apptest]
+## roles: [domaincontroller_master]
+## exposure: dangerous
+## packages:
+##   - univention-directory-manager-rest
+
+import json
+import time
+
+import pytest
+import requests
+
+from univention.admin.rest.async_client import UDM
+from univention.testing import strings as uts
+from univention.testing.utils import verify_ldap_object, wait_for_listener_replication
+
+
+URI = 'http://localhost/univention/udm/'
+USERS = 50
+
+
+@pytest.fixture()
+def credentials(ucr):
+    return ucr.get('tests/domainadmin/username', 'Administrator'), ucr.get('tests/domainadmin/pwd', 'univention')
+
+
+def create_user(username, **kwargs):
+    return dict({
+        'action': 'create',
+        'object_type': 'users/user',
+        'properties': {'username': username, 'lastname': username, 'password': uts.random_string()},
+    }, **kwargs)
+
+
+async def run(credentials, operations, parallelism=None):
+    async with UDM.http(URI, *credentials) as udm:
+        return [result async for result in udm.batch(operations, parallelism)]
+
+
+@pytest.mark.asyncio()
+async def test_create_modify_remove(credentials):
+    usernames = [uts.random_username() for _ in range(3)]
+    results = await run(credentials, [create_user(username, id=username) for username in usernames])
+    assert {result['id'] for result in results} == set(usernames)
+    assert {result['status'] for result in results} == {201}
+    dns = {result['id']: result['dn'] for result in results}
+    try:
+        for username, dn in dns.items():
+            verify_ldap_object(dn, {'uid': [username]})
+
+        results = await run(credentials, [
+            {'action': 'modify', 'object_type': 'users/user', 'dn': dn, 'properties': {'description': username}}
+            for username, dn in dns.items()
+        ])
+        assert {result['status'] for result in results} == {200}
+        for username, dn in dns.items():
+            verify_ldap_object(dn, {'uid': [username], 'description': [username]})
+    finally:
+        results = await run(credentials, [{'action': 'remove', 'object_type': 'users/user', 'dn': dn} for dn in dns.values()])
+    assert {result['status'] for result in results} == {204}
+    wait_for_listener_replication()
+    for dn in dns.values():
+        verify_ldap_object(dn, should_exist=False)
+
+
+@pytest.mark.asyncio()
+async def test_errors_per_operation(credentials, ucr):
+    username = uts.random_username()
+    results = await run(credentials, [
+        create_user(username, id='created'),
+        create_user(username, id='exists'),
+        {'action': 'remove', 'object_type': 'users/user', 'dn': 'uid=%s,cn=users,%s' % (uts.random_username(), ucr['ldap/base']), 'id': 'missing'},
+        {'action': 'create', 'object_type': 'users/doesnotexist', 'id': 'unknown-type'},
+        {'action': 'modify', 'object_type': 'users/user', 'id': 'no-dn'},
+    ], parallelism=1)
+    results = {result['id']: result for result in results}
+    try:
+        assert results['created']['status'] == 201
+        assert results['exists']['status'] == 422
+        assert results['missing']['status'] == 404
+        assert results['unknown-type']['status'] == 404
+        assert results['no-dn']['status'] == 422
+        assert all(result['error']['message'] for key, result in results.items() if key != 'created')
+    finally:
+        await run(credentials, [{'action': 'remove', 'object_type': 'users/user', 'dn': results['created']['dn']}])
+
+
+@pytest.mark.parametrize('content_type', ['application/x-ndjson', 'application/json'])
+def test_chunked_request_body(credentials, ucr, content_type):
+    operations = [
+        {'action': 'remove', 'object_type': 'users/user', 'dn': 'uid=%s,cn=users,%s' % (uts.random_username(), ucr['ldap/base']), 'id': str(i)}
+        for i in range(5)
+    ]
+    if content_type == 'application/x-ndjson':
+        body = '\n'.join(json.dumps(operation) for operation in operations).encode('UTF-8')  # the last line is not terminated
+    else:
+        body = json.dumps(operations).encode('UTF-8')
+
+    def chunks(size=7):  # splits the operations in the middle of a line
+        for i in range(0, len(body), size):
+            yield body[i:i + size]
+
+    response = requests.post(URI + 'batch', data=chunks(), auth=credentials, headers={'Content-Type': content_type, 'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+    assert sorted(result['id'] for result in results) == [str(i) for i in range(5)]
+    assert {result['status'] for result in results} == {404}
+
+
+@pytest.mark.asyncio()
+async def test_benchmark_batch(credentials):
+    usernames = [uts.random_username() for _ in range(USERS)]
+    async with UDM.http(URI, *credentials) as udm:
+        module = await udm.get('users/user')
+        start = time.monotonic()
+        objects = []
+        for username in usernames[:USERS // 2]:
+            obj = await module.new()
+            obj.properties.update(create_user(username)['properties'])
+            await obj.save(reload=False)
+            objects.append(obj)
+        single = time.monotonic() - start
+
+        start = time.monotonic()
+        results = [result async for result in udm.batch([create_user(username) for username in usernames[USERS // 2:]])]
+        batch = time.monotonic() - start
+
+        dns = [obj.dn for obj in objects] + [result['dn'] for result in results if result['status'] == 201]
+        async for _result in udm.batch([{'action': 'remove', 'object_type': 'users/user', 'dn': dn} for dn in dns]):
+            pass
+
+    print('%d users: single requests %.3fs, batch %.3fs' % (USERS // 2, single, batch))
+    assert {result['status'] for result in results} == {201}
+    assert batch < single
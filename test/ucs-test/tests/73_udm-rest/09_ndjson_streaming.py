@@ -0,0 +1,94 @@
+#!/usr/share/ucs-test/runner pytest-3 -s -l -vv
+## desc: Test streaming search results of the UDM REST API as NDJSON
+## tags: [udm,apptest]
+## roles: [domaincontroller_master]
+## exposure: dangerous
+## packages:
+##   - univention-directory-manager-rest
+
+import json
+import subprocess
+import time
+
+import pytest
+import requests
+
+from univention.config_registry import ucr
+
+
+USERS = 250
+URI = 'https://%s/univention/udm/users/user/' % (ucr['ldap/master'],)
+
+
+@pytest.fixture(scope='session')
+def auth(account):
+    return (account.username, account.bindpw)
+
+
+@pytest.fixture(scope='session')
+def users(udm_session, random_string):
+    prefix = random_string()
+    for i in range(USERS):
+        udm_session.create_user(username='%s%04d' % (prefix, i), wait_for_replication=False)
+    return prefix
+
+
+@pytest.fixture()
+def sizelimit(ucr):
+    # the first chunk of 100 objects is complete before the limit is reached in the second one
+    ucr.handler_set(['ldap/sizelimit=150'])
+    subprocess.check_call(['systemctl', 'restart', 'univention-directory-manager-rest'])
+    time.sleep(1)
+    yield 150
+    ucr.revert_to_original_registry()
+    subprocess.check_call(['systemctl', 'restart', 'univention-directory-manager-rest'])
+
+
+def search(auth, accept, **params):
+    return requests.get(URI, auth=auth, headers={'Accept': accept}, params=params, stream=True)
+
+
+@pytest.mark.parametrize('properties', ['username', '*'])
+def test_ndjson_equals_json(auth, users, properties):
+    params = {'query[username]': '%s*' % (users,), 'properties': properties}
+    expected = search(auth, 'application/json', **params).json()['_embedded']['udm:object']
+
+    response = search(auth, 'application/x-ndjson', **params)
+    assert response.status_code == 200, response.text
+    assert response.headers['Content-Type'].startswith('application/x-ndjson')
+    entries = [json.loads(line) for line in response.iter_lines() if line]
+
+    assert len(entries) == USERS
+    assert sorted(entry['dn'] for entry in entries) == sorted(entry['dn'] for entry in expected)
+    assert all(entry['properties']['username'].startswith(users) for entry in entries)
+    assert all(entry['_links']['self'][0]['href'].startswith(URI) for entry in entries)
+
+
+def test_ndjson_is_chunked(auth, users):
+    response = search(auth, 'application/x-ndjson', **{'query[username]': '%s*' % (users,), 'properties': 'username'})
+    assert response.headers.get('Transfer-Encoding') == 'chunked'
+    assert 'Content-Length' not in response.headers
+
+
+def test_ndjson_first_chunk_before_search_finished(auth, users, sizelimit):
+    response = search(auth, 'application/x-ndjson', **{'query[username]': '%s*' % (users,), 'properties': 'username'})
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    # the search failed after the first chunk had been sent
+    *entries, error = lines
+    assert len(entries) == 100
+    assert all(entry['properties']['username'].startswith(users) for entry in entries)
+    assert error['error']['code'] == 500
+
+
+def test_ndjson_invalid_position(auth, users):
+    response = search(auth, 'application/x-ndjson', position='cn=does-not-exist,%s' % (ucr['ldap/base'],))
+    assert response.status_code == 422
+    assert [error['location'] for error in response.json()['error']['error']] == [['query', 'position']]
+
+
+def test_ndjson_module_overview_is_json(auth):
+    response = requests.get(URI, auth=auth, headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert 'udm:layout' in response.json()['_links']